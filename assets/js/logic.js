@@ -5,7 +5,7 @@
  * Handles calculations and helper functions related to data processing.
  */
 
-import { formatDateLocal } from './utils.js';
+import { filterByDateRange, formatDayMonth, isoMonth } from './utils.js';
 import { fetchHistoricalData } from './dataService.js';
 
 /**
@@ -82,7 +82,7 @@ export function computeStartDate(endDate) {
 
 /**
  * Calculates the Grünland-Temperatur-Summe (GTS) with month-based weighting.
- * Replaces toISOString().split('T')[0] with formatDateLocal for consistency.
+ * The month is read with isoMonth from the ISO string, so no Date is created per day.
  * @param {Array<string>} dates - Array of date strings in 'YYYY-MM-DD' format.
  * @param {Array<number>} values - Array of temperature values.
  * @param {boolean} verbose - If true, logs additional debug information.
@@ -94,8 +94,7 @@ export function calculateGTS(dates, values) {
 
     for (let i = 0; i < values.length; i++) {
         let val = Math.max(0, values[i]); // Replace negative values with 0.0
-        const currentDate = new Date(dates[i]);
-        const month = currentDate.getMonth() + 1;
+        const month = isoMonth(dates[i]);
 
         // Apply weights based on the month
         if (month === 1) {
@@ -108,7 +107,7 @@ export function calculateGTS(dates, values) {
 
         // Append the cumulative sum for the current date
         results.push({
-            date: formatDateLocal(currentDate),
+            date: dates[i],
             gts: parseFloat(cumulativeSum.toFixed(2)), // Round to 2 decimal places
         });
     }
@@ -174,20 +173,12 @@ export async function fetchGTSForYear(
     // " yearPlotEnd=", formatDateLocal(yearPlotEnd));
 
     // E) Filter GTS results to the display window
-    const endOfDay = new Date(yearPlotEnd);
-    endOfDay.setHours(23, 59, 59, 999); // Set to end of the day
-    const displayedResults = gtsResults.filter(r => {
-        const d = new Date(r.date);
-        return (d >= yearPlotStart && d <= endOfDay);
-    });
+    const displayedResults = filterByDateRange(gtsResults, yearPlotStart, yearPlotEnd);
     // console.log("[DEBUG logic.js] => final displayed results for year=", year,
     // " =>", displayedResults.length, " points");
 
     // F) Convert to Chart.js-compatible arrays
-    const labels = displayedResults.map(item => {
-        const d = new Date(item.date);
-        return `${d.getDate()}.${d.getMonth() + 1}`;
-    });
+    const labels = displayedResults.map(item => formatDayMonth(item.date));
     const gtsValues = displayedResults.map(item => item.gts);
 
     return {
@@ -239,22 +230,13 @@ export async function buildYearData(
             // 2) Filter for the chosen time window
             //
 
-            const endOfDay = new Date(yearPlotEnd);
-            endOfDay.setHours(23, 59, 59, 999); // Set to end of the day
-
-            const displayedResults = data_current_year.filter(item => {
-                const d = new Date(item.date);
-                return (d >= yearPlotStart && d <= endOfDay);
-            });
+            const displayedResults = filterByDateRange(data_current_year, yearPlotStart, yearPlotEnd);
 
             // console.log(`[DEBUG build5YearData] Year ${y} - plotStartDate: ${yearPlotStart}, endOfDay: ${endOfDay}`);
             // console.log(`[DEBUG build5YearData] Year ${y} - Displayed Results:`, displayedResults);
 
             // Convert to Chart.js data format
-            const labels = displayedResults.map(item => {
-                const d = new Date(item.date);
-                return `${d.getDate()}.${d.getMonth() + 1}`;
-            });
+            const labels = displayedResults.map(item => formatDayMonth(item.date));
             const gtsValues = displayedResults.map(item => item.gts);
 
             allResults.push({
@@ -343,16 +325,8 @@ export async function buildFullYearData(
                 baseEndDate.getDate()
             );
             if (y === endYear && Array.isArray(data_current_year)) {
-                const endOfDay = new Date(yearPlotEnd);
-                endOfDay.setHours(23, 59, 59, 999);
-                const displayedResults = data_current_year.filter((item) => {
-                    const d = new Date(item.date);
-                    return d >= yearPlotStart && d <= endOfDay;
-                });
-                const labels = displayedResults.map((item) => {
-                    const d = new Date(item.date);
-                    return `${d.getDate()}.${d.getMonth() + 1}`;
-                });
+                const displayedResults = filterByDateRange(data_current_year, yearPlotStart, yearPlotEnd);
+                const labels = displayedResults.map((item) => formatDayMonth(item.date));
                 const gtsValues = displayedResults.map((item) => item.gts);
                 allResults.push({
                     year: y,
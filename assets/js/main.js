@@ -30,7 +30,7 @@ import { PlotUpdater } from './plotUpdater.js';
 import { plotComparisonData } from './charts.js';
 import { calculateGTS } from './logic.js';
 import { fetchHistoricalData, fetchRecentData, isOpenMeteoError } from './dataService.js';
-import { formatDateLocal, formatDayMonth } from './utils.js';
+import { filterByDateRange, formatDateLocal, formatDayMonth } from './utils.js';
 import { getNextTabTarget } from './locationTabNavigation.js';
 import { createTooltipGate } from './tooltipFrequency.js';
 import { shouldSwitchLocation } from './locationSwitching.js';
@@ -1194,12 +1194,7 @@ async function buildComparisonSeriesForLocation(location, endDate, selection, up
   }
 
   const gtsResults = calculateGTS(allDates, allTemps);
-  const endOfDay = new Date(endDate);
-  endOfDay.setHours(23, 59, 59, 999);
-  const filteredResults = gtsResults.filter((entry) => {
-    const d = new Date(entry.date);
-    return d >= plotStartDate && d <= endOfDay;
-  });
+  const filteredResults = filterByDateRange(gtsResults, plotStartDate, endDate);
   if (filteredResults.length === 0) {
     return null;
   }
@@ -15,7 +15,7 @@ import {
   computeDateRange
 } from './logic.js';
 import { updateHinweisSection } from './information.js';
-import { formatDateLocal, isValidDate } from './utils.js';
+import { filterByDateRange, formatDateLocal, isValidDate } from './utils.js';
 import { LocationNameFromGPS } from './location_name_from_gps.js'; // Import the new class
 import { destroyAllCharts } from './chartManager.js';
 import {
@@ -455,14 +455,7 @@ export class PlotUpdater {
    * @returns {Array<Object>} - Filtered GTS results.
    */
   step9FilterGTS(gtsResults, plotStartDate, endDate) {
-    // Create a new Date object set to the end of the endDate day
-    const endOfDay = new Date(endDate);
-    endOfDay.setHours(23, 59, 59, 999); // Set to 23:59:59.999
-
-    return gtsResults.filter(r => {
-      const d = new Date(r.date);
-      return d >= plotStartDate && d <= endOfDay;
-    });
+    return filterByDateRange(gtsResults, plotStartDate, endDate);
   }
 
   /**
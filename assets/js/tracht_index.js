@@ -0,0 +1,422 @@
+// assets/js/tracht_index.js
+// Generated by `beelot tracht-index` from assets/js/tracht_data.js. Do not edit by hand.
+
+/**
+ * @module tracht_index
+ * Precomputed GTS interval index over the active entries of defaultTrachtData.
+ * Only valid for the default data; user-edited tracht data must be scanned.
+ */
+
+/** Indexed entries; the array position is the bit position in every bitset. */
+export const TRACHT_INDEX_ENTRIES = [
+    {"plant": "Wohlriechende Heckenkirsche", "TS_start": 18, "TS_end": 18, "url": "https://www.naturadb.de/pflanzen/lonicera-fragrantissima/"},
+    {"plant": "Schneeglöckchen", "TS_start": 35, "TS_end": 70, "url": "https://www.naturadb.de/pflanzen/galanthus-nivalis/"},
+    {"plant": "Winterlinge", "TS_start": 35, "TS_end": 70, "url": "https://www.naturadb.de/pflanzen/eranthis-hyemalis/"},
+    {"plant": "Krokos", "TS_start": 65, "TS_end": 120, "url": "https://www.naturadb.de/pflanzen/crocus-tommasinianus/"},
+    {"plant": "Hasel", "TS_start": 65, "TS_end": 120, "url": "https://www.naturadb.de/pflanzen/corylus-avellana/"},
+    {"plant": "Winterjasmin", "TS_start": 65, "TS_end": 120, "url": "https://www.naturadb.de/pflanzen/jasminum-nudiflorum/"},
+    {"plant": "kleine Osterglocken", "TS_start": 175, "TS_end": 230, "url": "https://www.naturadb.de/pflanzen/narcissus-cyclamineus/"},
+    {"plant": "Forsythien", "TS_start": 175, "TS_end": 230, "url": "https://www.naturadb.de/pflanzen/forsythia-x-intermedia/"},
+    {"plant": "Weiden", "TS_start": 175, "TS_end": 260, "url": "https://www.naturadb.de/pflanzen/salix-caprea/"},
+    {"plant": "Kornelkirsche", "TS_start": 200, "TS_end": 200, "url": "https://www.naturadb.de/pflanzen/cornus-mas/"},
+    {"plant": "Traubenhyazinthe", "TS_start": 200, "TS_end": 200, "url": "https://www.naturadb.de/pflanzen/muscari-armeniacum/"},
+    {"plant": "Schlüsselblume", "TS_start": 210, "TS_end": 210, "url": "https://www.naturadb.de/pflanzen/primula-veris/"},
+    {"plant": "Lenzrose", "TS_start": 230, "TS_end": 230, "url": "https://www.naturadb.de/pflanzen/helleborus-orientalis/"},
+    {"plant": "Sumpfdotterblume", "TS_start": 240, "TS_end": 240, "url": "https://www.naturadb.de/pflanzen/caltha-palustris/"},
+    {"plant": "Aprikose", "TS_start": 250, "TS_end": 250, "url": "https://www.naturadb.de/pflanzen/prunus-armeniaca/"},
+    {"plant": "Nektarine", "TS_start": 270, "TS_end": 270, "url": "https://www.naturadb.de/pflanzen/prunus-persica/"},
+    {"plant": "Osterglocken", "TS_start": 275, "TS_end": 300, "url": "https://www.naturadb.de/pflanzen/narcissus-pseudonarcissus/"},
+    {"plant": "Quitte", "TS_start": 280, "TS_end": 280, "url": "https://www.naturadb.de/pflanzen/cydonia-oblonga/"},
+    {"plant": "Schlehe", "TS_start": 290, "TS_end": 290, "url": "https://www.naturadb.de/pflanzen/prunus-spinosa/"},
+    {"plant": "Pfirsich", "TS_start": 300, "TS_end": 300, "url": "https://www.naturadb.de/pflanzen/prunus-persica/"},
+    {"plant": "Tränendes Herz", "TS_start": 310, "TS_end": 310, "url": "https://www.naturadb.de/pflanzen/lamprocapnos-spectabilis/"},
+    {"plant": "Tulpe", "TS_start": 320, "TS_end": 320, "url": "https://www.naturadb.de/pflanzen/tulipa-sylvestris/"},
+    {"plant": "Birke", "TS_start": 340, "TS_end": 340, "url": "https://www.naturadb.de/pflanzen/betula-pendula/"},
+    {"plant": "Schöllkraut", "TS_start": 340, "TS_end": 340, "url": "https://www.naturadb.de/pflanzen/chelidonium-majus/"},
+    {"plant": "Löwenzahn", "TS_start": 350, "TS_end": 350, "url": "https://www.naturadb.de/pflanzen/taraxacum-officinale/"},
+    {"plant": "Magnolien", "TS_start": 350, "TS_end": 350, "url": "https://www.naturadb.de/pflanzen/magnolia-grandiflora/"},
+    {"plant": "Jostabeere", "TS_start": 360, "TS_end": 360, "url": "https://www.naturadb.de/pflanzen/ribes-x-nidigrolaria/"},
+    {"plant": "Kirsche", "TS_start": 365, "TS_end": 460, "url": "https://www.naturadb.de/pflanzen/prunus-avium/"},
+    {"plant": "Traubenkirsche", "TS_start": 370, "TS_end": 370, "url": "https://www.naturadb.de/pflanzen/prunus-padus/"},
+    {"plant": "Felsenbirne", "TS_start": 380, "TS_end": 380, "url": "https://www.naturadb.de/pflanzen/amelanchier-ovalis/"},
+    {"plant": "Steinkraut", "TS_start": 380, "TS_end": 380, "url": "https://www.naturadb.de/pflanzen/alyssum-saxatile/"},
+    {"plant": "Spargelaustrieb (ohne Folienabdeckung)", "TS_start": 390, "TS_end": 390, "url": "https://www.naturadb.de/pflanzen/asparagus-officinalis/"},
+    {"plant": "Empfehlung: Honigräume aufsetzen", "TS_start": 400, "TS_end": 400, "url": null},
+    {"plant": "Birne", "TS_start": 400, "TS_end": 400, "url": "https://www.naturadb.de/pflanzen/pyrus-communis/"},
+    {"plant": "Vergissmeinicht", "TS_start": 400, "TS_end": 400, "url": "https://www.naturadb.de/pflanzen/myosotis-sylvatica/"},
+    {"plant": "Fieberklee", "TS_start": 410, "TS_end": 410, "url": "https://www.naturadb.de/pflanzen/menyanthes-trifoliata/"},
+    {"plant": "Wiesen-Schaumkraut", "TS_start": 420, "TS_end": 420, "url": "https://www.naturadb.de/pflanzen/cardamine-pratensis/"},
+    {"plant": "Walnuss", "TS_start": 430, "TS_end": 430, "url": "https://www.naturadb.de/pflanzen/juglans-regia/"},
+    {"plant": "Akelei", "TS_start": 440, "TS_end": 440, "url": "https://www.naturadb.de/pflanzen/aquilegia-vulgaris/"},
+    {"plant": "Bärlauch", "TS_start": 450, "TS_end": 450, "url": "https://www.naturadb.de/pflanzen/allium-ursinum/"},
+    {"plant": "Stiefmütterchen", "TS_start": 450, "TS_end": 450, "url": "https://www.naturadb.de/pflanzen/viola-tricolor/"},
+    {"plant": "Hahnenfuß", "TS_start": 460, "TS_end": 460, "url": "https://www.naturadb.de/pflanzen/ranunculus-repens/"},
+    {"plant": "Taubnessel/Goldnessel", "TS_start": 470, "TS_end": 470, "url": "https://www.naturadb.de/pflanzen/lamium-galeobdolon/"},
+    {"plant": "Apfel", "TS_start": 480, "TS_end": 480, "url": "https://www.naturadb.de/pflanzen/malus-domestica/"},
+    {"plant": "Raps", "TS_start": 480, "TS_end": 480, "url": "https://www.naturadb.de/pflanzen/brassica-napus/"},
+    {"plant": "Flieder", "TS_start": 480, "TS_end": 480, "url": "https://www.naturadb.de/pflanzen/syringa-vulgaris/"},
+    {"plant": "Gefleckter Aronstab", "TS_start": 480, "TS_end": 480, "url": "https://www.naturadb.de/pflanzen/arum-maculatum/"},
+    {"plant": "Rhododendron", "TS_start": 490, "TS_end": 490, "url": "https://www.naturadb.de/pflanzen/rhododendron/"},
+    {"plant": "Wiesensalbei", "TS_start": 500, "TS_end": 500, "url": "https://www.naturadb.de/pflanzen/salvia-pratensis/"},
+    {"plant": "Wildrose", "TS_start": 520, "TS_end": 520, "url": "https://www.naturadb.de/pflanzen/rosa-canina/"},
+    {"plant": "Roßkastanie", "TS_start": 530, "TS_end": 530, "url": "https://www.naturadb.de/pflanzen/aesculus-hippocastanum/"},
+    {"plant": "Rosmarin", "TS_start": 550, "TS_end": 550, "url": "https://www.naturadb.de/pflanzen/rosmarinus-officinalis/"},
+    {"plant": "Ginster", "TS_start": 560, "TS_end": 560, "url": "https://www.naturadb.de/pflanzen/cytisus-scoparius/"},
+    {"plant": "Borretsch", "TS_start": 580, "TS_end": 580, "url": "https://www.naturadb.de/pflanzen/borago-officinalis/"},
+    {"plant": "Magerite", "TS_start": 650, "TS_end": 650, "url": "https://www.naturadb.de/pflanzen/leucanthemum-vulgare/"},
+    {"plant": "Milchstern", "TS_start": 680, "TS_end": 680, "url": "https://www.naturadb.de/pflanzen/ornithogalum-umbellatum/"},
+    {"plant": "Schnittlauch", "TS_start": 700, "TS_end": 700, "url": "https://www.naturadb.de/pflanzen/allium-schoenoprasum/"},
+    {"plant": "Taubenkropf-Leimkraut", "TS_start": 710, "TS_end": 710, "url": "https://www.naturadb.de/pflanzen/silene-vulgaris/"},
+    {"plant": "Acker-Witwenblume", "TS_start": 720, "TS_end": 720, "url": "https://www.naturadb.de/pflanzen/knautia-arvensis/"},
+    {"plant": "Weiß-Klee", "TS_start": 720, "TS_end": 720, "url": "https://www.naturadb.de/pflanzen/trifolium-repens/"},
+    {"plant": "Natternkopf", "TS_start": 730, "TS_end": 730, "url": "https://www.naturadb.de/pflanzen/echium-vulgare/"},
+    {"plant": "Klatschmohn", "TS_start": 740, "TS_end": 740, "url": "https://www.naturadb.de/pflanzen/papaver-rhoeas/"},
+    {"plant": "Riesenlauch", "TS_start": 750, "TS_end": 750, "url": "https://www.naturadb.de/pflanzen/allium-giganteum/"},
+    {"plant": "Kamille", "TS_start": 750, "TS_end": 750, "url": "https://www.naturadb.de/pflanzen/matricaria-chamomilla/"},
+    {"plant": "Kornblume", "TS_start": 760, "TS_end": 760, "url": "https://www.naturadb.de/pflanzen/centaurea-cyanus/"},
+    {"plant": "Schwertlilie (Iris hollandica)", "TS_start": 770, "TS_end": 770, "url": "https://www.naturadb.de/pflanzen/iris-germanica/"},
+    {"plant": "Lupine", "TS_start": 780, "TS_end": 780, "url": "https://www.naturadb.de/pflanzen/lupinus-polyphyllus/"},
+    {"plant": "Giersch", "TS_start": 780, "TS_end": 780, "url": "https://www.naturadb.de/pflanzen/aegopodium-podagraria/"},
+    {"plant": "Wiesen-Pippau", "TS_start": 790, "TS_end": 790, "url": "https://www.naturadb.de/pflanzen/crepis-biennis/"},
+    {"plant": "Fingerhut", "TS_start": 800, "TS_end": 800, "url": "https://www.naturadb.de/pflanzen/digitalis-purpurea/"},
+    {"plant": "Wiesen-Glockenblume", "TS_start": 800, "TS_end": 800, "url": "https://www.naturadb.de/pflanzen/campanula-patula/"},
+    {"plant": "Perückenstrauch", "TS_start": 810, "TS_end": 810, "url": "https://www.naturadb.de/pflanzen/cotinus-coggygria/"},
+    {"plant": "Robinie", "TS_start": 820, "TS_end": 820, "url": "https://www.naturadb.de/pflanzen/robinia-pseudoacacia/"},
+    {"plant": "Hartriegel", "TS_start": 830, "TS_end": 830, "url": "https://www.naturadb.de/pflanzen/cornus-sanguinea/"},
+    {"plant": "Holunder", "TS_start": 840, "TS_end": 840, "url": "https://www.naturadb.de/pflanzen/sambucus-nigra/"},
+    {"plant": "Strauchbasilikum", "TS_start": 850, "TS_end": 850, "url": "https://www.naturadb.de/pflanzen/ocimum-basilicum-african-blue/"},
+    {"plant": "Spargel Blüte", "TS_start": 860, "TS_end": 860, "url": "https://www.naturadb.de/pflanzen/asparagus-officinalis/"},
+    {"plant": "Faulbaum", "TS_start": 900, "TS_end": 900, "url": "https://www.naturadb.de/pflanzen/rhamnus-frangula/"},
+    {"plant": "Dahlie", "TS_start": 900, "TS_end": 900, "url": "https://www.naturadb.de/suche/?q=dahlie"},
+    {"plant": "Karthäusernelke", "TS_start": 910, "TS_end": 910, "url": "https://www.naturadb.de/pflanzen/dianthus-carthusianorum/"},
+    {"plant": "Pfingstrose", "TS_start": 940, "TS_end": 940, "url": "https://www.naturadb.de/pflanzen/paeonia-officinalis/"},
+    {"plant": "Phacelia", "TS_start": 940, "TS_end": 940, "url": "https://www.naturadb.de/pflanzen/phacelia-tanacetifolia/"},
+    {"plant": "Orangerotes Habichtskraut", "TS_start": 940, "TS_end": 940, "url": "https://www.naturadb.de/pflanzen/hieracium-aurantiacum/"},
+    {"plant": "Zuckererbse", "TS_start": 950, "TS_end": 950, "url": "https://www.naturadb.de/pflanzen/pisum-sativum/"},
+    {"plant": "Jungfer im Grünen", "TS_start": 960, "TS_end": 960, "url": "https://www.naturadb.de/pflanzen/nigella-damascena/"},
+    {"plant": "Fransenschwertel (Sparaxis)", "TS_start": 960, "TS_end": 960, "url": "https://de.wikipedia.org/wiki/Sparaxis"},
+    {"plant": "Bartnelke", "TS_start": 1000, "TS_end": 1000, "url": "https://www.naturadb.de/pflanzen/dianthus-barbatus/"},
+    {"plant": "Edelkastanie (Castanea sativa)", "TS_start": 1000, "TS_end": 1200, "url": "https://www.naturadb.de/pflanzen/castanea-sativa/"},
+    {"plant": "Marien-Glockenblume", "TS_start": 1020, "TS_end": 1020, "url": "https://www.naturadb.de/pflanzen/campanula-medium/"},
+    {"plant": "Roter Lein", "TS_start": 1030, "TS_end": 1030, "url": "https://www.naturadb.de/pflanzen/linum-grandiflorum/"},
+    {"plant": "Zwergmispel", "TS_start": 1040, "TS_end": 1040, "url": "https://www.naturadb.de/pflanzen/cotoneaster-integerrimus/"},
+    {"plant": "Scharfgarbe (rot)", "TS_start": 1050, "TS_end": 1050, "url": "https://www.naturadb.de/pflanzen/achillea-millefolium/"},
+    {"plant": "Wiesen-Labkraut", "TS_start": 1050, "TS_end": 1050, "url": "https://www.naturadb.de/pflanzen/galium-mollugo/"},
+    {"plant": "Mittagsblume", "TS_start": 1060, "TS_end": 1060, "url": "https://www.naturadb.de/pflanzen/delosperma-cooperi/"},
+    {"plant": "Königskerze", "TS_start": 1080, "TS_end": 1080, "url": "https://www.naturadb.de/pflanzen/verbascum-densiflorum/"},
+    {"plant": "Hauswurz", "TS_start": 1090, "TS_end": 1090, "url": "https://www.naturadb.de/pflanzen/sempervivum-tectorum/"},
+    {"plant": "Wilde Brombeere", "TS_start": 1100, "TS_end": 1100, "url": "https://www.naturadb.de/pflanzen/rubus-fruticosus/"},
+    {"plant": "Sommerlinde", "TS_start": 1100, "TS_end": 1100, "url": "https://www.naturadb.de/pflanzen/tilia-platyphyllos/"},
+    {"plant": "Clematis (spätblühend)", "TS_start": 1120, "TS_end": 1120, "url": "https://www.naturadb.de/pflanzen/clematis-vitalba/"},
+    {"plant": "Malve", "TS_start": 1200, "TS_end": 1200, "url": "https://www.naturadb.de/pflanzen/malva-sylvestris/"},
+    {"plant": "Nachtkerze", "TS_start": 1300, "TS_end": 1300, "url": "https://www.naturadb.de/pflanzen/oenothera-biennis/"},
+    {"plant": "Wiesen-Flockenblume", "TS_start": 1320, "TS_end": 1320, "url": "https://www.naturadb.de/pflanzen/centaurea-jacea/"},
+    {"plant": "Sumpf-Hornklee", "TS_start": 1350, "TS_end": 1350, "url": "https://www.naturadb.de/pflanzen/lotus-pedunculatus/"},
+    {"plant": "Löwenmaul", "TS_start": 1380, "TS_end": 1380, "url": "https://www.naturadb.de/pflanzen/antirrhinum-majus/"},
+    {"plant": "Winterlinde", "TS_start": 1400, "TS_end": 1400, "url": "https://www.naturadb.de/pflanzen/tilia-cordata/"},
+    {"plant": "Schlafmohn", "TS_start": 1420, "TS_end": 1420, "url": "https://www.naturadb.de/pflanzen/papaver-somniferum/"},
+    {"plant": "Vogelwicke", "TS_start": 1440, "TS_end": 1440, "url": "https://www.naturadb.de/pflanzen/vicia-cracca/"},
+    {"plant": "Lilie", "TS_start": 1450, "TS_end": 1450, "url": "https://www.naturadb.de/pflanzen/iris-germanica/"},
+    {"plant": "Edelwicke", "TS_start": 1460, "TS_end": 1460, "url": "https://www.naturadb.de/pflanzen/lathyrus-odoratus/"},
+    {"plant": "Speisezwiebel", "TS_start": 1480, "TS_end": 1480, "url": "https://www.naturadb.de/pflanzen/allium-cepa/"},
+    {"plant": "Schmetterlingsflieder", "TS_start": 1500, "TS_end": 1500, "url": "https://www.naturadb.de/pflanzen/buddleja-davidii/"},
+    {"plant": "Karotte", "TS_start": 1520, "TS_end": 1520, "url": "https://www.naturadb.de/pflanzen/daucus-carota/"},
+    {"plant": "Tigerblume", "TS_start": 1540, "TS_end": 1540, "url": "https://de.wikipedia.org/wiki/Tigerblumen/"},
+    {"plant": "Palmlilie", "TS_start": 1550, "TS_end": 1550, "url": "https://www.naturadb.de/pflanzen/yucca-filamentosa/"},
+    {"plant": "Dill", "TS_start": 1580, "TS_end": 1580, "url": "https://www.naturadb.de/pflanzen/anethum-graveolens/"},
+    {"plant": "Silberlinde", "TS_start": 1600, "TS_end": 1600, "url": "https://www.naturadb.de/pflanzen/tilia-tomentosa/"},
+    {"plant": "Lavendel", "TS_start": 1600, "TS_end": 1600, "url": "https://www.naturadb.de/pflanzen/lavandula-angustifolia/"},
+    {"plant": "Brennnessel", "TS_start": 1620, "TS_end": 1620, "url": "https://www.naturadb.de/pflanzen/urtica-dioica/"},
+    {"plant": "Phlox", "TS_start": 1680, "TS_end": 1680, "url": "https://www.naturadb.de/pflanzen/phlox-paniculata/"},
+    {"plant": "Oregano", "TS_start": 1720, "TS_end": 1720, "url": "https://www.naturadb.de/pflanzen/origanum-vulgare/"},
+    {"plant": "Wegwarte", "TS_start": 1900, "TS_end": 1900, "url": "https://www.naturadb.de/pflanzen/cichorium-intybus/"},
+    {"plant": "Drüsiges Springkraut", "TS_start": 2000, "TS_end": 2000, "url": "https://www.naturadb.de/pflanzen/impatiens-glandulifera/"},
+    {"plant": "Teufelsabbiss", "TS_start": 2300, "TS_end": 2300, "url": "https://www.naturadb.de/pflanzen/succisa-pratensis/"},
+    {"plant": "Kanadische Goldrute", "TS_start": 2500, "TS_end": 2500, "url": "https://www.naturadb.de/pflanzen/solidago-canadensis/"},
+    {"plant": "Aster (frühe Sorte)", "TS_start": 2900, "TS_end": 2900, "url": "https://www.naturadb.de/pflanzen/callistephus-chinensis/"},
+    {"plant": "Bartblume", "TS_start": 3000, "TS_end": 3000, "url": "https://www.naturadb.de/pflanzen/caryopteris-clandonensis/"},
+    {"plant": "Berg-Aster (späte Aster-Sorte)", "TS_start": 3100, "TS_end": 3100, "url": "https://www.naturadb.de/pflanzen/aster-amellus/"}
+];
+
+/** Largest TS_end in the index; lookups above this value are empty. */
+export const TRACHT_INDEX_MAX_GTS = 3100;
+
+/** Number of 32-bit words per bitset. */
+export const TRACHT_INDEX_WORDS = 4;
+
+// Endpoint sweep: the active set is constant from SEGMENT_STARTS[i] up to the next start.
+const SEGMENT_STARTS = [0, 18, 19, 35, 65, 71, 121, 175, 200, 201, 210, 211, 230, 231, 240, 241, 250, 251, 261, 270, 271, 275, 280, 281, 290, 291, 300, 301, 310, 311, 320, 321, 340, 341, 350, 351, 360, 361, 365, 370, 371, 380, 381, 390, 391, 400, 401, 410, 411, 420, 421, 430, 431, 440, 441, 450, 451, 460, 461, 470, 471, 480, 481, 490, 491, 500, 501, 520, 521, 530, 531, 550, 551, 560, 561, 580, 581, 650, 651, 680, 681, 700, 701, 710, 711, 720, 721, 730, 731, 740, 741, 750, 751, 760, 761, 770, 771, 780, 781, 790, 791, 800, 801, 810, 811, 820, 821, 830, 831, 840, 841, 850, 851, 860, 861, 900, 901, 910, 911, 940, 941, 950, 951, 960, 961, 1000, 1001, 1020, 1021, 1030, 1031, 1040, 1041, 1050, 1051, 1060, 1061, 1080, 1081, 1090, 1091, 1100, 1101, 1120, 1121, 1200, 1201, 1300, 1301, 1320, 1321, 1350, 1351, 1380, 1381, 1400, 1401, 1420, 1421, 1440, 1441, 1450, 1451, 1460, 1461, 1480, 1481, 1500, 1501, 1520, 1521, 1540, 1541, 1550, 1551, 1580, 1581, 1600, 1601, 1620, 1621, 1680, 1681, 1720, 1721, 1900, 1901, 2000, 2001, 2300, 2301, 2500, 2501, 2900, 2901, 3000, 3001, 3100, 3101];
+const SEGMENT_WORDS = [
+    0, 0, 0, 0,
+    1, 0, 0, 0,
+    0, 0, 0, 0,
+    6, 0, 0, 0,
+    62, 0, 0, 0,
+    56, 0, 0, 0,
+    0, 0, 0, 0,
+    448, 0, 0, 0,
+    1984, 0, 0, 0,
+    448, 0, 0, 0,
+    2496, 0, 0, 0,
+    448, 0, 0, 0,
+    4544, 0, 0, 0,
+    256, 0, 0, 0,
+    8448, 0, 0, 0,
+    256, 0, 0, 0,
+    16640, 0, 0, 0,
+    256, 0, 0, 0,
+    0, 0, 0, 0,
+    32768, 0, 0, 0,
+    0, 0, 0, 0,
+    65536, 0, 0, 0,
+    196608, 0, 0, 0,
+    65536, 0, 0, 0,
+    327680, 0, 0, 0,
+    65536, 0, 0, 0,
+    589824, 0, 0, 0,
+    0, 0, 0, 0,
+    1048576, 0, 0, 0,
+    0, 0, 0, 0,
+    2097152, 0, 0, 0,
+    0, 0, 0, 0,
+    12582912, 0, 0, 0,
+    0, 0, 0, 0,
+    50331648, 0, 0, 0,
+    0, 0, 0, 0,
+    67108864, 0, 0, 0,
+    0, 0, 0, 0,
+    134217728, 0, 0, 0,
+    402653184, 0, 0, 0,
+    134217728, 0, 0, 0,
+    1744830464, 0, 0, 0,
+    134217728, 0, 0, 0,
+    2281701376, 0, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 7, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 8, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 16, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 32, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 64, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 384, 0, 0,
+    134217728, 0, 0, 0,
+    134217728, 512, 0, 0,
+    0, 0, 0, 0,
+    0, 1024, 0, 0,
+    0, 0, 0, 0,
+    0, 30720, 0, 0,
+    0, 0, 0, 0,
+    0, 32768, 0, 0,
+    0, 0, 0, 0,
+    0, 65536, 0, 0,
+    0, 0, 0, 0,
+    0, 131072, 0, 0,
+    0, 0, 0, 0,
+    0, 262144, 0, 0,
+    0, 0, 0, 0,
+    0, 524288, 0, 0,
+    0, 0, 0, 0,
+    0, 1048576, 0, 0,
+    0, 0, 0, 0,
+    0, 2097152, 0, 0,
+    0, 0, 0, 0,
+    0, 4194304, 0, 0,
+    0, 0, 0, 0,
+    0, 8388608, 0, 0,
+    0, 0, 0, 0,
+    0, 16777216, 0, 0,
+    0, 0, 0, 0,
+    0, 33554432, 0, 0,
+    0, 0, 0, 0,
+    0, 201326592, 0, 0,
+    0, 0, 0, 0,
+    0, 268435456, 0, 0,
+    0, 0, 0, 0,
+    0, 536870912, 0, 0,
+    0, 0, 0, 0,
+    0, 3221225472, 0, 0,
+    0, 0, 0, 0,
+    0, 0, 1, 0,
+    0, 0, 0, 0,
+    0, 0, 2, 0,
+    0, 0, 0, 0,
+    0, 0, 12, 0,
+    0, 0, 0, 0,
+    0, 0, 16, 0,
+    0, 0, 0, 0,
+    0, 0, 96, 0,
+    0, 0, 0, 0,
+    0, 0, 128, 0,
+    0, 0, 0, 0,
+    0, 0, 256, 0,
+    0, 0, 0, 0,
+    0, 0, 512, 0,
+    0, 0, 0, 0,
+    0, 0, 1024, 0,
+    0, 0, 0, 0,
+    0, 0, 2048, 0,
+    0, 0, 0, 0,
+    0, 0, 4096, 0,
+    0, 0, 0, 0,
+    0, 0, 24576, 0,
+    0, 0, 0, 0,
+    0, 0, 32768, 0,
+    0, 0, 0, 0,
+    0, 0, 458752, 0,
+    0, 0, 0, 0,
+    0, 0, 524288, 0,
+    0, 0, 0, 0,
+    0, 0, 3145728, 0,
+    0, 0, 0, 0,
+    0, 0, 12582912, 0,
+    0, 0, 8388608, 0,
+    0, 0, 25165824, 0,
+    0, 0, 8388608, 0,
+    0, 0, 41943040, 0,
+    0, 0, 8388608, 0,
+    0, 0, 75497472, 0,
+    0, 0, 8388608, 0,
+    0, 0, 411041792, 0,
+    0, 0, 8388608, 0,
+    0, 0, 545259520, 0,
+    0, 0, 8388608, 0,
+    0, 0, 1082130432, 0,
+    0, 0, 8388608, 0,
+    0, 0, 2155872256, 0,
+    0, 0, 8388608, 0,
+    0, 0, 8388608, 3,
+    0, 0, 8388608, 0,
+    0, 0, 8388608, 4,
+    0, 0, 8388608, 0,
+    0, 0, 8388608, 8,
+    0, 0, 0, 0,
+    0, 0, 0, 16,
+    0, 0, 0, 0,
+    0, 0, 0, 32,
+    0, 0, 0, 0,
+    0, 0, 0, 64,
+    0, 0, 0, 0,
+    0, 0, 0, 128,
+    0, 0, 0, 0,
+    0, 0, 0, 256,
+    0, 0, 0, 0,
+    0, 0, 0, 512,
+    0, 0, 0, 0,
+    0, 0, 0, 1024,
+    0, 0, 0, 0,
+    0, 0, 0, 2048,
+    0, 0, 0, 0,
+    0, 0, 0, 4096,
+    0, 0, 0, 0,
+    0, 0, 0, 8192,
+    0, 0, 0, 0,
+    0, 0, 0, 16384,
+    0, 0, 0, 0,
+    0, 0, 0, 32768,
+    0, 0, 0, 0,
+    0, 0, 0, 65536,
+    0, 0, 0, 0,
+    0, 0, 0, 131072,
+    0, 0, 0, 0,
+    0, 0, 0, 262144,
+    0, 0, 0, 0,
+    0, 0, 0, 1572864,
+    0, 0, 0, 0,
+    0, 0, 0, 2097152,
+    0, 0, 0, 0,
+    0, 0, 0, 4194304,
+    0, 0, 0, 0,
+    0, 0, 0, 8388608,
+    0, 0, 0, 0,
+    0, 0, 0, 16777216,
+    0, 0, 0, 0,
+    0, 0, 0, 33554432,
+    0, 0, 0, 0,
+    0, 0, 0, 67108864,
+    0, 0, 0, 0,
+    0, 0, 0, 134217728,
+    0, 0, 0, 0,
+    0, 0, 0, 268435456,
+    0, 0, 0, 0,
+    0, 0, 0, 536870912,
+    0, 0, 0, 0,
+    0, 0, 0, 1073741824,
+    0, 0, 0, 0
+];
+
+const SORTED_STARTS = TRACHT_INDEX_ENTRIES.map(entry => entry.TS_start);
+
+/**
+ * Dense lookup table: TRACHT_INDEX_WORDS words per integer GTS from 0 to TRACHT_INDEX_MAX_GTS.
+ */
+export const TRACHT_INDEX_TABLE = (() => {
+    const table = new Uint32Array((TRACHT_INDEX_MAX_GTS + 1) * TRACHT_INDEX_WORDS);
+    for (let i = 0; i < SEGMENT_STARTS.length; i++) {
+        const end = i + 1 < SEGMENT_STARTS.length ? SEGMENT_STARTS[i + 1] : TRACHT_INDEX_MAX_GTS + 1;
+        for (let gts = SEGMENT_STARTS[i]; gts < Math.min(end, TRACHT_INDEX_MAX_GTS + 1); gts++) {
+            for (let w = 0; w < TRACHT_INDEX_WORDS; w++) {
+                table[gts * TRACHT_INDEX_WORDS + w] = SEGMENT_WORDS[i * TRACHT_INDEX_WORDS + w];
+            }
+        }
+    }
+    return table;
+})();
+
+/**
+ * Returns the entries with TS_start <= gts <= TS_end.
+ * @param {number} gts - Grassland temperature sum.
+ * @returns {Array<Object>} - Matching entries, ordered by TS_start.
+ */
+export function plantsActiveAt(gts) {
+    const position = Math.floor(gts);
+    if (!(position >= 0 && position <= TRACHT_INDEX_MAX_GTS)) {
+        return [];
+    }
+    // TS_end is an integer, so between two integers an entry must also cover the next one.
+    const between = gts !== position;
+    const result = [];
+    const offset = position * TRACHT_INDEX_WORDS;
+    for (let w = 0; w < TRACHT_INDEX_WORDS; w++) {
+        let word = TRACHT_INDEX_TABLE[offset + w];
+        if (between) {
+            const next = position < TRACHT_INDEX_MAX_GTS ? TRACHT_INDEX_TABLE[offset + TRACHT_INDEX_WORDS + w] : 0;
+            word = (word & next) >>> 0;
+        }
+        while (word !== 0) {
+            const bit = 31 - Math.clz32(word & -word);
+            result.push(TRACHT_INDEX_ENTRIES[w * 32 + bit]);
+            word = (word & (word - 1)) >>> 0;
+        }
+    }
+    return result;
+}
+
+function lowerBound(values, target, inclusive) {
+    let lo = 0;
+    let hi = values.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (values[mid] < target || (inclusive && values[mid] === target)) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+/**
+ * Returns the entries with low <= TS_start <= high.
+ * @param {number} low - Lower GTS bound (inclusive).
+ * @param {number} high - Upper GTS bound (inclusive).
+ * @returns {Array<Object>} - Matching entries, ordered by TS_start.
+ */
+export function plantsStartingBetween(low, high) {
+    const first = lowerBound(SORTED_STARTS, low, false);
+    const last = lowerBound(SORTED_STARTS, high, true);
+    return TRACHT_INDEX_ENTRIES.slice(first, last);
+}
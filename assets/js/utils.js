@@ -23,10 +23,31 @@ export function formatDateLocal(date) {
  * @returns {string} - Formatted date as "day.month"
  */
 export function formatDayMonth(dateStr) {
-    const d = new Date(dateStr);
-    const day = d.getDate();
-    const month = d.getMonth() + 1;
-    return `${day}.${month}`;
+    return `${Number(dateStr.slice(8, 10))}.${isoMonth(dateStr)}`;
+}
+
+/**
+ * Returns the month (1-12) of a "YYYY-MM-DD" string without creating a Date.
+ * @param {string} dateStr - Date string in "YYYY-MM-DD" format.
+ * @returns {number} - The month number.
+ */
+export function isoMonth(dateStr) {
+    return Number(dateStr.slice(5, 7));
+}
+
+/**
+ * Keeps the entries whose "YYYY-MM-DD" date lies within the local calendar
+ * days of startDate..endDate. ISO date strings sort like the dates, so each
+ * entry is compared as a string instead of being parsed into a Date.
+ * @param {Array<Object>} entries - Objects with a 'date' property.
+ * @param {Date} startDate - First day to keep.
+ * @param {Date} endDate - Last day to keep.
+ * @returns {Array<Object>} - The entries within the range.
+ */
+export function filterByDateRange(entries, startDate, endDate) {
+    const startKey = formatDateLocal(startDate);
+    const endKey = formatDateLocal(endDate);
+    return entries.filter(entry => entry.date >= startKey && entry.date <= endKey);
 }
 
 /**
@@ -0,0 +1,6 @@
+"""Helper tools for the beelot website: GTS computation, URL checks and release automation.
+
+Run `beelot --help` for the list of subcommands.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,117 @@
+"""Address normalization rules mirrored from assets/js/addressNormalization.js.
+
+Keep these functions in sync with their JS counterparts; the offline
+geocoding index (`beelot.geoindex`) relies on producing the same keys as the
+browser.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Final, FrozenSet, List, Tuple
+
+DEFAULT_ADDRESS_COUNTRY: Final[str] = "Deutschland"
+
+SETTLEMENT_TYPES: Final[FrozenSet[str]] = frozenset({"city", "town", "village", "municipality", "hamlet"})
+
+_COUNTRY_TOKENS: Final[Tuple[Tuple[str, FrozenSet[str]], ...]] = (
+    ("Deutschland", frozenset({"d", "de", "deutschland", "germany", "deu"})),
+    ("Schweiz", frozenset({"ch", "sch", "schweiz", "switzerland", "che"})),
+    ("Österreich", frozenset({"ö", "o", "au", "at", "österreich", "osterreich", "austria", "aut"})),
+)
+
+_COUNTRY_CODES: Final[Dict[str, str]] = {"Deutschland": "de", "Schweiz": "ch", "Österreich": "at"}
+
+_SUBSTITUTIONS: Final[Dict[str, Tuple[str, ...]]] = {
+    "a": ("ä",),
+    "ä": ("a",),
+    "o": ("ö",),
+    "ö": ("o",),
+    "u": ("ü",),
+    "ü": ("u",),
+    "n": ("m",),
+    "m": ("n",),
+    "b": ("p",),
+    "p": ("b",),
+    "d": ("t",),
+    "t": ("d",),
+    "g": ("k",),
+    "k": ("g",),
+    "f": ("v", "w"),
+    "v": ("f", "w"),
+    "w": ("v",),
+}
+
+_LETTER_REGEX = re.compile(r"^[A-Za-zÄÖÜäöüß]$")
+
+
+def normalize_address_field(value: Any) -> str:
+    """`normalizeAddressField`: strip strings, everything else becomes ""."""
+    if not isinstance(value, str):
+        return ""
+    return value.strip()
+
+
+def normalize_country_name(value: Any) -> str:
+    """`normalizeCountryName`: map common spellings to the German country name."""
+    token = normalize_address_field(value).lower().replace(".", "")
+    if not token:
+        return DEFAULT_ADDRESS_COUNTRY
+    for name, tokens in _COUNTRY_TOKENS:
+        if token in tokens:
+            return name
+    return normalize_address_field(value)
+
+
+def country_code_for_country_name(value: Any) -> str:
+    """`getCountryCodeForCountryName`: "de", "ch", "at" or ""."""
+    return _COUNTRY_CODES.get(normalize_country_name(value), "")
+
+
+def city_key(value: Any) -> str:
+    """Case-insensitive lookup key of a city, as used for de-duplication in the JS helpers."""
+    return normalize_address_field(value).lower()
+
+
+def _is_letter(char: str) -> bool:
+    return bool(_LETTER_REGEX.match(char))
+
+
+def build_city_typo_candidates(city: Any, max_candidates: int = 12) -> List[str]:
+    """`buildCityTypoCandidates`: substitutions, doubled letters, then swapped neighbours."""
+    base = normalize_address_field(city)
+    if len(base) < 3:
+        return []
+
+    candidates: List[str] = []
+    seen = {base.lower()}
+
+    def push(value: str) -> bool:
+        normalized = normalize_address_field(value)
+        if normalized and normalized.lower() not in seen:
+            seen.add(normalized.lower())
+            candidates.append(normalized)
+        return len(candidates) >= max_candidates
+
+    def apply_case(original: str, replacement: str) -> str:
+        return replacement.upper() if original == original.upper() else replacement
+
+    for i, current in enumerate(base):
+        for replacement in _SUBSTITUTIONS.get(current.lower(), ()):
+            if push(f"{base[:i]}{apply_case(current, replacement)}{base[i + 1:]}"):
+                return candidates
+
+    for i, current in enumerate(base):
+        if not _is_letter(current) or base[i + 1 : i + 2] == current:
+            continue
+        if push(f"{base[:i + 1]}{current}{base[i + 1:]}"):
+            return candidates
+
+    for i in range(len(base) - 1):
+        left, right = base[i], base[i + 1]
+        if not _is_letter(left) or not _is_letter(right) or left == right:
+            continue
+        if push(f"{base[:i]}{right}{left}{base[i + 2:]}"):
+            return candidates
+
+    return candidates
@@ -0,0 +1,352 @@
+"""Analog years: which stored years looked most like this year so far?
+
+The query is the GTS curve of the current year up to some day, placed on the
+calendar slots of the cube (`beelot cube`). Every (location, year) of the cube
+is a candidate; its distance to the query is the root-mean-square GTS
+difference over the slots the query knows (optionally only the last
+`window` of them). All candidates of a block of locations are compared in one
+array expression, so a query over decades × hundreds of locations reads the
+needed slots of the memory-mapped cube once and never loops per year.
+
+Candidates can be limited to locations within a radius around the query
+location; the query year itself is always excluded. For the top-k analogs the
+first crossing of every `TS_start` of `defaultTrachtData` is looked up, and
+the median crossing slot across the analogs gives an expected bloom date in
+the query year.
+
+Usage:
+
+    beelot analogs -d cube --id apiary-1 --year 2026 -k 5 -o analogs.json
+    beelot analogs -d cube -l 48.14,11.58 --radius 150 -o analogs.json
+    beelot analogs -d cube -l 48.14,11.58 -i this_year.js -o analogs.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_index import FEB_29_SLOT, SLOTS, calendar_slot, slot_date, year_slots
+from .cube import CubeStore
+from .ensemble import Threshold, thresholds_from_tracht
+from .heatsum import GTS, accumulate, months_from_iso_dates, to_fixed
+from .openmeteo import ARCHIVE_URL, FORECAST_URL, parse_location
+from .tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+DEFAULT_TOP_K: Final[int] = 5
+EARTH_RADIUS_KM: Final[float] = 6371.0
+
+# Upper bound for the float64 difference block of one location chunk.
+_CHUNK_ELEMENTS: Final[int] = 1 << 23
+
+
+@dataclass(frozen=True)
+class Analog:
+    """One past (location, year) close to the query curve.
+
+    `crossing_slots` holds the calendar slot on which the analog reached each
+    threshold, -1 if it did not within the stored days.
+    """
+
+    location_id: str
+    year: int
+    rmse: float
+    distance_km: Optional[float]
+    crossing_slots: Tuple[int, ...]
+
+    def crossing_dates(self) -> List[Optional[str]]:
+        return [_slot_iso(self.year, slot) if slot >= 0 else None for slot in self.crossing_slots]
+
+
+def _slot_iso(year: int, slot: int) -> str:
+    # 29 February of a leap analog maps to 1 March of a common year.
+    day = slot_date(year, slot) or slot_date(year, slot + 1)
+    return day.isoformat()  # type: ignore[union-attr]
+
+
+def query_slots(year: int, gts: Sequence[float]) -> np.ndarray:
+    """Place a GTS curve starting on 1 January of `year` on calendar slots (NaN after its last day)."""
+    values = np.asarray(gts, dtype=np.float64)
+    slots = year_slots(year)
+    if values.size > slots.size:
+        raise ValueError(f"The query curve is longer than the year {year}.")
+    query = np.full(SLOTS, np.nan)
+    query[slots[: values.size]] = values
+    return query
+
+
+def distances_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many (haversine)."""
+    phi1, phi2 = np.radians(lat), np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def trajectory_rmse(data: np.ndarray, rows: np.ndarray, slots: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """RMSE of every year of `rows` against `query` on `slots`, shape (rows, years).
+
+    Candidates with a missing value on one of the slots get `inf`.
+    """
+    years = data.shape[1]
+    result = np.empty((rows.size, years), dtype=np.float64)
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, years * slots.size))
+    for begin in range(0, rows.size, chunk):
+        block = data[rows[begin : begin + chunk]][:, :, slots].astype(np.float64)
+        block -= query
+        rmse = np.sqrt(np.mean(np.square(block), axis=-1))
+        result[begin : begin + chunk] = np.where(np.isnan(rmse), np.inf, rmse)
+    return result
+
+
+def crossing_slots(series: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """First slot with `series >= level` per row and level, -1 if never; series has shape (n, 366)."""
+    reached = series[:, None, :] >= levels[None, :, None]  # NaN compares False
+    first = np.argmax(reached, axis=-1)
+    hit = np.take_along_axis(reached, first[..., None], axis=-1)[..., 0]
+    return np.where(hit, first, -1)
+
+
+def find_analogs(
+    store: CubeStore,
+    query: np.ndarray,
+    year: int,
+    thresholds: Sequence[Threshold],
+    k: int = DEFAULT_TOP_K,
+    center: Optional[Tuple[float, float]] = None,
+    radius_km: Optional[float] = None,
+    window: Optional[int] = None,
+) -> List[Analog]:
+    """Top-k (location, year) candidates closest to `query`, best first.
+
+    Parameters
+    ----------
+    store:
+        Cube with the historical GTS curves.
+    query:
+        GTS per calendar slot of the query year, NaN where unknown (see
+        `query_slots`).
+    year:
+        Query year; it is excluded from the candidates.
+    thresholds:
+        Plants whose crossing slots are reported per analog.
+    k:
+        Number of analogs.
+    center, radius_km:
+        Query location; with a radius only locations within it are candidates.
+    window:
+        Compare only the last `window` known days of the query.
+    """
+    if radius_km is not None and center is None:
+        raise ValueError("A search radius needs the query location.")
+    slots = np.flatnonzero(~np.isnan(query))
+    slots = slots[slots != FEB_29_SLOT]  # NaN in all common candidate years
+    if window is not None:
+        slots = slots[-window:] if window > 0 else slots[:0]
+    if slots.size == 0:
+        raise ValueError("The query curve has no known days.")
+
+    locations = store.locations
+    rows = np.arange(len(locations))
+    distance: Optional[np.ndarray] = None
+    if center is not None and locations:
+        lats = np.array([location.lat for location in locations])
+        lons = np.array([location.lon for location in locations])
+        distance = distances_km(center[0], center[1], lats, lons)
+        if radius_km is not None:
+            rows = rows[distance <= radius_km]
+
+    scores = trajectory_rmse(store.data(), rows, slots, query[slots])
+    if store.first_year <= year <= store.last_year:
+        scores[:, store.year_index(year)] = np.inf
+    flat = scores.ravel()
+    count = min(k, int(np.isfinite(flat).sum()))
+    if count <= 0:
+        return []
+    best = np.argpartition(flat, count - 1)[:count]
+    best = best[np.argsort(flat[best], kind="stable")]
+    best_rows, best_years = np.divmod(best, store.years)
+    best_rows = rows[best_rows]
+
+    levels = np.array([threshold.gts for threshold in thresholds], dtype=np.float64)
+    crossings = crossing_slots(store.data()[best_rows, best_years].astype(np.float64), levels)
+    return [
+        Analog(
+            locations[row].id,
+            store.first_year + int(year_index),
+            float(flat[index]),
+            None if distance is None else float(distance[row]),
+            tuple(int(slot) for slot in slots_row),
+        )
+        for index, row, year_index, slots_row in zip(best, best_rows, best_years, crossings.tolist())
+    ]
+
+
+def expected_dates(analogs: Sequence[Analog], year: int, count: int) -> List[Dict[str, Any]]:
+    """Median crossing slot across the analogs that reached each threshold, as a date in `year`."""
+    table = np.array([analog.crossing_slots for analog in analogs], dtype=np.int64).reshape(len(analogs), count)
+    result = []
+    for column in range(count):
+        reached = table[:, column][table[:, column] >= 0]
+        median = int(np.median(reached)) if reached.size else None
+        result.append(
+            {
+                "reached": int(reached.size),
+                "date": _slot_iso(year, median) if median is not None else None,
+            }
+        )
+    return result
+
+
+def report(
+    analogs: Sequence[Analog], thresholds: Sequence[Threshold], year: int, query: np.ndarray
+) -> Dict[str, Any]:
+    """JSON payload with the analogs and the expected bloom date per plant."""
+    known = np.flatnonzero(~np.isnan(query))
+    query_crossings = crossing_slots(query[None, :], np.array([t.gts for t in thresholds], dtype=np.float64))[0]
+    expected = expected_dates(analogs, year, len(thresholds))
+    return {
+        "year": year,
+        "until": _slot_iso(year, int(known[-1])) if known.size else None,
+        "gts": to_fixed(float(query[known[-1]])) if known.size else None,
+        "analogs": [
+            {
+                "id": analog.location_id,
+                "year": analog.year,
+                "rmse": to_fixed(analog.rmse),
+                "distance_km": None if analog.distance_km is None else round(analog.distance_km, 1),
+                "dates": analog.crossing_dates(),
+            }
+            for analog in analogs
+        ],
+        "plants": [
+            {
+                "plant": threshold.plant,
+                "ts_start": threshold.gts,
+                "reached": _slot_iso(year, int(slot)) if slot >= 0 else None,
+                "analogs_reached": item["reached"],
+                "expected": item["date"],
+            }
+            for threshold, slot, item in zip(thresholds, query_crossings.tolist(), expected)
+        ],
+    }
+
+
+def query_from_temperatures(dates: Sequence[str], values: Sequence[float]) -> Tuple[int, np.ndarray]:
+    """Year and slot curve of daily temperatures starting on 1 January."""
+    if not dates:
+        raise ValueError("The query series is empty.")
+    first = date.fromisoformat(dates[0])
+    if (first.month, first.day) != (1, 1):
+        raise ValueError("The query series must start on 1 January.")
+    gts = accumulate(months_from_iso_dates(dates), np.asarray(values, dtype=np.float64), [GTS])[0]
+    return first.year, query_slots(first.year, gts)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Find the stored years whose GTS curve is closest to this year so far.",
+        epilog=(
+            "The query is a cube location (--id, --year, optionally --until), a JS input file of this\n"
+            "year's temperatures (-i) or, with only -l, fetched from Open-Meteo.\n\n"
+            "Examples:\n"
+            "  beelot analogs -d cube --id apiary-1 --year 2026 -k 5 -o analogs.json\n"
+            "  beelot analogs -d cube --id apiary-1 --year 2024 --until 04-15 --radius 100\n"
+            "  beelot analogs -d cube -l 48.14,11.58 --radius 150 -o analogs.json\n"
+            "  beelot analogs -d cube -l 48.14,11.58 -i this_year.js --max-gap 3"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-d", "--dir", required=True, help="Cube directory.")
+    parser.add_argument("--id", default=None, help="Query location stored in the cube.")
+    parser.add_argument("--year", type=int, default=None, help="Query year (with --id; default: this year).")
+    parser.add_argument("--until", default=None, help="Last query day MM-DD (with --id; default: last stored).")
+    parser.add_argument("-i", "--input", default=None, help="Temperatures of the query year as JS arrays.")
+    parser.add_argument("--max-gap", type=int, default=0, help="Interpolate gaps of the input up to this many days.")
+    parser.add_argument("-l", "--location", type=parse_location, default=None, help="Query location as lat,lon.")
+    parser.add_argument("--radius", type=float, default=None, help="Only compare locations within this many km.")
+    parser.add_argument(
+        "-k", "--top", type=int, default=DEFAULT_TOP_K, help="Number of analogs (default: %(default)s)."
+    )
+    parser.add_argument("--window", type=int, default=None, help="Compare only the last DAYS known days.")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="Override today (YYYY-MM-DD).")
+    parser.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+    parser.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+    parser.add_argument("--forecast-url", default=FORECAST_URL, help="Forecast endpoint (default: %(default)s).")
+    parser.add_argument("-o", "--output", default=None, help="Output JSON file (default: stdout).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    today = args.today or date.today()
+
+    try:
+        thresholds = thresholds_from_tracht(parse_tracht_data(Path(args.tracht)))
+        with CubeStore.open(Path(args.dir)) as store:
+            center = args.location
+            if args.id:
+                year = args.year or today.year
+                location = store.locations[store.row(args.id)]
+                center = center or (location.lat, location.lon)
+                query = np.array(store.series(args.id, year), dtype=np.float64)
+                if args.until:
+                    month, day = (int(part) for part in args.until.split("-"))
+                    query[calendar_slot(month, day) + 1 :] = np.nan
+            elif args.input:
+                from .gts import parse_js_arrays
+                from .quality import clean_series
+
+                dates, values = parse_js_arrays(Path(args.input), allow_null=True)
+                series = clean_series(dates, values, args.max_gap, strict=True)
+                year, query = query_from_temperatures(series.dates(), series.values)
+            elif args.location:
+                from .stitch import fetch_stitched
+
+                year = today.year
+                if today == date(year, 1, 1):
+                    raise ValueError("No days of this year are known yet.")
+                stitched = fetch_stitched(
+                    args.location[0],
+                    args.location[1],
+                    date(year, 1, 1),
+                    today - timedelta(days=1),
+                    today,
+                    archive_url=args.archive_url,
+                    forecast_url=args.forecast_url,
+                )
+                query = query_slots(year, stitched.gts())
+            else:
+                raise ValueError("Give the query with --id, --input or --location.")
+
+            analogs = find_analogs(store, query, year, thresholds, args.top, center, args.radius, args.window)
+            payload = report(analogs, thresholds, year, query)
+        text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+        if args.output:
+            Path(args.output).write_text(text, encoding="utf-8")
+        else:
+            sys.stdout.write(text)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        best = ", ".join(f"{analog.location_id} {analog.year}" for analog in analogs) or "none"
+        print(f"Closest years: {best}. Results saved to {args.output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
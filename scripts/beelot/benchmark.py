@@ -0,0 +1,398 @@
+"""Benchmark the hot paths of the scripts/ helpers against a stored baseline.
+
+Covered functions:
+
+* gts.py: `parse_js_arrays`, `calculate_gts`, `write_output` on synthetic
+  daily series from 1 to 100 years,
+* naturadb_url_check.py: `parse_js_file` on a synthetic tracht file with
+  10k entries and `check_urls` against a local HTTP stand-in for naturadb.de.
+
+For each case the best wall time of several repetitions is turned into a
+throughput (items per second) and the peak traced memory is recorded. Results
+are compared with the JSON baseline; the run fails if throughput drops or
+peak memory grows by more than the tolerance.
+
+The baseline records the Python version and machine it was measured on, and a
+run on a different environment warns that the numbers may not be comparable.
+Refresh it with `beelot benchmark --update-baseline` on the reference machine
+after an intended performance change or a Python upgrade, and commit the JSON.
+
+`--quick` runs only the smallest inputs with a single repetition. Its case
+names carry the input size, so it never compares against the full cases; it
+is meant for smoke tests against a temporary baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Final, Iterator, List, Optional, Sequence, Tuple
+
+from . import gts
+from .console import print_error, print_info, print_success, print_warning
+
+
+DEFAULT_BASELINE: Final[Path] = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_TOLERANCE: Final[float] = 0.25
+SERIES_YEARS: Final[Tuple[int, ...]] = (1, 10, 100)
+TRACHT_ENTRIES: Final[int] = 10_000
+URL_CHECK_ENTRIES: Final[int] = 200
+MIN_BATCH_SECONDS: Final[float] = 0.05
+QUICK_SERIES_YEARS: Final[Tuple[int, ...]] = (1,)
+QUICK_TRACHT_ENTRIES: Final[int] = 1_000
+QUICK_URL_CHECK_ENTRIES: Final[int] = 20
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Measurement of one benchmark case."""
+
+    name: str
+    items: int
+    seconds: float
+    items_per_second: float
+    peak_bytes: int
+
+
+# --- synthetic inputs -------------------------------------------------------
+
+
+def synthetic_series(years: int, seed: int = 1) -> Tuple[List[str], List[float]]:
+    """Daily dates and temperatures for `years` years, starting on 1 January."""
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+    end = date(2000 + years, 1, 1)
+    dates: List[str] = []
+    values: List[float] = []
+    current = start
+    while current < end:
+        seasonal = 9.0 - 10.0 * math.cos(2 * math.pi * current.timetuple().tm_yday / 365.25)
+        dates.append(current.isoformat())
+        values.append(round(seasonal + rng.gauss(0.0, 3.0), 1))
+        current += timedelta(days=1)
+    return dates, values
+
+
+def write_series_js(path: Path, dates: Sequence[str], values: Sequence[float]) -> None:
+    """Write a series in the input format of gts.py."""
+    path.write_text(
+        "const dates = [" + ", ".join(f"'{item}'" for item in dates) + "];\n"
+        "const values = [" + ", ".join(str(item) for item in values) + "];\n",
+        encoding="utf-8",
+    )
+
+
+def write_tracht_js(path: Path, entries: int, base_url: str) -> None:
+    """Write a tracht_data.js lookalike with `entries` rows pointing at `base_url`."""
+    lines = ["export const defaultTrachtData = ["]
+    for idx in range(entries):
+        marker = "missing" if idx % 10 == 0 else "ok"
+        lines.append(
+            f'    {{ active: true, TS_start: {idx % 900}, TS_end: {idx % 900 + 20}, '
+            f'plant: "Pflanze {idx}", url: "{base_url}/pflanzen/{marker}-{idx}/" }},'
+        )
+    lines.append("];")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class _NaturadbStandIn(BaseHTTPRequestHandler):
+    """Serves a small page; paths containing "missing" carry the Error404 marker."""
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        body = "<html><body>Error404</body></html>" if "missing" in self.path else (
+            "<html><body>" + "Pflanze " * 200 + "</body></html>"
+        )
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+class LocalHttpServer:
+    """Context manager running the naturadb stand-in on a free local port."""
+
+    def __enter__(self) -> str:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _NaturadbStandIn)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# --- measurement ------------------------------------------------------------
+
+
+def measure(name: str, items: int, func: Callable[[], object], repeat: int) -> BenchResult:
+    """Time `func` as best of `repeat` batches, then run it once under tracemalloc.
+
+    Fast cases are looped inside a batch until the batch takes at least
+    MIN_BATCH_SECONDS, so that timer resolution and scheduling noise do not
+    dominate small inputs.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_BATCH_SECONDS:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        items=items,
+        seconds=best,
+        items_per_second=items / best if best > 0 else float("inf"),
+        peak_bytes=peak,
+    )
+
+
+def run_cases(workdir: Path, repeat: int, only: Optional[str], quick: bool = False) -> Iterator[BenchResult]:
+    """Generate inputs in `workdir` and yield one result per benchmark case.
+
+    With `quick`, only the smallest inputs are generated.
+    """
+
+    def wanted(name: str) -> bool:
+        return only is None or only in name
+
+    series_years = QUICK_SERIES_YEARS if quick else SERIES_YEARS
+    tracht_entries = QUICK_TRACHT_ENTRIES if quick else TRACHT_ENTRIES
+    url_check_entries = QUICK_URL_CHECK_ENTRIES if quick else URL_CHECK_ENTRIES
+
+    for years in series_years:
+        dates, values = synthetic_series(years)
+        input_path = workdir / f"series_{years}y.js"
+        output_path = workdir / f"series_{years}y.txt"
+        write_series_js(input_path, dates, values)
+        results = gts.calculate_gts(dates, values)
+        days = len(dates)
+
+        name = f"gts.parse_js_arrays[{years}y]"
+        if wanted(name):
+            yield measure(name, days, lambda: gts.parse_js_arrays(input_path), repeat)
+        name = f"gts.calculate_gts[{years}y]"
+        if wanted(name):
+            yield measure(name, days, lambda: gts.calculate_gts(dates, values), repeat)
+        name = f"gts.write_output[{years}y]"
+        if wanted(name):
+            yield measure(name, days, lambda: gts.write_output(output_path, results), repeat)
+
+    parse_name = f"naturadb_url_check.parse_js_file[{tracht_entries}]"
+    check_name = f"naturadb_url_check.check_urls[{url_check_entries}]"
+    if not (wanted(parse_name) or wanted(check_name)):
+        return
+
+    # Imported lazily: it needs `requests`, which the gts cases do not.
+    from . import naturadb_url_check
+
+    with LocalHttpServer() as base_url:
+        tracht_path = workdir / "tracht_data.js"
+        write_tracht_js(tracht_path, tracht_entries, base_url)
+        if wanted(parse_name):
+            yield measure(
+                parse_name,
+                tracht_entries,
+                lambda: naturadb_url_check.parse_js_file(str(tracht_path)),
+                repeat,
+            )
+        if wanted(check_name):
+            entries = naturadb_url_check.parse_js_file(str(tracht_path))[:url_check_entries]
+            yield measure(
+                check_name,
+                len(entries),
+                lambda: naturadb_url_check.check_urls(entries, timeout_s=5.0, delay_s=0.0),
+                max(1, repeat // 2),
+            )
+
+
+# --- baseline ---------------------------------------------------------------
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, object]]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(
+            f"JSON parsing error in {path} at line {exc.lineno}, column {exc.colno}: {exc.msg}"
+        ) from exc
+
+
+def write_baseline(path: Path, results: Sequence[BenchResult], merge_into: Optional[Dict[str, object]]) -> None:
+    cases: Dict[str, object] = dict(merge_into.get("cases", {})) if merge_into else {}  # type: ignore[arg-type]
+    for result in results:
+        cases[result.name] = asdict(result)
+    data = {"environment": environment(), "cases": dict(sorted(cases.items()))}
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: Sequence[BenchResult], baseline: Dict[str, object], tolerance: float
+) -> List[str]:
+    """Return a list of regression messages; print a comparison table."""
+    cases: Dict[str, Dict[str, float]] = baseline.get("cases", {})  # type: ignore[assignment]
+    regressions: List[str] = []
+    width = max(len(result.name) for result in results)
+    print_info(f"{'case':<{width}}  {'items/s':>12}  {'vs base':>8}  {'peak KiB':>10}  {'vs base':>8}")
+    for result in results:
+        base = cases.get(result.name)
+        if base is None:
+            print(f"{result.name:<{width}}  {result.items_per_second:12.0f}  {'new':>8}  {result.peak_bytes / 1024:10.0f}  {'new':>8}")
+            continue
+        speed_ratio = result.items_per_second / base["items_per_second"]
+        memory_ratio = result.peak_bytes / base["peak_bytes"] if base["peak_bytes"] else 1.0
+        print(
+            f"{result.name:<{width}}  {result.items_per_second:12.0f}  {speed_ratio:7.2f}x  "
+            f"{result.peak_bytes / 1024:10.0f}  {memory_ratio:7.2f}x"
+        )
+        if speed_ratio < 1.0 - tolerance:
+            regressions.append(f"{result.name}: throughput {speed_ratio:.2f}x of baseline")
+        if memory_ratio > 1.0 + tolerance:
+            regressions.append(f"{result.name}: peak memory {memory_ratio:.2f}x of baseline")
+    return regressions
+
+
+# --- CLI ----------------------------------------------------------------------
+
+
+def usage() -> str:
+    return (
+        "beelot benchmark [--baseline FILE] [--tolerance T] [--repeat N] [--only SUBSTRING] [--quick]\n"
+        "                 [--update-baseline]\n\n"
+        "Examples:\n"
+        "  beelot benchmark\n"
+        "  beelot benchmark --only calculate_gts --repeat 10\n"
+        "  beelot benchmark --update-baseline\n"
+        "  beelot benchmark --quick --baseline /tmp/quick.json --update-baseline\n"
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark scripts/ hot paths and compare against a stored baseline.",
+        usage=usage(),
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help=f"Baseline JSON file (default: {DEFAULT_BASELINE.name} next to this script).",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative regression before failing (default: 0.25).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (default: 5).")
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text.")
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Run only the smallest inputs with one repetition (smoke test).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the measured values as the new baseline instead of comparing.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    baseline_path = Path(args.baseline)
+
+    try:
+        baseline = load_baseline(baseline_path)
+        with tempfile.TemporaryDirectory(prefix="beelot-bench-") as tmp:
+            repeat = 1 if args.quick else max(1, args.repeat)
+            results = list(run_cases(Path(tmp), repeat, args.only, quick=args.quick))
+    except Exception as exc:
+        print_error(f"Benchmark failed: {exc}")
+        return 1
+
+    if not results:
+        print_warning("No benchmark case matched.")
+        return 0
+
+    if args.update_baseline:
+        write_baseline(baseline_path, results, baseline)
+        for result in results:
+            print(f"{result.name}: {result.items_per_second:.0f} items/s, peak {result.peak_bytes / 1024:.0f} KiB")
+        print_success(f"Baseline written to {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print_warning(f"No baseline at {baseline_path}; run with --update-baseline first.")
+        compare(results, {"cases": {}}, args.tolerance)
+        return 0
+
+    if baseline.get("environment") != environment():
+        print_warning(
+            f"Baseline was recorded on {baseline.get('environment')}; numbers may not be comparable. "
+            "Refresh it with --update-baseline on the reference machine."
+        )
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        for message in regressions:
+            print_error(f"Regression: {message}")
+        return 1
+    print_success(f"No regressions beyond {args.tolerance:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,287 @@
+"""Precomputed calendar fields of day numbers, shared by all engines.
+
+Days are counted from 1970-01-01 (the integer value of `datetime64[D]`), the
+representation used by `stitch`, `updater` and the cube. Instead of parsing
+ISO strings or building `date` objects per row, the engines look the fields
+of whole arrays of day numbers up in one table that covers
+`TABLE_FIRST_YEAR`..`TABLE_LAST_YEAR`:
+
+    days = day_numbers_from_iso(dates)   # vectorized 'YYYY-MM-DD' parser
+    months(days), days_of_year(days), leap_flags(days), slots(days)
+    gts_weights(days)                    # month weight of the GTS preset
+
+Days outside the table are computed with the same integer arithmetic (the
+proleptic Gregorian `days_from_civil` algorithm), so results never depend on
+the table range.
+
+Calendar slots (used as the last axis of the cube) number the days of a leap
+year: slot 59 is always 29 February and does not occur in common years, so a
+calendar day has the same slot in every year.
+"""
+
+from __future__ import annotations
+
+import calendar
+import functools
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TABLE_FIRST_YEAR: Final[int] = 1900
+TABLE_LAST_YEAR: Final[int] = 2199
+EPOCH_ORDINAL: Final[int] = date(1970, 1, 1).toordinal()
+SLOTS: Final[int] = 366
+FEB_29_SLOT: Final[int] = 59
+
+_MONTH_LENGTHS: Final[np.ndarray] = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+# Slot of the first day of each month (index 1-12) in the leap-year numbering.
+_MONTH_SLOTS: Final[np.ndarray] = np.concatenate(([0, 0], np.cumsum(_MONTH_LENGTHS[1:12] + (np.arange(1, 12) == 2))))
+_DIGIT_COLUMNS: Final[List[int]] = [0, 1, 2, 3, 5, 6, 8, 9]
+
+
+@dataclass(frozen=True)
+class CalendarFields:
+    """Calendar fields of an array of day numbers; `day_of_year` is 0-based."""
+
+    year: np.ndarray
+    month: np.ndarray
+    day: np.ndarray
+    day_of_year: np.ndarray
+    leap: np.ndarray
+    slot: np.ndarray
+
+
+def _is_leap(year: np.ndarray) -> np.ndarray:
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def day_numbers_from_civil(year: Any, month: Any, day: Any) -> np.ndarray:
+    """Day numbers of (year, month, day) arrays; the inputs must form valid dates."""
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+    shifted = year - (month <= 2)
+    era = shifted // 400
+    year_of_era = shifted - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _compute(days: np.ndarray) -> CalendarFields:
+    shifted = days + 719468
+    era = shifted // 146097
+    day_of_era = shifted - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_march_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    march_month = (5 * day_of_march_year + 2) // 153
+    day = day_of_march_year - (153 * march_month + 2) // 5 + 1
+    month = np.where(march_month < 10, march_month + 3, march_month - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return CalendarFields(
+        year=year,
+        month=month,
+        day=day,
+        day_of_year=days - day_numbers_from_civil(year, 1, 1),
+        leap=_is_leap(year),
+        slot=_MONTH_SLOTS[month] + day - 1,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _table() -> Tuple[int, CalendarFields]:
+    first = int(day_numbers_from_civil(TABLE_FIRST_YEAR, 1, 1))
+    last = int(day_numbers_from_civil(TABLE_LAST_YEAR, 12, 31))
+    fields = _compute(np.arange(first, last + 1, dtype=np.int64))
+    compact = CalendarFields(
+        year=fields.year.astype(np.int16),
+        month=fields.month.astype(np.intp),
+        day=fields.day.astype(np.int8),
+        day_of_year=fields.day_of_year.astype(np.int16),
+        leap=fields.leap,
+        slot=fields.slot.astype(np.intp),
+    )
+    return first, compact
+
+
+@functools.lru_cache(maxsize=None)
+def _year_table() -> Tuple[np.ndarray, np.ndarray]:
+    """Day number of 1 January and leap flag per table year."""
+    table_years = np.arange(TABLE_FIRST_YEAR, TABLE_LAST_YEAR + 1, dtype=np.int64)
+    return day_numbers_from_civil(table_years, 1, 1), _is_leap(table_years)
+
+
+def _offsets(days: Any) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Table offsets of `days`, or `None` if one of them is outside the table."""
+    days = np.asarray(days, dtype=np.int64)
+    first, table = _table()
+    offsets = days - first
+    if offsets.size and (offsets.min() < 0 or offsets.max() >= table.year.size):
+        return days, None
+    return days, offsets
+
+
+def fields(days: Any) -> CalendarFields:
+    """All calendar fields of `days`."""
+    days, offsets = _offsets(days)
+    if offsets is None:
+        return _compute(days)
+    table = _table()[1]
+    return CalendarFields(
+        year=table.year[offsets],
+        month=table.month[offsets],
+        day=table.day[offsets],
+        day_of_year=table.day_of_year[offsets],
+        leap=table.leap[offsets],
+        slot=table.slot[offsets],
+    )
+
+
+def _column(name: str, days: Any) -> np.ndarray:
+    days, offsets = _offsets(days)
+    if offsets is None:
+        return getattr(_compute(days), name)
+    return getattr(_table()[1], name)[offsets]
+
+
+def years(days: Any) -> np.ndarray:
+    return _column("year", days)
+
+
+def months(days: Any) -> np.ndarray:
+    """Month numbers (1-12), usable as index into `HeatSumMetric.weight_table`."""
+    return _column("month", days)
+
+
+def days_of_year(days: Any) -> np.ndarray:
+    """0-based day of the year."""
+    return _column("day_of_year", days)
+
+
+def leap_flags(days: Any) -> np.ndarray:
+    return _column("leap", days)
+
+
+def slots(days: Any) -> np.ndarray:
+    """Calendar slots (0-365) of `days`."""
+    return _column("slot", days)
+
+
+def weights(days: Any, weight_table: np.ndarray) -> np.ndarray:
+    """Month weights of `days` from a table indexed by month number."""
+    return np.asarray(weight_table, dtype=np.float64)[months(days)]
+
+
+def gts_weights(days: Any) -> np.ndarray:
+    """Weights of the GTS preset (January 0.5, February 0.75, else 1)."""
+    from .heatsum import GTS
+
+    return weights(days, GTS.weight_table())
+
+
+def _iso_codes(dates: Sequence[str]) -> np.ndarray:
+    """Character codes of `dates` as an (n, width) array."""
+    if isinstance(dates, list) and dates:
+        # Fast path for the usual list of 10-character ASCII strings: one join
+        # instead of building a unicode array string by string. With exactly
+        # one separator per gap, and all of them 11 bytes apart, every item
+        # has 10 characters.
+        try:
+            joined = "\n".join(dates).encode("ascii") + b"\n"
+        except (TypeError, UnicodeEncodeError):
+            joined = b""
+        count = len(dates)
+        if len(joined) == 11 * count and joined.count(b"\n") == count:
+            codes = np.frombuffer(joined, dtype=np.uint8).reshape(count, 11)
+            if (codes[:, 10] == ord("\n")).all():
+                return codes[:, :10]
+    text = np.asarray(dates)
+    if text.dtype.kind not in "SU":
+        text = text.astype(np.str_)
+    unit = np.uint8 if text.dtype.kind == "S" else np.uint32
+    width = text.dtype.itemsize // np.dtype(unit).itemsize
+    return np.ascontiguousarray(text.reshape(-1)).view(unit).reshape(text.size, width)
+
+
+def parse_iso_dates(dates: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Day numbers of 'YYYY-MM-DD' strings and a mask of the valid ones.
+
+    The strings are viewed as one (n, width) array of code points, so parsing
+    and validation are array operations regardless of the number of dates.
+    Invalid entries (other formats, impossible dates) get day number 0.
+    """
+    codes = _iso_codes(dates)
+    count, width = codes.shape
+    if count == 0 or width < 10:
+        return np.zeros(count, dtype=np.int64), np.zeros(count, dtype=bool)
+
+    digit_codes = codes[:, _DIGIT_COLUMNS]
+    valid = ((digit_codes >= ord("0")) & (digit_codes <= ord("9"))).all(axis=1)
+    digits = digit_codes.astype(np.int32) - ord("0")
+    valid &= (codes[:, 4] == ord("-")) & (codes[:, 7] == ord("-"))
+    if width > 10:
+        valid &= (codes[:, 10:] == 0).all(axis=1)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    valid &= (month >= 1) & (month <= 12) & (year >= 1)
+    month = np.where(valid, month, 1)
+
+    starts, leap_years = _year_table()
+    index = year - TABLE_FIRST_YEAR
+    if index.min() >= 0 and index.max() < leap_years.size:
+        # Table path: no integer division per date.
+        leap = leap_years[index]
+        numbers = starts[index] + _MONTH_SLOTS[month] - ((month > 2) & ~leap) + day - 1
+    else:
+        leap = _is_leap(year)
+        numbers = day_numbers_from_civil(np.where(valid, year, 1970), month, np.where(valid, day, 1))
+    valid &= (day >= 1) & (day <= _MONTH_LENGTHS[month] + ((month == 2) & leap))
+    numbers[~valid] = 0
+    return numbers, valid
+
+
+def day_numbers_from_iso(dates: Sequence[str]) -> np.ndarray:
+    """Day numbers of 'YYYY-MM-DD' strings; raises ValueError on the first invalid one."""
+    numbers, valid = parse_iso_dates(dates)
+    if not valid.all():
+        bad = int(np.argmin(valid))
+        raise ValueError(f"Invalid ISO date in input: '{dates[bad]}'")
+    return numbers
+
+
+def iso_from_day_numbers(days: Any) -> List[str]:
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype("datetime64[D]")).tolist()
+
+
+def day_number(day: date) -> int:
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def from_day_number(days: int) -> date:
+    return date.fromordinal(int(days) + EPOCH_ORDINAL)
+
+
+def calendar_slot(month: int, day: int) -> int:
+    """Slot of a calendar day (29 February is slot 59)."""
+    return date(2000, month, day).timetuple().tm_yday - 1
+
+
+def year_slots(year: int) -> np.ndarray:
+    """Slot of every day of `year`, in order."""
+    days = 366 if calendar.isleap(year) else 365
+    year_slots = np.arange(days, dtype=np.intp)
+    if days == 365:
+        year_slots[FEB_29_SLOT:] += 1
+    return year_slots
+
+
+def slot_date(year: int, slot: int) -> Optional[date]:
+    """Date of `slot` in `year`; `None` for slot 59 of a common year."""
+    if slot == FEB_29_SLOT and not calendar.isleap(year):
+        return None
+    day = date(2000, 1, 1) + timedelta(days=slot)
+    return date(year, day.month, day.day)
@@ -0,0 +1,86 @@
+"""Entry point of the `beelot` command.
+
+Subcommands are listed in a static table and their modules are imported only
+when the subcommand actually runs, so `beelot --help` and cheap subcommands
+such as `beelot sync-versions --check` do not load heavy dependencies like
+`requests`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Dict, Final, NamedTuple, Optional, Sequence
+
+
+class Subcommand(NamedTuple):
+    """Module implementing a subcommand and its one-line description."""
+
+    module: str
+    summary: str
+
+
+SUBCOMMANDS: Final[Dict[str, Subcommand]] = {
+    "gts": Subcommand("gts", "Compute GTS from JS arrays and write Jest expectation output."),
+    "difftest": Subcommand("difftest", "Compare the Python GTS engines with calculateGTS from logic.js."),
+    "fixtures": Subcommand("fixtures", "Render Jest GTS fixtures for all scenarios of a manifest."),
+    "heatsum": Subcommand("heatsum", "Compute GTS, growing degree days and other heat sums in one pass."),
+    "quality": Subcommand("quality", "Validate daily series, fill short gaps and report the counts."),
+    "urlcheck": Subcommand("naturadb_url_check", "Check tracht_data.js URLs for Naturadb Error404 pages."),
+    "sync-versions": Subcommand("sync_versions", "Synchronize package.json and assets/js/version.js."),
+    "release": Subcommand("release_from_dev", "Release dev into main with tagging."),
+    "hotfix": Subcommand("release_current_hotfix", "Release the current hotfix from main."),
+    "preflight": Subcommand("preflight", "Run tests, version check and build concurrently."),
+    "build": Subcommand("pipeline", "Run the release pipeline stages in parallel, skipping up-to-date ones."),
+    "tracht-index": Subcommand("tracht_index", "Generate the GTS interval index module for tracht data."),
+    "downsample": Subcommand("downsample", "Downsample a {labels, gtsValues} JSON series."),
+    "benchmark": Subcommand("benchmark", "Benchmark the hot paths against the stored baseline."),
+    "ensemble": Subcommand("ensemble", "Predict p10/p50/p90 bloom dates from ensemble forecasts."),
+    "scenarios": Subcommand("scenarios", "Shift of bloom dates under temperature what-if scenarios."),
+    "analogs": Subcommand("analogs", "Find the stored years closest to this year's GTS curve so far."),
+    "zonal": Subcommand("zonal", "Area-weighted GTS and bloom dates of GeoJSON regions from the cube."),
+    "stitch": Subcommand("stitch", "Merge archive, recent and forecast temperatures with provenance."),
+    "updater": Subcommand("updater", "Keep GTS and bloom tables of tracked locations up to date."),
+    "cube": Subcommand("cube", "Store and query the GTS of many locations and years in one cube."),
+    "geoindex": Subcommand("geoindex", "Build the static offline settlement search and reverse index."),
+    "serve": Subcommand("service", "Serve GTS per year over HTTP with a shared cache."),
+    "standin": Subcommand("standin", "Serve synthetic Open-Meteo responses for offline runs."),
+}
+
+
+def usage() -> str:
+    width = max(len(name) for name in SUBCOMMANDS)
+    commands = "\n".join(f"  {name:<{width}}  {command.summary}" for name, command in SUBCOMMANDS.items())
+    return (
+        "beelot <subcommand> [options]\n\n"
+        "Subcommands:\n"
+        f"{commands}\n\n"
+        "Run `beelot <subcommand> --help` for the options of a subcommand.\n\n"
+        "Examples:\n"
+        "  beelot sync-versions --source max --check\n"
+        "  beelot gts -i input.js -o output.txt\n"
+        "  beelot release --dryrun\n"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Dispatch to a subcommand and return its exit status."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ("-h", "--help", "-?"):
+        print(usage())
+        return 0
+
+    name, rest = args[0], args[1:]
+    command = SUBCOMMANDS.get(name)
+    if command is None:
+        print(f"Error: unknown subcommand: {name}\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 1
+
+    module = importlib.import_module(f"{__package__}.{command.module}")
+    result = module.main(rest)
+    return int(result or 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Colored console output shared by the beelot commands.
+
+Errors go to stderr, everything else to stdout:
+
+    from .console import print_error, print_info
+
+    print_info("Fetching archive data")
+    print_error(f"Request failed: {exc}")
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Final
+
+ANSI_RED: Final[str] = "\033[31m"
+ANSI_YELLOW: Final[str] = "\033[33m"
+ANSI_CYAN: Final[str] = "\033[36m"
+ANSI_GREEN: Final[str] = "\033[32m"
+ANSI_GREY: Final[str] = "\033[90m"
+ANSI_RESET: Final[str] = "\033[0m"
+
+
+def print_error(message: str) -> None:
+    print(f"{ANSI_RED}{message}{ANSI_RESET}", file=sys.stderr)
+
+
+def print_warning(message: str) -> None:
+    print(f"{ANSI_YELLOW}{message}{ANSI_RESET}")
+
+
+def print_info(message: str) -> None:
+    print(f"{ANSI_CYAN}{message}{ANSI_RESET}")
+
+
+def print_success(message: str) -> None:
+    print(f"{ANSI_GREEN}{message}{ANSI_RESET}")
+
+
+def print_debug(message: str) -> None:
+    print(f"{ANSI_GREY}{message}{ANSI_RESET}")
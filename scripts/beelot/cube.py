@@ -0,0 +1,613 @@
+"""Memory-mapped GTS cube of many locations and years.
+
+The store keeps the daily GTS of all locations in one dense float32 array of
+shape (locations, years, 366) in `cube.f32`, mapped into memory with
+`numpy.memmap`. The location index (id, lat, lon per row) and the year range
+live next to it in `cube.json`.
+
+The last axis is a calendar slot, not the day of the year: slot 59 is always
+29 February and stays NaN in common years, so 1 April is slot 91 in every
+year. That keeps cross-year questions such as "all locations on 1 April in all
+years" a single strided view:
+
+    store.calendar_day(4, 1)   # (locations, years), no copy
+    store.day(date(2024, 4, 1))  # (locations,), no copy
+    store.location("apiary-1")   # (years, 366), no copy
+
+Days that were not written are NaN. Temperatures are appended in place with
+`write_days`; the GTS continues from the stored value of the previous day and
+later days of the same year are cleared, because they are no longer valid.
+Adding locations grows the file. New years are appended with
+`beelot cube extend` (the updater does this on its first tick of a new year);
+since years are the middle axis, that rewrites the data file once.
+
+Usage:
+
+    beelot cube init -d cube --years 2005:2026
+    beelot cube extend -d cube --to 2027
+    beelot cube fill -d cube -l apiary-1=48.14,11.58 --start 2005-01-01 --end 2025-12-31
+    beelot cube day -d cube --date 2024-04-01 -o layer.geojson
+    beelot cube climatology -d cube --id apiary-1 -o climatology.json
+    beelot cube climatology -d cube --id apiary-1 --max-points 60 --max-error 1 -o chart.json
+    beelot cube bloom -d cube --year 2024 -o bloom.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import warnings
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import calendar_index
+from .calendar_index import (  # noqa: F401 (slot helpers are part of the cube API)
+    FEB_29_SLOT,
+    SLOTS,
+    calendar_slot,
+    day_number,
+    iso_from_day_numbers,
+    slot_date,
+    year_slots,
+)
+from .console import print_error, print_info, print_success, print_warning
+from .downsample import downsample, refine_to_error
+from .ensemble import Threshold, thresholds_from_tracht
+from .heatsum import GTS, accumulate, to_fixed
+from .openmeteo import ARCHIVE_URL, fetch_daily, parse_location
+from .tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+DATA_FILE: Final[str] = "cube.f32"
+INDEX_FILE: Final[str] = "cube.json"
+FORMAT_VERSION: Final[int] = 1
+DEFAULT_CAPACITY: Final[int] = 64
+
+
+@dataclass(frozen=True)
+class CubeLocation:
+    id: str
+    lat: float
+    lon: float
+
+
+def _read_only(view: np.ndarray) -> np.ndarray:
+    view = view.view()
+    view.flags.writeable = False
+    return view
+
+
+class CubeStore:
+    """Dense (locations, years, 366) float32 GTS cube backed by a memory-mapped file.
+
+    Use `CubeStore.create` or `CubeStore.open`; close the store (or use it as
+    a context manager) to flush writes. Query methods return read-only views
+    into the mapping, which stay valid until the store grows.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        first_year: int,
+        last_year: int,
+        locations: List[CubeLocation],
+        capacity: int,
+        writable: bool,
+    ) -> None:
+        self.path = path
+        self.first_year = first_year
+        self.last_year = last_year
+        self._locations = locations
+        self._rows = {location.id: row for row, location in enumerate(locations)}
+        self._capacity = capacity
+        self._writable = writable
+        self._lock = threading.Lock()
+        self._cube = self._map()
+
+    # --- lifecycle ------------------------------------------------------------
+
+    @classmethod
+    def create(cls, path: Path, first_year: int, last_year: int, capacity: int = DEFAULT_CAPACITY) -> "CubeStore":
+        """Create an empty store in directory `path`."""
+        if last_year < first_year:
+            raise ValueError("The last year is before the first year.")
+        if (path / INDEX_FILE).exists():
+            raise FileExistsError(f"A cube already exists in {path}")
+        path.mkdir(parents=True, exist_ok=True)
+        capacity = max(1, capacity)
+        years = last_year - first_year + 1
+        data = np.memmap(path / DATA_FILE, dtype=np.float32, mode="w+", shape=(capacity, years, SLOTS))
+        data[:] = np.nan
+        data.flush()
+        del data
+        store = cls(path, first_year, last_year, [], capacity, writable=True)
+        store._save_index()
+        return store
+
+    @classmethod
+    def open(cls, path: Path, writable: bool = False) -> "CubeStore":
+        """Open an existing store; read-only unless `writable`."""
+        index_path = path / INDEX_FILE
+        if not index_path.exists():
+            raise FileNotFoundError(f"No cube in {path} (missing {INDEX_FILE}).")
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if index.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cube format: {index.get('format')}")
+        locations = [CubeLocation(item["id"], float(item["lat"]), float(item["lon"])) for item in index["locations"]]
+        first_year, last_year, capacity = int(index["first_year"]), int(index["last_year"]), int(index["capacity"])
+        expected = capacity * (last_year - first_year + 1) * SLOTS * np.dtype(np.float32).itemsize
+        size = (path / DATA_FILE).stat().st_size
+        if size != expected:
+            # E.g. `extend_years` was interrupted between replacing the data and the index.
+            raise ValueError(f"{path / DATA_FILE} has {size} bytes, but {INDEX_FILE} describes {expected}.")
+        return cls(path, first_year, last_year, locations, capacity, writable)
+
+    def __enter__(self) -> "CubeStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        if self._writable:
+            self._cube.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _map(self) -> np.memmap:
+        return np.memmap(
+            self.path / DATA_FILE,
+            dtype=np.float32,
+            mode="r+" if self._writable else "r",
+            shape=(self._capacity, self.years, SLOTS),
+        )
+
+    def _save_index(self) -> None:
+        index = {
+            "format": FORMAT_VERSION,
+            "first_year": self.first_year,
+            "last_year": self.last_year,
+            "capacity": self._capacity,
+            "locations": [{"id": loc.id, "lat": loc.lat, "lon": loc.lon} for loc in self._locations],
+        }
+        tmp_path = self.path / f".{INDEX_FILE}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(index, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path / INDEX_FILE)
+
+    def _require_writable(self) -> None:
+        if not self._writable:
+            raise PermissionError(f"Cube {self.path} is opened read-only.")
+
+    # --- index ----------------------------------------------------------------
+
+    @property
+    def years(self) -> int:
+        return self.last_year - self.first_year + 1
+
+    @property
+    def locations(self) -> List[CubeLocation]:
+        return list(self._locations)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, location_id: object) -> bool:
+        return location_id in self._rows
+
+    def row(self, location_id: str) -> int:
+        try:
+            return self._rows[location_id]
+        except KeyError:
+            raise KeyError(f"Location '{location_id}' is not in the cube.") from None
+
+    def year_index(self, year: int) -> int:
+        if not self.first_year <= year <= self.last_year:
+            raise ValueError(f"Year {year} is outside the cube ({self.first_year}-{self.last_year}).")
+        return year - self.first_year
+
+    def add_location(self, location_id: str, lat: float, lon: float) -> int:
+        """Add a location (or update its coordinates) and return its row."""
+        self._require_writable()
+        with self._lock:
+            if location_id in self._rows:
+                row = self._rows[location_id]
+                self._locations[row] = CubeLocation(location_id, lat, lon)
+            else:
+                row = len(self._locations)
+                if row >= self._capacity:
+                    self._grow(max(self._capacity * 2, row + 1))
+                self._locations.append(CubeLocation(location_id, lat, lon))
+                self._rows[location_id] = row
+            self._save_index()
+            return row
+
+    def _grow(self, capacity: int) -> None:
+        # Location rows are the outer axis, so growing only appends to the file.
+        self._cube.flush()
+        old_capacity = self._capacity
+        row_bytes = self.years * SLOTS * np.dtype(np.float32).itemsize
+        with open(self.path / DATA_FILE, "r+b") as handle:
+            handle.truncate(capacity * row_bytes)
+        self._capacity = capacity
+        self._cube = self._map()
+        self._cube[old_capacity:] = np.nan
+
+    def extend_years(self, last_year: int) -> bool:
+        """Append empty years up to `last_year`; returns False if the cube already covers it.
+
+        Years are the middle axis, so the data is copied row by row into a new
+        file that replaces the old one. Views taken before are stale afterwards.
+        """
+        self._require_writable()
+        with self._lock:
+            if last_year <= self.last_year:
+                return False
+            self._cube.flush()
+            old_years = self.years
+            new_years = last_year - self.first_year + 1
+            tmp_path = self.path / f".{DATA_FILE}.{os.getpid()}.tmp"
+            data = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(self._capacity, new_years, SLOTS))
+            for row in range(self._capacity):
+                data[row, :old_years] = self._cube[row]
+                data[row, old_years:] = np.nan
+            data.flush()
+            del data
+            os.replace(tmp_path, self.path / DATA_FILE)
+            self.last_year = last_year
+            self._cube = self._map()
+            self._save_index()
+            return True
+
+    # --- writes ---------------------------------------------------------------
+
+    def write_days(self, location_id: str, start: date, temperatures: Sequence[float]) -> int:
+        """Write daily mean temperatures from `start` on as GTS; returns the number of days written.
+
+        The GTS continues from the stored value of the day before `start`
+        (0 on 1 January); later days of the last written year are cleared.
+
+        Raises
+        ------
+        ValueError
+            If a temperature is missing, the day before `start` has no value
+            or the days leave the year range of the cube.
+        """
+        self._require_writable()
+        values = np.asarray(temperatures, dtype=np.float64)
+        if values.size == 0:
+            return 0
+        if np.isnan(values).any():
+            raise ValueError(f"{location_id}: missing temperatures; fill gaps before writing to the cube.")
+        row = self.row(location_id)
+
+        days = day_number(start) + np.arange(values.size, dtype=np.int64)
+        table = calendar_index.fields(days)
+        bounds = [0, *(np.flatnonzero(np.diff(table.year)) + 1).tolist(), values.size]
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            year_row = self._cube[row, self.year_index(int(table.year[begin]))]
+            slots = table.slot[begin:end]
+            if table.day_of_year[begin] == 0:
+                previous = 0.0
+            else:
+                previous = float(year_row[calendar_index.slots(days[begin] - 1)])
+                if np.isnan(previous):
+                    missing = iso_from_day_numbers([days[begin] - 1])[0]
+                    raise ValueError(f"{location_id}: no GTS stored for {missing}.")
+            gts = previous + accumulate(table.month[begin:end], values[begin:end], [GTS])[0]
+            year_row[slots] = gts
+            year_row[slots[-1] + 1 :] = np.nan
+        return int(values.size)
+
+    # --- queries (zero-copy views) ----------------------------------------------
+
+    def data(self) -> np.ndarray:
+        """GTS of all locations in all years, shape (locations, years, 366)."""
+        return _read_only(self._cube[: len(self)])
+
+    def day(self, day: date) -> np.ndarray:
+        """GTS of all locations on `day`, shape (locations,)."""
+        year = self.year_index(day.year)
+        return _read_only(self._cube[: len(self), year, calendar_slot(day.month, day.day)])
+
+    def calendar_day(self, month: int, day: int) -> np.ndarray:
+        """GTS of all locations on one calendar day of every year, shape (locations, years)."""
+        return _read_only(self._cube[: len(self), :, calendar_slot(month, day)])
+
+    def year(self, year: int) -> np.ndarray:
+        """GTS of all locations in `year`, shape (locations, 366)."""
+        return _read_only(self._cube[: len(self), self.year_index(year)])
+
+    def location(self, location_id: str) -> np.ndarray:
+        """GTS of one location in all years, shape (years, 366)."""
+        return _read_only(self._cube[self.row(location_id)])
+
+    def series(self, location_id: str, year: int) -> np.ndarray:
+        """GTS of one location in one year, shape (366,) indexed by calendar slot."""
+        return _read_only(self._cube[self.row(location_id), self.year_index(year)])
+
+
+# --- generators ---------------------------------------------------------------
+
+
+def day_layer(store: CubeStore, day: date) -> Dict[str, Any]:
+    """GeoJSON points with the GTS of every location on `day` (map tiles and layers)."""
+    values = store.day(day)
+    features = []
+    for location, value in zip(store.locations, values.tolist()):
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [location.lon, location.lat]},
+                "properties": {"id": location.id, "gts": None if np.isnan(value) else to_fixed(value)},
+            }
+        )
+    return {"type": "FeatureCollection", "date": day.isoformat(), "features": features}
+
+
+def climatology(
+    store: CubeStore, location_id: str, quantiles: Sequence[float] = (0.1, 0.5, 0.9)
+) -> np.ndarray:
+    """GTS quantiles across all stored years per calendar slot, shape (len(quantiles), 366)."""
+    with warnings.catch_warnings():
+        # Slots without any year (29 February, unwritten days) are NaN on purpose.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanquantile(store.location(location_id), quantiles, axis=0)
+
+
+def climatology_slots(table: np.ndarray, max_points: int, max_error: Optional[float] = None) -> List[int]:
+    """Calendar slots to keep when the quantile curves of `climatology` are charted.
+
+    Each curve is reduced to about `max_points` points with `downsample` and
+    the union of the kept slots is used for all curves, so they stay aligned.
+    With `max_error`, slots are added until every curve deviates from its
+    linear interpolation by at most that much. Slots without a value are
+    dropped.
+    """
+    present = np.flatnonzero(~np.isnan(table).any(axis=0))
+    xs = present.tolist()
+    rows = table[:, present].tolist()
+    kept = sorted(set().union(*(downsample(xs, ys, max_points) for ys in rows)))
+    while max_error is not None:
+        # Points added for one curve can lengthen the segments of another.
+        refined = kept
+        for ys in rows:
+            refined = refine_to_error(xs, ys, refined, max_error)
+        if refined == kept:
+            break
+        kept = refined
+    return present[kept].tolist()
+
+
+def bloom_slots(store: CubeStore, year: int, thresholds: Sequence[Threshold]) -> np.ndarray:
+    """First slot on which each location reaches each `TS_start`; -1 if not reached.
+
+    Returns an int array of shape (locations, thresholds).
+    """
+    gts = store.year(year)
+    result = np.full((len(store), len(thresholds)), -1, dtype=np.intp)
+    for column, threshold in enumerate(thresholds):
+        reached = gts >= threshold.gts  # NaN compares False
+        first = np.argmax(reached, axis=1)
+        result[:, column] = np.where(reached[np.arange(len(store)), first], first, -1)
+    return result
+
+
+def bloom_tables(store: CubeStore, year: int, thresholds: Sequence[Threshold]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bloom table per location like the updater's `bloom/<id>.json`, for a stored year."""
+    slots = bloom_slots(store, year, thresholds)
+    tables: Dict[str, List[Dict[str, Any]]] = {}
+    for location, row in zip(store.locations, slots.tolist()):
+        tables[location.id] = [
+            {
+                "plant": threshold.plant,
+                "ts_start": threshold.gts,
+                "date": slot_date(year, slot).isoformat() if slot >= 0 else None,  # type: ignore[union-attr]
+            }
+            for threshold, slot in zip(thresholds, row)
+        ]
+    return tables
+
+
+def fill_from_archive(
+    store: CubeStore,
+    location: CubeLocation,
+    start: date,
+    end: date,
+    archive_url: str = ARCHIVE_URL,
+) -> int:
+    """Fetch archive temperatures for `start`..`end` and write them; stops at the first missing day."""
+    store.add_location(location.id, location.lat, location.lon)
+    dates, values = fetch_daily(archive_url, location.lat, location.lon, start, end)
+    if not dates or dates[0] != start.isoformat():
+        raise ValueError(f"{location.id}: archive data does not start at {start.isoformat()}.")
+    complete = next((index for index, value in enumerate(values) if value is None), len(values))
+    return store.write_days(location.id, start, values[:complete])  # type: ignore[arg-type]
+
+
+# --- CLI ----------------------------------------------------------------------
+
+
+def _parse_years(text: str) -> Tuple[int, int]:
+    try:
+        first, _, last = text.partition(":")
+        return int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid year range '{text}' (expected FIRST:LAST).") from None
+
+
+def _parse_named_location(text: str) -> CubeLocation:
+    location_id, sep, coordinates = text.partition("=")
+    if not sep or not location_id:
+        raise argparse.ArgumentTypeError(f"Invalid location '{text}' (expected ID=LAT,LON).")
+    lat, lon = parse_location(coordinates)
+    return CubeLocation(location_id, lat, lon)
+
+
+def _write_json(path: Optional[str], payload: Any) -> None:
+    text = json.dumps(payload, ensure_ascii=False) + "\n"
+    if path is None:
+        sys.stdout.write(text)
+    else:
+        Path(path).write_text(text, encoding="utf-8")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Store the GTS of many locations and years in one memory-mapped cube and query it.",
+        epilog=(
+            "Examples:\n"
+            "  beelot cube init -d cube --years 2005:2026\n"
+            "  beelot cube extend -d cube --to 2027\n"
+            "  beelot cube fill -d cube -l apiary-1=48.14,11.58 -l apiary-2=52.52,13.40 \\\n"
+            "      --start 2005-01-01 --end 2025-12-31\n"
+            "  beelot cube day -d cube --date 2024-04-01 -o layer.geojson\n"
+            "  beelot cube compare -d cube --day 04-01\n"
+            "  beelot cube climatology -d cube --id apiary-1 -o climatology.json\n"
+            "  beelot cube climatology -d cube --id apiary-1 --max-points 60 --max-error 1 -o chart.json\n"
+            "  beelot cube bloom -d cube --year 2024 -o bloom.json"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="Create an empty cube.")
+    init.add_argument("--years", type=_parse_years, required=True, help="Year range FIRST:LAST.")
+    init.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Initial location rows.")
+
+    extend = commands.add_parser("extend", help="Append empty years to the cube.")
+    extend.add_argument("--to", type=int, required=True, help="New last year.")
+
+    fill = commands.add_parser("fill", help="Fetch archive temperatures into the cube.")
+    fill.add_argument(
+        "-l",
+        "--location",
+        type=_parse_named_location,
+        action="append",
+        required=True,
+        help="Location as ID=LAT,LON (repeatable).",
+    )
+    fill.add_argument("--start", type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD).")
+    fill.add_argument("--end", type=date.fromisoformat, required=True, help="Last day (YYYY-MM-DD).")
+    fill.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+
+    day = commands.add_parser("day", help="GeoJSON layer of all locations on one day.")
+    day.add_argument("--date", type=date.fromisoformat, required=True, help="Day (YYYY-MM-DD).")
+
+    compare = commands.add_parser("compare", help="All locations on one calendar day of every year.")
+    compare.add_argument("--day", required=True, help="Calendar day MM-DD.")
+
+    clim = commands.add_parser("climatology", help="GTS quantiles across years for one location.")
+    clim.add_argument("--id", required=True, help="Location id.")
+    clim.add_argument("--quantiles", default="0.1,0.5,0.9", help="Comma-separated quantiles (default: %(default)s).")
+    clim.add_argument(
+        "--max-points", type=int, default=None, help="Downsample each curve to about N points (default: all slots)."
+    )
+    clim.add_argument(
+        "--max-error", type=float, default=None, help="With --max-points: maximum interpolation error in GTS units."
+    )
+
+    bloom = commands.add_parser("bloom", help="Bloom tables of all locations for one year.")
+    bloom.add_argument("--year", type=int, required=True, help="Year.")
+    bloom.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+
+    for command in (init, extend, fill, day, compare, clim, bloom):
+        command.add_argument("-d", "--dir", required=True, help="Cube directory.")
+    for command in (day, compare, clim, bloom):
+        command.add_argument("-o", "--output", default=None, help="Output JSON file (default: stdout).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    path = Path(args.dir)
+
+    try:
+        if args.command == "init":
+            first, last = args.years
+            CubeStore.create(path, first, last, args.capacity).close()
+            print_success(f"Created cube for {first}-{last} in {path}.")
+            return 0
+
+        if args.command == "extend":
+            with CubeStore.open(path, writable=True) as store:
+                first = store.first_year
+                if not store.extend_years(args.to):
+                    print_warning(f"The cube already covers {first}-{store.last_year}.")
+                    return 0
+            print_success(f"Extended cube to {first}-{args.to}.")
+            return 0
+
+        if args.command == "fill":
+            if args.end < args.start:
+                raise ValueError("End date is before start date.")
+            failures = 0
+            with CubeStore.open(path, writable=True) as store:
+                for location in args.location:
+                    try:
+                        days = fill_from_archive(store, location, args.start, args.end, args.archive_url)
+                    except Exception as exc:
+                        failures += 1
+                        print_error(f"{location.id}: {exc}")
+                        continue
+                    print_info(f"{location.id}: {days} days")
+            if failures:
+                print_warning(f"{failures} of {len(args.location)} locations failed.")
+                return 1
+            print_success(f"Filled {len(args.location)} locations.")
+            return 0
+
+        with CubeStore.open(path) as store:
+            if args.command == "day":
+                payload: Any = day_layer(store, args.date)
+            elif args.command == "compare":
+                month, day_of_month = (int(part) for part in args.day.split("-"))
+                values = store.calendar_day(month, day_of_month)
+                payload = {
+                    "day": args.day,
+                    "years": list(range(store.first_year, store.last_year + 1)),
+                    "gts": {
+                        location.id: [None if np.isnan(value) else to_fixed(value) for value in row]
+                        for location, row in zip(store.locations, values.tolist())
+                    },
+                }
+            elif args.command == "climatology":
+                quantiles = [float(item) for item in args.quantiles.split(",")]
+                table = climatology(store, args.id, quantiles)
+                if args.max_points is not None:
+                    slots = climatology_slots(table, args.max_points, args.max_error)
+                elif args.max_error is not None:
+                    raise ValueError("--max-error needs --max-points.")
+                else:
+                    slots = list(range(SLOTS))
+                table = table[:, slots]
+                payload = {
+                    "id": args.id,
+                    "slots": slots,
+                    "quantiles": {
+                        str(q): [None if np.isnan(value) else to_fixed(value) for value in row]
+                        for q, row in zip(quantiles, table.tolist())
+                    },
+                }
+            else:
+                thresholds = thresholds_from_tracht(parse_tracht_data(Path(args.tracht)))
+                payload = {"year": args.year, "locations": bloom_tables(store, args.year, thresholds)}
+        _write_json(args.output, payload)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,328 @@
+"""Differential test of the Python GTS engines against `calculateGTS` in logic.js.
+
+One long-lived Node process (difftest_worker.mjs) imports logic.js and answers
+NDJSON requests on stdin/stdout, so thousands of randomized series per second
+go through both implementations without a process start per case. Results
+must agree exactly: same dates, same floats after `toFixed(2)`.
+
+Cases are drawn from a seeded generator that favours the known edge cases:
+values on exact binary ties such as 1.125 (`toFixed` rounds half up, Python's
+`round` half to even), negative values, empty and single-day series, leap days
+and month and year boundaries. `calculateGTS` takes the month from the ISO
+string itself, so its result must not depend on the time zone. Node still runs
+in the zone given by `--tz`, by default one west of UTC: a regression to
+reading the month of `new Date("YYYY-MM-DD")` (UTC midnight) in local time
+would move the first day of every month into the previous one there and show
+up as mismatches.
+
+A mismatch is shrunk to a minimal failing input by removing days and
+simplifying values while the mismatch persists. Everything runs offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Final, List, Sequence, Tuple
+
+from .console import print_error, print_info, print_success
+from .gts import calculate_gts
+from .heatsum import GTS, accumulate_series, to_fixed
+
+DEFAULT_LOGIC: Final[Path] = Path("assets/js/logic.js")
+# West of UTC, where Date-based month lookups are off by one day.
+DEFAULT_TZ: Final[str] = "America/Los_Angeles"
+DEFAULT_CASES: Final[int] = 5000
+BATCH_SIZE: Final[int] = 500
+WORKER: Final[Path] = Path(__file__).with_name("difftest_worker.mjs")
+
+Case = Tuple[List[str], List[float]]
+Outcome = List[Tuple[str, float]]
+
+
+def _engine_gts(dates: List[str], values: List[float]) -> Outcome:
+    return [(str(row["date"]), float(row["gts"])) for row in calculate_gts(dates, values)]
+
+
+def _engine_heatsum(dates: List[str], values: List[float]) -> Outcome:
+    if not dates:
+        return []
+    series = accumulate_series(dates, values, [GTS])[GTS.name]
+    return [(date_str, to_fixed(value)) for date_str, value in zip(dates, series.tolist())]
+
+
+ENGINES: Final[Dict[str, Callable[[List[str], List[float]], Outcome]]] = {
+    "gts": _engine_gts,
+    "heatsum": _engine_heatsum,
+}
+
+
+class NodeGTS:
+    """Long-lived Node process evaluating `calculateGTS` for batches of cases."""
+
+    def __init__(self, logic_path: Path, tz: str = DEFAULT_TZ, node: str = "node") -> None:
+        executable = shutil.which(node)
+        if executable is None:
+            raise RuntimeError(f"Node executable not found: {node}")
+        if not logic_path.exists():
+            raise FileNotFoundError(f"logic.js is missing: {logic_path}")
+        self._process = subprocess.Popen(
+            [executable, str(WORKER), str(logic_path.resolve())],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={**os.environ, "TZ": tz},
+            text=True,
+            encoding="utf-8",
+            bufsize=1 << 16,
+        )
+        self._next_id = 0
+
+    def __enter__(self) -> "NodeGTS":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            assert self._process.stdin is not None
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+    def run(self, cases: Sequence[Case]) -> List[object]:
+        """JS outcome per case: list of `(date, gts)` or an error string."""
+        assert self._process.stdin is not None and self._process.stdout is not None
+        first_id = self._next_id
+        self._next_id += len(cases)
+        payload = "".join(
+            json.dumps({"id": first_id + index, "dates": dates, "values": values}) + "\n"
+            for index, (dates, values) in enumerate(cases)
+        )
+
+        # Write from a thread so that a full stdout pipe cannot block both sides.
+        def write() -> None:
+            assert self._process.stdin is not None
+            self._process.stdin.write(payload)
+            self._process.stdin.flush()
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        results: List[object] = [None] * len(cases)
+        for _ in cases:
+            line = self._process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Node worker exited with status {self._process.poll()}")
+            response = json.loads(line)
+            index = response["id"] - first_id
+            if "error" in response:
+                results[index] = f"error: {response['error']}"
+            else:
+                results[index] = [(str(item[0]), float(item[1])) for item in response["result"]]
+        writer.join()
+        return results
+
+
+def python_outcome(engine: Callable[[List[str], List[float]], Outcome], case: Case) -> object:
+    try:
+        return engine(list(case[0]), list(case[1]))
+    except Exception as exc:
+        return f"error: {exc}"
+
+
+def _random_value(rng: random.Random, style: int) -> float:
+    if style == 0:
+        return round(rng.uniform(-25.0, 38.0), 1)
+    if style == 1:
+        # Multiples of 1/8 are exact in binary and produce rounding ties after weighting.
+        return rng.randint(-40, 200) / 8
+    if style == 2:
+        return float(rng.randint(-10, 30))
+    return rng.choice([0.0, -0.0, 0.005, 0.125, 1e-9, -1e-9, 99.995, 1234.5675, round(rng.uniform(0, 40), 2)])
+
+
+def random_case(rng: random.Random) -> Case:
+    """One random series; dates are ascending, mostly consecutive days."""
+    length = rng.choice([0, 1, 2, 3, rng.randint(1, 40), rng.randint(1, 40), rng.randint(30, 400)])
+    day = date(1950, 1, 1) + timedelta(days=rng.randint(0, 85 * 365))
+    if rng.random() < 0.3:
+        # Start close to a month or year boundary.
+        day = date(day.year, rng.choice([1, 2, 3, 12]), 1) - timedelta(days=rng.randint(0, 3))
+    gaps = rng.random() < 0.2
+    style = rng.randint(0, 3)
+    dates: List[str] = []
+    values: List[float] = []
+    for _ in range(length):
+        dates.append(day.isoformat())
+        values.append(_random_value(rng, style if rng.random() < 0.9 else rng.randint(0, 3)))
+        day += timedelta(days=rng.randint(1, 40) if gaps else 1)
+    return dates, values
+
+
+def _simpler_values(value: float) -> List[float]:
+    candidates = [0.0, float(int(value)), round(value, 1), round(value, 2)]
+    return [item for item in dict.fromkeys(candidates) if item != value and abs(item) <= abs(value)]
+
+
+def shrink(case: Case, fails: Callable[[Sequence[Case]], List[bool]]) -> Case:
+    """Reduce a failing case while it keeps failing.
+
+    `fails` evaluates a batch of candidates at once, so every shrinking step
+    is a single round trip to Node.
+    """
+    dates, values = list(case[0]), list(case[1])
+
+    chunk = max(1, len(dates) // 2)
+    while chunk >= 1 and dates:
+        candidates = [
+            (dates[:start] + dates[start + chunk :], values[:start] + values[start + chunk :])
+            for start in range(0, len(dates), chunk)
+        ]
+        verdicts = fails(candidates)
+        if any(verdicts):
+            dates, values = map(list, candidates[verdicts.index(True)])
+            chunk = min(chunk, max(1, len(dates) // 2))
+        elif chunk == 1:
+            break
+        else:
+            chunk //= 2
+
+    improved = True
+    while improved:
+        improved = False
+        candidates = []
+        for index, value in enumerate(values):
+            for simpler in _simpler_values(value):
+                candidates.append((dates, values[:index] + [simpler] + values[index + 1 :]))
+        if candidates:
+            verdicts = fails(candidates)
+            if any(verdicts):
+                dates, values = map(list, candidates[verdicts.index(True)])
+                improved = True
+    return dates, values
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    case: Case
+    minimal: Case
+    js: object
+    python: object
+
+
+def first_difference(js: object, python: object) -> str:
+    if isinstance(js, list) and isinstance(python, list):
+        for index, (left, right) in enumerate(zip(js, python)):
+            if left != right:
+                return f"day {index}: js={left} python={right}"
+        if len(js) != len(python):
+            return f"length: js={len(js)} python={len(python)}"
+    return f"js={js} python={python}"
+
+
+def run_difftest(
+    logic_path: Path,
+    engine_name: str,
+    cases: int,
+    seed: int,
+    tz: str = DEFAULT_TZ,
+    node: str = "node",
+    max_mismatches: int = 3,
+) -> Tuple[int, float, List[Mismatch]]:
+    """Compare `cases` random series; returns (cases run, seconds, shrunk mismatches)."""
+    engine = ENGINES[engine_name]
+    rng = random.Random(seed)
+    mismatches: List[Mismatch] = []
+    done = 0
+    started = time.perf_counter()
+
+    with NodeGTS(logic_path, tz, node) as worker:
+
+        def fails(candidates: Sequence[Case]) -> List[bool]:
+            return [
+                js != python_outcome(engine, candidate)
+                for candidate, js in zip(candidates, worker.run(candidates))
+            ]
+
+        while done < cases and len(mismatches) < max_mismatches:
+            batch = [random_case(rng) for _ in range(min(BATCH_SIZE, cases - done))]
+            for case, js in zip(batch, worker.run(batch)):
+                python = python_outcome(engine, case)
+                if js != python and len(mismatches) < max_mismatches:
+                    minimal = shrink(case, fails)
+                    minimal_js = worker.run([minimal])[0]
+                    mismatches.append(Mismatch(case, minimal, minimal_js, python_outcome(engine, minimal)))
+            done += len(batch)
+
+    return done, time.perf_counter() - started, mismatches
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Compare the Python GTS engines with calculateGTS from logic.js on random series.",
+        epilog=(
+            "Examples:\n"
+            "  beelot difftest\n"
+            "  beelot difftest --engine heatsum --cases 50000 --seed 7\n"
+            "  beelot difftest --tz Asia/Tokyo --report mismatches.ndjson"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="gts", help="Python engine (default: gts).")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help=f"Random cases (default: {DEFAULT_CASES}).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the case generator (default: 0).")
+    parser.add_argument("--tz", default=DEFAULT_TZ, help=f"Time zone of the Node process (default: {DEFAULT_TZ}).")
+    parser.add_argument("--logic", default=str(DEFAULT_LOGIC), help=f"Path to logic.js (default: {DEFAULT_LOGIC}).")
+    parser.add_argument("--node", default="node", help="Node executable (default: node).")
+    parser.add_argument("--max-mismatches", type=int, default=3, help="Stop after this many mismatches.")
+    parser.add_argument("--report", help="Write minimal failing cases as NDJSON to this file.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        done, seconds, mismatches = run_difftest(
+            Path(args.logic), args.engine, args.cases, args.seed, args.tz, args.node, args.max_mismatches
+        )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    rate = done / seconds if seconds > 0 else float("inf")
+    print_info(f"{done} cases in {seconds:.2f} s ({rate:.0f} cases/s), engine {args.engine}, TZ {args.tz}.")
+    if args.report:
+        with Path(args.report).open("w", encoding="utf-8") as handle:
+            for mismatch in mismatches:
+                dates, values = mismatch.minimal
+                handle.write(json.dumps({"dates": dates, "values": values}) + "\n")
+
+    if not mismatches:
+        print_success("No mismatches.")
+        return 0
+    for mismatch in mismatches:
+        dates, values = mismatch.minimal
+        print_error(f"Mismatch (shrunk from {len(mismatch.case[0])} days): {first_difference(mismatch.js, mismatch.python)}")
+        print(f"  dates  = {json.dumps(dates)}")
+        print(f"  values = {json.dumps(values)}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
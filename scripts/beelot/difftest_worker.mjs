@@ -0,0 +1,44 @@
+// Long-lived worker of `beelot difftest`.
+//
+// Reads one JSON case per line from stdin ({"id", "dates", "values"}), runs
+// calculateGTS from assets/js/logic.js and writes one JSON line per case
+// ({"id", "result": [[date, gts], ...]} or {"id", "error"}) to stdout.
+
+import { createInterface } from "node:readline";
+import { pathToFileURL } from "node:url";
+
+const logicPath = process.argv[2];
+const { calculateGTS } = await import(pathToFileURL(logicPath).href);
+
+const lines = createInterface({ input: process.stdin, crlfDelay: Infinity });
+const out = [];
+let scheduled = false;
+
+const flush = () => {
+    scheduled = false;
+    if (out.length > 0) {
+        process.stdout.write(out.join(""));
+        out.length = 0;
+    }
+};
+
+lines.on("line", (line) => {
+    if (!line) {
+        return;
+    }
+    const request = JSON.parse(line);
+    let response;
+    try {
+        const result = calculateGTS(request.dates, request.values);
+        response = { id: request.id, result: result.map((entry) => [entry.date, entry.gts]) };
+    } catch (error) {
+        response = { id: request.id, error: String(error) };
+    }
+    out.push(`${JSON.stringify(response)}\n`);
+    if (!scheduled) {
+        scheduled = true;
+        setImmediate(flush);
+    }
+});
+
+lines.on("close", flush);
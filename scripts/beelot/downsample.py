@@ -0,0 +1,279 @@
+"""Downsample chart series before they are shipped to the client.
+
+Full-year and multi-year views would otherwise push every daily point to
+Chart.js. This module reduces a curve to a few hundred points:
+
+* `lttb` keeps the visually most significant points
+  (Largest-Triangle-Three-Buckets).
+* `minmax_envelope` keeps the extreme points of every bucket. For monotone
+  GTS curves these are simply the first and last point of each bucket.
+* `refine_to_error` inserts original points until the piecewise linear curve
+  through the kept points deviates from the input by at most `max_error`.
+
+All functions return sorted indices into the input, so callers can pick the
+matching labels/dates themselves. `downsample` combines a method with the
+error bound; `beelot cube climatology --max-points` uses it for the quantile
+curves and `beelot downsample` for a `{labels, gtsValues}` JSON series.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import sys
+from pathlib import Path
+from typing import Final, List, Optional, Sequence, Tuple
+
+
+METHODS: Final[Tuple[str, ...]] = ("lttb", "minmax")
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Return indices selected by Largest-Triangle-Three-Buckets.
+
+    Parameters
+    ----------
+    xs, ys:
+        Coordinates of the series; `xs` must be increasing.
+    threshold:
+        Number of points to keep (at least 3 to have an effect).
+
+    Returns
+    -------
+    Sorted list of indices, always including the first and last point.
+    """
+    count = len(ys)
+    if len(xs) != count:
+        raise ValueError("The xs and ys arrays must have the same length.")
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    selected = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket (or the last point) is the third vertex.
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            avg_x, avg_y = xs[count - 1], ys[count - 1]
+        else:
+            span = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / span
+            avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[anchor], ys[anchor]
+        best_area = -1.0
+        best_index = start
+        for idx in range(start, end):
+            area = abs((ax - avg_x) * (ys[idx] - ay) - (ax - xs[idx]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best_index = idx
+        selected.append(best_index)
+        anchor = best_index
+
+    selected.append(count - 1)
+    return selected
+
+
+def minmax_envelope(ys: Sequence[float], bucket_count: int) -> List[int]:
+    """Return the indices of the minimum and maximum of each bucket.
+
+    For a monotone series the minimum and maximum of a bucket are its first
+    and last point, so consecutive buckets are joined exactly and all error is
+    confined to the inside of a bucket.
+    """
+    count = len(ys)
+    if bucket_count <= 0 or 2 * bucket_count + 2 >= count:
+        return list(range(count))
+
+    selected = {0, count - 1}
+    bucket_size = count / bucket_count
+    for bucket in range(bucket_count):
+        start = int(bucket * bucket_size)
+        end = min(int((bucket + 1) * bucket_size), count)
+        if start >= end:
+            continue
+        window = range(start, end)
+        selected.add(min(window, key=ys.__getitem__))
+        selected.add(max(window, key=ys.__getitem__))
+    return sorted(selected)
+
+
+def _segment_error(
+    xs: Sequence[float], ys: Sequence[float], left: int, right: int
+) -> Tuple[float, int]:
+    """Return the largest vertical deviation inside (left, right) and its index."""
+    worst_error = 0.0
+    worst_index = left
+    x0, y0 = xs[left], ys[left]
+    dx = xs[right] - x0
+    slope = (ys[right] - y0) / dx if dx else 0.0
+    for idx in range(left + 1, right):
+        error = abs(y0 + slope * (xs[idx] - x0) - ys[idx])
+        if error > worst_error:
+            worst_error = error
+            worst_index = idx
+    return worst_error, worst_index
+
+
+def max_interpolation_error(xs: Sequence[float], ys: Sequence[float], indices: Sequence[int]) -> float:
+    """Largest vertical distance between the input and the line through `indices`."""
+    return max(
+        (_segment_error(xs, ys, left, right)[0] for left, right in zip(indices, indices[1:])),
+        default=0.0,
+    )
+
+
+def refine_to_error(
+    xs: Sequence[float], ys: Sequence[float], indices: Sequence[int], max_error: float
+) -> List[int]:
+    """Insert points until the linear interpolation error is at most `max_error`.
+
+    The worst segment is split at its worst point first, so the result stays
+    close to the minimal number of extra points. The bound is guaranteed:
+    in the limit every original point is kept and the error is zero.
+    """
+    if max_error < 0:
+        raise ValueError("max_error must not be negative.")
+    kept = sorted(set(indices) | {0, len(ys) - 1}) if ys else []
+
+    heap: List[Tuple[float, int, int, int]] = []
+    for left, right in zip(kept, kept[1:]):
+        error, worst = _segment_error(xs, ys, left, right)
+        if error > max_error:
+            heapq.heappush(heap, (-error, left, right, worst))
+
+    extra: List[int] = []
+    while heap:
+        _, left, right, worst = heapq.heappop(heap)
+        extra.append(worst)
+        for a, b in ((left, worst), (worst, right)):
+            error, split = _segment_error(xs, ys, a, b)
+            if error > max_error:
+                heapq.heappush(heap, (-error, a, b, split))
+
+    return sorted(set(kept).union(extra))
+
+
+def downsample(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    max_points: int,
+    max_error: Optional[float] = None,
+    method: str = "lttb",
+) -> List[int]:
+    """Reduce a series to about `max_points` points.
+
+    Parameters
+    ----------
+    xs, ys:
+        Coordinates of the series; `xs` must be increasing.
+    max_points:
+        Target number of points.
+    max_error:
+        Optional bound for the vertical interpolation error. If set, it takes
+        precedence over `max_points`: points are added until it holds.
+    method:
+        "lttb" or "minmax".
+
+    Returns
+    -------
+    Sorted list of kept indices.
+    """
+    if method == "lttb":
+        indices = lttb(xs, ys, max_points)
+    elif method == "minmax":
+        indices = minmax_envelope(ys, max(1, (max_points - 2) // 2))
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    if max_error is not None:
+        indices = refine_to_error(xs, ys, indices, max_error)
+    return indices
+
+
+def downsample_gts_series(
+    labels: Sequence[str],
+    gts_values: Sequence[float],
+    max_points: int,
+    max_error: Optional[float] = None,
+    method: str = "lttb",
+) -> Tuple[List[str], List[float]]:
+    """Downsample a daily `{labels, gtsValues}` series; the x axis is the day index."""
+    if len(labels) != len(gts_values):
+        raise ValueError("The labels and gtsValues arrays must have the same length.")
+    xs = range(len(gts_values))
+    indices = downsample(xs, gts_values, max_points, max_error=max_error, method=method)
+    return [labels[idx] for idx in indices], [gts_values[idx] for idx in indices]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Downsample a JSON series of the form {\"labels\": [...], \"gtsValues\": [...]} "
+            "(the shape returned by fetchGTSForYear)."
+        ),
+        epilog=(
+            "Examples:\n"
+            "  beelot downsample -i year.json -o year_small.json\n"
+            "  beelot downsample -i year.json -o year_small.json --max-points 200 --max-error 0.5\n"
+            "  beelot downsample -i year.json -o year_small.json --method minmax"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-i", "--input", required=True, help="Input JSON file.")
+    parser.add_argument("-o", "--output", required=True, help="Output JSON file.")
+    parser.add_argument("--max-points", type=int, default=300, help="Target number of points (default: 300).")
+    parser.add_argument(
+        "--max-error",
+        type=float,
+        default=None,
+        help="Maximum vertical interpolation error in GTS units; overrides --max-points.",
+    )
+    parser.add_argument("--method", choices=METHODS, default="lttb", help="Downsampling method (default: lttb).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    parser = build_parser()
+    if len(argv) == 0:
+        parser.print_help()
+        return 0
+
+    args = parser.parse_args(argv)
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    try:
+        data = json.loads(input_path.read_text(encoding="utf-8"))
+        labels, values = downsample_gts_series(
+            data["labels"],
+            [float(value) for value in data["gtsValues"]],
+            args.max_points,
+            max_error=args.max_error,
+            method=args.method,
+        )
+        data["labels"] = labels
+        data["gtsValues"] = values
+        output_path.write_text(json.dumps(data, ensure_ascii=False) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Downsampled to {len(labels)} points. Result saved to {output_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
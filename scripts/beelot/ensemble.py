@@ -0,0 +1,342 @@
+"""Probabilistic bloom dates from ensemble temperature forecasts.
+
+`fetchRecentData` in dataService.js only uses the deterministic forecast, so a
+predicted bloom close to a `TS_start` threshold carries no uncertainty. This
+engine continues the observed GTS of the current year with every member of an
+ensemble forecast and reports, per plant, the spread of the day on which the
+member crosses `TS_start`:
+
+* `p10`, `p50`, `p90`: quantiles of the crossing date over all members
+  (`None` if that quantile lies beyond the forecast horizon),
+* `probability`: share of members that cross within the horizon.
+
+Members with a missing day (NaN, e.g. a member that ends before the horizon)
+are left out of the distribution of their location rather than counted as
+0 °C, which would delay their crossing; the output reports how many members
+each location used.
+
+The thresholds are applied to all locations, members and plants as one array
+operation on a `(locations, members, days)` cube, processed in location chunks
+so that memory stays bounded for hundreds of locations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_index import day_numbers_from_iso, gts_weights
+from .heatsum import to_fixed
+from .openmeteo import (
+    ARCHIVE_URL,
+    DEFAULT_ENSEMBLE_MODEL,
+    ENSEMBLE_URL,
+    FORECAST_URL,
+    fetch_ensemble,
+    parse_location,
+)
+from .stitch import fetch_stitched
+from .tracht_index import DEFAULT_INPUT, TrachtInterval, parse_tracht_data
+
+DEFAULT_HORIZON_DAYS: Final[int] = 16
+DEFAULT_WORKERS: Final[int] = 8
+QUANTILES: Final[Tuple[float, ...]] = (0.1, 0.5, 0.9)
+
+# Upper bound for the boolean comparison block of one location chunk.
+_CHUNK_ELEMENTS: Final[int] = 1 << 24
+
+
+@dataclass(frozen=True)
+class Threshold:
+    """GTS value at which a plant starts blooming."""
+
+    plant: str
+    gts: float
+
+
+@dataclass(frozen=True)
+class BloomForecast:
+    """Bloom-date distribution of one plant at one location."""
+
+    plant: str
+    ts_start: float
+    already_reached: bool
+    probability: float
+    p10: Optional[str]
+    p50: Optional[str]
+    p90: Optional[str]
+
+
+def thresholds_from_tracht(intervals: Sequence[TrachtInterval]) -> List[Threshold]:
+    """Unique `(plant, TS_start)` pairs, ordered by threshold."""
+    unique = {(entry.plant, float(entry.ts_start)) for entry in intervals}
+    return [Threshold(plant, gts) for plant, gts in sorted(unique, key=lambda item: (item[1], item[0]))]
+
+
+def member_gts(dates: Sequence[str], forecasts: np.ndarray, start_gts: np.ndarray) -> np.ndarray:
+    """Cumulative GTS per member.
+
+    Parameters
+    ----------
+    dates:
+        ISO dates of the forecast days.
+    forecasts:
+        Daily mean temperatures of shape (locations, members, days); NaN
+        counts as 0 °C (`forecast_bloom_dates` leaves such members out).
+    start_gts:
+        Observed GTS per location before the first forecast day.
+
+    Returns
+    -------
+    Array of the same shape as `forecasts`.
+    """
+    weights = gts_weights(day_numbers_from_iso(dates))
+    contributions = np.maximum(np.nan_to_num(forecasts, nan=0.0), 0.0) * weights
+    return np.cumsum(contributions, axis=-1) + np.asarray(start_gts, dtype=np.float64)[:, None, None]
+
+
+def complete_members(forecasts: np.ndarray) -> np.ndarray:
+    """Mask of the members without missing days, shape (locations, members)."""
+    return ~np.isnan(forecasts).any(axis=-1)
+
+
+def crossing_indices(cumulative: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """Index of the first day with `cumulative >= threshold`.
+
+    `cumulative` has shape (locations, members, days) and is non-decreasing
+    along the last axis, so the first crossing equals the number of days still
+    below the threshold. The result has shape (locations, members, thresholds);
+    a value equal to the number of days means "not within the horizon".
+    """
+    locations, members, days = cumulative.shape
+    result = np.empty((locations, members, len(thresholds)), dtype=np.int32)
+    per_location = max(1, members * days * len(thresholds))
+    chunk = max(1, _CHUNK_ELEMENTS // per_location)
+    for begin in range(0, locations, chunk):
+        block = cumulative[begin : begin + chunk]
+        result[begin : begin + chunk] = (block[..., None, :] < thresholds[:, None]).sum(axis=-1)
+    return result
+
+
+def forecast_bloom_dates(
+    dates: Sequence[str],
+    forecasts: np.ndarray,
+    start_gts: Sequence[float],
+    thresholds: Sequence[Threshold],
+) -> List[List[BloomForecast]]:
+    """Per-location, per-plant bloom-date distributions.
+
+    Parameters
+    ----------
+    dates:
+        ISO dates of the forecast days.
+    forecasts:
+        Member forecasts of shape (locations, members, days) or, for a single
+        location, (members, days). Members with a NaN day are left out.
+    start_gts:
+        Observed GTS per location before `dates[0]`.
+    thresholds:
+        Plants and their `TS_start` values.
+
+    Returns
+    -------
+    One list of `BloomForecast` per location, in the order of `thresholds`.
+    """
+    cube = np.asarray(forecasts, dtype=np.float64)
+    if cube.ndim == 2:
+        cube = cube[None]
+    if cube.ndim != 3 or cube.shape[2] != len(dates):
+        raise ValueError("Forecasts must have shape (locations, members, days) matching the dates.")
+    start = np.asarray(start_gts, dtype=np.float64)
+    if start.shape != (cube.shape[0],):
+        raise ValueError("Exactly one observed GTS value per location is required.")
+
+    complete = complete_members(cube)
+    if not complete.any(axis=1).all():
+        location = int(np.argmin(complete.any(axis=1)))
+        raise ValueError(f"Every ensemble member of location {location} has missing days.")
+
+    days = len(dates)
+    levels = np.array([threshold.gts for threshold in thresholds], dtype=np.float64)
+    crossings = crossing_indices(member_gts(dates, cube, start), levels)
+    if complete.all():
+        probability = (crossings < days).mean(axis=1)
+        quantiles = np.quantile(crossings, QUANTILES, axis=1, method="inverted_cdf").astype(np.int64)
+    else:
+        # The number of members differs between locations, so one at a time.
+        probability = np.empty((cube.shape[0], len(levels)), dtype=np.float64)
+        quantiles = np.empty((len(QUANTILES), cube.shape[0], len(levels)), dtype=np.int64)
+        for loc in range(cube.shape[0]):
+            used = crossings[loc, complete[loc]]
+            probability[loc] = (used < days).mean(axis=0)
+            quantiles[:, loc] = np.quantile(used, QUANTILES, axis=0, method="inverted_cdf")
+    reached = start[:, None] >= levels[None, :]
+
+    def to_date(index: int) -> Optional[str]:
+        return dates[index] if index < days else None
+
+    results: List[List[BloomForecast]] = []
+    for loc in range(cube.shape[0]):
+        plants: List[BloomForecast] = []
+        for column, threshold in enumerate(thresholds):
+            if reached[loc, column]:
+                plants.append(BloomForecast(threshold.plant, threshold.gts, True, 1.0, None, None, None))
+                continue
+            p10, p50, p90 = (to_date(int(quantiles[q, loc, column])) for q in range(len(QUANTILES)))
+            plants.append(
+                BloomForecast(
+                    threshold.plant,
+                    threshold.gts,
+                    False,
+                    round(float(probability[loc, column]), 4),
+                    p10,
+                    p50,
+                    p90,
+                )
+            )
+        results.append(plants)
+    return results
+
+
+def fetch_location(
+    lat: float,
+    lon: float,
+    today: date,
+    horizon_days: int,
+    ensemble_url: str,
+    forecast_url: str,
+    model: str,
+    archive_url: str = ARCHIVE_URL,
+) -> Tuple[float, List[str], np.ndarray]:
+    """Observed GTS up to yesterday plus the ensemble members from today on."""
+    year_start = date(today.year, 1, 1)
+    observed = 0.0
+    if today > year_start:
+        series = fetch_stitched(
+            lat, lon, year_start, today - timedelta(days=1), today, archive_url=archive_url, forecast_url=forecast_url
+        )
+        observed = float(series.gts()[-1])
+    dates, members = fetch_ensemble(
+        lat, lon, today, today + timedelta(days=horizon_days - 1), base_url=ensemble_url, model=model
+    )
+    return observed, dates, np.array(members, dtype=np.float64)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Predict p10/p50/p90 bloom dates per plant from Open-Meteo ensemble forecasts.",
+        epilog=(
+            "Examples:\n"
+            "  beelot ensemble -l 48.14,11.58 -o bloom.json\n"
+            "  beelot ensemble -l 48.14,11.58 -l 52.52,13.40 --members-url http://127.0.0.1:8765/v1/ensemble \\\n"
+            "      --forecast-url http://127.0.0.1:8765/v1/forecast -o bloom.json"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument(
+        "-l",
+        "--location",
+        action="append",
+        type=parse_location,
+        required=True,
+        help="Location as lat,lon; may be repeated.",
+    )
+    parser.add_argument("-o", "--output", required=True, help="Path to output JSON file.")
+    parser.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=DEFAULT_HORIZON_DAYS,
+        help=f"Forecast days starting today (default: {DEFAULT_HORIZON_DAYS}).",
+    )
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="Override today's date (YYYY-MM-DD).")
+    parser.add_argument("--members-url", default=ENSEMBLE_URL, help="Ensemble endpoint (default: %(default)s).")
+    parser.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint for the observed GTS.")
+    parser.add_argument("--forecast-url", default=FORECAST_URL, help="Forecast endpoint for the observed GTS.")
+    parser.add_argument("--model", default=DEFAULT_ENSEMBLE_MODEL, help="Ensemble model (default: %(default)s).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent location requests (default: {DEFAULT_WORKERS}).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    today = args.today or date.today()
+    output_path = Path(args.output)
+
+    try:
+        if args.horizon < 1:
+            raise ValueError("--horizon must be at least 1.")
+        thresholds = thresholds_from_tracht(parse_tracht_data(Path(args.tracht)))
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            fetched = list(
+                pool.map(
+                    lambda loc: fetch_location(
+                        loc[0],
+                        loc[1],
+                        today,
+                        args.horizon,
+                        args.members_url,
+                        args.forecast_url,
+                        args.model,
+                        args.archive_url,
+                    ),
+                    args.location,
+                )
+            )
+        dates = fetched[0][1]
+        if any(item[1] != dates for item in fetched):
+            raise ValueError("Ensemble responses cover different dates.")
+        member_counts = {item[2].shape[0] for item in fetched}
+        if len(member_counts) != 1:
+            raise ValueError(f"Ensemble responses have different member counts: {sorted(member_counts)}")
+
+        forecasts = np.stack([item[2] for item in fetched])
+        start_gts = [item[0] for item in fetched]
+        results = forecast_bloom_dates(dates, forecasts, start_gts, thresholds)
+        used_members = complete_members(forecasts).sum(axis=1).tolist()
+        payload = {
+            "today": today.isoformat(),
+            "forecast_dates": [dates[0], dates[-1]],
+            "members": forecasts.shape[1],
+            "locations": [
+                {
+                    "lat": lat,
+                    "lon": lon,
+                    "observed_gts": to_fixed(observed),
+                    "members": used,
+                    "plants": [asdict(item) for item in plants],
+                }
+                for (lat, lon), observed, used, plants in zip(args.location, start_gts, used_members, results)
+            ],
+        }
+        output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Forecast bloom dates for {len(thresholds)} plants at {len(args.location)} location(s) "
+        f"from {forecasts.shape[1]} members. Results saved to {output_path}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,284 @@
+"""Generate Jest golden fixtures for GTS from a scenario manifest.
+
+Instead of running `beelot gts` once per case and pasting the output, a
+manifest lists all scenarios and this tool renders them in parallel. For each
+scenario it writes
+
+    <output_dir>/<name>.input.js    `const dates = [...]; const values = [...];`
+    <output_dir>/<name>.expect.txt  the `expect(result).toEqual([...])` block
+
+Scenarios whose input hash and generator version did not change since the
+last run are skipped; the hashes live in `<output_dir>/fixtures.lock.json`.
+Both files are written line by line from generators, so large fixtures never
+exist as one joined string.
+
+Manifest format:
+
+    {
+      "output_dir": "tests/fixtures/gts",
+      "scenarios": [
+        {"name": "munich-2024", "input": "tmp/munich_2024.js"},
+        {"name": "leap-february", "synthetic": {"start": "2024-02-20", "days": 14, "mean": 3, "seed": 1}},
+        {"name": "negative-winter", "synthetic": {"start": "2023-12-15", "days": 60, "mean": -4, "amplitude": 3}},
+        {"name": "berlin-2023", "location": [52.52, 13.40], "year": 2023}
+      ]
+    }
+
+Paths are relative to the manifest. `location` scenarios fetch a full past
+year from the archive endpoint; the data of past years does not change, so
+their hash covers the request, not the response.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Final, Iterator, List, Optional, Sequence, Tuple
+
+from .console import print_error, print_info, print_success
+from .gts import calculate_gts, parse_js_arrays, render_expectation
+
+# Bump whenever the rendered output changes for the same input.
+GENERATOR_VERSION: Final[str] = "2"
+LOCK_FILE: Final[str] = "fixtures.lock.json"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One manifest entry; exactly one of `input`, `synthetic` and `location` is set."""
+
+    name: str
+    input: Optional[Path] = None
+    synthetic: Optional[Dict[str, Any]] = None
+    location: Optional[Tuple[float, float]] = None
+    year: Optional[int] = None
+
+    def input_hash(self, archive_url: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(GENERATOR_VERSION.encode("utf-8"))
+        if self.input is not None:
+            digest.update(b"input\0")
+            digest.update(self.input.read_bytes())
+        elif self.synthetic is not None:
+            digest.update(b"synthetic\0")
+            digest.update(json.dumps(self.synthetic, sort_keys=True).encode("utf-8"))
+        else:
+            digest.update(b"location\0")
+            digest.update(json.dumps([self.location, self.year, archive_url]).encode("utf-8"))
+        return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class FixtureResult:
+    name: str
+    input_hash: str
+    days: int
+    skipped: bool = False
+
+
+def load_manifest(path: Path) -> Tuple[Path, List[Scenario]]:
+    """Output directory and scenarios of a manifest file."""
+    if not path.exists():
+        raise FileNotFoundError(f"Manifest is missing: {path}")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    base = path.parent
+    output_dir = base / data.get("output_dir", "fixtures")
+
+    scenarios: List[Scenario] = []
+    seen = set()
+    for index, item in enumerate(data.get("scenarios", [])):
+        name = item.get("name")
+        if not isinstance(name, str) or not name or "/" in name:
+            raise ValueError(f"Scenario {index}: invalid name {name!r}")
+        if name in seen:
+            raise ValueError(f"Scenario {index}: duplicate name '{name}'")
+        seen.add(name)
+        kinds = [key for key in ("input", "synthetic", "location") if key in item]
+        if len(kinds) != 1:
+            raise ValueError(f"Scenario '{name}': set exactly one of input, synthetic or location.")
+        if "input" in item:
+            scenarios.append(Scenario(name, input=base / item["input"]))
+        elif "synthetic" in item:
+            if "start" not in item["synthetic"] or "days" not in item["synthetic"]:
+                raise ValueError(f"Scenario '{name}': synthetic needs start and days.")
+            scenarios.append(Scenario(name, synthetic=dict(item["synthetic"])))
+        else:
+            lat, lon = item["location"]
+            year = int(item.get("year", 0))
+            if not 1940 <= year < date.today().year:
+                raise ValueError(f"Scenario '{name}': location scenarios need a past year.")
+            scenarios.append(Scenario(name, location=(float(lat), float(lon)), year=year))
+    if not scenarios:
+        raise ValueError(f"No scenarios in {path}")
+    return output_dir, scenarios
+
+
+def synthetic_series(spec: Dict[str, Any]) -> Tuple[List[str], List[float]]:
+    """Deterministic daily series: seasonal sine around `mean` plus seeded noise, one decimal."""
+    start = date.fromisoformat(spec["start"])
+    days = int(spec["days"])
+    mean = float(spec.get("mean", 5.0))
+    amplitude = float(spec.get("amplitude", 6.0))
+    noise = float(spec.get("noise", 2.0))
+    rng = random.Random(spec.get("seed", 0))
+    dates: List[str] = []
+    values: List[float] = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        season = -math.cos(2 * math.pi * (day.timetuple().tm_yday - 15) / 365.25)
+        dates.append(day.isoformat())
+        values.append(round(mean + amplitude * season + rng.gauss(0.0, noise), 1))
+    return dates, values
+
+
+def scenario_series(scenario: Scenario, archive_url: str) -> Tuple[List[str], List[float]]:
+    if scenario.input is not None:
+        return parse_js_arrays(scenario.input)
+    if scenario.synthetic is not None:
+        return synthetic_series(scenario.synthetic)
+
+    from .openmeteo import fetch_daily
+
+    assert scenario.location is not None and scenario.year is not None
+    lat, lon = scenario.location
+    dates, values = fetch_daily(
+        archive_url, lat, lon, date(scenario.year, 1, 1), date(scenario.year, 12, 31)
+    )
+    if any(value is None for value in values):
+        raise ValueError(f"Scenario '{scenario.name}': archive data has gaps.")
+    return dates, [float(value) for value in values]  # type: ignore[arg-type]
+
+
+def render_inputs(dates: Sequence[str], values: Sequence[float]) -> Iterator[str]:
+    """Yield the input file in the format read by `parse_js_arrays` (no trailing commas)."""
+    yield "const dates = [\n"
+    last = len(dates) - 1
+    for index, date_str in enumerate(dates):
+        yield f"    '{date_str}'{',' if index < last else ''}\n"
+    yield "];\nconst values = [\n"
+    for index, value in enumerate(values):
+        yield f"    {value}{',' if index < last else ''}\n"
+    yield "];\n"
+
+
+def _write_lines(path: Path, lines: Iterator[str]) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.writelines(lines)
+    os.replace(tmp_path, path)
+
+
+def render_scenario(scenario: Scenario, output_dir: Path, input_hash: str, archive_url: str) -> FixtureResult:
+    """Compute and write both files of one scenario (runs in a worker process)."""
+    dates, values = scenario_series(scenario, archive_url)
+    if not dates:
+        raise ValueError(f"Scenario '{scenario.name}' has no data.")
+    _write_lines(output_dir / f"{scenario.name}.input.js", render_inputs(dates, values))
+    _write_lines(output_dir / f"{scenario.name}.expect.txt", render_expectation(calculate_gts(dates, values)))
+    return FixtureResult(scenario.name, input_hash, len(dates))
+
+
+def generate(
+    manifest: Path,
+    jobs: Optional[int] = None,
+    force: bool = False,
+    archive_url: Optional[str] = None,
+) -> List[FixtureResult]:
+    """Render all changed scenarios of `manifest` in parallel; returns one result per scenario."""
+    from .openmeteo import ARCHIVE_URL
+
+    archive_url = archive_url or ARCHIVE_URL
+    output_dir, scenarios = load_manifest(manifest)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    lock_path = output_dir / LOCK_FILE
+    lock: Dict[str, str] = json.loads(lock_path.read_text(encoding="utf-8")) if lock_path.exists() else {}
+
+    results: List[FixtureResult] = []
+    pending: List[Tuple[Scenario, str]] = []
+    for scenario in scenarios:
+        input_hash = scenario.input_hash(archive_url)
+        outputs_exist = all(
+            (output_dir / f"{scenario.name}{suffix}").exists() for suffix in (".input.js", ".expect.txt")
+        )
+        if not force and lock.get(scenario.name) == input_hash and outputs_exist:
+            results.append(FixtureResult(scenario.name, input_hash, 0, skipped=True))
+        else:
+            pending.append((scenario, input_hash))
+
+    errors: List[str] = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(render_scenario, scenario, output_dir, input_hash, archive_url): scenario.name
+                for scenario, input_hash in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    errors.append(f"{futures[future]}: {exc}")
+                    continue
+                results.append(result)
+                lock[result.name] = result.input_hash
+
+    # Forget removed scenarios so that the lock file mirrors the manifest.
+    names = {scenario.name for scenario in scenarios}
+    lock = {name: value for name, value in sorted(lock.items()) if name in names}
+    lock_path.write_text(json.dumps(lock, indent=2) + "\n", encoding="utf-8")
+
+    if errors:
+        raise RuntimeError("Fixture generation failed:\n  " + "\n  ".join(errors))
+    order = {scenario.name: index for index, scenario in enumerate(scenarios)}
+    return sorted(results, key=lambda item: order[item.name])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Render Jest GTS fixtures for all scenarios of a manifest in parallel.",
+        epilog=(
+            "Examples:\n"
+            "  beelot fixtures -m tests/fixtures/gts.json\n"
+            "  beelot fixtures -m tests/fixtures/gts.json --jobs 8 --force"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-m", "--manifest", required=True, help="Scenario manifest (JSON).")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Render all scenarios, even unchanged ones.")
+    parser.add_argument("--archive-url", default=None, help="Archive endpoint for location scenarios.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        results = generate(Path(args.manifest), args.jobs, args.force, args.archive_url)
+    except Exception as exc:
+        print_error(f"Error: {exc}")
+        return 1
+
+    for result in results:
+        if result.skipped:
+            print_info(f"{result.name}: unchanged")
+        else:
+            print_success(f"{result.name}: {result.days} days")
+    rendered = sum(1 for result in results if not result.skipped)
+    print(f"Rendered {rendered} of {len(results)} scenarios.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,410 @@
+"""Build a static offline geocoding index for settlements from an OSM extract.
+
+The builder reads settlement places (city, town, village, municipality,
+hamlet — the settlement types of addressNormalization.js) from a local OSM
+extract and writes two static structures that can be served next to the site:
+
+* Forward search: settlements are sharded by the first `shard_chars`
+  characters of their lookup key (`city_key`, i.e. the trimmed, lower-cased
+  name as in addressNormalization.js). Each shard file holds the entries and
+  a radix trie over their keys; every trie node lists the best-ranked entries
+  below it, so a prefix lookup is one walk down the trie after one fetch.
+* Reverse lookup: a grid of `cell_deg` cells grouped into `tile_deg` tiles.
+  Each tile also contains the cells of a one-cell margin around it, so the
+  nearest settlement within the 3x3 neighbourhood of a point can be found from
+  a single tile.
+
+Input is either GeoJSON (Point features with OSM tags as properties) or
+Overpass JSON (`elements` with `lat`, `lon` and `tags`), e.g. from
+
+    osmium tags-filter germany-latest.osm.pbf n/place=city,town,village,hamlet,municipality \\
+        -o places.osm.pbf && osmium export places.osm.pbf -o places.geojson
+
+Output layout:
+
+    <out>/manifest.json
+    <out>/search/<shard>.json
+    <out>/reverse/<lat_tile>_<lon_tile>.json
+
+`GeoIndex` is the reference reader of that on-disk format: it defines how a
+prefix search and a reverse lookup are answered from the shard and tile files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Final, Iterator, List, Optional, Sequence, Tuple
+
+from .address import (
+    SETTLEMENT_TYPES,
+    build_city_typo_candidates,
+    city_key,
+    country_code_for_country_name,
+    normalize_address_field,
+)
+
+FORMAT_VERSION: Final[int] = 1
+DEFAULT_SHARD_CHARS: Final[int] = 2
+DEFAULT_TOP_K: Final[int] = 8
+DEFAULT_CELL_DEG: Final[float] = 0.1
+DEFAULT_TILE_DEG: Final[float] = 1.0
+DEFAULT_COUNTRY: Final[str] = "de"
+
+# Larger settlements rank first in search results.
+PLACE_RANK: Final[Dict[str, int]] = {"city": 0, "town": 1, "municipality": 2, "village": 3, "hamlet": 4}
+
+
+@dataclass(frozen=True)
+class Settlement:
+    name: str
+    lat: float
+    lon: float
+    place: str
+    country: str
+    population: int
+    state: str
+
+    @property
+    def key(self) -> str:
+        return city_key(self.name)
+
+    def rank(self) -> Tuple[int, int, str]:
+        return PLACE_RANK.get(self.place, len(PLACE_RANK)), -self.population, self.key
+
+    def to_row(self) -> List[Any]:
+        return [self.name, round(self.lat, 5), round(self.lon, 5), self.place, self.country, self.state]
+
+
+def _parse_population(value: Any) -> int:
+    try:
+        return max(0, int(str(value).replace(".", "").replace(",", "").strip()))
+    except ValueError:
+        return 0
+
+
+def _settlement_from_tags(tags: Dict[str, Any], lat: Any, lon: Any, default_country: str) -> Optional[Settlement]:
+    place = normalize_address_field(tags.get("place") or tags.get("type")).lower()
+    name = normalize_address_field(tags.get("name"))
+    if place not in SETTLEMENT_TYPES or not name:
+        return None
+    try:
+        lat_value, lon_value = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(lat_value) and math.isfinite(lon_value)):
+        return None
+    country_tag = tags.get("country_code") or tags.get("addr:country") or tags.get("is_in:country_code")
+    country = country_code_for_country_name(country_tag) if country_tag else default_country
+    state = normalize_address_field(tags.get("is_in:state") or tags.get("state"))
+    return Settlement(name, lat_value, lon_value, place, country, _parse_population(tags.get("population")), state)
+
+
+def read_settlements(path: Path, default_country: str = DEFAULT_COUNTRY) -> List[Settlement]:
+    """Settlements from a GeoJSON or Overpass JSON extract."""
+    if not path.exists():
+        raise FileNotFoundError(f"Input file is missing: {path}")
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    settlements: List[Settlement] = []
+    if isinstance(data, dict) and isinstance(data.get("features"), list):
+        for feature in data["features"]:
+            geometry = feature.get("geometry") or {}
+            coords = geometry.get("coordinates") if geometry.get("type") == "Point" else None
+            if not isinstance(coords, list) or len(coords) < 2:
+                continue
+            item = _settlement_from_tags(feature.get("properties") or {}, coords[1], coords[0], default_country)
+            if item:
+                settlements.append(item)
+    elif isinstance(data, dict) and isinstance(data.get("elements"), list):
+        for element in data["elements"]:
+            center = element.get("center") or element
+            item = _settlement_from_tags(element.get("tags") or {}, center.get("lat"), center.get("lon"), default_country)
+            if item:
+                settlements.append(item)
+    else:
+        raise ValueError(f"{path}: expected a GeoJSON FeatureCollection or Overpass JSON.")
+
+    if not settlements:
+        raise ValueError(f"No settlements found in {path}")
+    return settlements
+
+
+def shard_name(key: str, shard_chars: int) -> str:
+    """File stem of the shard for `key`; code points keep non-ASCII prefixes file-name safe."""
+    return "-".join(f"{ord(char):x}" for char in key[:shard_chars])
+
+
+def _build_trie(keys: Sequence[Tuple[str, int]], top_k: int) -> Dict[str, Any]:
+    """Radix trie over `(key, entry id)`; ids are in rank order, so the smallest ids are the best."""
+    root: Dict[str, Any] = {}
+    for key, entry_id in keys:
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault("", []).append(entry_id)
+
+    def compress(node: Dict[str, Any]) -> Dict[str, Any]:
+        exact = sorted(node.get("", []))
+        edges: Dict[str, Any] = {}
+        best: List[int] = list(exact)
+        for char, child in node.items():
+            if char == "":
+                continue
+            label = char
+            # Merge chains of single children without own entries into one edge.
+            while "" not in child and len(child) == 1:
+                (next_char, next_child), = child.items()
+                label += next_char
+                child = next_child
+            compressed = compress(child)
+            edges[label] = compressed
+            best.extend(compressed["t"])
+        result: Dict[str, Any] = {"t": sorted(set(best))[:top_k]}
+        if exact:
+            result["x"] = exact
+        if edges:
+            result["e"] = edges
+        return result
+
+    return compress(root)
+
+
+def _cell(value: float, size: float) -> int:
+    return math.floor(value / size)
+
+
+def build_index(
+    settlements: Sequence[Settlement],
+    output_dir: Path,
+    shard_chars: int = DEFAULT_SHARD_CHARS,
+    top_k: int = DEFAULT_TOP_K,
+    cell_deg: float = DEFAULT_CELL_DEG,
+    tile_deg: float = DEFAULT_TILE_DEG,
+) -> Dict[str, Any]:
+    """Write search shards, reverse tiles and the manifest; returns the manifest."""
+    if shard_chars < 1 or top_k < 1:
+        raise ValueError("shard_chars and top_k must be at least 1.")
+    cells_per_tile = round(tile_deg / cell_deg)
+    if cells_per_tile < 1 or not math.isclose(cells_per_tile * cell_deg, tile_deg):
+        raise ValueError("tile_deg must be a multiple of cell_deg.")
+
+    unique = {(item.key, round(item.lat, 5), round(item.lon, 5)): item for item in settlements}
+    ranked = sorted(unique.values(), key=Settlement.rank)
+
+    shards: Dict[str, List[Settlement]] = defaultdict(list)
+    for item in ranked:
+        shards[shard_name(item.key, shard_chars)].append(item)
+
+    (output_dir / "search").mkdir(parents=True, exist_ok=True)
+    for name, items in shards.items():
+        payload = {
+            "entries": [item.to_row() for item in items],
+            "trie": _build_trie([(item.key, index) for index, item in enumerate(items)], top_k),
+        }
+        _write_json(output_dir / "search" / f"{name}.json", payload)
+
+    tiles: Dict[Tuple[int, int], Dict[Tuple[int, int], List[Settlement]]] = defaultdict(lambda: defaultdict(list))
+    for item in ranked:
+        row, col = _cell(item.lat, cell_deg), _cell(item.lon, cell_deg)
+        # Also place the item into neighbouring tiles whose margin contains its cell.
+        for tile_row in {(row + delta) // cells_per_tile for delta in (-1, 0, 1)}:
+            for tile_col in {(col + delta) // cells_per_tile for delta in (-1, 0, 1)}:
+                tiles[(tile_row, tile_col)][(row, col)].append(item)
+
+    (output_dir / "reverse").mkdir(parents=True, exist_ok=True)
+    for (tile_row, tile_col), cells in tiles.items():
+        entries: List[Settlement] = []
+        index_of: Dict[int, int] = {}
+        cell_rows: Dict[str, List[int]] = {}
+        for (row, col), items in sorted(cells.items()):
+            ids = []
+            for item in items:
+                if id(item) not in index_of:
+                    index_of[id(item)] = len(entries)
+                    entries.append(item)
+                ids.append(index_of[id(item)])
+            cell_rows[f"{row}_{col}"] = ids
+        _write_json(
+            output_dir / "reverse" / f"{tile_row}_{tile_col}.json",
+            {"entries": [item.to_row() for item in entries], "cells": cell_rows},
+        )
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "shard_chars": shard_chars,
+        "top_k": top_k,
+        "cell_deg": cell_deg,
+        "tile_deg": tile_deg,
+        "settlements": len(ranked),
+        "shards": sorted(shards),
+        "tiles": sorted(f"{row}_{col}" for row, col in tiles),
+        "row": ["name", "lat", "lon", "place", "country", "state"],
+    }
+    _write_json(output_dir / "manifest.json", manifest)
+    return manifest
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+class GeoIndex:
+    """Reference reader of the on-disk index format (prefix search and reverse lookup)."""
+
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = index_dir
+        self.manifest: Dict[str, Any] = json.loads((index_dir / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index version: {self.manifest.get('version')}")
+        self._shards = set(self.manifest["shards"])
+        self._tiles = set(self.manifest["tiles"])
+        self.fetches = 0
+
+    def _load(self, path: Path) -> Dict[str, Any]:
+        self.fetches += 1
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _prefix_matches(self, key: str) -> List[List[Any]]:
+        shard_chars = self.manifest["shard_chars"]
+        if len(key) < shard_chars:
+            return []
+        name = shard_name(key, shard_chars)
+        if name not in self._shards:
+            return []
+        shard = self._load(self.index_dir / "search" / f"{name}.json")
+        node, rest = shard["trie"], key
+        while rest:
+            for label, child in node.get("e", {}).items():
+                if label.startswith(rest):
+                    return [shard["entries"][index] for index in child["t"]]
+                if rest.startswith(label):
+                    node, rest = child, rest[len(label):]
+                    break
+            else:
+                return []
+        return [shard["entries"][index] for index in node["t"]]
+
+    def search(self, query: str, limit: Optional[int] = None, typos: bool = True) -> List[List[Any]]:
+        """Best-ranked settlements whose key starts with the query.
+
+        Without a prefix match, the typo candidates of `buildCityTypoCandidates`
+        are tried in order, like the live search does with Nominatim.
+        """
+        limit = limit or self.manifest["top_k"]
+        matches = self._prefix_matches(city_key(query))
+        if not matches and typos:
+            for candidate in build_city_typo_candidates(query):
+                matches = self._prefix_matches(city_key(candidate))
+                if matches:
+                    break
+        return matches[:limit]
+
+    def reverse(self, lat: float, lon: float) -> Optional[List[Any]]:
+        """Nearest settlement within the 3x3 cell neighbourhood of the point, or None."""
+        cell_deg = self.manifest["cell_deg"]
+        cells_per_tile = round(self.manifest["tile_deg"] / cell_deg)
+        row, col = _cell(lat, cell_deg), _cell(lon, cell_deg)
+        tile = f"{row // cells_per_tile}_{col // cells_per_tile}"
+        if tile not in self._tiles:
+            return None
+        data = self._load(self.index_dir / "reverse" / f"{tile}.json")
+        scale = math.cos(math.radians(lat))
+        best: Optional[List[Any]] = None
+        best_distance = math.inf
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                for index in data["cells"].get(f"{row + d_row}_{col + d_col}", []):
+                    entry = data["entries"][index]
+                    distance = (entry[1] - lat) ** 2 + ((entry[2] - lon) * scale) ** 2
+                    if distance < best_distance:
+                        best, best_distance = entry, distance
+        return best
+
+
+def _iter_queries(values: Sequence[str]) -> Iterator[Tuple[str, str]]:
+    for value in values:
+        kind, _, rest = value.partition(":")
+        yield kind, rest
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Build a static offline geocoding index (prefix search and reverse grid) for settlements.",
+        epilog=(
+            "Examples:\n"
+            "  beelot geoindex -i places.geojson -o assets/geo\n"
+            "  beelot geoindex -i overpass.json -o assets/geo --shard-chars 3 --cell 0.05\n"
+            "  beelot geoindex --lookup assets/geo -q search:Münch -q reverse:48.14,11.58"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-i", "--input", help="GeoJSON or Overpass JSON file with place nodes.")
+    parser.add_argument("-o", "--output", help="Output directory of the index.")
+    parser.add_argument(
+        "--country",
+        default=DEFAULT_COUNTRY,
+        help=f"Country code for places without country tag (default: {DEFAULT_COUNTRY}).",
+    )
+    parser.add_argument("--shard-chars", type=int, default=DEFAULT_SHARD_CHARS, help="Key prefix length per shard.")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Results stored per trie node.")
+    parser.add_argument("--cell", type=float, default=DEFAULT_CELL_DEG, help="Reverse grid cell size in degrees.")
+    parser.add_argument("--tile", type=float, default=DEFAULT_TILE_DEG, help="Reverse tile size in degrees.")
+    parser.add_argument("--lookup", help="Query an existing index directory instead of building one.")
+    parser.add_argument(
+        "-q",
+        "--query",
+        action="append",
+        default=[],
+        help="With --lookup: search:<text> or reverse:<lat>,<lon>; may be repeated.",
+    )
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    parser = build_parser()
+    if len(argv) == 0:
+        parser.print_help()
+        return 0
+    args = parser.parse_args(argv)
+
+    try:
+        if args.lookup:
+            index = GeoIndex(Path(args.lookup))
+            for kind, value in _iter_queries(args.query):
+                if kind == "search":
+                    result: Any = index.search(value)
+                elif kind == "reverse":
+                    lat_text, _, lon_text = value.partition(",")
+                    result = index.reverse(float(lat_text), float(lon_text))
+                else:
+                    raise ValueError(f"Invalid query '{kind}:{value}': use search:<text> or reverse:<lat>,<lon>.")
+                print(json.dumps({"query": f"{kind}:{value}", "result": result}, ensure_ascii=False))
+            return 0
+
+        if not args.input or not args.output:
+            parser.error("--input and --output are required to build an index.")
+        settlements = read_settlements(Path(args.input), args.country)
+        manifest = build_index(settlements, Path(args.output), args.shard_chars, args.top_k, args.cell, args.tile)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Indexed {manifest['settlements']} settlements into {len(manifest['shards'])} search shards "
+        f"and {len(manifest['tiles'])} reverse tiles in {args.output}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
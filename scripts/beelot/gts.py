@@ -0,0 +1,162 @@
+"""Compute GTS values from JavaScript arrays and emit Jest expectation output."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Parse `dates` and `values` arrays from a JS file, calculate GTS, "
+            "and write Jest expectation output."
+        ),
+        epilog=(
+            "Examples:\n"
+            "  ./scripts/gts.py -i input.js -o output.txt\n"
+            "  ./scripts/gts.py --input ./tmp/test_data.js --output ./tmp/gts_expectation.txt\n"
+            "  ./scripts/gts.py --help"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument(
+        "-i",
+        "--input",
+        required=True,
+        help="Path to input JS file containing `const dates = [...]` and `const values = [...]`.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Path to output file for generated Jest expectation block.",
+    )
+    parser.add_argument(
+        "--max-gap",
+        type=int,
+        default=None,
+        help="Validate the series first and interpolate gaps of up to this many days (see `beelot quality`).",
+    )
+    return parser
+
+
+def parse_js_arrays(input_file: Path, allow_null: bool = False) -> tuple[list[str], list[float]]:
+    """Parse JavaScript arrays for dates and values from input file; `null` values are kept only if allowed."""
+    if not input_file.exists():
+        raise FileNotFoundError(f"Input file is missing: {input_file}")
+
+    content = input_file.read_text(encoding="utf-8")
+
+    dates_match = re.search(r"const dates = \[(.*?)\];", content, re.DOTALL)
+    values_match = re.search(r"const values = \[(.*?)\];", content, re.DOTALL)
+    if not dates_match or not values_match:
+        raise ValueError("Input file must contain valid `dates` and `values` arrays.")
+
+    dates_str = dates_match.group(1).strip()
+    values_str = values_match.group(1).strip()
+
+    try:
+        dates = json.loads("[" + dates_str.replace("'", '"') + "]")
+        values = json.loads("[" + values_str + "]")
+    except json.JSONDecodeError as exc:
+        raise ValueError(
+            f"JSON parsing error in extracted arrays at line {exc.lineno}, column {exc.colno}: {exc.msg}"
+        ) from exc
+
+    if not isinstance(dates, list) or not isinstance(values, list):
+        raise ValueError("Parsed `dates` and `values` must be JSON arrays.")
+
+    if None in values and not allow_null:
+        raise ValueError("`values` contains null entries; validate the series with --max-gap or `beelot quality`.")
+
+    return [str(item) for item in dates], [None if item is None else float(item) for item in values]
+
+
+def calculate_gts(dates: list[str], values: list[float]) -> list[dict[str, float | str]]:
+    """Calculate GTS using monthly weighting rules (the `GTS` heat-sum preset)."""
+    if len(dates) != len(values):
+        raise ValueError("The dates and values arrays must have the same length.")
+
+    # Imported here so that `beelot gts --help` and the argument checks do not load numpy.
+    from .heatsum import GTS, accumulate_series, to_fixed_array
+
+    cumulative = accumulate_series(dates, values, [GTS])[GTS.name]
+    return [
+        {"date": date_str, "gts": gts_value}
+        for date_str, gts_value in zip(dates, to_fixed_array(cumulative).tolist())
+    ]
+
+
+def render_expectation(results: Iterable[dict[str, float | str]]) -> Iterator[str]:
+    """Yield the lines of the Jest expectation block for `results`.
+
+    `results` is consumed one row at a time; the dates were validated by
+    `calculate_gts`, so the month is read straight from the ISO string.
+    """
+    from .heatsum import GTS
+
+    month_weights = GTS.weight_table().tolist()
+    yield "        expect(result).toEqual([\n"
+    prev_gts: float | None = None
+    for result in results:
+        date_str = str(result["date"])
+        gts_value = float(result["gts"])
+        weight = month_weights[int(date_str[5:7])]
+        if prev_gts is None:
+            yield f"            // 0 + ({gts_value:.1f} * 0.5) = {gts_value}\n"
+        else:
+            increment = gts_value - prev_gts
+            if increment > 0:
+                yield f"            // {prev_gts} + ({increment / weight:.1f} * {weight}) = {gts_value}\n"
+            else:
+                yield f"            // {prev_gts} + (0 * {weight}) = {gts_value}\n"
+        yield f"            {{ date: '{date_str}', gts: {gts_value} }},\n"
+        prev_gts = gts_value
+    yield "        ]);\n"
+
+
+def write_output(output_file: Path, results: list[dict[str, float | str]]) -> None:
+    """Write calculated GTS values in Jest expectation format."""
+    with output_file.open("w", encoding="utf-8") as handle:
+        handle.writelines(render_expectation(results))
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    parser = build_parser()
+    if len(argv) == 0:
+        parser.print_help()
+        return 0
+
+    args = parser.parse_args(argv)
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    try:
+        dates, values = parse_js_arrays(input_path, allow_null=args.max_gap is not None)
+        if args.max_gap is not None:
+            from .quality import clean_series
+
+            series = clean_series(dates, values, args.max_gap, strict=True)
+            print(f"Validated input: {series.report.summary()}")
+            dates, values = series.dates(), series.values.tolist()
+        results = calculate_gts(dates, values)
+        write_output(output_path, results)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"GTS calculation completed successfully. Results saved to {output_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""Single-pass accumulation of several heat-sum metrics over a daily series.
+
+Every metric is described declaratively by a base temperature and a
+month-weight table; the daily contribution is
+
+    max(0, T - base) * weight[month]
+
+and the metric is the cumulative sum of those contributions. All requested
+metrics are computed together as one 2D array operation over the series, so
+the data is parsed once no matter how many metrics are asked for.
+
+The Grünland-Temperatur-Summe is the `GTS` preset: base 0 °C, January
+weighted 0.5 and February 0.75.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Dict, Final, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from . import calendar_index
+
+
+@dataclass(frozen=True)
+class HeatSumMetric:
+    """Declarative definition of one heat-sum metric.
+
+    Parameters
+    ----------
+    name:
+        Key of the metric in results.
+    base_temperature:
+        Temperature subtracted before clamping at zero.
+    month_weights:
+        Weight per month (1-12); months not listed are weighted 1.0.
+    """
+
+    name: str
+    base_temperature: float = 0.0
+    month_weights: Mapping[int, float] = field(default_factory=dict)
+
+    def weight_for_month(self, month: int) -> float:
+        return float(self.month_weights.get(month, 1.0))
+
+    def weight_table(self) -> np.ndarray:
+        """Weights indexed by month number; index 0 is unused."""
+        table = np.ones(13, dtype=np.float64)
+        for month, weight in self.month_weights.items():
+            if not 1 <= month <= 12:
+                raise ValueError(f"Invalid month {month} in weights of metric '{self.name}'.")
+            table[month] = weight
+        return table
+
+
+GTS: Final[HeatSumMetric] = HeatSumMetric("gts", 0.0, {1: 0.5, 2: 0.75})
+GDD5: Final[HeatSumMetric] = HeatSumMetric("gdd5", 5.0)
+GDD10: Final[HeatSumMetric] = HeatSumMetric("gdd10", 10.0)
+UNWEIGHTED: Final[HeatSumMetric] = HeatSumMetric("sum", 0.0)
+
+PRESETS: Final[Dict[str, HeatSumMetric]] = {
+    metric.name: metric for metric in (GTS, GDD5, GDD10, UNWEIGHTED)
+}
+
+
+def to_fixed(value: float, digits: int = 2) -> float:
+    """`parseFloat(value.toFixed(digits))` of JavaScript.
+
+    `toFixed` rounds the exact binary value half away from zero, whereas
+    `round` rounds half to even, e.g. 1.125 becomes 1.13 here but 1.12 with
+    `round(1.125, 2)`.
+    """
+    if not math.isfinite(value):
+        return value
+    return float(Decimal(value).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def _split(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Veltkamp split into a high and a low half of 26 bits each."""
+    scaled = values * 134217729.0  # 2**27 + 1
+    high = scaled - (scaled - values)
+    return high, values - high
+
+
+def to_fixed_array(values: np.ndarray, digits: int = 2) -> np.ndarray:
+    """`to_fixed` for a whole array.
+
+    The scaled value `values * 10**digits` is computed together with its
+    rounding error (Dekker's exact product), so a scaled value that lands on
+    a .5 tie is rounded by the sign of that error, and away from zero if the
+    tie is exact. Elsewhere `np.round` already agrees with `to_fixed`. Values
+    too large for the product to be exact go through `to_fixed`; NaN and
+    infinities are passed through.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0**digits
+    with np.errstate(invalid="ignore", over="ignore"):
+        product = values * scale
+        value_high, value_low = _split(values)
+        scale_high, scale_low = _split(np.float64(scale))
+        error = ((value_high * scale_high - product) + value_high * scale_low + value_low * scale_high) + (
+            value_low * scale_low
+        )
+        magnitude = np.abs(product)
+        tie = magnitude - np.floor(magnitude) == 0.5
+        away = (error == 0.0) | (np.sign(error) == np.sign(product))
+        rounded = np.where(tie, np.copysign(np.floor(magnitude) + away, product), np.round(product)) / scale
+        rounded = np.where(np.isfinite(product), rounded, values)
+    for index in np.flatnonzero(np.isfinite(values) & (magnitude >= 2.0**50)):
+        rounded.flat[index] = to_fixed(float(values.flat[index]), digits)
+    return rounded
+
+
+def months_from_day_numbers(days: np.ndarray) -> np.ndarray:
+    """Month numbers (1-12) of days counted from 1970-01-01 (see `calendar_index`)."""
+    return calendar_index.months(days)
+
+
+def months_from_iso_dates(dates: Sequence[str]) -> np.ndarray:
+    """Month numbers (1-12) of 'YYYY-MM-DD' strings, parsed in one vectorized step."""
+    return calendar_index.months(calendar_index.day_numbers_from_iso(dates))
+
+
+def accumulate(
+    months: np.ndarray, values: np.ndarray, metrics: Sequence[HeatSumMetric]
+) -> np.ndarray:
+    """Cumulative heat sums for all metrics.
+
+    Parameters
+    ----------
+    months:
+        Month number (1-12) per day.
+    values:
+        Daily mean temperature per day.
+    metrics:
+        Metrics to compute.
+
+    Returns
+    -------
+    Array of shape (len(metrics), days); row i belongs to metrics[i].
+    """
+    months = np.asarray(months, dtype=np.intp)
+    values = np.asarray(values, dtype=np.float64)
+    if months.shape != values.shape:
+        raise ValueError("The months and values arrays must have the same length.")
+
+    bases = np.array([metric.base_temperature for metric in metrics], dtype=np.float64)[:, None]
+    weights = np.stack([metric.weight_table() for metric in metrics]) if metrics else np.ones((0, 13))
+
+    contributions = np.maximum(values[None, :] - bases, 0.0)
+    contributions *= np.take_along_axis(weights, np.broadcast_to(months, contributions.shape), axis=1)
+    return np.cumsum(contributions, axis=1)
+
+
+def accumulate_series(
+    dates: Sequence[str], values: Sequence[float], metrics: Sequence[HeatSumMetric]
+) -> Dict[str, np.ndarray]:
+    """Like `accumulate`, but for ISO date strings; returns a dict keyed by metric name."""
+    if len(dates) != len(values):
+        raise ValueError("The dates and values arrays must have the same length.")
+    names = [metric.name for metric in metrics]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Metric names must be unique: {names}")
+    sums = accumulate(months_from_iso_dates(dates), np.asarray(values, dtype=np.float64), metrics)
+    return dict(zip(names, sums))
+
+
+def parse_metric_spec(spec: str) -> HeatSumMetric:
+    """Parse a preset name or `name:base[:month=weight,...]`, e.g. `gdd8:8` or `gts2:0:1=0.5,2=0.75`."""
+    if spec in PRESETS:
+        return PRESETS[spec]
+    parts = spec.split(":")
+    if len(parts) not in (2, 3) or not parts[0]:
+        raise ValueError(
+            f"Invalid metric '{spec}': use a preset ({', '.join(PRESETS)}) or name:base[:month=weight,...]."
+        )
+    weights: Dict[int, float] = {}
+    if len(parts) == 3 and parts[2]:
+        for item in parts[2].split(","):
+            month, _, weight = item.partition("=")
+            weights[int(month)] = float(weight)
+    metric = HeatSumMetric(parts[0], float(parts[1]), weights)
+    metric.weight_table()  # validates the months
+    return metric
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compute several heat-sum metrics in one pass from a JS file containing "
+            "`const dates = [...]` and `const values = [...]`."
+        ),
+        epilog=(
+            "Metrics are presets (" + ", ".join(PRESETS) + ") or name:base[:month=weight,...].\n\n"
+            "Examples:\n"
+            "  beelot heatsum -i input.js -o sums.json\n"
+            "  beelot heatsum -i input.js -o sums.json -m gts -m gdd5 -m gdd10 -m sum\n"
+            "  beelot heatsum -i input.js -o sums.json -m gdd8:8 -m spring:0:1=0,2=0.5"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-i", "--input", required=True, help="Path to input JS file.")
+    parser.add_argument("-o", "--output", required=True, help="Path to output JSON file.")
+    parser.add_argument(
+        "-m",
+        "--metric",
+        action="append",
+        default=None,
+        help="Metric to compute; may be repeated (default: all presets).",
+    )
+    parser.add_argument(
+        "--max-gap",
+        type=int,
+        default=None,
+        help="Validate the series first and interpolate gaps of up to this many days (see `beelot quality`).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    from .gts import parse_js_arrays
+
+    parser = build_parser()
+    if len(argv) == 0:
+        parser.print_help()
+        return 0
+
+    args = parser.parse_args(argv)
+    output_path = Path(args.output)
+
+    try:
+        metrics: List[HeatSumMetric] = (
+            [parse_metric_spec(spec) for spec in args.metric] if args.metric else list(PRESETS.values())
+        )
+        dates, values = parse_js_arrays(Path(args.input), allow_null=args.max_gap is not None)
+        if args.max_gap is not None:
+            from .quality import clean_series
+
+            series = clean_series(dates, values, args.max_gap, strict=True)
+            print(f"Validated input: {series.report.summary()}")
+            dates, values = series.dates(), series.values.tolist()
+        sums = accumulate_series(dates, values, metrics)
+        payload = {
+            "dates": dates,
+            "metrics": {name: to_fixed_array(series).tolist() for name, series in sums.items()},
+        }
+        output_path.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Computed {', '.join(sums)} for {len(dates)} days. Results saved to {output_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,334 @@
+"""Check Naturadb URLs from a JS data file for Error404 pages.
+
+This script reads a JavaScript file containing a defaultTrachtData array,
+extracts all URLs, fetches them, and reports entries whose pages contain
+the marker text "Error404" or could not be fetched.
+
+With `--metrics-json` / `--metrics-prom` every request attempt is timed (see
+`urlmetrics`) and written as a JSON report and a Prometheus text file.
+
+With `--state` and/or `--since` only new or changed entries and a rolling
+sample of the others are checked (see `urlstate`); `--report-json` and
+`--junit` write the results of the checked entries for CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .urlmetrics import MetricsRecorder, RequestMetrics, RequestTimer, instrumented_session, write_outputs
+
+# Statuses that mean "try again later" rather than "page is broken".
+RETRY_STATUSES: Final[FrozenSet[int]] = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER_S: Final[float] = 120.0
+
+
+@dataclass(frozen=True)
+class TrachtEntry:
+    """Single parsed entry from the JS file."""
+
+    plant: str
+    url: str
+    line_no: int
+
+
+@dataclass(frozen=True)
+class UrlProblem:
+    """Description of a problematic URL."""
+
+    plant: str
+    url: str
+    line_no: int
+    reason: str
+
+
+_URL_REGEX = re.compile(
+    r"""
+    plant:\s*"(?P<plant>[^"]+)"      # plant name
+    .*?
+    url:\s*"(?P<url>https?://[^"]+)" # url
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def parse_js_file(path: str) -> List[TrachtEntry]:
+    """Parse a JS file and extract plant + url entries.
+
+    Parameters
+    ----------
+    path:
+        Path to the JavaScript file.
+
+    Returns
+    -------
+    List of TrachtEntry objects.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    return parse_js_text("".join(lines))
+
+
+def parse_js_text(text: str) -> List[TrachtEntry]:
+    """Extract plant + url entries from the text of a JS file."""
+    entries: List[TrachtEntry] = []
+
+    for match in _URL_REGEX.finditer(text):
+        start_pos = match.start()
+        line_no = text[:start_pos].count("\n") + 1
+
+        entries.append(
+            TrachtEntry(
+                plant=match.group("plant"),
+                url=match.group("url"),
+                line_no=line_no,
+            )
+        )
+
+    return entries
+
+
+def _pause(seconds: float, recorder: Optional[MetricsRecorder]) -> None:
+    time.sleep(seconds)
+    if recorder is not None:
+        recorder.slept(seconds)
+
+
+def _retry_delay(response: Any, attempt: int, backoff_s: float) -> float:
+    """Seconds to wait before the next attempt; honours a numeric Retry-After header."""
+    header = response.headers.get("Retry-After", "") if response is not None else ""
+    if header.strip().isdigit():
+        return min(float(header), MAX_RETRY_AFTER_S)
+    return backoff_s * 2**attempt
+
+
+def _fetch(
+    session: Any,
+    entry: TrachtEntry,
+    timeout_s: float,
+    retries: int,
+    backoff_s: float,
+    recorder: Optional[MetricsRecorder],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Fetch one URL with retries; returns (html, problem reason)."""
+    import requests
+
+    host = urlsplit(entry.url).hostname or ""
+    attempt = 0
+    while True:
+        response = None
+        html: Optional[str] = None
+        reason: Optional[str] = None
+        size = 0
+        with RequestTimer() as timer:
+            try:
+                response = session.get(entry.url, timeout=timeout_s, allow_redirects=True, stream=True)
+                timer.headers_received()
+                body = response.content
+                size = len(body)
+            except requests.RequestException as exc:
+                reason = f"request failed: {exc}"
+        if reason is None:
+            try:
+                response.encoding = response.encoding or "utf-8"
+                html = response.text
+            except Exception as exc:
+                reason = f"decode failed: {exc}"
+
+        if recorder is not None:
+            recorder.record(
+                RequestMetrics(
+                    url=entry.url,
+                    host=host,
+                    attempt=attempt,
+                    status=response.status_code if response is not None else None,
+                    bytes=size,
+                    phases=timer.phases,
+                    redirects=tuple(f"{hop.status_code} {hop.url}" for hop in response.history)
+                    if response is not None
+                    else (),
+                    error=reason,
+                )
+            )
+
+        retryable = response is None or response.status_code in RETRY_STATUSES
+        if not retryable or attempt >= retries:
+            if reason is None and response.status_code in RETRY_STATUSES:
+                reason = f"HTTP {response.status_code} after {attempt + 1} attempt(s)"
+            return html, reason
+        _pause(_retry_delay(response, attempt, backoff_s), recorder)
+        attempt += 1
+
+
+def check_urls(
+    entries: Iterable[TrachtEntry],
+    timeout_s: float = 15.0,
+    delay_s: float = 0.3,
+    retries: int = 0,
+    backoff_s: float = 1.0,
+    recorder: Optional[MetricsRecorder] = None,
+) -> List[UrlProblem]:
+    """Fetch URLs and detect Naturadb Error404 pages.
+
+    Parameters
+    ----------
+    entries:
+        Parsed TrachtEntry objects.
+    timeout_s:
+        Per-request timeout in seconds.
+    delay_s:
+        Delay between requests to reduce blocking.
+    retries:
+        Extra attempts after a failed request or a 429/5xx response.
+    backoff_s:
+        Base of the exponential retry delay, unless the server sends Retry-After.
+    recorder:
+        Collects per-attempt timings, status, bytes and sleep time if given.
+
+    Returns
+    -------
+    List of UrlProblem objects.
+    """
+    # Imported here so that parsing and `--help` do not pay for loading requests.
+    import requests
+
+    problems: List[UrlProblem] = []
+
+    session = instrumented_session() if recorder is not None else requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36"
+            ),
+            "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
+        }
+    )
+
+    for entry in entries:
+        html, reason = _fetch(session, entry, timeout_s, retries, backoff_s, recorder)
+        if reason is None and html is not None and "Error404" in html:
+            reason = "Error404 marker found in HTML"
+        if reason is not None:
+            problems.append(
+                UrlProblem(
+                    plant=entry.plant,
+                    url=entry.url,
+                    line_no=entry.line_no,
+                    reason=reason,
+                )
+            )
+
+        _pause(delay_s, recorder)
+
+    return problems
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Check tracht_data.js URLs for Naturadb Error404 pages.",
+        epilog=(
+            "Examples:\n"
+            "  beelot urlcheck assets/js/tracht_data.js\n"
+            "  beelot urlcheck assets/js/tracht_data.js --retries 2 \\\n"
+            "      --metrics-json urlcheck.json --metrics-prom /var/lib/node_exporter/beelot_urlcheck.prom\n"
+            "  beelot urlcheck assets/js/tracht_data.js --state urlcheck-state.json --sample 20\n"
+            "  beelot urlcheck assets/js/tracht_data.js --since origin/main...HEAD \\\n"
+            "      --junit urlcheck.xml --fail-on-problems"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("js_path", help="Path to tracht_data.js.")
+    parser.add_argument("--timeout", type=float, default=15.0, help="Request timeout in s (default: %(default)s).")
+    parser.add_argument("--delay", type=float, default=0.3, help="Delay between requests in s (default: %(default)s).")
+    parser.add_argument("--retries", type=int, default=0, help="Retries after 429/5xx (default: %(default)s).")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base retry delay in s (default: %(default)s).")
+    parser.add_argument("--metrics-json", default=None, help="Write a JSON report with per-request metrics.")
+    parser.add_argument("--metrics-prom", default=None, help="Write metrics in Prometheus text format.")
+    parser.add_argument("--state", default=None, help="Results of previous runs; only new entries are checked.")
+    parser.add_argument("--since", default=None, help="Check entries changed in a git range (A, A..B or A...B).")
+    parser.add_argument(
+        "--sample", type=int, default=20, help="Other entries re-checked with --state (default: %(default)s)."
+    )
+    parser.add_argument("--report-json", default=None, help="Write the results of the checked entries as JSON.")
+    parser.add_argument("--junit", default=None, help="Write the results of the checked entries as JUnit XML.")
+    parser.add_argument("--fail-on-problems", action="store_true", help="Exit with status 1 if a URL has a problem.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Imported here because urlstate builds on the entry types of this module.
+    from . import urlstate
+
+    recorder = MetricsRecorder() if args.metrics_json or args.metrics_prom else None
+    try:
+        js_path = Path(args.js_path)
+        entries = parse_js_file(args.js_path)
+        state = urlstate.load_state(Path(args.state)) if args.state else None
+        changed = urlstate.changed_fingerprints(js_path, args.since) if args.since else None
+        selected = urlstate.select_entries(entries, state, changed, args.sample)
+        problems = check_urls(
+            [item.entry for item in selected], args.timeout, args.delay, args.retries, args.backoff, recorder
+        )
+        if args.state:
+            updated = urlstate.update_state(state, entries, selected, problems, time.time())
+            urlstate.save_state(Path(args.state), updated)
+        if args.report_json or args.junit:
+            urlstate.write_reports(
+                selected,
+                problems,
+                len(entries),
+                js_path.name,
+                Path(args.report_json) if args.report_json else None,
+                Path(args.junit) if args.junit else None,
+            )
+        if recorder is not None:
+            write_outputs(
+                recorder,
+                len(problems),
+                Path(args.metrics_json) if args.metrics_json else None,
+                Path(args.metrics_prom) if args.metrics_prom else None,
+            )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    if len(selected) < len(entries):
+        reasons = [item.selected for item in selected]
+        details = ", ".join(
+            f"{reasons.count(reason)} {reason}" for reason in urlstate.SELECTION_REASONS if reason in reasons
+        )
+        print(f"Checked {len(selected)} of {len(entries)} entries ({details or 'none selected'}).")
+
+    if not problems:
+        print("No problematic URLs found.")
+        return 0
+
+    print("Problematic URLs (Error404 or fetch problems):\n")
+    for p in problems:
+        print(
+            f"- line {p.line_no}: "
+            f'plant="{p.plant}", '
+            f"url={p.url}\n"
+            f"  reason: {p.reason}"
+        )
+
+    return 1 if args.fail_on_problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""Minimal Open-Meteo client mirroring the requests made by assets/js/dataService.js.
+
+Base URLs are parameters everywhere, so batch jobs and tests can point the
+client at a local stand-in (see `beelot.standin`) instead of the public API.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import re
+from datetime import date
+from typing import Any, Dict, Final, List, Optional, Tuple
+
+ARCHIVE_URL: Final[str] = "https://archive-api.open-meteo.com/v1/era5"
+FORECAST_URL: Final[str] = "https://api.open-meteo.com/v1/forecast"
+ENSEMBLE_URL: Final[str] = "https://ensemble-api.open-meteo.com/v1/ensemble"
+
+DAILY_VARIABLE: Final[str] = "temperature_2m_mean"
+TIMEZONE: Final[str] = "Europe/Berlin"
+DEFAULT_ENSEMBLE_MODEL: Final[str] = "icon_seamless"
+
+_MEMBER_KEY_REGEX = re.compile(rf"^{DAILY_VARIABLE}_member(\d+)$")
+
+
+class OpenMeteoError(RuntimeError):
+    """Raised for failed requests and malformed Open-Meteo responses."""
+
+
+def round_coordinate(value: float) -> float:
+    """Round to 0.01 like `Math.round(value * 100) / 100` in dataService.js."""
+    return math.floor(value * 100 + 0.5) / 100
+
+
+def parse_location(spec: str) -> Tuple[float, float]:
+    """Parse a `lat,lon` command line argument."""
+    lat_text, sep, lon_text = spec.partition(",")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Invalid location '{spec}': expected lat,lon")
+    try:
+        return float(lat_text), float(lon_text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid location '{spec}': {exc}") from exc
+
+
+def fetch_json(url: str, params: Dict[str, Any], timeout_s: float = 30.0, session: Any = None) -> Dict[str, Any]:
+    """GET `url` with `params` and return the decoded JSON object."""
+    # Imported here so that the offline engines do not pay for loading requests.
+    import requests
+
+    getter = session.get if session is not None else requests.get
+    try:
+        response = getter(url, params=params, timeout=timeout_s)
+    except requests.RequestException as exc:
+        raise OpenMeteoError(f"Open-Meteo request failed: {exc}") from exc
+    if response.status_code != 200:
+        raise OpenMeteoError(f"Open-Meteo error: {response.status_code} {response.reason}")
+    try:
+        data = response.json()
+    except ValueError as exc:
+        raise OpenMeteoError(f"Invalid JSON from Open-Meteo: {exc}") from exc
+    if not isinstance(data, dict):
+        raise OpenMeteoError("Invalid Open-Meteo response: expected an object.")
+    return data
+
+
+def daily_params(lat: float, lon: float, start: date, end: date, **extra: Any) -> Dict[str, Any]:
+    """Query parameters shared by all daily mean temperature requests."""
+    params: Dict[str, Any] = {
+        "latitude": round_coordinate(lat),
+        "longitude": round_coordinate(lon),
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "daily": DAILY_VARIABLE,
+        "timezone": TIMEZONE,
+    }
+    params.update(extra)
+    return params
+
+
+def ensure_daily(data: Dict[str, Any], context: str) -> Dict[str, Any]:
+    """Return `data["daily"]` or raise like `ensureDailyData` in dataService.js."""
+    daily = data.get("daily")
+    if not isinstance(daily, dict) or not isinstance(daily.get("time"), list):
+        raise OpenMeteoError(f"Invalid Open-Meteo response ({context}).")
+    return daily
+
+
+def parse_daily(data: Dict[str, Any], context: str = "daily") -> Tuple[List[str], List[Optional[float]]]:
+    """Dates and daily mean temperatures; missing values stay `None`."""
+    daily = ensure_daily(data, context)
+    temps = daily.get(DAILY_VARIABLE)
+    if not isinstance(temps, list) or len(temps) != len(daily["time"]):
+        raise OpenMeteoError(f"Invalid Open-Meteo response ({context}): {DAILY_VARIABLE} missing.")
+    return [str(item) for item in daily["time"]], temps
+
+
+def parse_ensemble(data: Dict[str, Any]) -> Tuple[List[str], List[List[Optional[float]]]]:
+    """Dates and one temperature row per ensemble member (control run first)."""
+    daily = ensure_daily(data, "ensemble")
+    members: List[Tuple[int, List[Optional[float]]]] = []
+    for key, values in daily.items():
+        if key == DAILY_VARIABLE:
+            members.append((0, values))
+            continue
+        match = _MEMBER_KEY_REGEX.match(key)
+        if match:
+            members.append((int(match.group(1)), values))
+    if not members:
+        raise OpenMeteoError("Invalid Open-Meteo response (ensemble): no members.")
+    members.sort(key=lambda item: item[0])
+    return [str(item) for item in daily["time"]], [values for _, values in members]
+
+
+def fetch_daily(
+    base_url: str, lat: float, lon: float, start: date, end: date, timeout_s: float = 30.0, session: Any = None
+) -> Tuple[List[str], List[Optional[float]]]:
+    """Fetch daily mean temperatures from an archive or forecast endpoint."""
+    data = fetch_json(base_url, daily_params(lat, lon, start, end), timeout_s=timeout_s, session=session)
+    return parse_daily(data, base_url)
+
+
+def fetch_ensemble(
+    lat: float,
+    lon: float,
+    start: date,
+    end: date,
+    base_url: str = ENSEMBLE_URL,
+    model: str = DEFAULT_ENSEMBLE_MODEL,
+    timeout_s: float = 30.0,
+    session: Any = None,
+) -> Tuple[List[str], List[List[Optional[float]]]]:
+    """Fetch all ensemble members of the daily mean temperature."""
+    params = daily_params(lat, lon, start, end, models=model)
+    return parse_ensemble(fetch_json(base_url, params, timeout_s=timeout_s, session=session))
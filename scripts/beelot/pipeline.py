@@ -0,0 +1,543 @@
+"""Run the site and data pipeline stages of a release as a dependency graph.
+
+Every stage declares the files it reads (`inputs`) and writes (`outputs`) as
+paths or glob patterns relative to the repository root; a directory stands for
+all files below it. A stage depends on every stage that writes one of its
+inputs (and on the stages listed in `after`), so independent stages run side
+by side on a process pool while dependent ones wait.
+
+A stage is up to date, and skipped, if its command, the content of its inputs
+and the content of its outputs are unchanged since its last successful run
+(recorded in the state file). Inputs are hashed when the stage becomes ready,
+so a stage whose upstream stage ran but wrote identical files is skipped as
+well. File hashes are reused as long as size and mtime are unchanged.
+
+Commands starting with `beelot` run in-process in a pool worker, everything
+else as a subprocess. Output is printed per stage once it finished, followed
+by a timing report with the critical path, the chain of dependent stages that
+bounds the wall time.
+
+Further stages (bundling, images, tiles, bloom tables) are declared in a JSON
+file passed with `--pipeline`; stages with the name of a default stage replace
+it:
+
+    {"stages": [{"name": "geoindex", "command": ["beelot", "geoindex", "-i", "data/places.geojson", "-o", "geo"],
+                 "inputs": ["data/places.geojson"], "outputs": ["geo"]}]}
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Set, Tuple
+
+from .console import ANSI_GREEN, ANSI_GREY, ANSI_RED, ANSI_RESET, ANSI_YELLOW, print_error, print_info, print_success
+from .urlmetrics import write_atomic
+
+DEFAULT_STATE: Final[Path] = Path(".beelot-build.json")
+STATE_VERSION: Final[int] = 1
+
+STATUS_BUILT: Final[str] = "built"
+STATUS_UP_TO_DATE: Final[str] = "up-to-date"
+STATUS_FAILED: Final[str] = "failed"
+STATUS_SKIPPED: Final[str] = "skipped"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage.
+
+    Parameters
+    ----------
+    name:
+        Unique stage name.
+    command:
+        Command line; `beelot ...` runs a subcommand in-process.
+    inputs:
+        Files, directories or glob patterns the stage reads.
+    outputs:
+        Files or directories the stage writes.
+    after:
+        Stages that must finish first although no output is declared as input.
+    """
+
+    name: str
+    command: Tuple[str, ...]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class StageRun:
+    """Result of executing a stage command in a worker."""
+
+    returncode: int
+    output: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Outcome of one stage; `start` and `end` are seconds since the build started."""
+
+    name: str
+    status: str
+    start: float
+    end: float
+    returncode: Optional[int] = None
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class BuildSummary:
+    """Outcome of a whole build."""
+
+    results: List[StageResult]
+    wall_seconds: float
+    critical_path: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.status in (STATUS_BUILT, STATUS_UP_TO_DATE) for result in self.results)
+
+
+def default_stages() -> List[Stage]:
+    """Stages of this repository that need no downloaded data."""
+    return [
+        Stage(
+            "versions",
+            ("beelot", "sync-versions", "--source", "max"),
+            inputs=("package.json", "assets/js/version.js"),
+            outputs=("package.json", "assets/js/version.js"),
+        ),
+        Stage(
+            "tracht-index",
+            ("beelot", "tracht-index"),
+            inputs=("assets/js/tracht_data.js",),
+            outputs=("assets/js/tracht_index.js",),
+        ),
+        Stage(
+            "test",
+            ("npm", "test", "--silent"),
+            inputs=("package.json", "assets/js", "tests", "jest.config.cjs", "babel.config.cjs"),
+        ),
+    ]
+
+
+def load_pipeline(path: Path, base: Sequence[Stage] = ()) -> List[Stage]:
+    """Stages of `base` updated with the stages declared in a JSON file."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    stages = {stage.name: stage for stage in base}
+    for item in payload.get("stages", []):
+        unknown = set(item) - {"name", "command", "inputs", "outputs", "after"}
+        if unknown:
+            raise ValueError(f"{path}: unknown keys in stage {item.get('name')!r}: {', '.join(sorted(unknown))}")
+        if not item.get("name") or not item.get("command"):
+            raise ValueError(f"{path}: every stage needs a name and a command")
+        stages[item["name"]] = Stage(
+            name=item["name"],
+            command=tuple(item["command"]),
+            inputs=tuple(item.get("inputs", ())),
+            outputs=tuple(item.get("outputs", ())),
+            after=tuple(item.get("after", ())),
+        )
+    return list(stages.values())
+
+
+def _covers(pattern: str, path: str) -> bool:
+    """Whether a declared input pattern includes the declared output `path`."""
+    pattern, path = pattern.rstrip("/"), path.rstrip("/")
+    return (
+        pattern == path
+        or fnmatch.fnmatchcase(path, pattern)
+        or path.startswith(pattern + "/")
+        or pattern.startswith(path + "/")
+    )
+
+
+def dependencies(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    """Upstream stages of every stage; raises ValueError on unknown names and cycles."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("stage names must be unique")
+    upstream: Dict[str, Set[str]] = {}
+    for stage in stages:
+        missing = set(stage.after) - set(names)
+        if missing:
+            raise ValueError(f"stage {stage.name!r} runs after unknown stage(s): {', '.join(sorted(missing))}")
+        upstream[stage.name] = set(stage.after) | {
+            other.name
+            for other in stages
+            if other.name != stage.name
+            and any(_covers(pattern, output) for pattern in stage.inputs for output in other.outputs)
+        }
+
+    # Kahn's algorithm only to detect cycles; the scheduler works on `upstream` directly.
+    remaining = {name: set(deps) for name, deps in upstream.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return upstream
+
+
+class FileHashes:
+    """Content hashes of files, reused while size and mtime are unchanged."""
+
+    def __init__(self, root: Path, known: Optional[Dict[str, List[Any]]] = None) -> None:
+        self.root = root
+        self.known: Dict[str, List[Any]] = dict(known or {})
+
+    def files(self, patterns: Sequence[str]) -> List[str]:
+        found: Set[str] = set()
+        for pattern in patterns:
+            matches = self.root.glob(pattern) if any(char in pattern for char in "*?[") else [self.root / pattern]
+            for path in matches:
+                if path.is_dir():
+                    found.update(str(item.relative_to(self.root)) for item in path.rglob("*") if item.is_file())
+                elif path.is_file():
+                    found.add(str(path.relative_to(self.root)))
+        return sorted(item.replace(os.sep, "/") for item in found)
+
+    def file(self, relative: str) -> str:
+        stat = (self.root / relative).stat()
+        cached = self.known.get(relative)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256((self.root / relative).read_bytes()).hexdigest()
+        self.known[relative] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def digest(self, patterns: Sequence[str]) -> str:
+        """One hash over the names and contents of all files matching `patterns`."""
+        combined = hashlib.sha256()
+        for relative in self.files(patterns):
+            combined.update(f"{relative}\0{self.file(relative)}\n".encode("utf-8"))
+        return combined.hexdigest()
+
+
+def _stage_key(stage: Stage, hashes: FileHashes) -> Dict[str, str]:
+    return {
+        "command": json.dumps(stage.command),
+        "inputs": hashes.digest(stage.inputs),
+        "outputs": hashes.digest(stage.outputs),
+    }
+
+
+def _outputs_exist(stage: Stage, root: Path) -> bool:
+    return all(
+        any(root.glob(pattern)) if any(char in pattern for char in "*?[") else (root / pattern).exists()
+        for pattern in stage.outputs
+    )
+
+
+def run_stage(command: Sequence[str], root: str) -> StageRun:
+    """Execute a stage command; runs in a pool worker."""
+    start = time.perf_counter()
+    if command and command[0] == "beelot":
+        from .cli import main as beelot_main
+
+        output = io.StringIO()
+        previous = os.getcwd()
+        os.chdir(root)
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                try:
+                    returncode = beelot_main(list(command[1:]))
+                except SystemExit as exc:
+                    returncode = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+                except Exception as exc:
+                    print(f"Error: {exc}", file=sys.stderr)
+                    returncode = 1
+        finally:
+            os.chdir(previous)
+        return StageRun(returncode, output.getvalue(), time.perf_counter() - start)
+
+    try:
+        process = subprocess.run(command, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    except OSError as exc:
+        return StageRun(127, f"could not start: {exc}\n", time.perf_counter() - start)
+    return StageRun(process.returncode, process.stdout, time.perf_counter() - start)
+
+
+def critical_path(stages: Sequence[Stage], upstream: Dict[str, Set[str]], seconds: Dict[str, float]) -> List[str]:
+    """Chain of dependent stages with the largest total duration."""
+    finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+
+    def earliest_finish(name: str) -> float:
+        if name not in finish:
+            before = max(upstream[name], key=earliest_finish, default=None)
+            via[name] = before
+            finish[name] = seconds.get(name, 0.0) + (finish[before] if before is not None else 0.0)
+        return finish[name]
+
+    last = max((stage.name for stage in stages), key=earliest_finish, default=None)
+    path: List[str] = []
+    while last is not None:
+        path.append(last)
+        last = via[last]
+    return path[::-1]
+
+
+def _emit(name: str, width: int, text: str) -> None:
+    for line in text.splitlines():
+        print(f"{ANSI_GREY}[{name:<{width}}]{ANSI_RESET} {line}", flush=True)
+
+
+@dataclass
+class _Build:
+    """Mutable state of one build run."""
+
+    stages: Dict[str, Stage]
+    upstream: Dict[str, Set[str]]
+    hashes: FileHashes
+    records: Dict[str, Dict[str, str]]
+    force: bool
+    started: float = field(default_factory=time.perf_counter)
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    running: Dict[Future, Tuple[str, float]] = field(default_factory=dict)
+
+    def now(self) -> float:
+        return time.perf_counter() - self.started
+
+    def ready(self) -> List[str]:
+        return [
+            name
+            for name in self.stages
+            if name not in self.results
+            and name not in {running for running, _ in self.running.values()}
+            and all(dep in self.results for dep in self.upstream[name])
+        ]
+
+    def up_to_date(self, stage: Stage) -> bool:
+        record = self.records.get(stage.name)
+        if self.force or record is None or not _outputs_exist(stage, self.hashes.root):
+            return False
+        return record == _stage_key(stage, self.hashes)
+
+
+def run_build(
+    stages: Sequence[Stage],
+    root: Path,
+    state_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> BuildSummary:
+    """Run all stages in dependency order and in parallel where possible.
+
+    Parameters
+    ----------
+    stages:
+        Stages of the pipeline.
+    root:
+        Repository root; commands run there and paths are relative to it.
+    state_path:
+        File with the hashes of the last successful runs. Defaults to
+        `.beelot-build.json` in `root`.
+    max_workers:
+        Size of the process pool. Defaults to the CPU count.
+    force:
+        Run every stage even if it is up to date.
+
+    Returns
+    -------
+    BuildSummary with one result per stage, in declaration order.
+    """
+    upstream = dependencies(stages)
+    state_path = state_path if state_path is not None else root / DEFAULT_STATE
+    state: Dict[str, Any] = {}
+    if state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if state.get("version") != STATE_VERSION:
+            state = {}
+    build = _Build(
+        stages={stage.name: stage for stage in stages},
+        upstream=upstream,
+        hashes=FileHashes(root, state.get("files")),
+        records=dict(state.get("stages", {})),
+        force=force,
+    )
+    width = max((len(stage.name) for stage in stages), default=0)
+
+    with ProcessPoolExecutor(max_workers=max(1, max_workers or os.cpu_count() or 1)) as pool:
+        while len(build.results) < len(stages):
+            for name in build.ready():
+                stage = build.stages[name]
+                failed = [dep for dep in upstream[name] if build.results[dep].status in (STATUS_FAILED, STATUS_SKIPPED)]
+                now = build.now()
+                if failed:
+                    build.results[name] = StageResult(name, STATUS_SKIPPED, now, now)
+                    _emit(name, width, f"{ANSI_YELLOW}skipped, {', '.join(sorted(failed))} did not succeed{ANSI_RESET}")
+                elif build.up_to_date(stage):
+                    build.results[name] = StageResult(name, STATUS_UP_TO_DATE, now, now)
+                else:
+                    build.running[pool.submit(run_stage, stage.command, str(root))] = (name, now)
+            if not build.running:
+                continue
+
+            done, _ = wait(list(build.running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, start = build.running.pop(future)
+                stage = build.stages[name]
+                try:
+                    run = future.result()
+                except Exception as exc:
+                    run = StageRun(1, f"worker failed: {exc}\n", build.now() - start)
+                _emit(name, width, run.output)
+                if run.returncode == 0:
+                    build.records[name] = _stage_key(stage, build.hashes)
+                    status = STATUS_BUILT
+                else:
+                    build.records.pop(name, None)
+                    status = STATUS_FAILED
+                build.results[name] = StageResult(name, status, start, build.now(), run.returncode)
+
+    files = {path: build.hashes.known[path] for path in sorted(build.hashes.known) if (root / path).is_file()}
+    payload = {"version": STATE_VERSION, "stages": build.records, "files": files}
+    write_atomic(state_path, json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+    results = [build.results[stage.name] for stage in stages]
+    seconds = {result.name: result.seconds for result in results}
+    return BuildSummary(results, build.now(), critical_path(stages, upstream, seconds))
+
+
+def print_summary(summary: BuildSummary, upstream: Dict[str, Set[str]]) -> None:
+    """Print per-stage status and timings, the critical path and the wall time."""
+    width = max((len(result.name) for result in summary.results), default=0)
+    colors = {
+        STATUS_BUILT: ANSI_GREEN,
+        STATUS_UP_TO_DATE: ANSI_GREY,
+        STATUS_FAILED: ANSI_RED,
+        STATUS_SKIPPED: ANSI_YELLOW,
+    }
+    print_info("Build summary:")
+    for result in summary.results:
+        color = colors[result.status]
+        marker = "*" if result.name in summary.critical_path else " "
+        after = ", ".join(sorted(upstream[result.name]))
+        print(
+            f" {marker}{result.name:<{width}}  {color}{result.status:<10}{ANSI_RESET}"
+            f" {result.start:8.3f}s .. {result.end:8.3f}s {result.seconds:8.3f}s"
+            + (f"  after {after}" if after else "")
+        )
+    by_name = {result.name: result for result in summary.results}
+    critical = sum(by_name[name].seconds for name in summary.critical_path)
+    serial = sum(result.seconds for result in summary.results)
+    print(f"  critical path: {' -> '.join(summary.critical_path)} ({critical:.3f}s)")
+    print(f"  wall {summary.wall_seconds:.3f}s (serial would be {serial:.3f}s)")
+
+
+def find_root(start: Path) -> Path:
+    """Nearest directory at or above `start` that contains package.json."""
+    for directory in (start, *start.parents):
+        if (directory / "package.json").is_file():
+            return directory
+    raise FileNotFoundError(f"no package.json found at or above {start}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run the release pipeline stages in parallel, skipping the up-to-date ones.",
+        epilog=(
+            "Examples:\n"
+            "  beelot build\n"
+            "  beelot build --pipeline pipeline.json --jobs 4\n"
+            "  beelot build --stage tracht-index --force\n"
+            "  beelot build --list"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("--root", default=None, help="Repository root (default: nearest directory with package.json).")
+    parser.add_argument("--pipeline", default=None, help="JSON file with additional or replaced stages.")
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=None,
+        help="Run only this stage and the stages it depends on (repeatable).",
+    )
+    parser.add_argument("--state", default=None, help=f"State file (default: <root>/{DEFAULT_STATE}).")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Size of the process pool (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Run all selected stages even if up to date.")
+    parser.add_argument("--list", action="store_true", help="Print the stages and their dependencies and exit.")
+    return parser
+
+
+def select_stages(stages: Sequence[Stage], names: Sequence[str]) -> List[Stage]:
+    """`names` and everything they depend on, in declaration order."""
+    upstream = dependencies(stages)
+    unknown = set(names) - set(upstream)
+    if unknown:
+        raise ValueError(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    selected: Set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(upstream[name])
+    return [stage for stage in stages if stage.name in selected]
+
+
+def main(argv: Sequence[str]) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        root = Path(args.root).resolve() if args.root else find_root(Path.cwd())
+        stages = default_stages()
+        if args.pipeline:
+            stages = load_pipeline(Path(args.pipeline), stages)
+        if args.stage:
+            stages = select_stages(stages, args.stage)
+        upstream = dependencies(stages)
+
+        if args.list:
+            for stage in stages:
+                after = ", ".join(sorted(upstream[stage.name])) or "-"
+                print(f"{stage.name}: {' '.join(stage.command)}\n  after: {after}")
+                print(f"  inputs: {', '.join(stage.inputs) or '-'}\n  outputs: {', '.join(stage.outputs) or '-'}")
+            return 0
+
+        print_info(f"Building {len(stages)} stage(s) in {root}")
+        summary = run_build(
+            stages,
+            root,
+            state_path=Path(args.state) if args.state else None,
+            max_workers=args.jobs,
+            force=args.force,
+        )
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print_summary(summary, upstream)
+    if not summary.ok:
+        failed = ", ".join(result.name for result in summary.results if result.status == STATUS_FAILED)
+        print_error(f"Build failed: {failed}")
+        return 1
+    print_success("Build finished.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,278 @@
+"""Run the release pre-flight checks concurrently.
+
+The checks (unit tests, version consistency, site build) are independent of
+each other, so they run side by side on a bounded worker pool. Every output
+line is prefixed with the name of its check, the first failing check stops
+all others, and a summary with per-check timings is printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Final, List, Optional, Sequence
+
+from .console import ANSI_GREEN, ANSI_GREY, ANSI_RED, ANSI_RESET, ANSI_YELLOW, print_error, print_info, print_success
+
+
+SYNC_SCRIPT: Final[Path] = Path("scripts/sync_versions.py")
+
+STATUS_PASSED: Final[str] = "passed"
+STATUS_FAILED: Final[str] = "failed"
+STATUS_CANCELLED: Final[str] = "cancelled"
+STATUS_SKIPPED: Final[str] = "skipped"
+
+
+@dataclass(frozen=True)
+class Check:
+    """A single pre-flight check: a name and the command that runs it."""
+
+    name: str
+    command: List[str]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Outcome of one check."""
+
+    name: str
+    status: str
+    returncode: Optional[int]
+    seconds: float
+
+
+@dataclass(frozen=True)
+class PreflightSummary:
+    """Outcome of a whole pre-flight run."""
+
+    results: List[CheckResult]
+    wall_seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return all(result.status == STATUS_PASSED for result in self.results)
+
+
+def default_checks(version_source: str) -> List[Check]:
+    """Return the standard release checks.
+
+    Both release scripts sync the version files right before the pre-flight
+    checks, so there the `versions` check only confirms that the sync wrote
+    both files; it catches drifted versions when `beelot preflight` is run on
+    its own.
+
+    Parameters
+    ----------
+    version_source:
+        Value passed to `sync_versions.py --source` for the consistency check.
+    """
+    return [
+        Check("test", ["npm", "test", "--silent"]),
+        Check(
+            "versions",
+            [sys.executable, str(SYNC_SCRIPT), "--source", version_source, "--check"],
+        ),
+        Check("build", ["npm", "run", "--if-present", "--silent", "build"]),
+    ]
+
+
+def _terminate(process: subprocess.Popen[str]) -> None:
+    """Stop a check including its children (e.g. jest workers started by npm)."""
+    if process.poll() is not None:
+        return
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    else:
+        process.terminate()
+
+
+class _Runner:
+    """Shared state of one pre-flight run: output lock, live processes, abort flag."""
+
+    def __init__(self, cwd: Optional[Path]) -> None:
+        self.cwd = cwd
+        self.abort = threading.Event()
+        self.output_lock = threading.Lock()
+        self.process_lock = threading.Lock()
+        self.processes: Dict[str, subprocess.Popen[str]] = {}
+        self.width = 0
+
+    def emit(self, name: str, line: str) -> None:
+        with self.output_lock:
+            print(f"{ANSI_GREY}[{name:<{self.width}}]{ANSI_RESET} {line}", flush=True)
+
+    def cancel_all(self) -> None:
+        self.abort.set()
+        with self.process_lock:
+            for process in self.processes.values():
+                _terminate(process)
+
+    def run(self, check: Check) -> CheckResult:
+        if self.abort.is_set():
+            return CheckResult(check.name, STATUS_SKIPPED, None, 0.0)
+
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                check.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                cwd=self.cwd,
+                start_new_session=os.name == "posix",
+            )
+        except OSError as exc:
+            self.emit(check.name, f"{ANSI_RED}could not start: {exc}{ANSI_RESET}")
+            self.cancel_all()
+            return CheckResult(check.name, STATUS_FAILED, None, time.perf_counter() - start)
+
+        with self.process_lock:
+            self.processes[check.name] = process
+        # A failure elsewhere may have happened while this process was starting.
+        if self.abort.is_set():
+            _terminate(process)
+
+        assert process.stdout is not None
+        for line in process.stdout:
+            self.emit(check.name, line.rstrip("\n"))
+        returncode = process.wait()
+        seconds = time.perf_counter() - start
+
+        with self.process_lock:
+            del self.processes[check.name]
+
+        if returncode == 0:
+            return CheckResult(check.name, STATUS_PASSED, returncode, seconds)
+        if self.abort.is_set():
+            return CheckResult(check.name, STATUS_CANCELLED, returncode, seconds)
+        self.cancel_all()
+        return CheckResult(check.name, STATUS_FAILED, returncode, seconds)
+
+
+def run_preflight(
+    checks: Sequence[Check],
+    max_workers: Optional[int] = None,
+    cwd: Optional[Path] = None,
+) -> PreflightSummary:
+    """Run checks concurrently and stop all of them on the first failure.
+
+    Parameters
+    ----------
+    checks:
+        Checks to run.
+    max_workers:
+        Upper bound for concurrently running checks. Defaults to the number of
+        checks, capped by the CPU count.
+    cwd:
+        Working directory for the check commands.
+
+    Returns
+    -------
+    PreflightSummary with one result per check, in input order.
+    """
+    if max_workers is None:
+        max_workers = min(len(checks), os.cpu_count() or 1)
+    runner = _Runner(cwd)
+    runner.width = max((len(check.name) for check in checks), default=0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="preflight") as pool:
+        results = list(pool.map(runner.run, checks))
+    return PreflightSummary(results=results, wall_seconds=time.perf_counter() - start)
+
+
+def print_summary(summary: PreflightSummary) -> None:
+    """Print per-check status and timings plus the total wall time."""
+    width = max((len(result.name) for result in summary.results), default=0)
+    colors = {
+        STATUS_PASSED: ANSI_GREEN,
+        STATUS_FAILED: ANSI_RED,
+        STATUS_CANCELLED: ANSI_YELLOW,
+        STATUS_SKIPPED: ANSI_YELLOW,
+    }
+    print_info("Pre-flight summary:")
+    for result in summary.results:
+        color = colors[result.status]
+        print(f"  {result.name:<{width}}  {color}{result.status:<9}{ANSI_RESET} {result.seconds:8.3f}s")
+    serial = sum(result.seconds for result in summary.results)
+    print(f"  {'wall':<{width}}  {'':<9} {summary.wall_seconds:8.3f}s (serial would be {serial:.3f}s)")
+
+
+def run_release_preflight(version_source: str, dryrun: bool, max_workers: Optional[int] = None) -> None:
+    """Run the default checks for a release script and raise on failure."""
+    checks = default_checks(version_source)
+    print_info("Running pre-flight checks")
+    if dryrun:
+        for check in checks:
+            print_info(f"[{check.name}] {' '.join(check.command)}")
+        return
+    summary = run_preflight(checks, max_workers=max_workers)
+    print_summary(summary)
+    if not summary.ok:
+        failed = ", ".join(r.name for r in summary.results if r.status == STATUS_FAILED)
+        raise RuntimeError(f"Pre-flight checks failed: {failed}")
+
+
+def usage() -> str:
+    return (
+        "preflight.py [--source {version-js,package-json,max}] [--jobs N] [--dryrun]\n\n"
+        "Examples:\n"
+        "  ./scripts/preflight.py\n"
+        "  ./scripts/preflight.py --source version-js --jobs 2\n"
+        "  ./scripts/preflight.py --dryrun\n"
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run release pre-flight checks (tests, version check, build) concurrently.",
+        usage=usage(),
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help")
+    parser.add_argument(
+        "--source",
+        choices=("version-js", "package-json", "max"),
+        default="max",
+        help="Source of truth passed to the version consistency check.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Maximum number of checks running at the same time.",
+    )
+    parser.add_argument(
+        "--dryrun",
+        action="store_true",
+        help="Print the check commands without executing them.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = parse_args(argv)
+    try:
+        run_release_preflight(args.source, dryrun=args.dryrun, max_workers=args.jobs)
+    except RuntimeError as exc:
+        print_error(str(exc))
+        return 1
+    if not args.dryrun:
+        print_success("All pre-flight checks passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,350 @@
+"""Validation and gap filling of daily temperature series before GTS accumulation.
+
+Open-Meteo returns `null` for the latest ERA5 days and occasionally leaves
+gaps; hand-made inputs may contain duplicates or unordered dates. Passing such
+series to the heat-sum engine either fails or silently turns the rest of the
+year into NaN. This stage runs first:
+
+1. `SeriesValidator.feed` consumes (date, value) pairs in one linear pass,
+   e.g. straight from a parser, and only appends them to flat buffers.
+   Nulls and implausible values are marked on the way.
+2. `SeriesValidator.finish` parses all dates at once (`calendar_index`),
+   scatters the values onto a dense daily axis (the first non-null value of
+   a day wins) and counts invalid and missing dates, duplicates and
+   unordered entries with array operations.
+3. Interior runs of missing values of at most `max_gap` days are filled by
+   linear interpolation, vectorized over all runs. Trailing missing days (the
+   ERA5 delay) are trimmed; longer gaps stay NaN and are reported.
+
+`clean_series` combines the steps for in-memory arrays; `beelot quality`
+runs them over many input files and keeps going when a file is broken.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Final, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_index import day_number, from_day_number, iso_from_day_numbers, parse_iso_dates
+from .console import print_error, print_info, print_success, print_warning
+
+DEFAULT_MAX_GAP: Final[int] = 3
+# Daily means outside this range are measurement or parsing errors.
+PLAUSIBLE_RANGE: Final[Tuple[float, float]] = (-60.0, 50.0)
+
+# Value flags collected by `SeriesValidator.feed`.
+_OK: Final[int] = 0
+_NULL: Final[int] = 1
+_IMPLAUSIBLE: Final[int] = 2
+
+
+class DataQualityError(ValueError):
+    """Raised when a series cannot be used even after gap filling."""
+
+
+@dataclass(frozen=True)
+class QualityReport:
+    """Counts of one validated series.
+
+    Parameters
+    ----------
+    entries:
+        Input (date, value) pairs.
+    days:
+        Days of the cleaned series.
+    invalid_dates:
+        Entries whose date could not be parsed (dropped).
+    nulls:
+        Entries without a numeric value.
+    implausible:
+        Values outside `PLAUSIBLE_RANGE` (treated as null).
+    duplicates:
+        Extra entries for an already present date.
+    unordered:
+        Entries whose date is before the date of the previous entry.
+    missing_dates:
+        Days between the first and last date without any entry.
+    filled:
+        Days filled by interpolation.
+    trimmed:
+        Trailing days without value that were removed.
+    unfilled:
+        Days still without value (gaps longer than `max_gap`, leading gaps).
+    """
+
+    entries: int = 0
+    days: int = 0
+    invalid_dates: int = 0
+    nulls: int = 0
+    implausible: int = 0
+    duplicates: int = 0
+    unordered: int = 0
+    missing_dates: int = 0
+    filled: int = 0
+    trimmed: int = 0
+    unfilled: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.unfilled == 0 and self.days > 0
+
+    def summary(self) -> str:
+        counts = {key: value for key, value in asdict(self).items() if key not in ("entries", "days") and value}
+        details = ", ".join(f"{key.replace('_', ' ')}: {value}" for key, value in counts.items())
+        return f"{self.days} days" + (f" ({details})" if details else "")
+
+
+@dataclass(frozen=True)
+class CleanSeries:
+    """Dense daily series after validation; `values` is NaN only where `report.unfilled` counts."""
+
+    first_day: date
+    values: np.ndarray
+    report: QualityReport
+
+    def dates(self) -> List[str]:
+        return iso_from_day_numbers(day_number(self.first_day) + np.arange(self.values.size))
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class SeriesValidator:
+    """Single-pass collector of (date, value) pairs; call `finish` once all pairs are fed."""
+
+    def __init__(self, max_gap: int = DEFAULT_MAX_GAP, trim_trailing: bool = True) -> None:
+        self.max_gap = max_gap
+        self.trim_trailing = trim_trailing
+        self._dates: List[str] = []
+        self._values = array("d")
+        self._flags = array("b")
+
+    def feed(self, day: str, value: Any) -> None:
+        number = _to_float(value)
+        if number is None:
+            flag, number = _NULL, math.nan
+        elif not PLAUSIBLE_RANGE[0] <= number <= PLAUSIBLE_RANGE[1]:
+            flag, number = _IMPLAUSIBLE, math.nan
+        else:
+            flag = _OK
+        self._dates.append(str(day)[:10])
+        self._values.append(number)
+        self._flags.append(flag)
+
+    def feed_all(self, pairs: Iterable[Tuple[str, Any]]) -> "SeriesValidator":
+        for day, value in pairs:
+            self.feed(day, value)
+        return self
+
+    def finish(self) -> CleanSeries:
+        days, parsed = parse_iso_dates(self._dates)
+        values = np.frombuffer(self._values, dtype=np.float64) if self._values else np.empty(0)
+        flags = np.frombuffer(self._flags, dtype=np.int8) if self._flags else np.empty(0, dtype=np.int8)
+        days, values, flags = days[parsed], values[parsed], flags[parsed]
+        if days.size == 0:
+            raise DataQualityError("The series has no valid dates.")
+
+        first = int(days.min())
+        offsets = days - first
+        span = int(offsets.max()) + 1
+        counts = np.bincount(offsets, minlength=span)
+        duplicates = int((counts[counts > 1] - 1).sum())
+        missing_dates = int(np.count_nonzero(counts == 0))
+        unordered = int(np.count_nonzero(np.diff(days) < 0))
+
+        dense = np.full(span, np.nan, dtype=np.float64)
+        present = ~np.isnan(values)
+        unique_offsets, first_index = np.unique(offsets[present], return_index=True)
+        dense[unique_offsets] = values[present][first_index]
+
+        filled = fill_gaps(dense, self.max_gap)
+        trimmed = 0
+        if self.trim_trailing:
+            valid = np.flatnonzero(~np.isnan(dense))
+            keep = int(valid[-1]) + 1 if valid.size else 0
+            trimmed = span - keep
+            dense = dense[:keep]
+        report = QualityReport(
+            entries=len(self._dates),
+            days=int(dense.size),
+            invalid_dates=int(np.count_nonzero(~parsed)),
+            nulls=int(np.count_nonzero(flags == _NULL)),
+            implausible=int(np.count_nonzero(flags == _IMPLAUSIBLE)),
+            duplicates=duplicates,
+            unordered=unordered,
+            missing_dates=missing_dates,
+            filled=filled,
+            trimmed=trimmed,
+            unfilled=int(np.count_nonzero(np.isnan(dense))),
+        )
+        return CleanSeries(from_day_number(first), dense, report)
+
+
+def fill_gaps(values: np.ndarray, max_gap: int) -> int:
+    """Interpolate interior NaN runs of at most `max_gap` days in place; returns the filled count."""
+    missing = np.isnan(values)
+    if max_gap <= 0 or not missing.any() or missing.all():
+        return 0
+    edges = np.diff(np.concatenate(([0], missing.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    fillable = (starts > 0) & (ends < values.size) & (ends - starts <= max_gap)
+    if not fillable.any():
+        return 0
+    marks = np.zeros(values.size + 1, dtype=np.int64)
+    np.add.at(marks, starts[fillable], 1)
+    np.add.at(marks, ends[fillable], -1)
+    targets = np.flatnonzero(np.cumsum(marks[:-1]) > 0)
+    known = np.flatnonzero(~missing)
+    values[targets] = np.interp(targets, known, values[known])
+    return int(targets.size)
+
+
+def clean_series(
+    dates: Sequence[str],
+    values: Sequence[Any],
+    max_gap: int = DEFAULT_MAX_GAP,
+    trim_trailing: bool = True,
+    strict: bool = False,
+) -> CleanSeries:
+    """Validate and fill one series given as parallel arrays.
+
+    Unlike `calculate_gts`, arrays of different length are not rejected: the
+    pairs up to the shorter length are used and the rest counts as invalid.
+
+    Raises
+    ------
+    DataQualityError
+        If no date is valid, or `strict` and gaps remain after filling.
+    """
+    validator = SeriesValidator(max_gap, trim_trailing).feed_all(zip(dates, values))
+    extra = abs(len(dates) - len(values))
+    series = validator.finish()
+    if extra:
+        report = series.report
+        counts = {**asdict(report), "entries": report.entries + extra, "invalid_dates": report.invalid_dates + extra}
+        series = CleanSeries(series.first_day, series.values, QualityReport(**counts))
+    if strict and series.report.unfilled:
+        raise DataQualityError(
+            f"{series.report.unfilled} days have no value after filling gaps of up to {max_gap} days."
+        )
+    return series
+
+
+def read_series(path: Path) -> Tuple[List[str], List[Any]]:
+    """Dates and values of a JS input file (like `beelot gts`) or an Open-Meteo JSON response."""
+    if path.suffix == ".json":
+        from .openmeteo import DAILY_VARIABLE
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        daily = data.get("daily", data) if isinstance(data, dict) else None
+        if not isinstance(daily, dict):
+            raise ValueError(f"{path}: expected an object with 'daily' data.")
+        dates = daily.get("time", daily.get("dates"))
+        values = daily.get(DAILY_VARIABLE, daily.get("values"))
+        if not isinstance(dates, list) or not isinstance(values, list):
+            raise ValueError(f"{path}: dates or values are missing.")
+        return dates, values
+
+    from .gts import parse_js_arrays
+
+    return parse_js_arrays(path, allow_null=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Validate daily temperature series, fill short gaps and report the counts.",
+        epilog=(
+            "Inputs are JS files with `dates`/`values` arrays or Open-Meteo JSON responses.\n\n"
+            "Examples:\n"
+            "  beelot quality data/*.js\n"
+            "  beelot quality data/*.json --max-gap 5 --output-dir cleaned --report quality.jsonl"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("inputs", nargs="+", help="Input files.")
+    parser.add_argument(
+        "--max-gap",
+        type=int,
+        default=DEFAULT_MAX_GAP,
+        help=f"Longest gap in days that is interpolated (default: {DEFAULT_MAX_GAP}).",
+    )
+    parser.add_argument("--keep-trailing", action="store_true", help="Do not trim trailing days without value.")
+    parser.add_argument("--output-dir", default=None, help="Write cleaned series as <name>.json here.")
+    parser.add_argument("--report", default=None, help="Write one JSON report line per input file.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    report_lines: List[str] = []
+    failures = 0
+    incomplete = 0
+
+    try:
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        for name in args.inputs:
+            path = Path(name)
+            try:
+                dates, values = read_series(path)
+                series = clean_series(dates, values, args.max_gap, trim_trailing=not args.keep_trailing)
+            except Exception as exc:
+                failures += 1
+                print_error(f"{path}: {exc}")
+                report_lines.append(json.dumps({"input": str(path), "error": str(exc)}, ensure_ascii=False))
+                continue
+
+            report = series.report
+            report_lines.append(json.dumps({"input": str(path), "ok": report.ok, **asdict(report)}))
+            if report.ok:
+                print_info(f"{path}: {report.summary()}")
+            else:
+                incomplete += 1
+                print_warning(f"{path}: {report.summary()}")
+            if output_dir is not None:
+                payload = {
+                    "dates": series.dates(),
+                    "values": [None if math.isnan(value) else value for value in series.values.tolist()],
+                    "quality": asdict(report),
+                }
+                (output_dir / f"{path.stem}.json").write_text(json.dumps(payload) + "\n", encoding="utf-8")
+
+        if args.report:
+            Path(args.report).write_text("".join(line + "\n" for line in report_lines), encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    total = len(args.inputs)
+    if failures or incomplete:
+        complete = total - failures - incomplete
+        print_warning(f"{complete} of {total} series complete; {incomplete} with gaps, {failures} unreadable.")
+        return 1
+    print_success(f"All {total} series complete.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
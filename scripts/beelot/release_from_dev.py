@@ -0,0 +1,418 @@
+"""Release automation script for creating a release from dev branch.
+
+This script reads version values from assets/js/version.js and package.json on dev,
+uses the maximum of the two as the release version, merges dev into main,
+commits the version update if needed, creates
+an annotated git tag, pushes changes and tags, and finally merges
+main back into dev.
+
+Before anything is committed or tagged, the pre-flight checks from
+preflight.py (tests, version check, build) must pass on the merged tree. If
+the merge or a check fails, main is reset to its state before the merge.
+The version check runs after the version sync, so here it only confirms that
+the sync wrote both files; version files that drifted apart are caught when
+preflight.py is run on its own before a release.
+
+All git access goes through a `GitSession`: both version files are read with a
+single `git cat-file --batch` process, the network `ls-remote` for the tag runs
+while dev and main are pulled, the local tag query (after the pulls, which may
+fetch tags) overlaps the merge and checks, and the time spent in each step is
+reported at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Final, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .console import print_error, print_info, print_success, print_warning
+from .preflight import run_release_preflight
+from .versioning import max_version
+
+
+VERSION_FILE: Final[Path] = Path("assets/js/version.js")
+PACKAGE_FILE: Final[Path] = Path("package.json")
+SYNC_SCRIPT: Final[Path] = Path("scripts/sync_versions.py")
+DEV_BRANCH: Final[str] = "dev"
+MAIN_BRANCH: Final[str] = "main"
+
+T = TypeVar("T")
+
+
+def usage() -> str:
+    return (
+        "release_from_dev.py [--apply | --dryrun]\n\n"
+        "Examples:\n"
+        "  ./release_from_dev.py --apply\n"
+        "  ./release_from_dev.py --dryrun\n"
+        "  ./release_from_dev.py -h\n"
+        "  ./release_from_dev.py -?\n"
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Release from dev into main with tagging.",
+        usage=usage(),
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help")
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Apply changes (required for real release).",
+    )
+    parser.add_argument(
+        "--dryrun",
+        action="store_true",
+        help="Print commands without executing them.",
+    )
+    if len(argv) == 0:
+        parser.print_help()
+        sys.exit(0)
+    args = parser.parse_args(argv)
+    if not args.apply and not args.dryrun:
+        parser.print_help()
+        sys.exit(0)
+    return args
+
+
+def ensure_beelot_directory() -> None:
+    cwd = Path.cwd()
+    if cwd.name != "beelot":
+        raise RuntimeError("You must run this script from the ../beelot directory.")
+
+
+class StepTimer:
+    """Collect wall-clock durations of the individual release steps."""
+
+    def __init__(self) -> None:
+        self.timings: List[Tuple[str, float]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a duration that was measured elsewhere, e.g. in a worker thread."""
+        self.timings.append((name, seconds))
+
+    def report(self) -> None:
+        """Print all recorded step durations followed by the total wall time."""
+        if not self.timings:
+            return
+        width = max(len(name) for name, _ in self.timings)
+        print_info("Step timings:")
+        for name, seconds in self.timings:
+            print(f"  {name:<{width}}  {seconds:8.3f}s")
+        total = time.perf_counter() - self._started
+        print(f"  {'total (wall)':<{width}}  {total:8.3f}s")
+
+
+class GitSession:
+    """Git plumbing used by the release procedure.
+
+    Read-only queries are independent of each other and may be submitted to a
+    small thread pool via `submit`, so slow network queries overlap with local
+    work instead of serializing the release.
+    """
+
+    def __init__(self, dryrun: bool, cwd: Optional[Path] = None, max_workers: int = 3) -> None:
+        self.dryrun = dryrun
+        self.cwd = cwd
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="git")
+
+    def __enter__(self) -> "GitSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, func: Callable[..., T], *args: object) -> "Future[Tuple[T, float]]":
+        """Run `func(*args)` in the background and return its result with its duration."""
+
+        def timed() -> Tuple[T, float]:
+            start = time.perf_counter()
+            value = func(*args)
+            return value, time.perf_counter() - start
+
+        return self._executor.submit(timed)
+
+    def _capture(self, args: List[str]) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            ["git"] + args,
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=self.cwd,
+        )
+
+    def run(self, args: List[str]) -> None:
+        """Run a git command and abort on error."""
+        printable = f"git {' '.join(args)}"
+        print_info(printable)
+        if self.dryrun:
+            return
+        result = self._capture(args)
+        if result.returncode != 0:
+            if result.stdout.strip():
+                print(result.stdout.strip())
+            if result.stderr.strip():
+                print_error(result.stderr.strip())
+            raise RuntimeError(f"Git command failed: {printable}")
+        if result.stdout.strip():
+            print(result.stdout.strip())
+
+    def read_blobs(self, specs: Sequence[str]) -> Dict[str, str]:
+        """Read several `<rev>:<path>` objects through one `git cat-file --batch` process."""
+        request = "".join(f"{spec}\n" for spec in specs).encode("utf-8")
+        result = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            input=request,
+            capture_output=True,
+            check=False,
+            cwd=self.cwd,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git cat-file --batch failed: {result.stderr.decode('utf-8', 'replace').strip()}"
+            )
+
+        output = result.stdout
+        blobs: Dict[str, str] = {}
+        pos = 0
+        for spec in specs:
+            header_end = output.index(b"\n", pos)
+            header = output[pos:header_end].decode("utf-8")
+            pos = header_end + 1
+            if header.endswith(" missing") or header.endswith(" ambiguous"):
+                raise RuntimeError(f"Failed to read {spec}: {header}")
+            _object_id, _object_type, size_text = header.split()
+            size = int(size_text)
+            blobs[spec] = output[pos:pos + size].decode("utf-8")
+            pos += size + 1  # content is followed by a newline
+        return blobs
+
+    def rev_parse(self, rev: str) -> str:
+        """Return the commit id of `rev`."""
+        result = self._capture(["rev-parse", "--verify", f"{rev}^{{commit}}"])
+        if result.returncode != 0:
+            raise RuntimeError(f"Unknown revision: {rev}")
+        return result.stdout.strip()
+
+    def is_worktree_clean(self) -> bool:
+        """Return True if `git status --porcelain` reports no changes."""
+        return not self._capture(["status", "--porcelain"]).stdout.strip()
+
+    def local_tag_exists(self, tag_name: str) -> bool:
+        """Check if a local tag already exists."""
+        if self.dryrun:
+            return False
+        result = self._capture(["rev-parse", "-q", "--verify", f"refs/tags/{tag_name}"])
+        return result.returncode == 0
+
+    def remote_tag_exists(self, tag_name: str) -> bool:
+        """Check if a remote tag already exists on origin."""
+        if self.dryrun:
+            return False
+        result = self._capture(["ls-remote", "--tags", "origin", tag_name])
+        return bool(result.stdout.strip())
+
+
+def run_sync_versions(dryrun: bool) -> None:
+    """Synchronize both version files to the maximum version."""
+    command: List[str] = [
+        sys.executable,
+        str(SYNC_SCRIPT),
+        "--source",
+        "max",
+    ]
+    if dryrun:
+        command.append("--dryrun")
+    print_info("Running version sync script")
+    print_info(" ".join(command))
+    if dryrun:
+        return
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        if result.stdout.strip():
+            print(result.stdout.strip())
+        if result.stderr.strip():
+            print_error(result.stderr.strip())
+        raise RuntimeError("Version synchronization failed.")
+    if result.stdout.strip():
+        print(result.stdout.strip())
+
+
+def undo_merge(session: GitSession, main_head: str) -> None:
+    """Reset main to `main_head` after a failed merge, sync or pre-flight check."""
+    recovery = f"git checkout {MAIN_BRANCH} && git reset --hard {main_head}"
+    print_warning(f"Resetting {MAIN_BRANCH} to {main_head[:12]}, its state before the merge")
+    try:
+        session.run(["reset", "--hard", main_head])
+    except RuntimeError:
+        print_error(f"Could not reset {MAIN_BRANCH}; recover with `{recovery}`.")
+        return
+    print_warning(f"{MAIN_BRANCH} is unchanged. Fix the problem on {DEV_BRANCH} and run the release again.")
+
+
+def read_versions_from_branch(session: GitSession, branch: str) -> Tuple[str, str]:
+    """Read version strings from assets/js/version.js and package.json on a branch."""
+    version_spec = f"{branch}:{VERSION_FILE.as_posix()}"
+    package_spec = f"{branch}:{PACKAGE_FILE.as_posix()}"
+    try:
+        blobs = session.read_blobs([version_spec, package_spec])
+    except RuntimeError as exc:
+        raise RuntimeError(f"Failed to read version files from branch '{branch}': {exc}") from exc
+
+    match = re.search(r'export\s+const\s+VERSION\s*=\s*"([^"]+)"', blobs[version_spec])
+    if not match:
+        raise ValueError("No version string found in version.js")
+    version_js = match.group(1)
+
+    try:
+        package_json = json.loads(blobs[package_spec])
+    except json.JSONDecodeError as exc:
+        raise ValueError(
+            f"JSON parsing error in {PACKAGE_FILE} from branch '{branch}' at line {exc.lineno}, column {exc.colno}"
+        ) from exc
+
+    package_version = package_json.get("version")
+    if not isinstance(package_version, str) or not package_version.strip():
+        raise ValueError(f"Missing or invalid 'version' field in {PACKAGE_FILE}")
+
+    return version_js, package_version
+
+
+def main(argv: Sequence[str]) -> None:
+    """Main release procedure."""
+    timer = StepTimer()
+    try:
+        args = parse_args(argv)
+        ensure_beelot_directory()
+        session = GitSession(dryrun=args.dryrun)
+        with timer.step("read versions"):
+            version_js, package_version = read_versions_from_branch(session, DEV_BRANCH)
+        version = max_version(version_js, package_version)
+    except Exception as exc:
+        print_error(f"Error preparing release: {exc}")
+        sys.exit(1)
+
+    tag_name = f"v{version}"
+
+    print_info(f"Releasing version {version}")
+
+    try:
+        with session:
+            # The remote tag query only talks to origin, so it runs in the
+            # background while dev and main are being updated.
+            remote_tag_future = session.submit(session.remote_tag_exists, tag_name)
+
+            with timer.step("check worktree"):
+                if not session.is_worktree_clean():
+                    raise RuntimeError(
+                        "Working tree not clean. Commit or stash changes first.\n"
+                        "Hint: run `git status --short` to inspect pending changes."
+                    )
+
+            with timer.step("update dev"):
+                print_info("Checking out dev branch")
+                session.run(["checkout", DEV_BRANCH])
+                session.run(["pull"])
+
+            with timer.step("update main"):
+                print_info("Checking out main branch")
+                session.run(["checkout", MAIN_BRANCH])
+                session.run(["pull"])
+
+            # The pulls may fetch tags, so the local tag query waits for them.
+            local_tag_future = session.submit(session.local_tag_exists, tag_name)
+
+            # The checks need the merged tree; if the merge or a check fails,
+            # main goes back to where the pull left it, so nothing half-done is
+            # committed or left behind.
+            main_head = session.rev_parse("HEAD")
+            try:
+                with timer.step("merge dev into main"):
+                    print_info("Merging dev into main")
+                    session.run(["merge", DEV_BRANCH])
+
+                with timer.step("sync versions"):
+                    run_sync_versions(args.dryrun)
+
+                with timer.step("pre-flight checks"):
+                    run_release_preflight("max", args.dryrun)
+            except Exception:
+                if not args.dryrun:
+                    undo_merge(session, main_head)
+                raise
+
+            with timer.step("commit version update"):
+                print_info("Committing version update if needed")
+                if not session.is_worktree_clean() and not args.dryrun:
+                    session.run(["add", str(VERSION_FILE), str(PACKAGE_FILE)])
+                    session.run(["commit", "-m", f"Release version {version}"])
+                else:
+                    print_warning("No version file changes to commit")
+
+            with timer.step("wait for tag queries"):
+                local_tag, local_seconds = local_tag_future.result()
+                remote_tag, remote_seconds = remote_tag_future.result()
+            timer.record("  local tag query (background)", local_seconds)
+            timer.record("  remote tag query (background)", remote_seconds)
+
+            tag_created = False
+            with timer.step("create tag"):
+                if local_tag:
+                    print_warning(f"Local tag {tag_name} already exists; skipping tag creation")
+                elif remote_tag:
+                    print_warning(f"Remote tag {tag_name} already exists; skipping local tag creation")
+                else:
+                    print_info(f"Creating tag {tag_name}")
+                    session.run(["tag", "-a", tag_name, "-m", f"Release {version}"])
+                    tag_created = True
+
+            with timer.step("push main"):
+                print_info("Pushing main branch")
+                session.run(["push"])
+
+                if tag_created:
+                    print_info(f"Pushing tag {tag_name}")
+                    session.run(["push", "origin", tag_name])
+                else:
+                    print_warning("Skipping tag push; tag already existed")
+
+            with timer.step("merge main into dev"):
+                print_info("Merging main back into dev")
+                session.run(["checkout", DEV_BRANCH])
+                session.run(["merge", MAIN_BRANCH])
+                session.run(["push"])
+
+    except Exception as exc:
+        print_error(f"Release failed: {exc}")
+        timer.report()
+        sys.exit(1)
+
+    timer.report()
+    print_success("Release completed successfully")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
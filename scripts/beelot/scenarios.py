@@ -0,0 +1,310 @@
+"""Climate what-if scenarios: how far do bloom dates shift?
+
+A batch of temperature perturbations is applied to one base series (a year of
+daily mean temperatures at one location):
+
+* `offset`: constant offset in °C, optionally limited to some `months`,
+* `deltas`: offset per month, e.g. `{"3": 1.0, "4": 1.5}`,
+* `substitute`: temperatures of another year on the same calendar days,
+  optionally limited to some `months` (29 February of a common year is taken
+  from 28 February).
+
+All scenario series form one (scenarios, days) array; their GTS curves are a
+single cumulative sum along the days (`ensemble.member_gts`), and the first
+crossing of every `TS_start` of `defaultTrachtData` is found for all scenarios
+at once (`ensemble.crossing_indices`). The report lists the crossing date per
+plant and its shift in days against the unperturbed base.
+
+Scenario file format:
+
+    [
+      {"name": "+1 °C spring", "offset": 1.0, "months": [3, 4, 5]},
+      {"name": "warm March", "deltas": {"3": 2.0}},
+      {"name": "spring of 2018", "substitute": 2018, "months": [3, 4, 5]}
+    ]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import calendar_index
+from .calendar_index import FEB_29_SLOT, SLOTS, day_numbers_from_iso
+from .ensemble import Threshold, crossing_indices, member_gts, thresholds_from_tracht
+from .gts import parse_js_arrays
+from .heatsum import to_fixed
+from .openmeteo import ARCHIVE_URL, fetch_daily, parse_location
+from .tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One temperature perturbation.
+
+    Parameters
+    ----------
+    name:
+        Label in the report.
+    offset:
+        Constant offset in °C.
+    deltas:
+        Additional offset per month (1-12).
+    substitute:
+        Year whose temperatures replace the base temperatures.
+    months:
+        Months that `offset` and `substitute` apply to; all months if empty.
+    """
+
+    name: str
+    offset: float = 0.0
+    deltas: Mapping[int, float] = field(default_factory=dict)
+    substitute: Optional[int] = None
+    months: FrozenSet[int] = frozenset()
+
+    def month_mask(self) -> np.ndarray:
+        """Bool per month number (index 0 unused)."""
+        mask = np.zeros(13, dtype=bool)
+        mask[sorted(self.months) if self.months else slice(1, 13)] = True
+        return mask
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    name: str
+    final_gts: float
+    dates: List[Optional[str]]
+    shifts: List[Optional[int]]
+
+
+def parse_scenarios(data: Any) -> List[Scenario]:
+    """Scenarios from the decoded JSON of a scenario file."""
+    if not isinstance(data, list):
+        raise ValueError("The scenario file must contain a JSON array.")
+    scenarios: List[Scenario] = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            raise ValueError(f"Scenario {index}: expected an object.")
+        unknown = set(item) - {"name", "offset", "deltas", "substitute", "months"}
+        if unknown:
+            raise ValueError(f"Scenario {index}: unknown keys {sorted(unknown)}")
+        months = frozenset(int(month) for month in item.get("months", []))
+        deltas = {int(month): float(delta) for month, delta in item.get("deltas", {}).items()}
+        if not all(1 <= month <= 12 for month in months | set(deltas)):
+            raise ValueError(f"Scenario {index}: months must be 1-12.")
+        substitute = item.get("substitute")
+        scenarios.append(
+            Scenario(
+                name=str(item.get("name", f"scenario-{index}")),
+                offset=float(item.get("offset", 0.0)),
+                deltas=deltas,
+                substitute=int(substitute) if substitute is not None else None,
+                months=months,
+            )
+        )
+    return scenarios
+
+
+def calendar_slots(dates: Sequence[str]) -> np.ndarray:
+    """Calendar slot (see `beelot.calendar_index`) of every ISO date."""
+    return calendar_index.slots(day_numbers_from_iso(dates))
+
+
+def by_calendar_slot(dates: Sequence[str], values: Sequence[float]) -> np.ndarray:
+    """Temperatures of a whole year indexed by calendar slot; 29 February falls back to 28 February."""
+    table = np.full(SLOTS, np.nan, dtype=np.float64)
+    table[calendar_slots(dates)] = np.asarray(values, dtype=np.float64)
+    if np.isnan(table[FEB_29_SLOT]):
+        table[FEB_29_SLOT] = table[FEB_29_SLOT - 1]
+    return table
+
+
+def scenario_matrix(
+    dates: Sequence[str],
+    base: Sequence[float],
+    scenarios: Sequence[Scenario],
+    substitutes: Mapping[int, np.ndarray],
+) -> np.ndarray:
+    """Perturbed temperatures of shape (scenarios, days).
+
+    `substitutes` maps a year to its temperatures by calendar slot (see
+    `by_calendar_slot`).
+    """
+    if not scenarios:
+        return np.empty((0, len(dates)), dtype=np.float64)
+    days = day_numbers_from_iso(dates)
+    months = calendar_index.months(days)
+    temps = np.tile(np.asarray(base, dtype=np.float64), (len(scenarios), 1))
+    applies = np.stack([scenario.month_mask() for scenario in scenarios])[:, months]
+
+    slots = calendar_index.slots(days)
+    for row, scenario in enumerate(scenarios):
+        if scenario.substitute is None:
+            continue
+        if scenario.substitute not in substitutes:
+            raise ValueError(f"{scenario.name}: no data for substitute year {scenario.substitute}.")
+        replacement = substitutes[scenario.substitute][slots]
+        if np.isnan(replacement[applies[row]]).any():
+            raise ValueError(f"{scenario.name}: substitute year {scenario.substitute} has gaps.")
+        temps[row] = np.where(applies[row], replacement, temps[row])
+
+    offsets = np.array([scenario.offset for scenario in scenarios], dtype=np.float64)
+    deltas = np.zeros((len(scenarios), 13), dtype=np.float64)
+    for row, scenario in enumerate(scenarios):
+        for month, delta in scenario.deltas.items():
+            deltas[row, month] = delta
+    temps += offsets[:, None] * applies + deltas[:, months]
+    return temps
+
+
+def run_scenarios(
+    dates: Sequence[str],
+    base: Sequence[float],
+    scenarios: Sequence[Scenario],
+    thresholds: Sequence[Threshold],
+    substitutes: Optional[Mapping[int, np.ndarray]] = None,
+) -> List[ScenarioResult]:
+    """Crossing dates of the base series and of every scenario, with shifts in days.
+
+    Returns one result for the unperturbed base (named "base") followed by one
+    per scenario. A shift is `None` if the base or the scenario does not reach
+    the threshold within the series.
+    """
+    if len(dates) != len(base):
+        raise ValueError("The dates and values arrays must have the same length.")
+    if not dates:
+        raise ValueError("The base series is empty.")
+    if np.isnan(np.asarray(base, dtype=np.float64)).any():
+        raise ValueError("The base series has gaps.")
+
+    temps = np.vstack([np.asarray(base, dtype=np.float64), scenario_matrix(dates, base, scenarios, substitutes or {})])
+    # One "location" whose "members" are the base and the scenarios.
+    cumulative = member_gts(dates, temps[None], np.zeros(1))
+    levels = np.array([threshold.gts for threshold in thresholds], dtype=np.float64)
+    crossings = crossing_indices(cumulative, levels)[0]
+    days = len(dates)
+
+    def to_date(index: int) -> Optional[str]:
+        return dates[index] if index < days else None
+
+    reached = crossings < days
+    comparable = reached & reached[0]
+    shifts = crossings.astype(np.int64) - crossings[0]
+
+    results: List[ScenarioResult] = []
+    for row, name in enumerate(["base", *(scenario.name for scenario in scenarios)]):
+        results.append(
+            ScenarioResult(
+                name=name,
+                final_gts=to_fixed(float(cumulative[0, row, -1])),
+                dates=[to_date(int(index)) for index in crossings[row]],
+                shifts=[
+                    int(shift) if ok else None for shift, ok in zip(shifts[row].tolist(), comparable[row].tolist())
+                ],
+            )
+        )
+    return results
+
+
+def fetch_year(archive_url: str, lat: float, lon: float, year: int) -> Tuple[List[str], List[float]]:
+    """Daily archive temperatures of a complete past year."""
+    dates, values = fetch_daily(archive_url, lat, lon, date(year, 1, 1), date(year, 12, 31))
+    if any(value is None for value in values):
+        raise ValueError(f"Archive data of {year} has gaps.")
+    return dates, [float(value) for value in values]  # type: ignore[arg-type]
+
+
+def _parse_floats(text: str) -> List[float]:
+    try:
+        return [float(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid list of numbers: '{text}'") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Shift of bloom dates under temperature what-if scenarios.",
+        epilog=(
+            "Examples:\n"
+            "  beelot scenarios -l 48.14,11.58 --year 2024 --offsets -2,-1,1,2 --months 3,4,5 -o shifts.json\n"
+            "  beelot scenarios -l 48.14,11.58 --year 2024 -s scenarios.json -o shifts.json\n"
+            "  beelot scenarios -i input.js --offsets 0.5,1 -o shifts.json"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-i", "--input", default=None, help="Base series as JS arrays (like `beelot gts`).")
+    parser.add_argument("-l", "--location", type=parse_location, default=None, help="Location as lat,lon.")
+    parser.add_argument("--year", type=int, default=None, help="Past year of the base series (with --location).")
+    parser.add_argument("-s", "--scenarios", default=None, help="Scenario file (JSON).")
+    parser.add_argument("--offsets", type=_parse_floats, default=[], help="Comma-separated constant offsets in °C.")
+    parser.add_argument("--months", default="", help="Months the --offsets apply to, e.g. 3,4,5 (default: all).")
+    parser.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+    parser.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+    parser.add_argument("-o", "--output", required=True, help="Path to output JSON file.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    output_path = Path(args.output)
+
+    try:
+        scenarios: List[Scenario] = []
+        if args.scenarios:
+            scenarios.extend(parse_scenarios(json.loads(Path(args.scenarios).read_text(encoding="utf-8"))))
+        months = frozenset(int(month) for month in args.months.split(",") if month.strip())
+        for offset in args.offsets:
+            scenarios.append(Scenario(f"{offset:+g} °C", offset=offset, months=months))
+        if not scenarios:
+            raise ValueError("No scenarios given; use --scenarios and/or --offsets.")
+
+        if args.input:
+            dates, values = parse_js_arrays(Path(args.input))
+        elif args.location and args.year:
+            dates, values = fetch_year(args.archive_url, args.location[0], args.location[1], args.year)
+        else:
+            raise ValueError("Give the base series with --input or with --location and --year.")
+
+        substitutes: Dict[int, np.ndarray] = {}
+        for year in sorted({item.substitute for item in scenarios if item.substitute is not None}):
+            if args.location is None:
+                raise ValueError("Substitute years need --location.")
+            lat, lon = args.location
+            substitutes[year] = by_calendar_slot(*fetch_year(args.archive_url, lat, lon, year))
+
+        thresholds = thresholds_from_tracht(parse_tracht_data(Path(args.tracht)))
+        base, *results = run_scenarios(dates, values, scenarios, thresholds, substitutes)
+        payload = {
+            "base": {"start": dates[0], "end": dates[-1], "final_gts": base.final_gts},
+            "plants": [
+                {"plant": threshold.plant, "ts_start": threshold.gts, "base_date": base_date}
+                for threshold, base_date in zip(thresholds, base.dates)
+            ],
+            "scenarios": [asdict(result) for result in results],
+        }
+        output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    for result in results:
+        known = [shift for shift in result.shifts if shift is not None]
+        mean = f"{sum(known) / len(known):+.1f} days" if known else "n/a"
+        print(f"{result.name}: mean shift {mean} over {len(known)} plants")
+    print(f"Evaluated {len(results)} scenarios for {len(thresholds)} plants. Results saved to {output_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
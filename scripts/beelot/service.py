@@ -0,0 +1,468 @@
+"""Local GTS HTTP service with a shared cache.
+
+Serves
+
+    GET /gts?lat=48.14&lon=11.58&year=2024&start=2024-03-01&end=2024-05-10
+
+with the `{year, labels, gtsValues}` object of `fetchGTSForYear` in logic.js,
+so that several workstations on a LAN share one warm cache instead of each
+hitting Open-Meteo. `start` and `end` are the display window (only month and
+day are used, like `baseStartDate`/`baseEndDate`); they default to 1 January
+and today.
+
+Upstream data is cached in an in-memory LRU under the keys of
+`computeCacheKey` in dataService.js (`historical_48.14_11.58_2024`, ...).
+Full past years never change; they are also kept in an optional directory
+cache store (`--cache-dir`) behind the LRU and survive restarts. Ranges of the
+current year expire after `--recent-ttl` seconds. Concurrent requests for the
+same key are merged into one upstream fetch.
+
+`GET /stats` returns cache counters and `GET /health` a liveness check.
+
+Usage:
+
+    beelot serve --host 0.0.0.0 --port 8080 --cache-dir /var/cache/beelot
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .gts import calculate_gts
+from .openmeteo import ARCHIVE_URL, DAILY_VARIABLE, FORECAST_URL, OpenMeteoError, fetch_daily, round_coordinate
+
+DEFAULT_PORT: Final[int] = 8080
+DEFAULT_LRU_ENTRIES: Final[int] = 2048
+DEFAULT_RECENT_TTL_SECONDS: Final[float] = 3600.0
+DEFAULT_UPSTREAM_WORKERS: Final[int] = 8
+REQUEST_TIMEOUT_SECONDS: Final[float] = 30.0
+
+_REASONS: Final[Dict[int, str]] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    502: "Bad Gateway",
+}
+
+
+def _js_number(value: float) -> str:
+    """`String(value)` of JavaScript for a rounded coordinate (48.0 -> "48")."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def compute_cache_key(kind: str, lat: float, lon: float, year_or_range: str) -> str:
+    """Cache key of `computeCacheKey` in dataService.js."""
+    return f"{kind}_{_js_number(round_coordinate(lat))}_{_js_number(round_coordinate(lon))}_{year_or_range}"
+
+
+def _js_date(year: int, month: int, day: int) -> date:
+    """`new Date(year, month - 1, day)`; an invalid day rolls over (29 February -> 1 March)."""
+    return date(year, month, 1) + timedelta(days=day - 1)
+
+
+class LRUCache:
+    """Least-recently-used cache; entries may carry an expiry time."""
+
+    def __init__(self, max_entries: int = DEFAULT_LRU_ENTRIES) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_s: Optional[float] = None) -> None:
+        expires = time.monotonic() + ttl_s if ttl_s is not None else None
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class DirectoryCacheStore:
+    """Cache store with `get`/`set` like the `cacheStore` of dataService.js, one JSON file per key."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._file(key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        path = self._file(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    lru_hits: int = 0
+    store_hits: int = 0
+    coalesced: int = 0
+    upstream_fetches: int = 0
+    upstream_errors: int = 0
+
+
+class GTSService:
+    """Computes `fetchGTSForYear` results from cached or freshly fetched daily data.
+
+    All coroutines must run on one event loop; upstream requests run in a
+    thread pool.
+    """
+
+    def __init__(
+        self,
+        archive_url: str = ARCHIVE_URL,
+        forecast_url: str = FORECAST_URL,
+        lru_entries: int = DEFAULT_LRU_ENTRIES,
+        store: Optional[DirectoryCacheStore] = None,
+        recent_ttl_s: float = DEFAULT_RECENT_TTL_SECONDS,
+        upstream_workers: int = DEFAULT_UPSTREAM_WORKERS,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self.archive_url = archive_url
+        self.forecast_url = forecast_url
+        self.lru = LRUCache(lru_entries)
+        self.store = store
+        self.recent_ttl_s = recent_ttl_s
+        self.today = today
+        self.stats = ServiceStats()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, upstream_workers))
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self._sessions = threading.local()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _fetch(self, base_url: str, lat: float, lon: float, start: date, end: date) -> Dict[str, Any]:
+        # One requests session per worker thread keeps connections to Open-Meteo alive.
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            import requests
+
+            session = self._sessions.session = requests.Session()
+        dates, values = fetch_daily(base_url, lat, lon, start, end, session=session)
+        return {"daily": {"time": dates, DAILY_VARIABLE: values}}
+
+    async def _fill(self, key: str, persistent: bool, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        try:
+            self.stats.upstream_fetches += 1
+            try:
+                data = await loop.run_in_executor(self._executor, fetch)
+            except Exception:
+                self.stats.upstream_errors += 1
+                raise
+            if persistent and self.store is not None:
+                await loop.run_in_executor(self._executor, self.store.set, key, data)
+            self.lru.set(key, data, None if persistent else self.recent_ttl_s)
+            return data
+        finally:
+            del self._inflight[key]
+
+    async def cached(self, key: str, persistent: bool, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Data for `key` from the LRU, the store, a running fetch or a new upstream fetch."""
+        data = self.lru.get(key)
+        if data is not None:
+            self.stats.lru_hits += 1
+            return data
+        pending = self._inflight.get(key)
+        if pending is None and persistent and self.store is not None:
+            data = await asyncio.get_running_loop().run_in_executor(self._executor, self.store.get, key)
+            if data is not None:
+                self.stats.store_hits += 1
+                self.lru.set(key, data)
+                return data
+            pending = self._inflight.get(key)  # may have started while reading the store
+        if pending is not None:
+            self.stats.coalesced += 1
+        else:
+            pending = asyncio.ensure_future(self._fill(key, persistent, fetch))
+            self._inflight[key] = pending
+        # Shielded, so that a client that disconnects does not cancel the fetch for the others.
+        return await asyncio.shield(pending)
+
+    async def historical_data(self, lat: float, lon: float, start: date, end: date) -> Dict[str, Any]:
+        """`fetchHistoricalData`: full-year caching for past years, range caching with forecast fallback otherwise."""
+        today = self.today()
+        if start.year < today.year:
+            if start.year != end.year:
+                raise ValueError("Cross-year historical requests are not supported. Use one year at a time.")
+            year_start, year_end = date(start.year, 1, 1), date(start.year, 12, 31)
+            key = compute_cache_key("historical", lat, lon, str(start.year))
+            data = await self.cached(key, True, lambda: self._fetch(self.archive_url, lat, lon, year_start, year_end))
+            return _extract_range(data, start, end)
+
+        span = f"{start.isoformat()}_{end.isoformat()}"
+        key = compute_cache_key("historical", lat, lon, span)
+        try:
+            return await self.cached(key, False, lambda: self._fetch(self.archive_url, lat, lon, start, end))
+        except OpenMeteoError:
+            if end < today:
+                raise
+            key = compute_cache_key("recent", lat, lon, span)
+            return await self.cached(key, False, lambda: self._fetch(self.forecast_url, lat, lon, start, end))
+
+    async def gts_for_year(self, lat: float, lon: float, year: int, base_start: date, base_end: date) -> Dict[str, Any]:
+        """`fetchGTSForYear` of logic.js."""
+        year_end = _js_date(year, base_end.month, base_end.day) + timedelta(days=1)
+        if year_end.year != year:
+            year_end = date(year, 12, 31)
+        data = await self.historical_data(lat, lon, date(year, 1, 1), year_end)
+        dates = data["daily"]["time"]
+        values = [0.0 if value is None else value for value in data["daily"][DAILY_VARIABLE]]
+        results = calculate_gts(dates, values)
+
+        plot_start = _js_date(year, base_start.month, base_start.day).isoformat()
+        plot_end = _js_date(year, base_end.month, base_end.day).isoformat()
+        shown = [item for item in results if plot_start <= str(item["date"]) <= plot_end]
+        labels = []
+        for item in shown:
+            day = date.fromisoformat(str(item["date"]))
+            labels.append(f"{day.day}.{day.month}")
+        return {"year": year, "labels": labels, "gtsValues": [item["gts"] for item in shown]}
+
+    async def handle(self, method: str, target: str) -> Tuple[int, Any]:
+        """Status and JSON payload for one HTTP request."""
+        self.stats.requests += 1
+        if method != "GET":
+            return 405, {"error": f"Method {method} is not allowed."}
+        parts = urlsplit(target)
+        if parts.path == "/health":
+            return 200, {"ok": True}
+        if parts.path == "/stats":
+            return 200, {**asdict(self.stats), "lru_entries": len(self.lru), "inflight": len(self._inflight)}
+        if parts.path != "/gts":
+            return 404, {"error": f"Unknown path {parts.path}"}
+
+        try:
+            lat, lon, year, base_start, base_end = self._parse_query(parts.query)
+        except (KeyError, ValueError) as exc:
+            return 400, {"error": f"Invalid parameters: {exc}"}
+        try:
+            return 200, await self.gts_for_year(lat, lon, year, base_start, base_end)
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        except OpenMeteoError as exc:
+            return 502, {"error": str(exc)}
+
+    def _parse_query(self, query: str) -> Tuple[float, float, int, date, date]:
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        lat = float(params["lat"])
+        lon = float(params["lon"])
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+            raise ValueError("lat/lon out of range")
+        base_end = date.fromisoformat(params["end"]) if "end" in params else self.today()
+        base_start = date.fromisoformat(params["start"]) if "start" in params else date(base_end.year, 1, 1)
+        year = int(params.get("year", base_end.year))
+        if not 1940 <= year <= self.today().year:
+            raise ValueError(f"year {year} out of range")
+        return lat, lon, year, base_start, base_end
+
+
+def _extract_range(data: Dict[str, Any], start: date, end: date) -> Dict[str, Any]:
+    """`extractDateRangeFromYearData` of dataService.js."""
+    start_str, end_str = start.isoformat(), end.isoformat()
+    daily = data["daily"]
+    indices = [index for index, item in enumerate(daily["time"]) if start_str <= item <= end_str]
+    return {
+        "daily": {
+            "time": [daily["time"][index] for index in indices],
+            DAILY_VARIABLE: [daily[DAILY_VARIABLE][index] for index in indices],
+        }
+    }
+
+
+async def _handle_connection(service: GTSService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_SECONDS)
+        while True:
+            header = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT_SECONDS)
+            if header in (b"\r\n", b"\n", b""):
+                break
+        fields = request_line.decode("latin-1").split()
+        if len(fields) != 3:
+            status, payload = 400, {"error": "Malformed request line."}
+        else:
+            status, payload = await service.handle(fields[0], fields[1])
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(
+    service: GTSService,
+    host: str,
+    port: int,
+    ready: Optional[Callable[[str], None]] = None,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """Serve until `stop` is set (or forever)."""
+    server = await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    if ready is not None:
+        ready(f"http://{bound_host}:{bound_port}")
+    stop = stop or asyncio.Event()
+    async with server:
+        await stop.wait()
+
+
+class GTSServiceThread:
+    """Context manager running a `GTSService` on a free local port in a background thread."""
+
+    def __init__(self, service: GTSService, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.service = service
+        self.url = ""
+        self._host = host
+        self._port = port
+        self._ready = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        async def main() -> None:
+            self._loop = asyncio.get_running_loop()
+            self._stop = asyncio.Event()
+            await serve(self.service, self._host, self._port, self._set_url, self._stop)
+
+        asyncio.run(main())
+
+    def _set_url(self, url: str) -> None:
+        self.url = url
+        self._ready.set()
+
+    def __enter__(self) -> "GTSServiceThread":
+        self._thread.start()
+        if not self._ready.wait(10.0):
+            raise RuntimeError("GTS service did not start.")
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        assert self._loop is not None and self._stop is not None
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self.service.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Serve fetchGTSForYear results over HTTP with a shared LRU and request coalescing.",
+        epilog=(
+            "Examples:\n"
+            "  beelot serve\n"
+            "  beelot serve --host 0.0.0.0 --port 8080 --cache-dir /var/cache/beelot\n"
+            "  curl 'http://127.0.0.1:8080/gts?lat=48.14&lon=11.58&year=2024&start=2024-03-01&end=2024-05-10'"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT}).")
+    parser.add_argument("--cache-dir", default=None, help="Directory cache store for full past years.")
+    parser.add_argument(
+        "--lru-entries",
+        type=int,
+        default=DEFAULT_LRU_ENTRIES,
+        help=f"Entries of the in-memory LRU (default: {DEFAULT_LRU_ENTRIES}).",
+    )
+    parser.add_argument(
+        "--recent-ttl",
+        type=float,
+        default=DEFAULT_RECENT_TTL_SECONDS,
+        help=f"Seconds current-year data stays cached (default: {DEFAULT_RECENT_TTL_SECONDS:g}).",
+    )
+    parser.add_argument(
+        "--upstream-workers",
+        type=int,
+        default=DEFAULT_UPSTREAM_WORKERS,
+        help=f"Concurrent Open-Meteo requests (default: {DEFAULT_UPSTREAM_WORKERS}).",
+    )
+    parser.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+    parser.add_argument("--forecast-url", default=FORECAST_URL, help="Forecast endpoint (default: %(default)s).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+
+    async def run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        service = GTSService(
+            archive_url=args.archive_url,
+            forecast_url=args.forecast_url,
+            lru_entries=args.lru_entries,
+            store=DirectoryCacheStore(Path(args.cache_dir)) if args.cache_dir else None,
+            recent_ttl_s=args.recent_ttl,
+            upstream_workers=args.upstream_workers,
+        )
+        try:
+            await serve(service, args.host, args.port, lambda url: print(f"GTS service listening on {url}."), stop)
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(run())
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,191 @@
+"""Local stand-in for the Open-Meteo endpoints used by beelot.
+
+Serves deterministic synthetic daily mean temperatures in the response format
+of the archive (`/v1/era5`), forecast (`/v1/forecast`) and ensemble
+(`/v1/ensemble`) APIs. Values depend only on coordinates, date and member, so
+repeated runs see the same data. Like ERA5, the archive endpoint returns
+`null` for the most recent days.
+
+Used by tests and offline development, e.g.
+
+    beelot standin --port 8765
+    beelot ensemble -l 48.14,11.58 -o bloom.json \
+        --members-url http://127.0.0.1:8765/v1/ensemble \
+        --forecast-url http://127.0.0.1:8765/v1/forecast
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Final, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from .openmeteo import DAILY_VARIABLE
+
+ARCHIVE_DELAY_DAYS: Final[int] = 5
+DEFAULT_MEMBERS: Final[int] = 40
+
+
+def synthetic_temperature(lat: float, lon: float, day: date, member: int = 0, lead: int = 0) -> float:
+    """Deterministic daily mean temperature for a location, day and ensemble member.
+
+    Members spread around the control run (member 0), more so for larger
+    forecast lead times (days since the start of the request).
+    """
+    doy = day.timetuple().tm_yday
+    seasonal = 9.0 - 10.0 * math.cos(2 * math.pi * (doy - 15) / 365.25) - 0.5 * (lat - 50.0)
+    rng = random.Random(f"{lat:.2f}:{lon:.2f}:{day.toordinal()}")
+    value = seasonal + rng.gauss(0.0, 3.0)
+    if member:
+        value += random.Random(f"{lat:.2f}:{lon:.2f}:{day.toordinal()}:{member}").gauss(0.0, 0.4 + 0.25 * lead)
+    return round(value, 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StandInHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        with self.server.counter_lock:
+            self.server.request_count += 1
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        kind = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        if kind not in ("era5", "forecast", "ensemble"):
+            self._send(404, {"error": True, "reason": f"Unknown endpoint {parts.path}"})
+            return
+        try:
+            lat = float(query["latitude"])
+            lon = float(query["longitude"])
+            start = date.fromisoformat(query["start_date"])
+            end = date.fromisoformat(query["end_date"])
+        except (KeyError, ValueError) as exc:
+            self._send(400, {"error": True, "reason": f"Invalid parameters: {exc}"})
+            return
+        if end < start:
+            self._send(400, {"error": True, "reason": "end_date is before start_date"})
+            return
+
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        daily: Dict[str, List[Optional[float]]] = {"time": [day.isoformat() for day in days]}  # type: ignore[dict-item]
+        archive_limit = date.today() - timedelta(days=ARCHIVE_DELAY_DAYS)
+        daily[DAILY_VARIABLE] = [
+            None if kind == "era5" and day > archive_limit else synthetic_temperature(lat, lon, day)
+            for day in days
+        ]
+        if kind == "ensemble":
+            for member in range(1, self.server.members):
+                daily[f"{DAILY_VARIABLE}_member{member:02d}"] = [
+                    synthetic_temperature(lat, lon, day, member, (day - start).days) for day in days
+                ]
+        self._send(
+            200,
+            {
+                "latitude": lat,
+                "longitude": lon,
+                "timezone": query.get("timezone", "GMT"),
+                "daily_units": {"time": "iso8601", DAILY_VARIABLE: "°C"},
+                "daily": daily,
+            },
+        )
+
+    def _send(self, status: int, payload: object) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, members: int = DEFAULT_MEMBERS, verbose: bool = False) -> None:
+        super().__init__(address, _Handler)
+        self.members = members
+        self.verbose = verbose
+        self.request_count = 0
+        self.counter_lock = threading.Lock()
+
+
+class OpenMeteoStandIn:
+    """Context manager running the stand-in on a free local port in a thread.
+
+    The archive, forecast and ensemble URLs are available as attributes.
+    """
+
+    def __init__(self, members: int = DEFAULT_MEMBERS, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = StandInHTTPServer((host, port), members=members)
+        bound_host, bound_port = self._server.server_address[:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        self.archive_url = f"{self.base_url}/v1/era5"
+        self.forecast_url = f"{self.base_url}/v1/forecast"
+        self.ensemble_url = f"{self.base_url}/v1/ensemble"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def request_count(self) -> int:
+        return self._server.request_count
+
+    def __enter__(self) -> "OpenMeteoStandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Serve synthetic Open-Meteo archive, forecast and ensemble responses locally.",
+        epilog=(
+            "Examples:\n"
+            "  beelot standin\n"
+            "  beelot standin --port 8765 --members 51 --verbose"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765).")
+    parser.add_argument(
+        "--members",
+        type=int,
+        default=DEFAULT_MEMBERS,
+        help=f"Ensemble members including the control run (default: {DEFAULT_MEMBERS}).",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    server = StandInHTTPServer((args.host, args.port), members=args.members, verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Open-Meteo stand-in listening on http://{host}:{port} (Ctrl+C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,234 @@
+"""Merge archive, recent and forecast daily series into one series with provenance.
+
+Python counterpart of `fetchAllDataForRange` in main.js. Every source is a
+daily series tagged with its provenance; sources are merged by priority
+
+    ERA5 > recent > forecast
+
+on a dense axis of day numbers (days since 1970-01-01) covering all sources,
+so the merge is a single linear pass per source without per-date lookups.
+Unlike the browser, a `null` value of a higher-priority source does not hide
+a value of a lower-priority source: ERA5 reports `null` for the last few days,
+and those days are filled from the recent window instead.
+
+The merged series keeps its values as a NumPy array and can be handed to the
+heat-sum engine directly (`StitchedSeries.heat_sums`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_index import day_numbers_from_iso, iso_from_day_numbers
+from .heatsum import GTS, HeatSumMetric, accumulate, months_from_day_numbers, to_fixed_array
+from .openmeteo import ARCHIVE_URL, FORECAST_URL, OpenMeteoError, fetch_daily, parse_location
+
+# Provenance codes; a lower non-zero code has priority.
+MISSING: Final[int] = 0
+ERA5: Final[int] = 1
+RECENT: Final[int] = 2
+FORECAST: Final[int] = 3
+PROVENANCE_NAMES: Final[Tuple[str, ...]] = ("missing", "era5", "recent", "forecast")
+
+
+@dataclass(frozen=True)
+class DailySource:
+    """Daily mean temperatures from one source; `None` marks a missing value."""
+
+    provenance: int
+    dates: Sequence[str]
+    values: Sequence[Optional[float]]
+
+
+@dataclass(frozen=True)
+class StitchedSeries:
+    """Merged daily series.
+
+    Parameters
+    ----------
+    first_day:
+        Day number (days since 1970-01-01) of the first entry.
+    values:
+        Daily mean temperature per day; NaN where no source has a value.
+    provenance:
+        Provenance code per day (`MISSING`, `ERA5`, `RECENT` or `FORECAST`).
+    """
+
+    first_day: int
+    values: np.ndarray
+    provenance: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    @property
+    def day_numbers(self) -> np.ndarray:
+        return self.first_day + np.arange(len(self), dtype=np.int64)
+
+    def dates(self) -> List[str]:
+        return iso_from_day_numbers(self.day_numbers)
+
+    def months(self) -> np.ndarray:
+        return months_from_day_numbers(self.day_numbers)
+
+    def missing_days(self) -> int:
+        return int(np.count_nonzero(self.provenance == MISSING))
+
+    def heat_sums(self, metrics: Sequence[HeatSumMetric]) -> np.ndarray:
+        """Cumulative heat sums, one row per metric; missing days contribute 0 like `Math.max(0, null)`."""
+        return accumulate(self.months(), np.nan_to_num(self.values, nan=0.0), metrics)
+
+    def gts(self) -> np.ndarray:
+        return self.heat_sums([GTS])[0]
+
+
+def stitch(sources: Sequence[DailySource]) -> StitchedSeries:
+    """Merge `sources` by provenance priority into one contiguous daily series.
+
+    Raises
+    ------
+    ValueError
+        If no source has any dates, a provenance code is unknown or dates and
+        values differ in length.
+    """
+    spans: List[Tuple[int, np.ndarray, np.ndarray]] = []
+    for source in sources:
+        if not ERA5 <= source.provenance <= FORECAST:
+            raise ValueError(f"Unknown provenance code: {source.provenance}")
+        if len(source.dates) != len(source.values):
+            raise ValueError(f"{PROVENANCE_NAMES[source.provenance]}: dates and values differ in length.")
+        if len(source.dates):
+            spans.append(
+                (source.provenance, day_numbers_from_iso(source.dates), np.array(source.values, dtype=np.float64))
+            )
+    if not spans:
+        raise ValueError("No data to stitch.")
+
+    first_day = int(min(days.min() for _, days, _ in spans))
+    last_day = int(max(days.max() for _, days, _ in spans))
+    values = np.full(last_day - first_day + 1, np.nan, dtype=np.float64)
+    provenance = np.zeros(values.shape, dtype=np.uint8)
+
+    # Lowest priority first, so that higher priorities overwrite.
+    for code, days, temps in sorted(spans, key=lambda span: span[0], reverse=True):
+        present = ~np.isnan(temps)
+        offsets = days[present] - first_day
+        values[offsets] = temps[present]
+        provenance[offsets] = code
+
+    return StitchedSeries(first_day, values, provenance)
+
+
+def _split_at(dates: List[str], values: List[Optional[float]], day: date) -> Tuple[DailySource, DailySource]:
+    cut = next((index for index, item in enumerate(dates) if item >= day.isoformat()), len(dates))
+    return (
+        DailySource(RECENT, dates[:cut], values[:cut]),
+        DailySource(FORECAST, dates[cut:], values[cut:]),
+    )
+
+
+def fetch_stitched(
+    lat: float,
+    lon: float,
+    start: date,
+    end: date,
+    today: Optional[date] = None,
+    archive_url: str = ARCHIVE_URL,
+    forecast_url: str = FORECAST_URL,
+    session: Any = None,
+) -> StitchedSeries:
+    """Fetch and merge archive, recent and forecast data like `fetchAllDataForRange`.
+
+    ERA5 is requested up to yesterday; the days after its last value are
+    requested from the forecast endpoint and split into recent (before
+    `today`) and forecast (from `today` on). If the archive request fails and
+    the range reaches today, the forecast endpoint covers the whole range.
+    """
+    today = today or date.today()
+    if end < start:
+        raise ValueError("End date is before start date.")
+
+    sources: List[DailySource] = []
+    fill_from = start
+    if start < today:
+        try:
+            dates, values = fetch_daily(archive_url, lat, lon, start, min(end, today - timedelta(days=1)), session=session)
+        except OpenMeteoError:
+            if end < today:
+                raise
+        else:
+            sources.append(DailySource(ERA5, dates, values))
+            available = [item for item, value in zip(dates, values) if value is not None]
+            if available:
+                fill_from = date.fromisoformat(available[-1]) + timedelta(days=1)
+
+    if fill_from <= end:
+        dates, values = fetch_daily(forecast_url, lat, lon, fill_from, end, session=session)
+        sources.extend(_split_at(dates, values, today))
+
+    return stitch(sources)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Fetch archive, recent and forecast temperatures, merge them and compute GTS.",
+        epilog=(
+            "Examples:\n"
+            "  beelot stitch -l 48.14,11.58 --start 2026-01-01 --end 2026-05-10 -o series.json\n"
+            "  beelot stitch -l 48.14,11.58 --start 2026-01-01 --end 2026-05-10 -o series.json \\\n"
+            "      --archive-url http://127.0.0.1:8765/v1/era5 --forecast-url http://127.0.0.1:8765/v1/forecast"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-l", "--location", type=parse_location, required=True, help="Location as lat,lon.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Last day (YYYY-MM-DD).")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="Override today's date (YYYY-MM-DD).")
+    parser.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+    parser.add_argument("--forecast-url", default=FORECAST_URL, help="Forecast endpoint (default: %(default)s).")
+    parser.add_argument("-o", "--output", required=True, help="Path to output JSON file.")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    output_path = Path(args.output)
+    lat, lon = args.location
+
+    try:
+        series = fetch_stitched(
+            lat, lon, args.start, args.end, args.today, archive_url=args.archive_url, forecast_url=args.forecast_url
+        )
+        payload = {
+            "lat": lat,
+            "lon": lon,
+            "dates": series.dates(),
+            "values": [None if np.isnan(value) else value for value in series.values.tolist()],
+            "provenance": [PROVENANCE_NAMES[code] for code in series.provenance.tolist()],
+            "gts": to_fixed_array(series.gts()).tolist(),
+        }
+        output_path.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    counts = np.bincount(series.provenance, minlength=len(PROVENANCE_NAMES))
+    summary = ", ".join(f"{name}: {count}" for name, count in zip(PROVENANCE_NAMES[1:], counts[1:].tolist()))
+    print(f"Stitched {len(series)} days ({summary}, missing: {counts[0]}). Results saved to {output_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
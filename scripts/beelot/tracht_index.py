@@ -0,0 +1,354 @@
+"""Build a GTS interval index for defaultTrachtData and emit it as a JS module.
+
+The generator parses assets/js/tracht_data.js, runs a sorted endpoint sweep
+over all active `[TS_start, TS_end]` intervals and writes a module that the
+client can import to answer
+
+* "what blooms at GTS x" with one table lookup, and
+* "what starts in [a, b]" with two binary searches
+
+instead of scanning the whole list on every redraw.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_INPUT: Final[Path] = Path("assets/js/tracht_data.js")
+DEFAULT_OUTPUT: Final[Path] = Path("assets/js/tracht_index.js")
+
+# Bits per word of the emitted bitsets; JS bitwise operators work on 32 bits.
+WORD_BITS: Final[int] = 32
+
+_BLOCK_COMMENT_REGEX = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT_REGEX = re.compile(r"^\s*//.*$", re.MULTILINE)
+_OBJECT_REGEX = re.compile(r"\{([^{}]*)\}")
+_FIELD_REGEXES = {
+    "active": re.compile(r"\bactive:\s*(true|false)"),
+    "TS_start": re.compile(r"\bTS_start:\s*(-?\d+(?:\.\d+)?)"),
+    "TS_end": re.compile(r"\bTS_end:\s*(-?\d+(?:\.\d+)?)"),
+    "plant": re.compile(r'\bplant:\s*"([^"]*)"'),
+    "url": re.compile(r'\burl:\s*"([^"]*)"'),
+}
+
+
+@dataclass(frozen=True)
+class TrachtInterval:
+    """Single active entry of defaultTrachtData."""
+
+    plant: str
+    ts_start: int
+    ts_end: int
+    url: Optional[str]
+    line_no: int
+
+
+def _blank_comments(content: str) -> str:
+    """Replace comments by spaces so that offsets and line numbers stay valid."""
+
+    def blank(match: re.Match[str]) -> str:
+        return re.sub(r"[^\n]", " ", match.group(0))
+
+    content = _BLOCK_COMMENT_REGEX.sub(blank, content)
+    return _LINE_COMMENT_REGEX.sub(blank, content)
+
+
+def parse_tracht_data(input_file: Path) -> List[TrachtInterval]:
+    """Parse all active, uncommented entries from a tracht_data.js file."""
+    if not input_file.exists():
+        raise FileNotFoundError(f"Input file is missing: {input_file}")
+
+    content = _blank_comments(input_file.read_text(encoding="utf-8"))
+    intervals: List[TrachtInterval] = []
+
+    for match in _OBJECT_REGEX.finditer(content):
+        body = match.group(1)
+        fields = {name: regex.search(body) for name, regex in _FIELD_REGEXES.items()}
+        if fields["plant"] is None or fields["TS_start"] is None:
+            continue
+        line_no = content.count("\n", 0, match.start()) + 1
+        if fields["active"] is not None and fields["active"].group(1) == "false":
+            continue
+
+        ts_start = int(float(fields["TS_start"].group(1)))
+        ts_end = int(float(fields["TS_end"].group(1))) if fields["TS_end"] else ts_start
+        if ts_start < 0:
+            raise ValueError(f"line {line_no}: TS_start {ts_start} is negative")
+        if ts_end < ts_start:
+            raise ValueError(f"line {line_no}: TS_end {ts_end} is smaller than TS_start {ts_start}")
+
+        intervals.append(
+            TrachtInterval(
+                plant=fields["plant"].group(1),
+                ts_start=ts_start,
+                ts_end=ts_end,
+                url=fields["url"].group(1) if fields["url"] else None,
+                line_no=line_no,
+            )
+        )
+
+    if not intervals:
+        raise ValueError(f"No tracht entries found in {input_file}")
+    return intervals
+
+
+class TrachtIntervalIndex:
+    """Interval index over integer GTS values.
+
+    Entries are numbered in order of `(ts_start, ts_end, line_no)`; that
+    number is the bit position in every bitset. The index keeps
+
+    * `segments`: the result of the endpoint sweep, i.e. `(first_gts, bitset)`
+      pairs for each GTS range over which the active set is constant, and
+    * `table`: the dense expansion of those segments, one bitset per integer
+      GTS from 0 to `max_gts`.
+    """
+
+    def __init__(self, intervals: Sequence[TrachtInterval]) -> None:
+        for entry in intervals:
+            # The sweep would switch such an entry on and never off again.
+            if entry.ts_start < 0 or entry.ts_end < entry.ts_start:
+                raise ValueError(
+                    f"line {entry.line_no}: invalid GTS interval [{entry.ts_start}, {entry.ts_end}] for {entry.plant}"
+                )
+        self.entries: List[TrachtInterval] = sorted(
+            intervals, key=lambda item: (item.ts_start, item.ts_end, item.line_no)
+        )
+        self.starts: List[int] = [entry.ts_start for entry in self.entries]
+        self.max_gts: int = max((entry.ts_end for entry in self.entries), default=0)
+        self.segments: List[Tuple[int, int]] = self._sweep()
+        self.table: List[int] = self._expand()
+
+    def _sweep(self) -> List[Tuple[int, int]]:
+        # An interval [s, e] adds its bit at s and removes it at e + 1.
+        events: List[Tuple[int, int, int]] = []
+        for bit, entry in enumerate(self.entries):
+            events.append((entry.ts_start, 1, bit))
+            events.append((entry.ts_end + 1, 0, bit))
+        events.sort()
+
+        segments: List[Tuple[int, int]] = [(0, 0)]
+        active = 0
+        for position, is_start, bit in events:
+            if is_start:
+                active |= 1 << bit
+            else:
+                active &= ~(1 << bit)
+            if segments[-1][0] == position:
+                segments[-1] = (position, active)
+            elif segments[-1][1] != active:
+                segments.append((position, active))
+        return segments
+
+    def _expand(self) -> List[int]:
+        table: List[int] = []
+        boundaries = [position for position, _ in self.segments[1:]] + [self.max_gts + 1]
+        for (_, bitset), end in zip(self.segments, boundaries):
+            table.extend([bitset] * (min(end, self.max_gts + 1) - len(table)))
+        return table
+
+    def _members(self, bitset: int) -> Iterator[TrachtInterval]:
+        while bitset:
+            low = bitset & -bitset
+            yield self.entries[low.bit_length() - 1]
+            bitset ^= low
+
+    def active_at(self, gts: float) -> List[TrachtInterval]:
+        """Return all entries with `TS_start <= gts <= TS_end`."""
+        position = int(gts // 1)
+        if position < 0 or position > self.max_gts:
+            return []
+        bitset = self.table[position]
+        if gts != position:
+            # TS_end is an integer, so between two integers an entry must also cover the next one.
+            bitset &= self.table[position + 1] if position < self.max_gts else 0
+        return list(self._members(bitset))
+
+    def starting_between(self, low: float, high: float) -> List[TrachtInterval]:
+        """Return all entries with `low <= TS_start <= high`, ordered by TS_start."""
+        first = bisect.bisect_left(self.starts, low)
+        last = bisect.bisect_right(self.starts, high)
+        return self.entries[first:last]
+
+
+def _words(bitset: int, word_count: int) -> List[int]:
+    mask = (1 << WORD_BITS) - 1
+    return [(bitset >> (WORD_BITS * word)) & mask for word in range(word_count)]
+
+
+def render_js_module(index: TrachtIntervalIndex, source: Path) -> str:
+    """Render the index as an ES module with lookup helpers."""
+    word_count = max(1, (len(index.entries) + WORD_BITS - 1) // WORD_BITS)
+    entries_js = ",\n".join(
+        "    "
+        + json.dumps(
+            {"plant": entry.plant, "TS_start": entry.ts_start, "TS_end": entry.ts_end, "url": entry.url},
+            ensure_ascii=False,
+        )
+        for entry in index.entries
+    )
+    segment_starts = ", ".join(str(position) for position, _ in index.segments)
+    segment_words = ",\n".join(
+        "    " + ", ".join(str(word) for word in _words(bitset, word_count)) for _, bitset in index.segments
+    )
+
+    return f"""// assets/js/tracht_index.js
+// Generated by `beelot tracht-index` from {source.as_posix()}. Do not edit by hand.
+
+/**
+ * @module tracht_index
+ * Precomputed GTS interval index over the active entries of defaultTrachtData.
+ * Only valid for the default data; user-edited tracht data must be scanned.
+ */
+
+/** Indexed entries; the array position is the bit position in every bitset. */
+export const TRACHT_INDEX_ENTRIES = [
+{entries_js}
+];
+
+/** Largest TS_end in the index; lookups above this value are empty. */
+export const TRACHT_INDEX_MAX_GTS = {index.max_gts};
+
+/** Number of 32-bit words per bitset. */
+export const TRACHT_INDEX_WORDS = {word_count};
+
+// Endpoint sweep: the active set is constant from SEGMENT_STARTS[i] up to the next start.
+const SEGMENT_STARTS = [{segment_starts}];
+const SEGMENT_WORDS = [
+{segment_words}
+];
+
+const SORTED_STARTS = TRACHT_INDEX_ENTRIES.map(entry => entry.TS_start);
+
+/**
+ * Dense lookup table: TRACHT_INDEX_WORDS words per integer GTS from 0 to TRACHT_INDEX_MAX_GTS.
+ */
+export const TRACHT_INDEX_TABLE = (() => {{
+    const table = new Uint32Array((TRACHT_INDEX_MAX_GTS + 1) * TRACHT_INDEX_WORDS);
+    for (let i = 0; i < SEGMENT_STARTS.length; i++) {{
+        const end = i + 1 < SEGMENT_STARTS.length ? SEGMENT_STARTS[i + 1] : TRACHT_INDEX_MAX_GTS + 1;
+        for (let gts = SEGMENT_STARTS[i]; gts < Math.min(end, TRACHT_INDEX_MAX_GTS + 1); gts++) {{
+            for (let w = 0; w < TRACHT_INDEX_WORDS; w++) {{
+                table[gts * TRACHT_INDEX_WORDS + w] = SEGMENT_WORDS[i * TRACHT_INDEX_WORDS + w];
+            }}
+        }}
+    }}
+    return table;
+}})();
+
+/**
+ * Returns the entries with TS_start <= gts <= TS_end.
+ * @param {{number}} gts - Grassland temperature sum.
+ * @returns {{Array<Object>}} - Matching entries, ordered by TS_start.
+ */
+export function plantsActiveAt(gts) {{
+    const position = Math.floor(gts);
+    if (!(position >= 0 && position <= TRACHT_INDEX_MAX_GTS)) {{
+        return [];
+    }}
+    // TS_end is an integer, so between two integers an entry must also cover the next one.
+    const between = gts !== position;
+    const result = [];
+    const offset = position * TRACHT_INDEX_WORDS;
+    for (let w = 0; w < TRACHT_INDEX_WORDS; w++) {{
+        let word = TRACHT_INDEX_TABLE[offset + w];
+        if (between) {{
+            const next = position < TRACHT_INDEX_MAX_GTS ? TRACHT_INDEX_TABLE[offset + TRACHT_INDEX_WORDS + w] : 0;
+            word = (word & next) >>> 0;
+        }}
+        while (word !== 0) {{
+            const bit = 31 - Math.clz32(word & -word);
+            result.push(TRACHT_INDEX_ENTRIES[w * 32 + bit]);
+            word = (word & (word - 1)) >>> 0;
+        }}
+    }}
+    return result;
+}}
+
+function lowerBound(values, target, inclusive) {{
+    let lo = 0;
+    let hi = values.length;
+    while (lo < hi) {{
+        const mid = (lo + hi) >>> 1;
+        if (values[mid] < target || (inclusive && values[mid] === target)) {{
+            lo = mid + 1;
+        }} else {{
+            hi = mid;
+        }}
+    }}
+    return lo;
+}}
+
+/**
+ * Returns the entries with low <= TS_start <= high.
+ * @param {{number}} low - Lower GTS bound (inclusive).
+ * @param {{number}} high - Upper GTS bound (inclusive).
+ * @returns {{Array<Object>}} - Matching entries, ordered by TS_start.
+ */
+export function plantsStartingBetween(low, high) {{
+    const first = lowerBound(SORTED_STARTS, low, false);
+    const last = lowerBound(SORTED_STARTS, high, true);
+    return TRACHT_INDEX_ENTRIES.slice(first, last);
+}}
+"""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Build the GTS interval index JS module from tracht_data.js.",
+        epilog=(
+            "Examples:\n"
+            "  beelot tracht-index\n"
+            "  beelot tracht-index -i assets/js/tracht_data.js -o assets/js/tracht_index.js\n"
+            "  beelot tracht-index --help"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument(
+        "-i",
+        "--input",
+        default=str(DEFAULT_INPUT),
+        help=f"Path to tracht_data.js (default: {DEFAULT_INPUT}).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=str(DEFAULT_OUTPUT),
+        help=f"Path of the generated JS module (default: {DEFAULT_OUTPUT}).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    try:
+        index = TrachtIntervalIndex(parse_tracht_data(input_path))
+        output_path.write_text(render_js_module(index, input_path), encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Indexed {len(index.entries)} entries in {len(index.segments)} segments "
+        f"(GTS 0..{index.max_gts}). Module saved to {output_path}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
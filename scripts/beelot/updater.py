@@ -0,0 +1,478 @@
+"""Incremental daily updater for tracked locations.
+
+Keeps a set of tracked locations (e.g. apiaries) in a state directory and, on
+each tick, brings their GTS and bloom table up to date:
+
+* Only the days after the last *settled* day are fetched. A day is settled
+  once ERA5 has a value for it; days covered by the recent window or the
+  forecast are provisional and are fetched again on the next tick, because
+  ERA5 will replace them later.
+* The settled temperatures of the current year are stored per location, so
+  the cumulative GTS is advanced from the stored state instead of being
+  recomputed from a full-year download.
+* Artifacts (`gts/<id>.json`, `bloom/<id>.json`) are written only when their
+  content changed; their hashes are part of the state.
+* Locations are processed with bounded concurrency and a random start delay,
+  and the daemon starts each daily run with a random jitter.
+* State files are replaced atomically after every location, so a crashed run
+  resumes where it stopped; a daemon that starts after the daily run time and
+  finds no completed run for today catches up immediately.
+* With `--cube`, the settled days are also written into a GTS cube store
+  (see `beelot.cube`) for cross-location and cross-year queries. The first
+  tick of a new year appends that year to the cube.
+
+Usage:
+
+    beelot updater add apiary-1 48.14,11.58
+    beelot updater run --once
+    beelot updater run --at 05:30 --jitter 900
+    beelot updater run --once --cube cube
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence
+
+import numpy as np
+
+from .calendar_index import day_number
+from .console import print_error, print_info, print_success, print_warning
+from .cube import CubeStore
+from .ensemble import Threshold, thresholds_from_tracht
+from .heatsum import to_fixed_array
+from .openmeteo import ARCHIVE_URL, FORECAST_URL, parse_location
+from .stitch import ERA5, PROVENANCE_NAMES, StitchedSeries, fetch_stitched
+from .tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+DEFAULT_STATE_DIR: Final[Path] = Path(".beelot-updater")
+DEFAULT_HORIZON_DAYS: Final[int] = 7
+DEFAULT_WORKERS: Final[int] = 4
+DEFAULT_SPREAD_SECONDS: Final[float] = 2.0
+DEFAULT_RUN_AT: Final[str] = "05:30"
+DEFAULT_JITTER_SECONDS: Final[float] = 600.0
+
+_LOCATION_ID_REGEX = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+@dataclass(frozen=True)
+class TrackedLocation:
+    id: str
+    lat: float
+    lon: float
+
+
+@dataclass
+class LocationState:
+    """Persisted per-location state.
+
+    Parameters
+    ----------
+    year:
+        Year the settled values belong to.
+    settled:
+        ERA5 daily mean temperatures from 1 January on, without gaps.
+    artifact_hashes:
+        SHA-256 of the last written content per artifact name.
+    """
+
+    year: int
+    settled: List[float] = field(default_factory=list)
+    artifact_hashes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def settled_through(self) -> Optional[date]:
+        if not self.settled:
+            return None
+        return date(self.year, 1, 1) + timedelta(days=len(self.settled) - 1)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "LocationState":
+        return cls(int(data["year"]), [float(v) for v in data["settled"]], dict(data.get("artifact_hashes", {})))
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"year": self.year, "settled": self.settled, "artifact_hashes": self.artifact_hashes}
+
+
+@dataclass(frozen=True)
+class UpdateResult:
+    location_id: str
+    fetched_days: int
+    newly_settled: int
+    written: List[str]
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class UpdaterConfig:
+    state_dir: Path
+    output_dir: Path
+    thresholds: Sequence[Threshold]
+    archive_url: str = ARCHIVE_URL
+    forecast_url: str = FORECAST_URL
+    horizon_days: int = DEFAULT_HORIZON_DAYS
+    workers: int = DEFAULT_WORKERS
+    spread_seconds: float = DEFAULT_SPREAD_SECONDS
+    cube_dir: Optional[Path] = None
+
+
+def write_json_atomic(path: Path, payload: Any) -> None:
+    """Write JSON to a temporary file and rename it over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _content_hash(payload: Any) -> str:
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_locations(state_dir: Path) -> List[TrackedLocation]:
+    data = _read_json(state_dir / "locations.json", {"locations": []})
+    return [TrackedLocation(str(item["id"]), float(item["lat"]), float(item["lon"])) for item in data["locations"]]
+
+
+def save_locations(state_dir: Path, locations: Sequence[TrackedLocation]) -> None:
+    write_json_atomic(
+        state_dir / "locations.json",
+        {"locations": [{"id": loc.id, "lat": loc.lat, "lon": loc.lon} for loc in locations]},
+    )
+
+
+def _state_path(state_dir: Path, location_id: str) -> Path:
+    return state_dir / "state" / f"{location_id}.json"
+
+
+def load_state(state_dir: Path, location_id: str, year: int) -> LocationState:
+    """Stored state of a location, or a fresh one if missing or from another year."""
+    data = _read_json(_state_path(state_dir, location_id), None)
+    if data is None:
+        return LocationState(year)
+    state = LocationState.from_json(data)
+    if state.year != year:
+        return LocationState(year, artifact_hashes=state.artifact_hashes)
+    return state
+
+
+def bloom_table(series: StitchedSeries, gts: np.ndarray, thresholds: Sequence[Threshold]) -> List[Dict[str, Any]]:
+    """First day on which the GTS reaches each `TS_start`, with the provenance of that day."""
+    dates = series.dates()
+    levels = np.array([threshold.gts for threshold in thresholds], dtype=np.float64)
+    # The GTS is non-decreasing, so the first crossing is a binary search.
+    indices = np.searchsorted(gts, levels, side="left")
+    rows = []
+    for threshold, index in zip(thresholds, indices.tolist()):
+        reached = index < len(dates)
+        rows.append(
+            {
+                "plant": threshold.plant,
+                "ts_start": threshold.gts,
+                "date": dates[index] if reached else None,
+                "source": PROVENANCE_NAMES[int(series.provenance[index])] if reached else None,
+            }
+        )
+    return rows
+
+
+def update_location(
+    config: UpdaterConfig, location: TrackedLocation, today: date, cube: Optional[CubeStore] = None
+) -> UpdateResult:
+    """Advance one location to `today` and write changed artifacts (and its settled days to `cube`)."""
+    state = load_state(config.state_dir, location.id, today.year)
+    year_start = date(today.year, 1, 1)
+    fetch_from = (state.settled_through + timedelta(days=1)) if state.settled else year_start
+    end = today + timedelta(days=config.horizon_days - 1)
+
+    fetched = fetch_stitched(
+        location.lat,
+        location.lon,
+        fetch_from,
+        end,
+        today,
+        archive_url=config.archive_url,
+        forecast_url=config.forecast_url,
+    )
+
+    if fetched.first_day != day_number(fetch_from):
+        raise ValueError(f"Open-Meteo data does not start at {fetch_from.isoformat()}.")
+
+    # Settle the leading run of ERA5 days; everything after stays provisional.
+    provisional = np.flatnonzero(fetched.provenance != ERA5)
+    settle_count = int(provisional[0]) if provisional.size else len(fetched)
+    settle_count = min(settle_count, max(0, (today - fetch_from).days))
+    state.settled.extend(fetched.values[:settle_count].tolist())
+
+    settled = np.array(state.settled, dtype=np.float64)
+    series = StitchedSeries(
+        first_day=day_number(year_start),
+        values=np.concatenate([settled, fetched.values[settle_count:]]),
+        provenance=np.concatenate(
+            [np.full(settled.shape, ERA5, dtype=np.uint8), fetched.provenance[settle_count:]]
+        ),
+    )
+    gts = series.gts()
+    observed_end = (today - year_start).days  # index of today
+
+    artifacts = {
+        "gts": {
+            "id": location.id,
+            "lat": location.lat,
+            "lon": location.lon,
+            "as_of": today.isoformat(),
+            "start": year_start.isoformat(),
+            "gts": to_fixed_array(gts[:observed_end]).tolist(),
+            "forecast_gts": to_fixed_array(gts[observed_end:]).tolist(),
+            "settled_through": state.settled_through.isoformat() if state.settled_through else None,
+        },
+        "bloom": {
+            "id": location.id,
+            "plants": bloom_table(series, gts, config.thresholds),
+        },
+    }
+
+    written: List[str] = []
+    for name, payload in artifacts.items():
+        digest = _content_hash(payload)
+        path = config.output_dir / name / f"{location.id}.json"
+        known = state.artifact_hashes.get(name)
+        if known is None and path.exists():
+            # State lost (e.g. crash before it was saved): compare with the file itself.
+            known = _content_hash(_read_json(path, None))
+        if known == digest and path.exists():
+            state.artifact_hashes[name] = digest
+            continue
+        write_json_atomic(path, payload)
+        state.artifact_hashes[name] = digest
+        written.append(name)
+
+    write_json_atomic(_state_path(config.state_dir, location.id), state.to_json())
+    if cube is not None and state.settled:
+        if cube.first_year <= year_start.year <= cube.last_year:
+            cube.write_days(location.id, year_start, state.settled)
+        else:
+            print_warning(
+                f"{location.id}: {year_start.year} is outside the cube ({cube.first_year}-{cube.last_year}); "
+                "settled days not written."
+            )
+    return UpdateResult(location.id, len(fetched), settle_count, written)
+
+
+def run_tick(
+    config: UpdaterConfig, today: Optional[date] = None, stop: Optional[threading.Event] = None
+) -> List[UpdateResult]:
+    """Update all tracked locations once; failures are reported per location."""
+    today = today or date.today()
+    locations = load_locations(config.state_dir)
+    stop = stop or threading.Event()
+    cube = CubeStore.open(config.cube_dir, writable=True) if config.cube_dir is not None else None
+    if cube is not None:
+        # Register before the workers start, so that the file never grows under them.
+        if cube.extend_years(today.year):
+            print_info(f"Extended the cube to {cube.first_year}-{cube.last_year}.")
+        for location in locations:
+            cube.add_location(location.id, location.lat, location.lon)
+
+    def job(location: TrackedLocation) -> UpdateResult:
+        # Spread the requests of one tick instead of firing them all at once.
+        if stop.wait(random.uniform(0.0, config.spread_seconds)):
+            return UpdateResult(location.id, 0, 0, [], "stopped")
+        try:
+            return update_location(config, location, today, cube)
+        except Exception as exc:
+            return UpdateResult(location.id, 0, 0, [], str(exc))
+
+    with ThreadPoolExecutor(max_workers=max(1, config.workers)) as pool:
+        results = list(pool.map(job, locations))
+    if cube is not None:
+        cube.close()
+
+    if not stop.is_set():
+        write_json_atomic(config.state_dir / "scheduler.json", {"last_tick": today.isoformat()})
+    return results
+
+
+def report(results: Sequence[UpdateResult]) -> int:
+    failures = 0
+    for result in results:
+        if result.error:
+            failures += 1
+            print_error(f"{result.location_id}: {result.error}")
+        else:
+            written = ", ".join(result.written) if result.written else "unchanged"
+            print_info(
+                f"{result.location_id}: fetched {result.fetched_days} days, "
+                f"settled {result.newly_settled}, artifacts: {written}"
+            )
+    if failures:
+        print_warning(f"{failures} of {len(results)} locations failed; they are retried on the next tick.")
+    else:
+        print_success(f"Updated {len(results)} locations.")
+    return failures
+
+
+def next_run(now: datetime, run_at: time, last_tick: Optional[date], jitter_seconds: float) -> datetime:
+    """Time of the next tick; a missed run of today is caught up right away."""
+    scheduled = datetime.combine(now.date(), run_at)
+    if last_tick != now.date() and now >= scheduled:
+        return now
+    if now >= scheduled:
+        scheduled += timedelta(days=1)
+    return scheduled + timedelta(seconds=random.uniform(0.0, jitter_seconds))
+
+
+def run_forever(config: UpdaterConfig, run_at: time, jitter_seconds: float) -> int:
+    stop = threading.Event()
+
+    def request_stop(signum: int, _frame: Any) -> None:
+        print_warning(f"Received signal {signum}; stopping after the current location.")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    while not stop.is_set():
+        last = _read_json(config.state_dir / "scheduler.json", {}).get("last_tick")
+        when = next_run(datetime.now(), run_at, date.fromisoformat(last) if last else None, jitter_seconds)
+        print_info(f"Next update at {when:%Y-%m-%d %H:%M:%S}.")
+        if stop.wait(max(0.0, (when - datetime.now()).total_seconds())):
+            break
+        report(run_tick(config, stop=stop))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Keep GTS and bloom tables of tracked locations up to date with incremental fetches.",
+        epilog=(
+            "Examples:\n"
+            "  beelot updater add apiary-1 48.14,11.58\n"
+            "  beelot updater list\n"
+            "  beelot updater run --once\n"
+            "  beelot updater run --at 05:30 --jitter 900 --workers 8\n"
+            "  beelot updater remove apiary-1"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument(
+        "--state-dir",
+        default=str(DEFAULT_STATE_DIR),
+        help=f"Directory with tracked locations and state (default: {DEFAULT_STATE_DIR}).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Track a location.")
+    add.add_argument("id", help="Location id (letters, digits, '-' and '_').")
+    add.add_argument("location", type=parse_location, help="Location as lat,lon.")
+
+    remove = commands.add_parser("remove", help="Stop tracking a location.")
+    remove.add_argument("id", help="Location id.")
+
+    commands.add_parser("list", help="List tracked locations.")
+
+    run = commands.add_parser("run", help="Run the updater.")
+    run.add_argument("--once", action="store_true", help="Run a single tick and exit.")
+    run.add_argument("--today", type=date.fromisoformat, default=None, help="Override today's date (with --once).")
+    run.add_argument("--at", default=DEFAULT_RUN_AT, help=f"Daily run time HH:MM (default: {DEFAULT_RUN_AT}).")
+    run.add_argument(
+        "--jitter",
+        type=float,
+        default=DEFAULT_JITTER_SECONDS,
+        help=f"Maximum random delay of a daily run in seconds (default: {DEFAULT_JITTER_SECONDS:g}).",
+    )
+    run.add_argument(
+        "--spread",
+        type=float,
+        default=DEFAULT_SPREAD_SECONDS,
+        help=f"Maximum random start delay per location in seconds (default: {DEFAULT_SPREAD_SECONDS:g}).",
+    )
+    run.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help=f"Concurrent locations (default: {DEFAULT_WORKERS})."
+    )
+    run.add_argument(
+        "--horizon",
+        type=int,
+        default=DEFAULT_HORIZON_DAYS,
+        help=f"Forecast days starting today (default: {DEFAULT_HORIZON_DAYS}).",
+    )
+    run.add_argument("--output-dir", default=None, help="Artifact directory (default: <state-dir>/artifacts).")
+    run.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+    run.add_argument("--archive-url", default=ARCHIVE_URL, help="Archive endpoint (default: %(default)s).")
+    run.add_argument("--forecast-url", default=FORECAST_URL, help="Forecast endpoint (default: %(default)s).")
+    run.add_argument("--cube", default=None, help="Also write settled days into this cube (see `beelot cube`).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    state_dir = Path(args.state_dir)
+
+    try:
+        locations = load_locations(state_dir)
+        if args.command == "add":
+            if not _LOCATION_ID_REGEX.match(args.id):
+                raise ValueError(f"Invalid location id '{args.id}'.")
+            lat, lon = args.location
+            locations = [loc for loc in locations if loc.id != args.id] + [TrackedLocation(args.id, lat, lon)]
+            save_locations(state_dir, locations)
+            print_success(f"Tracking {args.id} at {lat},{lon}.")
+            return 0
+        if args.command == "remove":
+            remaining = [loc for loc in locations if loc.id != args.id]
+            if len(remaining) == len(locations):
+                raise ValueError(f"Location '{args.id}' is not tracked.")
+            save_locations(state_dir, remaining)
+            _state_path(state_dir, args.id).unlink(missing_ok=True)
+            print_success(f"Stopped tracking {args.id}.")
+            return 0
+        if args.command == "list":
+            for loc in locations:
+                print(f"{loc.id}\t{loc.lat},{loc.lon}")
+            return 0
+
+        if args.horizon < 1:
+            raise ValueError("--horizon must be at least 1.")
+        config = UpdaterConfig(
+            state_dir=state_dir,
+            output_dir=Path(args.output_dir) if args.output_dir else state_dir / "artifacts",
+            thresholds=thresholds_from_tracht(parse_tracht_data(Path(args.tracht))),
+            archive_url=args.archive_url,
+            forecast_url=args.forecast_url,
+            horizon_days=args.horizon,
+            workers=args.workers,
+            spread_seconds=args.spread,
+            cube_dir=Path(args.cube) if args.cube else None,
+        )
+        if args.once:
+            return 1 if report(run_tick(config, args.today)) else 0
+        return run_forever(config, time.fromisoformat(args.at), args.jitter)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,398 @@
+"""Per-request metrics for `beelot urlcheck`.
+
+Records the phases of every request attempt against naturadb.de (and any other
+host in the tracht data) and renders them as
+
+* a JSON report with per-host summaries and every attempt, and
+* a Prometheus text-format file (for the node_exporter textfile collector), so
+  that cron runs can be scraped and compared over time.
+
+Phase timings are non-overlapping durations like curl's `-w` timings:
+
+    dns      name resolution (urllib3's own getaddrinfo call)
+    connect  TCP connect
+    tls      TLS handshake (0 for plain HTTP)
+    ttfb     request sent until response headers (server time)
+    body     reading the response body
+    total    whole attempt
+
+A reused keep-alive connection has no dns/connect/tls time. When a request
+follows redirects, the phases are summed over all hops and the hops are listed
+in `redirects`.
+
+The timings are taken inside urllib3's connection classes through a session
+from `instrumented_session`; `requests` is only imported when such a session
+is created. urllib3 resolves the host itself in `create_connection` and then
+sets the options of the first socket it creates; the `dns` phase ends at that
+call, so the host is resolved exactly once per connection. The hook on that
+call is only in place while a timed connection is being opened.
+
+Per-run totals (requests, retries, redirects, bytes) are exported as gauges:
+every run rewrites the file from zero, so they are not Prometheus counters.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Final, Iterator, List, Optional, Sequence, Tuple
+
+PHASES: Final[Tuple[str, ...]] = ("dns", "connect", "tls", "ttfb", "body", "total")
+LATENCY_BUCKETS_S: Final[Tuple[float, ...]] = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX: Final[str] = "beelot_urlcheck"
+
+_LOCAL = threading.local()
+
+
+@dataclass(frozen=True)
+class RequestMetrics:
+    """One request attempt.
+
+    Parameters
+    ----------
+    url:
+        Requested URL.
+    host:
+        Host of `url`.
+    attempt:
+        0 for the first attempt, n for the n-th retry.
+    status:
+        Final HTTP status, or `None` if the request failed.
+    bytes:
+        Length of the (decoded) response body.
+    phases:
+        Seconds per phase, see `PHASES`.
+    redirects:
+        `"<status> <url>"` per redirect hop.
+    error:
+        Exception text of a failed request.
+    """
+
+    url: str
+    host: str
+    attempt: int
+    status: Optional[int]
+    bytes: int
+    phases: Dict[str, float]
+    redirects: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+class RequestTimer:
+    """Collects the phase timings of one attempt on the current thread.
+
+    Use as a context manager around `session.get(..., stream=True)` and the
+    body read; call `headers_received()` once `get` returned.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self._start = 0.0
+        self._headers_at: Optional[float] = None
+
+    def __enter__(self) -> "RequestTimer":
+        _LOCAL.timer = self
+        self._start = time.perf_counter()
+        return self
+
+    def headers_received(self) -> None:
+        self._headers_at = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+
+    def __exit__(self, *exc_info: object) -> None:
+        end = time.perf_counter()
+        _LOCAL.timer = None
+        headers_at = self._headers_at if self._headers_at is not None else end
+        connection = self.phases["dns"] + self.phases["connect"] + self.phases["tls"]
+        self.phases["ttfb"] = max(0.0, headers_at - self._start - connection)
+        self.phases["body"] = end - headers_at
+        self.phases["total"] = end - self._start
+
+
+def _current_timer() -> Optional[RequestTimer]:
+    return getattr(_LOCAL, "timer", None)
+
+
+@dataclass
+class MetricsRecorder:
+    """Thread-safe collection of request attempts and sleep time of one run."""
+
+    buckets: Sequence[float] = LATENCY_BUCKETS_S
+    started: float = field(default_factory=time.time)
+    requests: List[RequestMetrics] = field(default_factory=list)
+    sleep_s: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            self.requests.append(metrics)
+
+    def slept(self, seconds: float) -> None:
+        with self._lock:
+            self.sleep_s += seconds
+
+    def by_host(self) -> Dict[str, List[RequestMetrics]]:
+        hosts: Dict[str, List[RequestMetrics]] = {}
+        for item in self.requests:
+            hosts.setdefault(item.host, []).append(item)
+        return dict(sorted(hosts.items()))
+
+
+def cumulative_counts(values: Sequence[float], buckets: Sequence[float]) -> List[int]:
+    """Cumulative histogram counts per upper bound, plus the `+Inf` bucket."""
+    ordered = sorted(values)
+    return [bisect.bisect_right(ordered, bound) for bound in buckets] + [len(ordered)]
+
+
+def _quantile(ordered: Sequence[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _host_summary(items: Sequence[RequestMetrics], buckets: Sequence[float]) -> Dict[str, Any]:
+    statuses: Dict[str, int] = {}
+    for item in items:
+        key = str(item.status) if item.status is not None else "error"
+        statuses[key] = statuses.get(key, 0) + 1
+    phases: Dict[str, Any] = {}
+    for phase in PHASES:
+        values = sorted(item.phases[phase] for item in items)
+        phases[phase] = {
+            "sum": round(sum(values), 6),
+            "p50": round(_quantile(values, 0.5), 6),
+            "p90": round(_quantile(values, 0.9), 6),
+            "max": round(values[-1], 6) if values else 0.0,
+            "buckets": cumulative_counts(values, buckets),
+        }
+    return {
+        "requests": len(items),
+        "errors": sum(1 for item in items if item.status is None),
+        "retries": sum(1 for item in items if item.attempt > 0),
+        "redirects": sum(len(item.redirects) for item in items),
+        "bytes": sum(item.bytes for item in items),
+        "status": dict(sorted(statuses.items())),
+        "phases": phases,
+    }
+
+
+def build_report(recorder: MetricsRecorder, problems: int, finished: Optional[float] = None) -> Dict[str, Any]:
+    """JSON-serializable report of one run."""
+    finished = finished if finished is not None else time.time()
+    return {
+        "started": datetime.fromtimestamp(recorder.started, timezone.utc).isoformat(timespec="seconds"),
+        "duration_s": round(finished - recorder.started, 3),
+        "sleep_s": round(recorder.sleep_s, 3),
+        "problems": problems,
+        "buckets": list(recorder.buckets),
+        "hosts": {host: _host_summary(items, recorder.buckets) for host, items in recorder.by_host().items()},
+        "requests": [asdict(item) for item in recorder.requests],
+    }
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def render_prometheus(report: Dict[str, Any], finished: Optional[float] = None) -> Iterator[str]:
+    """Yield the lines of a Prometheus text-format exposition of `report`."""
+    finished = finished if finished is not None else time.time()
+    bounds = [*report["buckets"], float("inf")]
+    hosts = report["hosts"]
+
+    name = f"{METRIC_PREFIX}_phase_seconds"
+    yield f"# HELP {name} Duration of request phases per attempt.\n"
+    yield f"# TYPE {name} histogram\n"
+    for host, summary in hosts.items():
+        for phase, stats in summary["phases"].items():
+            for bound, count in zip(bounds, stats["buckets"]):
+                yield f"{name}_bucket{_labels(host=host, phase=phase, le=_format_bound(bound))} {count}\n"
+            yield f"{name}_sum{_labels(host=host, phase=phase)} {stats['sum']}\n"
+            yield f"{name}_count{_labels(host=host, phase=phase)} {summary['requests']}\n"
+
+    name = f"{METRIC_PREFIX}_requests"
+    yield f"# HELP {name} Request attempts of the last run by final status ('error' if the request failed).\n"
+    yield f"# TYPE {name} gauge\n"
+    for host, summary in hosts.items():
+        for status, count in summary["status"].items():
+            yield f"{name}{_labels(host=host, status=status)} {count}\n"
+
+    for key, help_text in (
+        ("retries", "Retried attempts of the last run."),
+        ("redirects", "Followed redirects of the last run."),
+        ("bytes", "Response body bytes of the last run."),
+    ):
+        name = f"{METRIC_PREFIX}_{key}"
+        yield f"# HELP {name} {help_text}\n"
+        yield f"# TYPE {name} gauge\n"
+        for host, summary in hosts.items():
+            yield f"{name}{_labels(host=host)} {summary[key]}\n"
+
+    for key, value, help_text in (
+        ("sleep_seconds", report["sleep_s"], "Time spent sleeping between requests and before retries."),
+        ("duration_seconds", report["duration_s"], "Wall time of the run."),
+        ("problems", report["problems"], "Problematic URLs found by the run."),
+        ("last_run_timestamp_seconds", round(finished, 3), "Unix time the run finished."),
+    ):
+        name = f"{METRIC_PREFIX}_{key}"
+        yield f"# HELP {name} {help_text}\n"
+        yield f"# TYPE {name} gauge\n"
+        yield f"{name} {value}\n"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write `text` to a temporary file and rename it over `path`.
+
+    The textfile collector must never see a half-written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_outputs(
+    recorder: MetricsRecorder,
+    problems: int,
+    json_path: Optional[Path] = None,
+    prom_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Write the JSON report and/or the Prometheus file; returns the report."""
+    finished = time.time()
+    report = build_report(recorder, problems, finished)
+    if json_path is not None:
+        write_atomic(json_path, json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    if prom_path is not None:
+        write_atomic(prom_path, "".join(render_prometheus(report, finished)))
+    return report
+
+
+_SESSION_CLASSES: Dict[str, Any] = {}
+
+
+_HOOK_LOCK = threading.Lock()
+_HOOK_STATE: Dict[str, Any] = {"users": 0, "original": None, "wrapper": None}
+
+
+@contextmanager
+def _resolution_hook() -> Iterator[None]:
+    """Note on the current thread when urllib3's `create_connection` has resolved the host.
+
+    `create_connection` calls `getaddrinfo` and then `_set_socket_options` on
+    every socket it tries, so the first such call after a connection started
+    marks the end of name resolution. The wrapper is only installed while a
+    timed `_new_conn` runs (shared by concurrent ones) and urllib3's function
+    is put back afterwards; other threads' calls pass straight through.
+    """
+    from urllib3.util import connection
+
+    with _HOOK_LOCK:
+        if _HOOK_STATE["users"] == 0:
+            original = connection._set_socket_options
+
+            def _set_socket_options(sock: socket.socket, options: Any) -> None:
+                if getattr(_LOCAL, "resolving", False):
+                    _LOCAL.resolving = False
+                    _LOCAL.resolved_at = time.perf_counter()
+                original(sock, options)
+
+            _HOOK_STATE.update(original=original, wrapper=_set_socket_options)
+            connection._set_socket_options = _set_socket_options
+        _HOOK_STATE["users"] += 1
+    try:
+        yield
+    finally:
+        with _HOOK_LOCK:
+            _HOOK_STATE["users"] -= 1
+            if _HOOK_STATE["users"] == 0:
+                # Leave it alone if someone else replaced it in the meantime.
+                if connection._set_socket_options is _HOOK_STATE["wrapper"]:
+                    connection._set_socket_options = _HOOK_STATE["original"]
+                _HOOK_STATE.update(original=None, wrapper=None)
+
+
+def _timed_adapter_class() -> Any:
+    """HTTPAdapter whose urllib3 connections report dns/connect/tls to the current `RequestTimer`."""
+    if "adapter" in _SESSION_CLASSES:
+        return _SESSION_CLASSES["adapter"]
+
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class _TimedConnectionMixin:
+        _connected_at: Optional[float] = None
+
+        def _new_conn(self) -> socket.socket:
+            timer = _current_timer()
+            _LOCAL.resolving = True
+            _LOCAL.resolved_at = None
+            start = time.perf_counter()
+            try:
+                with _resolution_hook():
+                    sock = super()._new_conn()  # type: ignore[misc]
+            finally:
+                _LOCAL.resolving = False
+            self._connected_at = time.perf_counter()
+            if timer is not None:
+                # Without the hook (e.g. a patched urllib3) all of it counts as connect.
+                resolved = _LOCAL.resolved_at if _LOCAL.resolved_at is not None else start
+                timer.add("dns", resolved - start)
+                timer.add("connect", self._connected_at - resolved)
+            return sock
+
+    class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+        pass
+
+    class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+        def connect(self) -> None:
+            super().connect()
+            timer = _current_timer()
+            if timer is not None and self._connected_at is not None:
+                timer.add("tls", time.perf_counter() - self._connected_at)
+
+    class _TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = _TimedHTTPConnection
+
+    class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = _TimedHTTPSConnection
+
+    class TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _TimedHTTPConnectionPool,
+                "https": _TimedHTTPSConnectionPool,
+            }
+
+    _SESSION_CLASSES["adapter"] = TimedHTTPAdapter
+    return TimedHTTPAdapter
+
+
+def instrumented_session() -> Any:
+    """`requests.Session` whose requests report their phases to the active `RequestTimer`."""
+    import requests
+
+    session = requests.Session()
+    adapter_class = _timed_adapter_class()
+    session.mount("http://", adapter_class())
+    session.mount("https://", adapter_class())
+    return session
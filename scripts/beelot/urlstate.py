@@ -0,0 +1,258 @@
+"""Incremental mode of `beelot urlcheck`.
+
+Most edits of tracht_data.js touch a few lines, yet a full run fetches every
+URL again. With a state file, each `TrachtEntry` is identified by a fingerprint
+of its plant name and URL (not its line number, so inserting lines elsewhere
+does not invalidate it) and the result of its last check is kept. A run then
+checks only
+
+* `new` entries, whose fingerprint is not in the state (added or edited),
+* `changed` entries, which differ between the revisions of a git range,
+* `retry` entries, whose last check found a problem, and
+* a rolling `sample` of the other entries, oldest check first, so that pages
+  removed on the server are still noticed within a few runs.
+
+The checked entries are written as a JSON report and/or as JUnit XML, so that
+CI can gate on the entries a change touched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Final, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .naturadb_url_check import TrachtEntry, UrlProblem, parse_js_text
+from .urlmetrics import write_atomic
+
+STATE_VERSION: Final[int] = 1
+SELECTION_REASONS: Final[Tuple[str, ...]] = ("all", "new", "changed", "retry", "sample")
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Last check of one entry; `reason` is `None` if the page was fine."""
+
+    fingerprint: str
+    plant: str
+    url: str
+    checked: float
+    reason: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SelectedEntry:
+    """Entry checked in this run, with the reason it was selected."""
+
+    entry: TrachtEntry
+    fingerprint: str
+    selected: str
+
+
+def fingerprint(entry: TrachtEntry) -> str:
+    """Stable identifier of an entry from its plant name and URL."""
+    return hashlib.sha256(f"{entry.plant}\0{entry.url}".encode("utf-8")).hexdigest()[:16]
+
+
+def load_state(path: Path) -> Dict[str, CheckResult]:
+    """Results of the previous run by fingerprint; empty if `path` does not exist."""
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != STATE_VERSION:
+        raise ValueError(f"{path}: unsupported state version {payload.get('version')!r}")
+    return {key: CheckResult(fingerprint=key, **item) for key, item in payload["entries"].items()}
+
+
+def save_state(path: Path, state: Dict[str, CheckResult]) -> None:
+    entries = {}
+    for key, result in sorted(state.items()):
+        item = asdict(result)
+        del item["fingerprint"]
+        entries[key] = item
+    payload = {"version": STATE_VERSION, "entries": entries}
+    write_atomic(path, json.dumps(payload, ensure_ascii=False, indent=2) + "\n")
+
+
+def _git(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, encoding="utf-8")
+
+
+def entries_at_revision(js_path: Path, revision: str) -> List[TrachtEntry]:
+    """Entries of `js_path` as of a git revision; empty if the file did not exist there."""
+    cwd = js_path.resolve().parent
+    check = _git(cwd, "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}")
+    if check.returncode != 0:
+        raise ValueError(f"unknown git revision: {revision}")
+    shown = _git(cwd, "show", f"{revision}:./{js_path.name}")
+    if shown.returncode != 0:
+        return []
+    return parse_js_text(shown.stdout)
+
+
+def changed_fingerprints(js_path: Path, revisions: str) -> Set[str]:
+    """Fingerprints of the entries added or edited in a git revision range.
+
+    `A..B` compares revision A with B, `A...B` the merge base of A and B with B,
+    and a single revision `A` compares A with the working tree.
+    """
+    cwd = js_path.resolve().parent
+    head: Optional[str]
+    if "..." in revisions:
+        left, right = revisions.split("...", 1)
+        merge_base = _git(cwd, "merge-base", left or "HEAD", right or "HEAD")
+        if merge_base.returncode != 0:
+            raise ValueError(f"no merge base for {revisions}: {merge_base.stderr.strip()}")
+        base, head = merge_base.stdout.strip(), right or "HEAD"
+    elif ".." in revisions:
+        left, right = revisions.split("..", 1)
+        base, head = left or "HEAD", right or "HEAD"
+    else:
+        base, head = revisions, None
+
+    before = {fingerprint(entry) for entry in entries_at_revision(js_path, base)}
+    after = entries_at_revision(js_path, head) if head is not None else parse_js_text(js_path.read_text("utf-8"))
+    return {key for key in map(fingerprint, after) if key not in before}
+
+
+def select_entries(
+    entries: Sequence[TrachtEntry],
+    state: Optional[Dict[str, CheckResult]] = None,
+    changed: Optional[Set[str]] = None,
+    sample: int = 0,
+) -> List[SelectedEntry]:
+    """Entries to check in this run, in file order.
+
+    Parameters
+    ----------
+    entries:
+        All entries of the current file.
+    state:
+        Results of the previous run; `None` disables `new`, `retry` and `sample`.
+    changed:
+        Fingerprints changed in a git range; `None` disables `changed`.
+    sample:
+        Number of the remaining entries to re-check, least recently checked first.
+
+    Returns
+    -------
+    List of SelectedEntry objects; every entry is selected (`all`) if neither
+    `state` nor `changed` is given.
+    """
+    keys = [fingerprint(entry) for entry in entries]
+    if state is None and changed is None:
+        return [SelectedEntry(entry, key, "all") for entry, key in zip(entries, keys)]
+
+    reasons: Dict[int, str] = {}
+    for index, key in enumerate(keys):
+        if changed is not None and key in changed:
+            reasons[index] = "changed"
+        elif state is not None and key not in state:
+            reasons[index] = "new"
+        elif state is not None and state[key].reason is not None:
+            reasons[index] = "retry"
+
+    if state is not None and sample > 0:
+        seen: Set[str] = {keys[index] for index in reasons}
+        rest: List[Tuple[float, int]] = []
+        for index, key in enumerate(keys):
+            if key not in seen:
+                seen.add(key)
+                rest.append((state[key].checked, index))
+        for _, index in sorted(rest)[:sample]:
+            reasons[index] = "sample"
+
+    return [SelectedEntry(entries[index], keys[index], reason) for index, reason in sorted(reasons.items())]
+
+
+def update_state(
+    state: Optional[Dict[str, CheckResult]],
+    entries: Iterable[TrachtEntry],
+    selected: Iterable[SelectedEntry],
+    problems: Iterable[UrlProblem],
+    now: float,
+) -> Dict[str, CheckResult]:
+    """State after a run: new results for checked entries, removed entries dropped."""
+    reasons = {(problem.plant, problem.url, problem.line_no): problem.reason for problem in problems}
+    previous = state or {}
+    checked = {}
+    for item in selected:
+        entry = item.entry
+        reason = reasons.get((entry.plant, entry.url, entry.line_no))
+        checked[item.fingerprint] = CheckResult(item.fingerprint, entry.plant, entry.url, now, reason)
+
+    updated: Dict[str, CheckResult] = {}
+    for entry in entries:
+        key = fingerprint(entry)
+        result = checked.get(key, previous.get(key))
+        if result is not None:
+            updated[key] = result
+    return updated
+
+
+def _rows(selected: Sequence[SelectedEntry], problems: Iterable[UrlProblem]) -> List[Dict[str, object]]:
+    reasons = {(problem.plant, problem.url, problem.line_no): problem.reason for problem in problems}
+    rows = []
+    for item in selected:
+        entry = item.entry
+        reason = reasons.get((entry.plant, entry.url, entry.line_no))
+        rows.append(
+            {
+                "plant": entry.plant,
+                "url": entry.url,
+                "line_no": entry.line_no,
+                "fingerprint": item.fingerprint,
+                "selected": item.selected,
+                "ok": reason is None,
+                "reason": reason,
+            }
+        )
+    return rows
+
+
+def render_json(selected: Sequence[SelectedEntry], problems: Sequence[UrlProblem], total: int) -> str:
+    """JSON report of the checked entries."""
+    rows = _rows(selected, problems)
+    report = {
+        "entries": total,
+        "checked": len(rows),
+        "skipped": total - len(rows),
+        "problems": sum(1 for row in rows if not row["ok"]),
+        "selected": {reason: sum(1 for row in rows if row["selected"] == reason) for reason in SELECTION_REASONS},
+        "results": rows,
+    }
+    return json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+
+
+def render_junit(selected: Sequence[SelectedEntry], problems: Sequence[UrlProblem], js_name: str) -> str:
+    """JUnit XML with one test case per checked entry."""
+    rows = _rows(selected, problems)
+    failures = sum(1 for row in rows if not row["ok"])
+    suites = ET.Element("testsuites", tests=str(len(rows)), failures=str(failures))
+    suite = ET.SubElement(suites, "testsuite", name="beelot urlcheck", tests=str(len(rows)), failures=str(failures))
+    for row in rows:
+        case = ET.SubElement(
+            suite, "testcase", classname=js_name, name=f"line {row['line_no']}: {row['plant']} ({row['selected']})"
+        )
+        if not row["ok"]:
+            failure = ET.SubElement(case, "failure", message=str(row["reason"]), type="UrlProblem")
+            failure.text = str(row["url"])
+    return ET.tostring(suites, encoding="unicode") + "\n"
+
+
+def write_reports(
+    selected: Sequence[SelectedEntry],
+    problems: Sequence[UrlProblem],
+    total: int,
+    js_name: str,
+    json_path: Optional[Path] = None,
+    junit_path: Optional[Path] = None,
+) -> None:
+    if json_path is not None:
+        write_atomic(json_path, render_json(selected, problems, total))
+    if junit_path is not None:
+        write_atomic(junit_path, '<?xml version="1.0" encoding="utf-8"?>\n' + render_junit(selected, problems, js_name))
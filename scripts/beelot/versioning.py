@@ -0,0 +1,47 @@
+"""Semantic version parsing and comparison shared by the release helpers."""
+
+from __future__ import annotations
+
+import re
+from typing import Tuple
+
+
+VersionKey = Tuple[Tuple[int, int, int], Tuple[Tuple[int, object], ...], bool]
+
+_VERSION_REGEX = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z.-]+))?(?:\+([0-9A-Za-z.-]+))?$")
+
+
+def parse_version(version: str) -> VersionKey:
+    """Split a semantic version into core, prerelease parts and release flag.
+
+    Raises
+    ------
+    ValueError
+        If `version` is not a valid semantic version.
+    """
+    match = _VERSION_REGEX.match(version)
+    if not match:
+        raise ValueError(f"Invalid version format: {version}")
+
+    major, minor, patch = (int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    prerelease = match.group(4)
+    if prerelease is None:
+        return (major, minor, patch), tuple(), True
+
+    parts = []
+    for item in prerelease.split("."):
+        if item.isdigit():
+            parts.append((0, int(item)))
+        else:
+            parts.append((1, item))
+
+    return (major, minor, patch), tuple(parts), False
+
+
+def max_version(version_a: str, version_b: str) -> str:
+    """Return the higher of two semantic versions; releases rank above prereleases."""
+    core_a, pre_a, is_release_a = parse_version(version_a)
+    core_b, pre_b, is_release_b = parse_version(version_b)
+    key_a = (core_a, is_release_a, pre_a)
+    key_b = (core_b, is_release_b, pre_b)
+    return version_a if key_a >= key_b else version_b
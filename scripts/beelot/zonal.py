@@ -0,0 +1,449 @@
+"""Area-weighted GTS of regions (districts, Landkreise) from the GTS cube.
+
+Every cube location stands for a grid cell of `cell_deg` × `cell_deg`
+degrees centred on it (e.g. the 0.1° grid of ERA5-Land). Regions are polygons
+from a local GeoJSON file. For each region, the area of its intersection with
+every cell is computed once by clipping the polygon rings against the cell
+(Sutherland-Hodgman per axis-parallel edge, vectorized over the ring
+vertices); the resulting (regions, cells) weight matrix is cached next to the
+cube and reused as long as the GeoJSON, the cell size and the cube locations
+are unchanged.
+
+The mean GTS curves of all regions for all years are then one matrix product
+per block of years; a region/day is NaN if less than `min_valid` of its
+covered area has data there. Threshold crossings of every `TS_start` of
+`defaultTrachtData` follow from the mean curves.
+
+Output (static files the site can fetch as they are):
+
+    <out>/zonal.json   regions, years, thresholds and bloom dates per region and year
+    <out>/curves.u16   mean GTS as little-endian uint16 tenths, shape (regions, years, 366),
+                       65535 where missing; the last axis is the cube's calendar slot
+
+Usage:
+
+    beelot zonal -d cube -r landkreise.geojson -o site/zonal
+    beelot zonal -d cube -r landkreise.geojson -o site/zonal --cell 0.25 --years 2015:2025
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .analogs import EARTH_RADIUS_KM, crossing_slots
+from .calendar_index import SLOTS, slot_date
+from .cube import CubeLocation, CubeStore
+from .ensemble import Threshold, thresholds_from_tracht
+from .tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+DEFAULT_CELL_DEG: Final[float] = 0.1
+DEFAULT_MIN_VALID: Final[float] = 0.5
+ID_PROPERTIES: Final[Tuple[str, ...]] = ("AGS", "id", "ID")
+NAME_PROPERTIES: Final[Tuple[str, ...]] = ("GEN", "name", "NAME")
+CURVE_SCALE: Final[int] = 10
+CURVE_MISSING: Final[int] = 0xFFFF
+WEIGHTS_VERSION: Final[int] = 1
+KM_PER_DEG: Final[float] = math.radians(1.0) * EARTH_RADIUS_KM
+
+# Upper bound for the float64 block of one chunk of years.
+_CHUNK_ELEMENTS: Final[int] = 1 << 23
+
+
+@dataclass(frozen=True)
+class Region:
+    """A region with its polygons; each polygon is (outer ring, *holes) as (n, 2) lon/lat arrays."""
+
+    id: str
+    name: str
+    polygons: Tuple[Tuple[np.ndarray, ...], ...]
+
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """(west, south, east, north)."""
+        points = np.concatenate([polygon[0] for polygon in self.polygons])
+        return (
+            float(points[:, 0].min()),
+            float(points[:, 1].min()),
+            float(points[:, 0].max()),
+            float(points[:, 1].max()),
+        )
+
+
+@dataclass(frozen=True)
+class ZonalWeights:
+    """Intersection areas in km² of every region with every cell, shape (regions, cells)."""
+
+    key: str
+    region_ids: List[str]
+    names: List[str]
+    area_km2: np.ndarray
+    matrix: np.ndarray
+
+    def coverage(self) -> np.ndarray:
+        """Share of each region's area covered by cells."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.clip(np.nan_to_num(self.matrix.sum(axis=1) / self.area_km2), 0.0, 1.0)
+
+
+# --- regions ------------------------------------------------------------------
+
+
+def _ring(coordinates: Sequence[Sequence[float]]) -> np.ndarray:
+    ring = np.asarray(coordinates, dtype=np.float64)[:, :2]
+    if len(ring) > 1 and (ring[0] == ring[-1]).all():
+        ring = ring[:-1]
+    return ring
+
+
+def _property(feature: Dict[str, Any], names: Sequence[str], fallback: Any) -> str:
+    properties = feature.get("properties") or {}
+    for name in names:
+        if properties.get(name) not in (None, ""):
+            return str(properties[name])
+    return str(fallback)
+
+
+def load_regions(
+    path: Path,
+    id_properties: Sequence[str] = ID_PROPERTIES,
+    name_properties: Sequence[str] = NAME_PROPERTIES,
+) -> List[Region]:
+    """Polygon and MultiPolygon features of a GeoJSON FeatureCollection as regions.
+
+    The id is the first non-empty property of `id_properties` (default: the
+    AGS key of the BKG district files), else the feature id, else its index.
+    """
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    features = payload.get("features") if payload.get("type") == "FeatureCollection" else [payload]
+    regions: List[Region] = []
+    for index, feature in enumerate(features or []):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            parts = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            parts = geometry["coordinates"]
+        else:
+            raise ValueError(f"{path}: feature {index} is a {geometry.get('type')}, not a (Multi)Polygon.")
+        region_id = _property(feature, id_properties, feature.get("id", index))
+        polygons = tuple(tuple(_ring(ring) for ring in part) for part in parts if part)
+        regions.append(Region(region_id, _property(feature, name_properties, region_id), polygons))
+    ids = [region.id for region in regions]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{path}: region ids are not unique; choose another --id-property.")
+    return regions
+
+
+# --- geometry -----------------------------------------------------------------
+
+
+def clip_ring(ring: np.ndarray, axis: int, bound: float, keep_above: bool) -> np.ndarray:
+    """Part of a closed ring on one side of the line `coordinate[axis] == bound`.
+
+    One Sutherland-Hodgman step: for every vertex the intersection with the
+    line (if its incoming edge crosses it) and the vertex itself (if inside)
+    are kept, in ring order.
+    """
+    if ring.shape[0] == 0:
+        return ring
+    values = ring[:, axis]
+    inside = values >= bound if keep_above else values <= bound
+    if inside.all():
+        return ring
+    if not inside.any():
+        return ring[:0]
+    previous = np.roll(ring, 1, axis=0)
+    crossing = inside != np.roll(inside, 1)
+    # Only the crossing edges need their intersection; the others may divide by zero.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (bound - previous[:, axis]) / (values - previous[:, axis])
+        points = previous + t[:, None] * (ring - previous)
+    points[:, axis] = bound
+    candidates = np.stack([points, ring], axis=1).reshape(-1, 2)
+    return candidates[np.stack([crossing, inside], axis=1).reshape(-1)]
+
+
+def ring_area(ring: np.ndarray) -> float:
+    """Unsigned shoelace area in the units of the coordinates."""
+    if ring.shape[0] < 3:
+        return 0.0
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)))
+
+
+def region_area_km2(region: Region) -> float:
+    """Area on the sphere, from the equal-area sinusoidal projection of the rings.
+
+    The projection is centred on the region, where its distortion is smallest.
+    """
+    west, _, east, _ = region.bbox()
+    meridian = (west + east) / 2
+    total = 0.0
+    for polygon in region.polygons:
+        for number, ring in enumerate(polygon):
+            projected = np.column_stack(((ring[:, 0] - meridian) * np.cos(np.radians(ring[:, 1])), ring[:, 1]))
+            total += ring_area(projected) if number == 0 else -ring_area(projected)
+    return total * KM_PER_DEG**2
+
+
+def cell_weights(region: Region, lats: np.ndarray, lons: np.ndarray, cell_deg: float) -> np.ndarray:
+    """Area in km² of the intersection of `region` with the cell around every location."""
+    weights = np.zeros(lats.size, dtype=np.float64)
+    half = cell_deg / 2
+    west, south, east, north = region.bbox()
+    candidates = np.flatnonzero(
+        (lats + half > south) & (lats - half < north) & (lons + half > west) & (lons - half < east)
+    )
+    rings = [(ring, number == 0) for polygon in region.polygons for number, ring in enumerate(polygon)]
+    # Clip to the latitude band of a row of cells once, then per cell to its longitudes.
+    for lat in np.unique(lats[candidates]):
+        band = []
+        for ring, outer in rings:
+            clipped = clip_ring(clip_ring(ring, 1, lat - half, True), 1, lat + half, False)
+            if clipped.shape[0] >= 3:
+                band.append((clipped, outer))
+        if not band:
+            continue
+        scale = math.cos(math.radians(lat)) * KM_PER_DEG**2
+        for cell in candidates[lats[candidates] == lat]:
+            area = 0.0
+            for ring, outer in band:
+                piece = ring_area(clip_ring(clip_ring(ring, 0, lons[cell] - half, True), 0, lons[cell] + half, False))
+                area += piece if outer else -piece
+            weights[cell] = max(area, 0.0) * scale
+    return weights
+
+
+def weights_key(
+    regions_path: Path, locations: Sequence[CubeLocation], cell_deg: float, properties: Sequence[str] = ()
+) -> str:
+    """Hash of everything the cached weights depend on."""
+    digest = hashlib.sha256()
+    digest.update(regions_path.read_bytes())
+    digest.update(json.dumps([cell_deg, list(properties), [[loc.id, loc.lat, loc.lon] for loc in locations]]).encode())
+    return digest.hexdigest()
+
+
+def build_weights(
+    regions: Sequence[Region], locations: Sequence[CubeLocation], cell_deg: float, key: str = ""
+) -> ZonalWeights:
+    lats = np.array([location.lat for location in locations], dtype=np.float64)
+    lons = np.array([location.lon for location in locations], dtype=np.float64)
+    matrix = np.zeros((len(regions), len(locations)), dtype=np.float64)
+    for row, region in enumerate(regions):
+        matrix[row] = cell_weights(region, lats, lons, cell_deg)
+    return ZonalWeights(
+        key=key,
+        region_ids=[region.id for region in regions],
+        names=[region.name for region in regions],
+        area_km2=np.array([region_area_km2(region) for region in regions], dtype=np.float64),
+        matrix=matrix,
+    )
+
+
+def save_weights(path: Path, weights: ZonalWeights) -> None:
+    rows, cells = np.nonzero(weights.matrix)
+    meta = {"version": WEIGHTS_VERSION, "key": weights.key, "ids": weights.region_ids, "names": weights.names}
+    with path.open("wb") as handle:
+        np.savez_compressed(
+            handle,
+            meta=np.array(json.dumps(meta, ensure_ascii=False)),
+            shape=np.array(weights.matrix.shape, dtype=np.int64),
+            rows=rows.astype(np.int32),
+            cells=cells.astype(np.int32),
+            values=weights.matrix[rows, cells],
+            area_km2=weights.area_km2,
+        )
+
+
+def load_weights(path: Path, key: str) -> Optional[ZonalWeights]:
+    """Cached weights, or `None` if the file is missing or was built from other inputs."""
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as payload:
+        meta = json.loads(str(payload["meta"]))
+        if meta.get("version") != WEIGHTS_VERSION or meta.get("key") != key:
+            return None
+        matrix = np.zeros(tuple(payload["shape"]), dtype=np.float64)
+        matrix[payload["rows"], payload["cells"]] = payload["values"]
+        return ZonalWeights(key, meta["ids"], meta["names"], payload["area_km2"], matrix)
+
+
+# --- aggregation --------------------------------------------------------------
+
+
+def zonal_means(data: np.ndarray, matrix: np.ndarray, min_valid: float = DEFAULT_MIN_VALID) -> np.ndarray:
+    """Area-weighted mean of `data` (cells, years, 366) per region, shape (regions, years, 366).
+
+    Cells without data on a slot are left out of its mean; the mean is NaN if
+    they make up more than `1 - min_valid` of the covered area.
+    """
+    used = np.flatnonzero(matrix.any(axis=0))
+    weights = matrix[:, used]
+    total = weights.sum(axis=1)[:, None]
+    years = data.shape[1]
+    result = np.full((matrix.shape[0], years, SLOTS), np.nan)
+    if used.size == 0:
+        return result
+    chunk = max(1, _CHUNK_ELEMENTS // max(1, used.size * SLOTS))
+    for begin in range(0, years, chunk):
+        block = np.asarray(data[used, begin : begin + chunk], dtype=np.float64).reshape(used.size, -1)
+        known = ~np.isnan(block)
+        sums = weights @ np.where(known, block, 0.0)
+        covered = weights @ known.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where((covered > 0) & (covered >= min_valid * total), sums / covered, np.nan)
+        result[:, begin : begin + chunk] = means.reshape(matrix.shape[0], -1, SLOTS)
+    return result
+
+
+def encode_curves(means: np.ndarray) -> bytes:
+    """Mean curves as little-endian uint16 tenths of GTS, `CURVE_MISSING` for NaN."""
+    scaled = np.clip(np.rint(np.nan_to_num(means, nan=-1.0) * CURVE_SCALE), 0, CURVE_MISSING - 1)
+    return np.where(np.isnan(means), CURVE_MISSING, scaled).astype("<u2").tobytes()
+
+
+def build_artifacts(
+    weights: ZonalWeights,
+    means: np.ndarray,
+    first_year: int,
+    thresholds: Sequence[Threshold],
+    cell_deg: float,
+) -> Dict[str, Any]:
+    """Payload of zonal.json for `means` of shape (regions, years, 366) starting at `first_year`."""
+    regions, years = means.shape[:2]
+    levels = np.array([threshold.gts for threshold in thresholds], dtype=np.float64)
+    crossings = crossing_slots(means.reshape(-1, SLOTS), levels).reshape(regions, years, len(thresholds))
+    coverage = weights.coverage()
+    cells = np.count_nonzero(weights.matrix, axis=1)
+    bloom: Dict[str, Dict[str, List[Optional[str]]]] = {}
+    for row, region_id in enumerate(weights.region_ids):
+        bloom[region_id] = {
+            str(first_year + index): [
+                slot_date(first_year + index, slot).isoformat() if slot >= 0 else None  # type: ignore[union-attr]
+                for slot in crossings[row, index].tolist()
+            ]
+            for index in range(years)
+        }
+    return {
+        "cell_deg": cell_deg,
+        "years": list(range(first_year, first_year + years)),
+        "curves": {
+            "file": "curves.u16",
+            "shape": [regions, years, SLOTS],
+            "scale": CURVE_SCALE,
+            "missing": CURVE_MISSING,
+        },
+        "thresholds": [{"plant": threshold.plant, "ts_start": threshold.gts} for threshold in thresholds],
+        "regions": [
+            {
+                "id": region_id,
+                "name": name,
+                "area_km2": round(float(area), 1),
+                "coverage": round(float(share), 3),
+                "cells": int(count),
+            }
+            for region_id, name, area, share, count in zip(
+                weights.region_ids, weights.names, weights.area_km2.tolist(), coverage.tolist(), cells.tolist()
+            )
+        ],
+        "bloom": bloom,
+    }
+
+
+# --- CLI ----------------------------------------------------------------------
+
+
+def _parse_years(text: str) -> Tuple[int, int]:
+    try:
+        first, _, last = text.partition(":")
+        return int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid year range '{text}' (expected FIRST:LAST).") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create and return argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Aggregate the GTS cube over GeoJSON regions into static bloom calendars.",
+        epilog=(
+            "Examples:\n"
+            "  beelot zonal -d cube -r landkreise.geojson -o site/zonal\n"
+            "  beelot zonal -d cube -r landkreise.geojson -o site/zonal --cell 0.25 --years 2015:2025\n"
+            "  beelot zonal -d cube -r regions.geojson -o out --id-property id --name-property name"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False,
+    )
+    parser.add_argument("-h", "--help", "-?", action="help", help="Show this help message and exit.")
+    parser.add_argument("-d", "--dir", required=True, help="Cube directory.")
+    parser.add_argument("-r", "--regions", required=True, help="GeoJSON file with Polygon/MultiPolygon regions.")
+    parser.add_argument("-o", "--output", required=True, help="Output directory of zonal.json and curves.u16.")
+    parser.add_argument(
+        "--cell", type=float, default=DEFAULT_CELL_DEG, help="Cell size around each location in degrees."
+    )
+    parser.add_argument("--years", type=_parse_years, default=None, help="Year range FIRST:LAST (default: all).")
+    parser.add_argument("--id-property", default=None, help=f"Region id property (default: {'/'.join(ID_PROPERTIES)}).")
+    parser.add_argument(
+        "--name-property", default=None, help=f"Region name property (default: {'/'.join(NAME_PROPERTIES)})."
+    )
+    parser.add_argument(
+        "--min-valid",
+        type=float,
+        default=DEFAULT_MIN_VALID,
+        help="Minimum share of a region's covered area with data (default: %(default)s).",
+    )
+    parser.add_argument("--weights", default=None, help="Weight cache (default: <cube>/zonal_<regions>.npz).")
+    parser.add_argument("--tracht", default=str(DEFAULT_INPUT), help=f"Tracht data file (default: {DEFAULT_INPUT}).")
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run CLI and return exit status."""
+    args = build_parser().parse_args(argv)
+    regions_path = Path(args.regions)
+    output = Path(args.output)
+    weights_path = Path(args.weights) if args.weights else Path(args.dir) / f"zonal_{regions_path.stem}.npz"
+
+    try:
+        thresholds = thresholds_from_tracht(parse_tracht_data(Path(args.tracht)))
+        with CubeStore.open(Path(args.dir)) as store:
+            id_properties = (args.id_property,) if args.id_property else ID_PROPERTIES
+            name_properties = (args.name_property,) if args.name_property else NAME_PROPERTIES
+            key = weights_key(regions_path, store.locations, args.cell, id_properties + name_properties)
+            weights = load_weights(weights_path, key)
+            cached = weights is not None
+            if weights is None:
+                regions = load_regions(regions_path, id_properties, name_properties)
+                weights = build_weights(regions, store.locations, args.cell, key)
+                save_weights(weights_path, weights)
+
+            first, last = args.years or (store.first_year, store.last_year)
+            begin, end = store.year_index(first), store.year_index(last) + 1
+            means = zonal_means(store.data()[:, begin:end], weights.matrix, args.min_valid)
+            payload = build_artifacts(weights, means, first, thresholds, args.cell)
+
+        output.mkdir(parents=True, exist_ok=True)
+        (output / "curves.u16").write_bytes(encode_curves(means))
+        (output / "zonal.json").write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    uncovered = sum(1 for region in payload["regions"] if region["cells"] == 0)
+    print(
+        f"Aggregated {len(weights.region_ids)} regions over {last - first + 1} years "
+        f"({'cached' if cached else 'new'} weights, {uncovered} regions without cells). Saved to {output}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
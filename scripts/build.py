@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""Run `beelot build` from a checkout without installing the package."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from beelot.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main(["build", *sys.argv[1:]]))
@@ -0,0 +1,166 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the analog-year search of beelot.analogs against a brute-force
+loop over a synthetic cube and runs `beelot analogs` on it.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+import numpy as np
+
+from beelot import analogs
+from beelot.analogs import crossing_slots, distances_km, find_analogs, query_slots
+from beelot.cube import CubeStore, calendar_slot
+from beelot.ensemble import Threshold
+from beelot.tracht_index import DEFAULT_INPUT
+
+TRACHT = str(Path(sys.argv[1]).parent / DEFAULT_INPUT)
+
+FIRST, LAST = 2001, 2024
+store = CubeStore.create(tmp / "cube", FIRST, LAST, capacity=4)
+rng = np.random.default_rng(11)
+start = date(FIRST, 1, 1)
+days = (date(LAST, 12, 31) - start).days + 1
+season = 8.0 - 10.0 * np.cos(2 * np.pi * np.arange(days) / 365.25)
+coordinates = {}
+for index in range(12):
+    location_id = f"loc-{index:02d}"
+    lat, lon = 47.5 + 0.4 * index, 9.0 + 0.3 * index
+    coordinates[location_id] = (lat, lon)
+    store.add_location(location_id, lat, lon)
+    store.write_days(location_id, start, season + rng.normal(0.0, 2.5, days) + 0.2 * index)
+store.close()
+
+store = CubeStore.open(tmp / "cube")
+thresholds = [Threshold("early", 80.0), Threshold("late", 350.0)]
+levels = np.array([item.gts for item in thresholds])
+query = np.array(store.series("loc-03", 2018), dtype=np.float64)
+query[calendar_slot(4, 10) + 1 :] = np.nan
+
+# Brute force: every (location, year) except the query year, RMSE over the known slots.
+known = np.flatnonzero(~np.isnan(query))
+known = known[known != 59]
+expected = []
+for location in store.locations:
+    for year in range(FIRST, LAST + 1):
+        if year == 2018:
+            continue
+        series = np.array(store.series(location.id, year), dtype=np.float64)
+        rmse = float(np.sqrt(np.mean((series[known] - query[known]) ** 2)))
+        expected.append((rmse, location.id, year))
+expected.sort()
+
+found = find_analogs(store, query, 2018, thresholds, k=6)
+assert [(item.location_id, item.year) for item in found] == [(loc, year) for _, loc, year in expected[:6]]
+assert np.allclose([item.rmse for item in found], [rmse for rmse, _, _ in expected[:6]])
+assert all(item.year != 2018 for item in found)
+for item in found:
+    series = np.array(store.series(item.location_id, item.year), dtype=np.float64)
+    first = [int(np.argmax(series >= level)) if (series >= level).any() else -1 for level in levels]
+    assert list(item.crossing_slots) == first, (item, first)
+    assert all(value is None or value.startswith(str(item.year)) for value in item.crossing_dates())
+
+# Radius limits the candidates; distances come from the haversine formula.
+center = coordinates["loc-03"]
+near = find_analogs(store, query, 2018, thresholds, k=50, center=center, radius_km=60.0)
+allowed = {
+    loc for loc, (lat, lon) in coordinates.items()
+    if distances_km(center[0], center[1], np.array([lat]), np.array([lon]))[0] <= 60.0
+}
+assert near and {item.location_id for item in near} <= allowed and len(allowed) < 12
+assert all(item.distance_km is not None and item.distance_km <= 60.0 for item in near)
+assert abs(distances_km(48.0, 11.0, np.array([49.0]), np.array([11.0]))[0] - 111.19) < 0.1
+
+# A window compares only the last known days; the query year of another location is excluded as well.
+windowed = find_analogs(store, query, 2018, thresholds, k=3, window=10)
+assert len(windowed) == 3 and all(item.year != 2018 for item in windowed)
+try:
+    find_analogs(store, np.full(366, np.nan), 2018, thresholds)
+except ValueError:
+    pass
+else:
+    raise AssertionError("an empty query must be rejected")
+
+# query_slots skips 29 February in common years; crossing_slots reports -1 if never reached.
+curve = query_slots(2023, np.arange(70, dtype=np.float64))
+assert np.isnan(curve[59]) and curve[60] == 59.0 and np.isnan(curve[71])
+assert crossing_slots(curve[None, :], np.array([10.0, 1000.0])).tolist() == [[10, -1]]
+
+# CLI: cube query and the same days given as a temperature file.
+output = tmp / "analogs.json"
+assert analogs.main(["-d", str(tmp / "cube"), "--id", "loc-03", "--year", "2018", "--until", "04-10",
+                     "-k", "4", "--tracht", TRACHT, "-o", str(output)]) == 0
+payload = json.loads(output.read_text(encoding="utf-8"))
+assert payload["year"] == 2018 and payload["until"] == "2018-04-10"
+assert [(item["id"], item["year"]) for item in payload["analogs"]] == [(loc, year) for _, loc, year in expected[:4]]
+assert payload["plants"] and all("expected" in plant for plant in payload["plants"])
+
+offset = (date(2018, 1, 1) - start).days
+temps = (season + 0.2 * 3)[offset : offset + 100]
+dates = [(date(2018, 1, 1) + timedelta(days=index)).isoformat() for index in range(100)]
+(tmp / "query.js").write_text(
+    f"const dates = {json.dumps(dates)};\nconst values = {json.dumps(temps.tolist())};\n", encoding="utf-8"
+)
+assert analogs.main(["-d", str(tmp / "cube"), "-i", str(tmp / "query.js"), "-l", "48.7,9.9",
+                     "--radius", "200", "--tracht", TRACHT, "-o", str(output)]) == 0
+payload = json.loads(output.read_text(encoding="utf-8"))
+assert payload["until"] == "2018-04-10" and 0 < len(payload["analogs"]) <= 5
+assert all(item["distance_km"] <= 200 for item in payload["analogs"])
+assert analogs.main(["-d", str(tmp / "cube"), "--tracht", TRACHT]) == 1
+EOF
+
+echo "OK"
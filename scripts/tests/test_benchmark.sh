@@ -0,0 +1,152 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Smoke test of beelot benchmark: runs the quick cases against a temporary
+baseline and checks the comparison and the regression exit status.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import contextlib
+import io
+import json
+import platform
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import benchmark
+
+
+def run(*args):
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        status = benchmark.main(["--quick", "--baseline", str(baseline_path), *args])
+    return status, out.getvalue(), err.getvalue()
+
+
+baseline_path = tmp / "baseline.json"
+
+# Without a baseline every case is new and the run passes.
+status, out, _ = run()
+assert status == 0, out
+assert "No baseline at" in out and " new " in out, out
+
+# --update-baseline records the cases and the environment.
+status, out, _ = run("--update-baseline")
+assert status == 0, out
+baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+assert baseline["environment"]["python"] == platform.python_version()
+assert baseline["environment"]["machine"] == platform.machine()
+names = set(baseline["cases"])
+assert names == {
+    "gts.parse_js_arrays[1y]",
+    "gts.calculate_gts[1y]",
+    "gts.write_output[1y]",
+    "naturadb_url_check.parse_js_file[1000]",
+    "naturadb_url_check.check_urls[20]",
+}, names
+for case in baseline["cases"].values():
+    assert case["items"] > 0 and case["items_per_second"] > 0 and case["peak_bytes"] > 0, case
+
+# The same machine with a generous tolerance shows no regression.
+status, out, err = run("--tolerance", "0.99")
+assert status == 0, out + err
+assert "No regressions" in out, out
+assert "numbers may not be comparable" not in out
+for name in names:
+    assert name in out, name
+
+# A baseline ten times faster than possible is a throughput regression.
+fast = json.loads(baseline_path.read_text(encoding="utf-8"))
+for case in fast["cases"].values():
+    case["items_per_second"] *= 10
+baseline_path.write_text(json.dumps(fast), encoding="utf-8")
+status, out, err = run("--only", "calculate_gts")
+assert status == 1, out + err
+assert "Regression: gts.calculate_gts[1y]: throughput" in err, err
+assert "parse_js_file" not in out
+
+# A baseline with tiny memory peaks is a memory regression.
+small = json.loads(json.dumps(baseline))
+for case in small["cases"].values():
+    case["peak_bytes"] = 1
+baseline_path.write_text(json.dumps(small), encoding="utf-8")
+status, out, err = run("--only", "gts.", "--tolerance", "0.99")
+assert status == 1, out + err
+assert "peak memory" in err, err
+
+# A baseline from another environment is used, but with a warning.
+other = json.loads(json.dumps(baseline))
+other["environment"]["python"] = "2.7.18"
+baseline_path.write_text(json.dumps(other), encoding="utf-8")
+status, out, _ = run("--only", "write_output", "--tolerance", "0.99")
+assert status == 0, out
+assert "numbers may not be comparable" in out and "--update-baseline" in out, out
+
+# Updating a subset keeps the other cases.
+status, _, _ = run("--only", "write_output", "--update-baseline")
+assert status == 0
+assert set(json.loads(baseline_path.read_text(encoding="utf-8"))["cases"]) == names
+
+status, out, _ = run("--only", "no-such-case")
+assert status == 0 and "No benchmark case matched." in out, out
+
+baseline_path.write_text("{", encoding="utf-8")
+status, _, err = run()
+assert status == 1 and "JSON parsing error" in err, err
+
+# The stored baseline covers the full cases and names its environment.
+stored = json.loads(benchmark.DEFAULT_BASELINE.read_text(encoding="utf-8"))
+assert set(stored["environment"]) == {"python", "implementation", "machine", "system"}
+assert "gts.calculate_gts[100y]" in stored["cases"]
+EOF
+
+echo "OK"
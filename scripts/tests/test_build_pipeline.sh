@@ -0,0 +1,179 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the stage graph, parallel execution, change detection and the
+critical-path report of beelot build.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import pipeline
+from beelot.pipeline import Stage
+
+root = tmp / "site"
+(root / "src").mkdir(parents=True)
+(root / "package.json").write_text("{}\n", encoding="utf-8")
+(root / "src" / "a.txt").write_text("alpha\n", encoding="utf-8")
+(root / "src" / "b.txt").write_text("beta\n", encoding="utf-8")
+shutil.copy(Path(sys.argv[1]).parent / "assets" / "js" / "tracht_data.js", root / "src" / "tracht_data.js")
+
+
+tool = tmp / "tool.py"
+tool.write_text(
+    "import sys, time\n"
+    "from pathlib import Path\n"
+    "action, *paths = sys.argv[1:]\n"
+    "if action == 'fail':\n"
+    "    sys.exit(3)\n"
+    "time.sleep(0.6 if action in ('upper', 'length') else 0.0)\n"
+    "text = ''.join(Path(path).read_text() for path in paths[:-1])\n"
+    "result = {'upper': text.upper(), 'length': str(len(text)), 'concat': text}[action]\n"
+    "Path(paths[-1]).parent.mkdir(exist_ok=True)\n"
+    "Path(paths[-1]).write_text(result)\n",
+    encoding="utf-8",
+)
+
+
+def tool_command(*args):
+    return (sys.executable, str(tool), *args)
+
+
+stages = [
+    Stage("a", tool_command("upper", "src/a.txt", "out/a.txt"), inputs=("src/a.txt",), outputs=("out/a.txt",)),
+    Stage("b", tool_command("length", "src/b.txt", "out/b.txt"), inputs=("src/b.txt",), outputs=("out/b.txt",)),
+    Stage(
+        "c",
+        tool_command("concat", "out/a.txt", "out/b.txt", "out/c.txt"),
+        inputs=("out/*.txt",),
+        outputs=("out/c.txt",),
+    ),
+    Stage("broken", tool_command("fail"), inputs=("src",)),
+    Stage("after-broken", tool_command("concat", "src/a.txt", "out/d.txt"), after=("broken",)),
+    Stage(
+        "tracht",
+        ("beelot", "tracht-index", "-i", "src/tracht_data.js", "-o", "gen/tracht_index.js"),
+        inputs=("src/tracht_data.js",),
+        outputs=("gen/tracht_index.js",),
+    ),
+]
+(root / "gen").mkdir()
+
+upstream = pipeline.dependencies(stages)
+assert upstream["c"] == {"a", "b"} and upstream["a"] == set() and upstream["after-broken"] == {"broken"}, upstream
+
+
+def build(**kwargs):
+    summary = pipeline.run_build(stages, root, max_workers=4, **kwargs)
+    return summary, {result.name: result.status for result in summary.results}
+
+
+summary, status = build()
+assert status == {
+    "a": "built", "b": "built", "c": "built", "broken": "failed", "after-broken": "skipped", "tracht": "built"
+}, status
+assert not summary.ok
+# a and b sleep 0.6 s each and run side by side.
+assert summary.wall_seconds < 1.1, summary.wall_seconds
+assert summary.critical_path[-1] == "c" and summary.critical_path[0] in ("a", "b"), summary.critical_path
+assert (root / "out" / "c.txt").read_text() == "ALPHA\n5"
+assert "TRACHT_INDEX_ENTRIES" in (root / "gen" / "tracht_index.js").read_text(encoding="utf-8")
+by_name = {result.name: result for result in summary.results}
+assert by_name["c"].start >= max(by_name["a"].end, by_name["b"].end)
+assert json.loads((root / pipeline.DEFAULT_STATE).read_text())["version"] == pipeline.STATE_VERSION
+
+summary, status = build()
+assert [name for name, value in status.items() if value == "up-to-date"] == ["a", "b", "c", "tracht"], status
+assert status["broken"] == "failed"
+
+# b runs again, but writes the same length, so c stays up to date.
+(root / "src" / "b.txt").write_text("BETA\n", encoding="utf-8")
+summary, status = build()
+assert status["a"] == "up-to-date" and status["b"] == "built" and status["c"] == "up-to-date", status
+
+# A changed or deleted output runs its stage and everything downstream.
+(root / "src" / "b.txt").write_text("gamma\n", encoding="utf-8")
+(root / "out" / "a.txt").unlink()
+summary, status = build()
+assert status["a"] == "built" and status["b"] == "built" and status["c"] == "built", status
+assert (root / "out" / "c.txt").read_text() == "ALPHA\n6"
+assert status["tracht"] == "up-to-date"
+summary, status = build(force=True)
+assert status["tracht"] == "built", status
+
+# Only the selected stages and their upstream stages.
+assert [stage.name for stage in pipeline.select_stages(stages, ["c"])] == ["a", "b", "c"]
+
+# Pipeline files add and replace stages; cycles are rejected.
+spec = tmp / "pipeline.json"
+spec.write_text(json.dumps({"stages": [
+    {"name": "c", "command": ["true"], "inputs": ["out/a.txt"], "outputs": ["out/c.txt"]},
+    {"name": "d", "command": ["true"], "inputs": ["out/c.txt"]},
+]}), encoding="utf-8")
+loaded = pipeline.load_pipeline(spec, stages)
+assert [stage.name for stage in loaded] == ["a", "b", "c", "broken", "after-broken", "tracht", "d"]
+assert pipeline.dependencies(loaded)["c"] == {"a"} and pipeline.dependencies(loaded)["d"] == {"c"}
+try:
+    pipeline.dependencies([Stage("x", ("true",), after=("y",)), Stage("y", ("true",), after=("x",))])
+except ValueError as exc:
+    assert "cycle" in str(exc)
+else:
+    raise AssertionError("cycle accepted")
+
+status = pipeline.main(["--root", str(root), "--stage", "tracht-index", "--list"])
+assert status == 0
+EOF
+
+echo "OK"
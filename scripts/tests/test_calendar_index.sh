@@ -0,0 +1,126 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the vectorized date parser and calendar table of
+beelot.calendar_index against numpy datetime64.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, sys.argv[1])
+from beelot import calendar_index as ci
+
+# Day numbers and fields against datetime64, inside and outside the table.
+days = np.arange(-140000, 90000, dtype=np.int64)
+iso = np.datetime_as_string(days.astype("datetime64[D]")).tolist()
+assert ci.iso_from_day_numbers(days) == iso
+assert (ci.day_numbers_from_iso(iso) == days).all()
+assert (ci.day_numbers_from_iso(np.array(iso)) == days).all()
+
+stamps = days.astype("datetime64[D]")
+year = stamps.astype("datetime64[Y]").astype(np.int64) + 1970
+month = stamps.astype("datetime64[M]").astype(np.int64) % 12 + 1
+day_of_year = days - stamps.astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+inside = (year >= ci.TABLE_FIRST_YEAR) & (year <= ci.TABLE_LAST_YEAR)
+for part in (days[inside], days[~inside], days):
+    fields = ci.fields(part)
+    select = np.isin(days, part)
+    assert (fields.year == year[select]).all()
+    assert (fields.month == month[select]).all()
+    assert (fields.day_of_year == day_of_year[select]).all()
+assert (ci.months(days) == month).all()
+
+# Slots: 29 February is slot 59, 1 March is 60 in every year.
+assert ci.slots([ci.day_number(date(2024, 2, 29))]).tolist() == [ci.FEB_29_SLOT]
+assert ci.slots([ci.day_number(date(2023, 3, 1)), ci.day_number(date(2024, 3, 1))]).tolist() == [60, 60]
+assert ci.calendar_slot(12, 31) == ci.SLOTS - 1
+assert len(ci.year_slots(2023)) == 365 and ci.FEB_29_SLOT not in ci.year_slots(2023)
+assert ci.slot_date(2023, ci.FEB_29_SLOT) is None and ci.slot_date(2024, 60) == date(2024, 3, 1)
+assert ci.from_day_number(ci.day_number(date(2026, 10, 19))) == date(2026, 10, 19)
+
+# GTS weights by month.
+weights = ci.gts_weights(ci.day_numbers_from_iso(["2024-01-31", "2024-02-29", "2024-03-01"]))
+assert weights.tolist() == [0.5, 0.75, 1.0], weights
+
+# Invalid strings are masked, also when they misalign the joined buffer.
+bad = ["2023-02-29", "2024-13-01", "2024-00-10", "2024-04-31", "2024/01/01", "2024-01-1", "02024-01-01", "", "0000-01-01"]
+numbers, valid = ci.parse_iso_dates(["2024-02-29"] + bad)
+assert valid.tolist() == [True] + [False] * len(bad), valid
+assert numbers[0] == ci.day_number(date(2024, 2, 29)) and (numbers[1:] == 0).all()
+numbers, valid = ci.parse_iso_dates(["2024-01-1", "02024-01-01"])
+assert not valid.any()
+
+# Characters below '0' are not digits on the unicode path (numpy input, non-ASCII
+# strings, or items that are not 10 characters long) nor on the ASCII fast path.
+below_zero = ["2024-1/-05", "2024-01-0.", "20 4-01-05", "2024-01-0*"]
+for dates in (below_zero, below_zero + ["2024-01-01x"], np.array(below_zero), below_zero + ["2024-01-0\u00e9"]):
+    numbers, valid = ci.parse_iso_dates(dates)
+    assert not valid.any(), (dates, valid)
+    assert (numbers == 0).all()
+try:
+    ci.day_numbers_from_iso(["2024-01-01", "2024-1/-05", "x"])
+except ValueError as exc:
+    assert "2024-1/-05" in str(exc)
+else:
+    raise AssertionError("malformed date accepted")
+try:
+    ci.day_numbers_from_iso(["2024-01-01", "2024-02-30"])
+except ValueError as exc:
+    assert "2024-02-30" in str(exc)
+else:
+    raise AssertionError("invalid date accepted")
+assert ci.parse_iso_dates([])[0].size == 0
+EOF
+
+echo "OK"
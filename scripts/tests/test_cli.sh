@@ -0,0 +1,167 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the beelot command: help, unknown subcommands, dispatch through the
+scripts/*.py wrappers, and that cheap subcommands load neither numpy nor
+requests.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import ast
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+scripts_dir = Path(sys.argv[1])
+sys.path.insert(0, str(scripts_dir))
+tmp = Path(sys.argv[2])
+
+from beelot.cli import SUBCOMMANDS
+
+env = dict(os.environ, PYTHONPATH=str(scripts_dir))
+
+
+def beelot(*args, cwd=tmp):
+    return subprocess.run(
+        [sys.executable, "-m", "beelot", *args], cwd=cwd, env=env, capture_output=True, text=True
+    )
+
+
+# Help lists every subcommand; no arguments behaves the same.
+for args in ((), ("--help",), ("-h",), ("-?",)):
+    result = beelot(*args)
+    assert result.returncode == 0, (args, result.stderr)
+    assert result.stdout.startswith("beelot <subcommand> [options]"), result.stdout
+    for name, command in SUBCOMMANDS.items():
+        assert f"  {name} " in result.stdout and command.summary in result.stdout, name
+
+# Unknown subcommands fail with the usage on stderr.
+result = beelot("no-such-command")
+assert result.returncode == 1, result.returncode
+assert result.stdout == ""
+assert result.stderr.startswith("Error: unknown subcommand: no-such-command"), result.stderr
+assert "Subcommands:" in result.stderr
+
+# Every subcommand points at an existing module.
+for name, command in SUBCOMMANDS.items():
+    assert importlib.util.find_spec(f"beelot.{command.module}") is not None, name
+
+# Every scripts/*.py wrapper dispatches to a known subcommand.
+wrappers = {}
+for path in sorted(scripts_dir.glob("*.py")):
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    calls = [
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "main"
+    ]
+    assert len(calls) == 1, path.name
+    subcommand = calls[0].args[0].elts[0].value
+    assert subcommand in SUBCOMMANDS, (path.name, subcommand)
+    wrappers[path.name] = subcommand
+assert wrappers["gts.py"] == "gts" and wrappers["sync_versions.py"] == "sync-versions", wrappers
+
+for name in wrappers:
+    command = [sys.executable, str(scripts_dir / name), "--help"]
+    result = subprocess.run(command, cwd=tmp, capture_output=True, text=True)
+    assert result.returncode == 0, (name, result.stderr)
+    assert result.stdout.strip(), name
+
+# A wrapper passes its arguments and exit status through.
+(tmp / "assets" / "js").mkdir(parents=True)
+(tmp / "assets" / "js" / "version.js").write_text('export const VERSION = "1.2.3";\n', encoding="utf-8")
+(tmp / "package.json").write_text(json.dumps({"name": "beelot", "version": "1.2.3"}) + "\n", encoding="utf-8")
+wrapper = [sys.executable, str(scripts_dir / "sync_versions.py"), "--source", "max", "--check"]
+result = subprocess.run(wrapper, cwd=tmp, capture_output=True, text=True)
+assert result.returncode == 0, result.stdout + result.stderr
+(tmp / "package.json").write_text(json.dumps({"name": "beelot", "version": "1.2.4"}) + "\n", encoding="utf-8")
+result = subprocess.run(wrapper, cwd=tmp, capture_output=True, text=True)
+assert result.returncode != 0, result.stdout
+(tmp / "package.json").write_text(json.dumps({"name": "beelot", "version": "1.2.3"}) + "\n", encoding="utf-8")
+
+# Cheap subcommands must not load the heavy dependencies.
+probe = """
+import contextlib, io, sys
+from beelot.cli import main
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    try:
+        status = main(sys.argv[1:])
+    except SystemExit as exc:
+        status = exc.code
+heavy = sorted(name for name in ("numpy", "requests") if name in sys.modules)
+print(status, ",".join(heavy) or "-")
+"""
+cheap = [
+    ["--help"],
+    ["gts", "--help"],
+    ["sync-versions", "--source", "max", "--check"],
+    ["preflight", "--dryrun"],
+    ["release", "--help"],
+    ["hotfix", "--help"],
+    ["build", "--help"],
+    ["urlcheck", "--help"],
+    ["downsample", "--help"],
+    ["tracht-index", "--help"],
+    ["fixtures", "--help"],
+    ["geoindex", "--help"],
+    ["serve", "--help"],
+    ["standin", "--help"],
+    ["benchmark", "--help"],
+]
+for args in cheap:
+    result = subprocess.run([sys.executable, "-c", probe, *args], cwd=tmp, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, (args, result.stderr)
+    status, heavy = result.stdout.split()
+    assert status in ("0", "None"), (args, status)
+    assert heavy == "-", f"beelot {' '.join(args)} imported {heavy}"
+EOF
+
+echo "OK"
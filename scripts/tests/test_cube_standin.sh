@@ -0,0 +1,254 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Builds a GTS cube from the local Open-Meteo stand-in and checks its
+layout, zero-copy queries, in-place appends, growth and the generators.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import contextlib
+import io
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import cube, updater
+from beelot.ensemble import Threshold
+from beelot.heatsum import GTS, accumulate_series
+from beelot.openmeteo import fetch_daily
+from beelot.standin import OpenMeteoStandIn
+
+today = date.today()
+cube_dir = tmp / "cube"
+assert cube.main(["init", "-d", str(cube_dir), "--years", f"2023:{today.year}", "--capacity", "1"]) == 0
+assert cube.main(["init", "-d", str(cube_dir), "--years", "2023:2024"]) == 1
+
+locations = {"a1": (48.14, 11.58), "b2": (52.52, 13.40), "c3": (50.94, 6.96)}
+with OpenMeteoStandIn() as standin:
+    args = ["fill", "-d", str(cube_dir), "--start", "2023-01-01", "--end", "2024-12-31"]
+    for location_id, (lat, lon) in locations.items():
+        args += ["-l", f"{location_id}={lat},{lon}"]
+    assert cube.main(args + ["--archive-url", standin.archive_url]) == 0
+    dates, values = fetch_daily(standin.archive_url, 52.52, 13.40, date(2023, 1, 1), date(2024, 12, 31))
+
+    with cube.CubeStore.open(cube_dir) as store:
+        # Capacity 1 grew to hold all locations without losing rows.
+        assert [loc.id for loc in store.locations] == ["a1", "b2", "c3"]
+        expected = accumulate_series(dates[:365], values[:365], [GTS])["gts"]
+        common = store.series("b2", 2023)
+        assert np.isnan(common[cube.FEB_29_SLOT])
+        assert np.allclose(common[cube.year_slots(2023)], expected, atol=0.01)
+        expected = accumulate_series(dates[365:], values[365:], [GTS])["gts"]
+        assert np.allclose(store.series("b2", 2024)[cube.year_slots(2024)], expected, atol=0.01)
+
+        # Queries are read-only views of the mapping.
+        april = store.calendar_day(4, 1)
+        assert april.shape == (3, store.years)
+        assert np.shares_memory(april, store._cube) and not april.flags.writeable
+        assert np.shares_memory(store.day(date(2024, 4, 1)), store._cube)
+        assert np.shares_memory(store.location("a1"), store._cube)
+        assert april[1, 0] == store.series("b2", 2023)[cube.calendar_slot(4, 1)]
+        assert april[1, 1] == store.day(date(2024, 4, 1))[1]
+        try:
+            store.write_days("a1", date(2023, 1, 1), [1.0])
+        except PermissionError:
+            pass
+        else:
+            raise AssertionError("read-only store accepted a write")
+
+    # Appending continues the GTS in place and clears the stale tail.
+    with cube.CubeStore.open(cube_dir, writable=True) as store:
+        before = store.series("a1", 2024)[cube.calendar_slot(6, 30)]
+        store.write_days("a1", date(2024, 7, 1), [20.0, 21.0])
+        series = store.series("a1", 2024)
+        assert np.isclose(series[cube.calendar_slot(7, 2)], before + 41.0)
+        assert np.isnan(series[cube.calendar_slot(7, 3)])
+        try:
+            store.write_days("a1", date(2024, 7, 10), [20.0])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("write after a gap was accepted")
+
+    with cube.CubeStore.open(cube_dir) as store:
+        slots = cube.bloom_slots(store, 2023, [Threshold("Früh", 50.0), Threshold("Nie", 99999.0)])
+        gts = store.series("c3", 2023)[cube.year_slots(2023)]
+        first = int(np.searchsorted(gts, 50.0))
+        assert slots[2, 0] == cube.year_slots(2023)[first] and slots[2, 1] == -1, slots
+        tables = cube.bloom_tables(store, 2023, [Threshold("Früh", 50.0)])
+        assert tables["c3"][0]["date"] == date.fromordinal(date(2023, 1, 1).toordinal() + first).isoformat()
+        quantiles = cube.climatology(store, "b2", [0.5])
+        assert quantiles.shape == (1, cube.SLOTS)
+
+    assert cube.main(["day", "-d", str(cube_dir), "--date", "2024-04-01", "-o", str(tmp / "layer.json")]) == 0
+    layer = json.loads((tmp / "layer.json").read_text(encoding="utf-8"))
+    assert [feature["properties"]["id"] for feature in layer["features"]] == ["a1", "b2", "c3"]
+    assert layer["features"][1]["geometry"]["coordinates"] == [13.40, 52.52]
+    assert cube.main(["compare", "-d", str(cube_dir), "--day", "04-01", "-o", str(tmp / "compare.json")]) == 0
+    compare = json.loads((tmp / "compare.json").read_text(encoding="utf-8"))
+    assert compare["years"][0] == 2023 and compare["gts"]["b2"][-1] is None
+
+    # Climatology curves, complete and downsampled for charts within an error bound.
+    climatology_args = ["climatology", "-d", str(cube_dir), "--id", "b2", "-o", str(tmp / "clim.json")]
+    assert cube.main(climatology_args) == 0
+    full = json.loads((tmp / "clim.json").read_text(encoding="utf-8"))
+    assert full["slots"] == list(range(cube.SLOTS)) and len(full["quantiles"]["0.9"]) == cube.SLOTS
+    assert cube.main(climatology_args + ["--max-points", "20", "--max-error", "2"]) == 0
+    small = json.loads((tmp / "clim.json").read_text(encoding="utf-8"))
+    assert 20 <= len(small["slots"]) < 200 and small["slots"] == sorted(small["slots"])
+    for q, values in small["quantiles"].items():
+        assert None not in values and values == [full["quantiles"][q][slot] for slot in small["slots"]]
+        present = [slot for slot, value in enumerate(full["quantiles"][q]) if value is not None]
+        curve = np.interp(present, small["slots"], values)
+        assert np.abs(curve - [full["quantiles"][q][slot] for slot in present]).max() <= 2.01, q
+    with contextlib.redirect_stderr(io.StringIO()):
+        assert cube.main(climatology_args + ["--max-error", "2"]) == 1
+
+    # The updater feeds the settled days of the current year into the cube.
+    state = ["--state-dir", str(tmp / "state")]
+    assert updater.main(state + ["add", "d4", "47.37,8.54"]) == 0
+    (tmp / "tracht_data.js").write_text(
+        'export const defaultTrachtData = [\n'
+        '  { active: true, plant: "Früh", TS_start: 50, TS_end: 120, url: "" },\n'
+        '];\n',
+        encoding="utf-8",
+    )
+    config = updater.UpdaterConfig(
+        state_dir=tmp / "state",
+        output_dir=tmp / "out",
+        thresholds=updater.thresholds_from_tracht(updater.parse_tracht_data(tmp / "tracht_data.js")),
+        archive_url=standin.archive_url,
+        forecast_url=standin.forecast_url,
+        spread_seconds=0.0,
+        cube_dir=cube_dir,
+    )
+    results = updater.run_tick(config, today)
+    assert all(result.error is None for result in results), results
+    settled = updater.load_state(tmp / "state", "d4", today.year).settled
+
+    # The first tick of a new year extends the year axis; earlier years are kept.
+    next_year = date(today.year + 1, 1, 10)
+    with cube.CubeStore.open(cube_dir) as store:
+        before = store.data().copy()
+    results = updater.run_tick(config, next_year)
+    assert all(result.error is None for result in results), results
+    with cube.CubeStore.open(cube_dir) as store:
+        assert (store.first_year, store.last_year) == (2023, today.year + 1)
+        assert np.array_equal(store.data()[:, :-1], before, equal_nan=True)
+        settled_next = updater.load_state(tmp / "state", "d4", next_year.year).settled
+        assert np.count_nonzero(~np.isnan(store.series("d4", next_year.year))) == len(settled_next)
+        assert np.isnan(store.series("a1", next_year.year)).all()
+
+# A year before the cube is skipped with a warning instead of failing the location.
+with OpenMeteoStandIn() as standin:
+    config = updater.UpdaterConfig(
+        state_dir=tmp / "state",
+        output_dir=tmp / "out",
+        thresholds=config.thresholds,
+        archive_url=standin.archive_url,
+        forecast_url=standin.forecast_url,
+        spread_seconds=0.0,
+        cube_dir=cube_dir,
+    )
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        results = updater.run_tick(config, date(2022, 6, 1))
+    assert all(result.error is None for result in results), results
+    assert "2022 is outside the cube" in out.getvalue(), out.getvalue()
+
+# `beelot cube extend` appends empty years and keeps the data.
+other_dir = tmp / "extend"
+assert cube.main(["init", "-d", str(other_dir), "--years", "2023:2023", "--capacity", "2"]) == 0
+with cube.CubeStore.open(other_dir, writable=True) as store:
+    store.add_location("x", 50.0, 10.0)
+    store.write_days("x", date(2023, 1, 1), [0.0] * 364)
+with contextlib.redirect_stdout(io.StringIO()):
+    assert cube.main(["init", "-d", str(other_dir), "--years", "2023:2024"]) == 1
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    assert cube.main(["extend", "-d", str(other_dir), "--to", "2025"]) == 0
+    assert cube.main(["extend", "-d", str(other_dir), "--to", "2024"]) == 0
+assert "already covers 2023-2025" in out.getvalue(), out.getvalue()
+with cube.CubeStore.open(other_dir, writable=True) as store:
+    assert store.years == 3 and not np.isnan(store.series("x", 2023)[cube.calendar_slot(12, 30)])
+    assert np.isnan(store.data()[:, 1:]).all()
+    store.write_days("x", date(2023, 12, 31), [10.0, 10.0])
+    assert np.isclose(store.series("x", 2024)[0], 5.0)
+    store.add_location("y", 51.0, 11.0)
+    store.add_location("z", 52.0, 12.0)
+    assert store.extend_years(2026) and len(store) == 3
+assert not list(other_dir.glob(".*.tmp"))
+
+# A data file that does not match the index is refused.
+with open(other_dir / cube.DATA_FILE, "r+b") as handle:
+    handle.truncate(1024)
+try:
+    cube.CubeStore.open(other_dir)
+except ValueError as exc:
+    assert "bytes" in str(exc)
+else:
+    raise AssertionError("mismatched data file accepted")
+
+with cube.CubeStore.open(cube_dir) as store:
+    assert "d4" in store
+    stored = store.series("d4", today.year)[cube.year_slots(today.year)]
+    assert np.count_nonzero(~np.isnan(stored)) == len(settled)
+    expected = accumulate_series(
+        [date.fromordinal(date(today.year, 1, 1).toordinal() + i).isoformat() for i in range(len(settled))],
+        settled,
+        [GTS],
+    )["gts"]
+    assert np.allclose(stored[: len(settled)], expected, atol=0.01)
+EOF
+
+echo "OK"
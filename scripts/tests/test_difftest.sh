@@ -0,0 +1,95 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Runs the differential test of the Python GTS engines against calculateGTS
+in logic.js (needs node) and checks that a mismatch is shrunk to one day.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+if ! command -v node >/dev/null 2>&1; then
+  echo "SKIP: node not found"
+  exit 0
+fi
+
+python3 - "$SCRIPTS_DIR" <<'EOF'
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+logic = Path(sys.argv[1]).parent / "assets" / "js" / "logic.js"
+
+from beelot import difftest
+from beelot.heatsum import GTS, accumulate_series, to_fixed
+
+assert to_fixed(1.125) == 1.13 and to_fixed(0.375) == 0.38 and to_fixed(2.675) == 2.67
+
+for engine in sorted(difftest.ENGINES):
+    done, _, mismatches = difftest.run_difftest(logic, engine, 2000, seed=1)
+    assert done == 2000 and not mismatches, (engine, mismatches)
+
+# The month comes from the ISO string, so the result is the same in every time zone.
+for tz in ("America/New_York", "UTC", "Asia/Tokyo"):
+    done, _, mismatches = difftest.run_difftest(logic, "gts", 1000, seed=2, tz=tz)
+    assert done == 1000 and not mismatches, (tz, mismatches)
+
+# Python's round() rounds ties to even; the harness must find and shrink that.
+def round_half_even(dates, values):
+    if not dates:
+        return []
+    series = accumulate_series(dates, values, [GTS])[GTS.name]
+    return [(day, round(gts, 2)) for day, gts in zip(dates, series.tolist())]
+
+
+difftest.ENGINES["round"] = round_half_even
+_, _, mismatches = difftest.run_difftest(logic, "round", 2000, seed=1, max_mismatches=1)
+assert len(mismatches) == 1, mismatches
+dates, values = mismatches[0].minimal
+assert len(dates) == 1 and len(values) == 1, mismatches[0].minimal
+EOF
+
+echo "OK"
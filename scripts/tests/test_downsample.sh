@@ -0,0 +1,174 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the LTTB and min/max downsampling of beelot.downsample, the error
+bound of refine_to_error and the JSON output of beelot downsample.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import downsample as ds
+
+
+def assert_indices(indices, count):
+    assert indices[0] == 0 and indices[-1] == count - 1, indices[:3] + indices[-3:]
+    assert all(a < b for a, b in zip(indices, indices[1:])), "indices must strictly increase"
+
+
+def raises(exc_type, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except exc_type:
+        return
+    raise AssertionError(f"{func.__name__} did not raise {exc_type.__name__}")
+
+
+rng = random.Random(29)
+count = 1000
+xs = list(range(count))
+noisy = [math.sin(i / 40.0) * 10 + rng.uniform(-3, 3) for i in xs]
+gts = []
+total = 0.0
+for i in xs:
+    total += max(0.0, 8 * math.sin(math.pi * i / 365.0) + rng.uniform(-4, 4))
+    gts.append(total)
+
+# LTTB: exactly the requested number of points.
+for threshold in (3, 10, 100, 300, 999):
+    for ys in (noisy, gts):
+        indices = ds.lttb(xs, ys, threshold)
+        assert len(indices) == threshold, (threshold, len(indices))
+        assert_indices(indices, count)
+assert ds.lttb(xs, noisy, count) == xs
+assert ds.lttb(xs, noisy, 2) == xs
+raises(ValueError, ds.lttb, xs[:-1], noisy, 10)
+
+# LTTB keeps a lone spike.
+spike = [0.0] * count
+spike[517] = 100.0
+assert 517 in ds.lttb(xs, spike, 20)
+
+# Min/max envelope: the extremes of every bucket survive.
+for bucket_count in (1, 7, 50, 200):
+    indices = ds.minmax_envelope(noisy, bucket_count)
+    assert_indices(indices, count)
+    assert len(indices) <= 2 * bucket_count + 2
+    kept = set(indices)
+    size = count / bucket_count
+    for bucket in range(bucket_count):
+        window = noisy[int(bucket * size):min(int((bucket + 1) * size), count)]
+        values = {noisy[i] for i in kept if int(bucket * size) <= i < int((bucket + 1) * size)}
+        assert min(window) in values and max(window) in values, bucket
+assert ds.minmax_envelope(noisy, 0) == xs
+assert ds.minmax_envelope(noisy[:10], 4) == list(range(10))
+
+# For a monotone curve the envelope is the bucket boundaries.
+indices = ds.minmax_envelope(gts, 10)
+assert set(indices) >= {0, 99, 100, 199, 999}, indices
+
+# refine_to_error keeps the input indices and meets the bound.
+for base in (ds.lttb(xs, noisy, 20), ds.minmax_envelope(gts, 5), [0, count - 1]):
+    for ys in (noisy, gts):
+        for max_error in (5.0, 1.0, 0.25, 0.0):
+            refined = ds.refine_to_error(xs, ys, base, max_error)
+            assert_indices(refined, count)
+            assert set(base) <= set(refined)
+            assert ds.max_interpolation_error(xs, ys, refined) <= max_error, (max_error, len(refined))
+assert ds.refine_to_error(xs, noisy, [], 1.0)[0] == 0
+assert ds.refine_to_error(xs, [], [], 1.0) == []
+raises(ValueError, ds.refine_to_error, xs, noisy, [0], -1.0)
+
+# A straight line needs no extra points.
+line = [2.0 * i + 1 for i in xs]
+assert ds.refine_to_error(xs, line, [0, count - 1], 0.0) == [0, count - 1]
+
+# downsample: method dispatch and the error bound overriding max_points.
+assert ds.downsample(xs, noisy, 50) == ds.lttb(xs, noisy, 50)
+assert ds.downsample(xs, noisy, 50, method="minmax") == ds.minmax_envelope(noisy, 24)
+bounded = ds.downsample(xs, noisy, 50, max_error=0.5)
+assert len(bounded) > 50 and ds.max_interpolation_error(xs, noisy, bounded) <= 0.5
+raises(ValueError, ds.downsample, xs, noisy, 50, method="nearest")
+
+# downsample_gts_series keeps labels and values together.
+labels = [f"d{i}" for i in xs]
+small_labels, small_values = ds.downsample_gts_series(labels, gts, 40)
+assert len(small_labels) == len(small_values) == 40
+assert all(gts[int(label[1:])] == value for label, value in zip(small_labels, small_values))
+raises(ValueError, ds.downsample_gts_series, labels[:-1], gts, 40)
+
+# CLI: extra keys survive, the series is reduced.
+source = tmp / "year.json"
+target = tmp / "year_small.json"
+source.write_text(json.dumps({"labels": labels, "gtsValues": gts, "year": 2024}), encoding="utf-8")
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    assert ds.main(["-i", str(source), "-o", str(target), "--max-points", "60", "--max-error", "2"]) == 0
+assert "Downsampled to" in out.getvalue()
+data = json.loads(target.read_text(encoding="utf-8"))
+assert data["year"] == 2024
+assert len(data["labels"]) == len(data["gtsValues"]) >= 60
+kept = [int(label[1:]) for label in data["labels"]]
+assert_indices(kept, count)
+assert ds.max_interpolation_error(xs, gts, kept) <= 2
+
+with contextlib.redirect_stderr(io.StringIO()) as err:
+    assert ds.main(["-i", str(tmp / "missing.json"), "-o", str(target)]) == 1
+assert err.getvalue().startswith("Error: ")
+EOF
+
+echo "OK"
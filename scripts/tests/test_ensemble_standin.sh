@@ -0,0 +1,145 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Runs the ensemble bloom-date engine against the local Open-Meteo stand-in
+and checks the crossing dates against a brute-force scan.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+cat > "$TMP_DIR/tracht_data.js" <<'EOF'
+export const defaultTrachtData = [
+  { active: true, plant: "Früh", TS_start: 50, TS_end: 120, url: "" },
+  { active: true, plant: "Mitte", TS_start: 180, TS_end: 260, url: "" },
+  { active: true, plant: "Spät", TS_start: 2000, TS_end: 2100, url: "" },
+];
+EOF
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import ensemble
+from beelot.standin import OpenMeteoStandIn
+
+with OpenMeteoStandIn(members=51) as standin:
+    status = ensemble.main(
+        [
+            "-l", "48.14,11.58",
+            "-l", "52.52,13.40",
+            "--today", "2026-03-20",
+            "--tracht", str(tmp / "tracht_data.js"),
+            "--members-url", standin.ensemble_url,
+            "--archive-url", standin.archive_url,
+            "--forecast-url", standin.forecast_url,
+            "-o", str(tmp / "bloom.json"),
+        ]
+    )
+    assert status == 0, status
+    observed, dates, members = ensemble.fetch_location(
+        48.14,
+        11.58,
+        date(2026, 3, 20),
+        16,
+        standin.ensemble_url,
+        standin.forecast_url,
+        "icon_seamless",
+        standin.archive_url,
+    )
+
+result = json.loads((tmp / "bloom.json").read_text(encoding="utf-8"))
+assert result["members"] == 51, result["members"]
+assert result["forecast_dates"] == ["2026-03-20", "2026-04-04"], result["forecast_dates"]
+plants = {item["plant"]: item for item in result["locations"][0]["plants"]}
+assert plants["Früh"]["already_reached"] is True
+assert plants["Spät"]["probability"] == 0.0 and plants["Spät"]["p50"] is None
+
+# Brute force: first day on which each member reaches TS_start of "Mitte".
+crossings = []
+for row in members.tolist():
+    total = observed
+    index = len(dates)
+    for day, value in enumerate(row):
+        total += max(0.0, value)
+        if total >= 180:
+            index = day
+            break
+    crossings.append(index)
+crossings.sort()
+median = crossings[(len(crossings) + 1) // 2 - 1]
+mitte = plants["Mitte"]
+assert mitte["already_reached"] is False and mitte["p10"] != mitte["p90"], mitte
+assert mitte["probability"] == round(sum(i < len(dates) for i in crossings) / len(crossings), 4), mitte
+assert mitte["p50"] == (dates[median] if median < len(dates) else None), (mitte, crossings)
+assert [location["members"] for location in result["locations"]] == [51, 51]
+
+# Members with a missing day are left out instead of counting it as 0 °C.
+thresholds = ensemble.thresholds_from_tracht(ensemble.parse_tracht_data(tmp / "tracht_data.js"))
+complete = ensemble.forecast_bloom_dates(dates, members, [observed], thresholds)
+gappy = np.concatenate([members, np.full((3, len(dates)), 30.0)])
+gappy[-3:, 2] = np.nan
+assert ensemble.forecast_bloom_dates(dates, gappy, [observed], thresholds) == complete
+assert ensemble.complete_members(gappy).sum() == len(members)
+both = ensemble.forecast_bloom_dates(dates, np.stack([gappy, gappy[::-1]]), [observed, observed], thresholds)
+assert both == [complete[0], complete[0]]
+gappy[:, 0] = np.nan
+try:
+    ensemble.forecast_bloom_dates(dates, gappy, [observed], thresholds)
+except ValueError as exc:
+    assert "missing days" in str(exc), exc
+else:
+    raise AssertionError("forecast without a complete member accepted")
+EOF
+
+echo "OK"
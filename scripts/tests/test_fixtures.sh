@@ -0,0 +1,119 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Renders a fixture manifest with beelot.fixtures, checks the output against
+beelot gts and verifies that unchanged scenarios are skipped.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+mkdir -p "$TMP_DIR/data"
+cat > "$TMP_DIR/data/sample.js" <<'EOF'
+const dates = ['2024-01-30', '2024-01-31', '2024-02-01', '2024-02-29', '2024-03-01'];
+const values = [2.0, -3.5, 4.0, 6.2, 10.0];
+EOF
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import fixtures, gts
+from beelot.standin import OpenMeteoStandIn
+
+manifest = tmp / "manifest.json"
+manifest.write_text(
+    json.dumps(
+        {
+            "output_dir": "out",
+            "scenarios": [
+                {"name": "sample", "input": "data/sample.js"},
+                {"name": "leap-february", "synthetic": {"start": "2024-02-20", "days": 14, "mean": 3, "seed": 1}},
+                {"name": "negative-winter", "synthetic": {"start": "2023-12-15", "days": 60, "mean": -6, "amplitude": 2}},
+                {"name": "munich-2023", "location": [48.14, 11.58], "year": 2023},
+            ],
+        }
+    ),
+    encoding="utf-8",
+)
+
+with OpenMeteoStandIn() as standin:
+    archive = ["--archive-url", standin.archive_url]
+    assert fixtures.main(["-m", str(manifest), "-j", "2"] + archive) == 0
+    out = tmp / "out"
+
+    # The rendered expectation equals `beelot gts` on the same input.
+    assert gts.main(["-i", str(tmp / "data" / "sample.js"), "-o", str(tmp / "single.txt")]) == 0
+    assert (out / "sample.expect.txt").read_text() == (tmp / "single.txt").read_text()
+
+    # Rendered inputs round-trip through parse_js_arrays.
+    dates, values = gts.parse_js_arrays(out / "leap-february.input.js")
+    assert "2024-02-29" in dates and len(values) == 14, dates
+    dates, values = gts.parse_js_arrays(out / "munich-2023.input.js")
+    assert len(dates) == 365 and dates[0] == "2023-01-01", dates[:2]
+    assert any(value < 0 for value in gts.parse_js_arrays(out / "negative-winter.input.js")[1])
+
+    results = fixtures.generate(manifest, jobs=2, archive_url=standin.archive_url)
+    assert all(result.skipped for result in results), results
+    requests_before = standin.request_count
+
+    (tmp / "data" / "sample.js").write_text(
+        "const dates = ['2024-03-01'];\nconst values = [7.5];\n", encoding="utf-8"
+    )
+    results = fixtures.generate(manifest, jobs=2, archive_url=standin.archive_url)
+    assert [result.name for result in results if not result.skipped] == ["sample"], results
+    assert standin.request_count == requests_before
+    assert "gts: 7.5" in (out / "sample.expect.txt").read_text()
+
+lock = json.loads((out / fixtures.LOCK_FILE).read_text(encoding="utf-8"))
+assert sorted(lock) == ["leap-february", "munich-2023", "negative-winter", "sample"], lock
+EOF
+
+echo "OK"
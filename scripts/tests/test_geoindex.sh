@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Builds the offline geocoding index from a small place extract and checks
+prefix search, typo fallback and reverse lookup across tile borders.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+cat > "$TMP_DIR/places.geojson" <<'EOF'
+{
+  "type": "FeatureCollection",
+  "features": [
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [11.5755, 48.1374]}, "properties": {"name": "München", "place": "city", "population": "1512491"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [11.6500, 48.0900]}, "properties": {"name": "Münchenstein", "place": "village"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [7.6261, 51.9607]}, "properties": {"name": "Münster", "place": "city", "population": "316403"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [11.0000, 48.0400]}, "properties": {"name": "Grenzdorf", "place": "hamlet"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [10.9300, 47.9300]}, "properties": {"name": "Randhof", "place": "hamlet"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [8.5417, 47.3769]}, "properties": {"name": "Zürich", "place": "city", "addr:country": "CH"}},
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [11.5, 48.1]}, "properties": {"name": "Bahnhof", "place": "locality"}},
+    {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[1, 2], [3, 4]]}, "properties": {"name": "Weg", "place": "town"}}
+  ]
+}
+EOF
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import geoindex
+
+assert geoindex.main(["-i", str(tmp / "places.geojson"), "-o", str(tmp / "geo")]) == 0
+index = geoindex.GeoIndex(tmp / "geo")
+assert index.manifest["settlements"] == 6, index.manifest
+
+names = [row[0] for row in index.search("mün")]
+assert names == ["München", "Münster", "Münchenstein"], names
+assert index.fetches == 1
+assert [row[0] for row in index.search("  MÜNCHEN ")] == ["München", "Münchenstein"]
+assert index.search("Zürich")[0][4] == "ch"
+assert index.search("x") == [] and index.search("Bahnhof") == []
+
+# "Nünchen" has no prefix match; its typo candidate "München" has.
+assert index.search("Nünchen")[0][0] == "München"
+assert index.search("Nünchen", typos=False) == []
+
+assert index.reverse(48.14, 11.58)[0] == "München"
+# Just across the tile border at 48.0 from Grenzdorf, and Randhof is farther.
+assert index.reverse(47.99, 11.01)[0] == "Grenzdorf"
+assert index.reverse(47.96, 10.95)[0] == "Randhof"
+assert index.reverse(53.5, 10.0) is None
+EOF
+
+echo "OK"
@@ -0,0 +1,159 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the heat-sum presets, metric specs, accumulate_series and the JSON
+output of beelot heatsum, and that `beelot gts --help` does not load numpy.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import math
+import random
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+import numpy as np
+
+from beelot import heatsum
+from beelot.heatsum import GDD5, GDD10, GTS, UNWEIGHTED, HeatSumMetric, parse_metric_spec
+
+# 1 January to 31 March of a leap year.
+start = date(2024, 1, 1)
+dates = [(start + timedelta(days=offset)).isoformat() for offset in range(91)]
+values = [-2.0 + 0.25 * offset for offset in range(91)]
+
+sums = heatsum.accumulate_series(dates, values, [GTS, GDD5, GDD10, UNWEIGHTED])
+assert list(sums) == ["gts", "gdd5", "gdd10", "sum"]
+for metric in (GTS, GDD5, GDD10, UNWEIGHTED):
+    total, expected = 0.0, []
+    for day, value in zip(dates, values):
+        total += max(0.0, value - metric.base_temperature) * metric.weight_for_month(int(day[5:7]))
+        expected.append(total)
+    assert np.allclose(sums[metric.name], expected), metric.name
+assert GTS.weight_for_month(1) == 0.5 and GTS.weight_for_month(2) == 0.75 and GTS.weight_for_month(3) == 1.0
+assert sums["gts"][0] == 0.0 and sums["gdd10"][40] == 0.0
+assert set(heatsum.PRESETS) == {"gts", "gdd5", "gdd10", "sum"}
+
+# Metric specs: presets, custom bases and weights, invalid specs.
+assert parse_metric_spec("gdd5") is GDD5
+custom = parse_metric_spec("spring:2.5:1=0,2=0.5")
+assert custom == HeatSumMetric("spring", 2.5, {1: 0.0, 2: 0.5})
+assert parse_metric_spec("gdd8:8") == HeatSumMetric("gdd8", 8.0, {})
+for spec in ("unknown", ":5", "a:b", "x:1:13=0.5", "x:1:1=", "x:1:2:3"):
+    try:
+        parse_metric_spec(spec)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"accepted {spec!r}")
+for bad in (([GTS, GTS], dates, values), ([GTS], dates[:-1], values)):
+    try:
+        heatsum.accumulate_series(bad[1], bad[2], bad[0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid input accepted")
+
+# JS rounding: half away from zero on the exact binary value.
+assert heatsum.to_fixed(1.125) == 1.13 and heatsum.to_fixed(-1.125) == -1.13 and heatsum.to_fixed(2.675) == 2.67
+
+# The vectorized rounding agrees with to_fixed, including exact and near ties.
+samples = [k / 1000 for k in range(-5000, 5000)] + [1.005, 2.675, 0.375, 1e20, float("inf")]
+rng = random.Random(38)
+samples += [rng.uniform(-2000, 2000) for _ in range(20000)]
+rounded = heatsum.to_fixed_array(np.array(samples)).tolist()
+assert rounded == [heatsum.to_fixed(value) for value in samples]
+assert math.isnan(heatsum.to_fixed_array(np.array([float("nan")]))[0])
+
+# The Jest expectation block is rendered while the rows are produced.
+from beelot import gts
+
+consumed = []
+
+
+def rows():
+    for row in gts.calculate_gts(dates, values):
+        consumed.append(row)
+        yield row
+
+
+lines = gts.render_expectation(rows())
+assert next(lines).startswith("        expect(result)") and next(lines).startswith("            // 0 + ")
+assert len(consumed) == 1
+block = "".join(lines)
+assert len(consumed) == len(dates) and block.endswith("        ]);\n")
+assert "* 0.5) = " in block and "* 0.75) = " in block and "* 1.0) = " in block
+
+# CLI JSON output.
+source = tmp / "input.js"
+source.write_text(f"const dates = {json.dumps(dates)};\nconst values = {json.dumps(values)};\n", encoding="utf-8")
+output = tmp / "sums.json"
+assert heatsum.main(["-i", str(source), "-o", str(output), "-m", "gts", "-m", "gdd8:8"]) == 0
+payload = json.loads(output.read_text(encoding="utf-8"))
+assert payload["dates"] == dates and list(payload["metrics"]) == ["gts", "gdd8"]
+assert payload["metrics"]["gts"] == [heatsum.to_fixed(value) for value in sums["gts"].tolist()]
+assert heatsum.main(["-i", str(source), "-o", str(output)]) == 0
+assert list(json.loads(output.read_text(encoding="utf-8"))["metrics"]) == ["gts", "gdd5", "gdd10", "sum"]
+assert heatsum.main(["-i", str(source), "-o", str(output), "-m", "bad"]) == 1
+
+# `beelot gts --help` stays cheap: numpy is only imported for the computation.
+probe = (
+    "import sys; sys.argv = ['beelot', 'gts', '--help']; from beelot.cli import main\n"
+    "try:\n    main()\nexcept SystemExit:\n    pass\n"
+    "assert 'numpy' not in sys.modules, 'numpy imported'"
+)
+subprocess.run([sys.executable, "-c", probe], cwd=sys.argv[1], check=True, stdout=subprocess.DEVNULL)
+EOF
+
+echo "OK"
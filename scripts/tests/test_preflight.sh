@@ -0,0 +1,183 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks that beelot.preflight runs checks concurrently, prefixes their output,
+cancels the remaining checks (and their child processes) on the first failure
+and reports it in the summary and the exit status.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import preflight
+from beelot.preflight import Check
+
+python = sys.executable
+child_pid_file = tmp / "child.pid"
+
+
+def process_alive(pid):
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+# The sleeping check starts a grandchild like npm starts jest workers; the
+# failing check waits until that grandchild exists, then fails.
+sleeper = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+    f"open({str(child_pid_file)!r}, 'w').write(str(child.pid))\n"
+    "print('sleeping', flush=True)\n"
+    "time.sleep(30)\n"
+)
+failer = (
+    "import os, sys, time\n"
+    f"while not os.path.exists({str(child_pid_file)!r}): time.sleep(0.02)\n"
+    "time.sleep(0.1)\n"
+    "print('boom', flush=True)\n"
+    "sys.exit(3)\n"
+)
+checks = [
+    Check("pass", [python, "-c", "print('fine')"]),
+    Check("fail", [python, "-c", failer]),
+    Check("sleep", [python, "-c", sleeper]),
+]
+
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    summary = preflight.run_preflight(checks, max_workers=3)
+    preflight.print_summary(summary)
+text = out.getvalue()
+
+results = {result.name: result for result in summary.results}
+assert [result.name for result in summary.results] == ["pass", "fail", "sleep"]
+assert results["pass"].status == preflight.STATUS_PASSED and results["pass"].returncode == 0
+assert results["fail"].status == preflight.STATUS_FAILED and results["fail"].returncode == 3
+assert results["sleep"].status == preflight.STATUS_CANCELLED, results["sleep"]
+assert results["sleep"].returncode != 0
+assert not summary.ok
+assert summary.wall_seconds < 15, summary.wall_seconds
+
+child_pid = int(child_pid_file.read_text())
+deadline = time.monotonic() + 5
+while process_alive(child_pid) and time.monotonic() < deadline:
+    time.sleep(0.05)
+assert not process_alive(child_pid), "grandchild of the cancelled check survived"
+
+# Output lines carry the padded check name.
+assert "[pass ]\033[0m fine" in text, text
+assert "[fail ]\033[0m boom" in text, text
+assert "[sleep]\033[0m sleeping" in text, text
+
+assert "Pre-flight summary:" in text
+summary_lines = text[text.index("Pre-flight summary:"):].splitlines()
+assert any(line.strip().startswith("fail") and "failed" in line for line in summary_lines), text
+assert any(line.strip().startswith("sleep") and "cancelled" in line for line in summary_lines), text
+assert any(line.strip().startswith("wall") and "serial would be" in line for line in summary_lines), text
+
+# Checks not started before the failure are skipped.
+child_pid_file.unlink()
+serial = [
+    Check("fail", [python, "-c", "import sys; sys.exit(1)"]),
+    Check("later", [python, "-c", "print('never')"]),
+]
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    summary = preflight.run_preflight(serial, max_workers=1)
+assert [result.status for result in summary.results] == [preflight.STATUS_FAILED, preflight.STATUS_SKIPPED]
+assert "never" not in out.getvalue()
+
+# A command that cannot be started counts as a failure.
+with contextlib.redirect_stdout(io.StringIO()):
+    summary = preflight.run_preflight([Check("missing", [str(tmp / "no-such-command")])])
+assert summary.results[0].status == preflight.STATUS_FAILED and summary.results[0].returncode is None
+
+# main: exit status and summary for a failing and a passing set of checks.
+original_default_checks = preflight.default_checks
+stderr = io.StringIO()
+preflight.default_checks = lambda source: [checks[0], serial[0]]
+try:
+    with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(stderr):
+        status = preflight.main([])
+finally:
+    preflight.default_checks = original_default_checks
+assert status == 1
+assert "Pre-flight checks failed: fail" in stderr.getvalue(), stderr.getvalue()
+assert "Pre-flight summary:" in out.getvalue()
+
+preflight.default_checks = lambda source: checks[:1]
+try:
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        status = preflight.main(["--jobs", "1"])
+finally:
+    preflight.default_checks = original_default_checks
+assert status == 0
+assert "All pre-flight checks passed." in out.getvalue()
+
+# Dry run prints the default commands and runs nothing.
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    status = preflight.main(["--dryrun", "--source", "version-js"])
+assert status == 0
+text = out.getvalue()
+assert "[test] npm test --silent" in text, text
+assert "sync_versions.py --source version-js --check" in text, text
+assert "[build] npm run --if-present --silent build" in text, text
+assert "Pre-flight summary:" not in text
+EOF
+
+echo "OK"
@@ -0,0 +1,164 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks validation and gap filling of beelot.quality and the batch
+`beelot quality` run over good, gappy and broken input files.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+import numpy as np
+
+from beelot import gts, heatsum, quality
+from beelot.quality import DataQualityError, clean_series, fill_gaps
+
+# Duplicates, unordered and missing dates, nulls, an implausible value and trailing nulls.
+dates = [
+    "2024-01-01", "2024-01-02", "2024-01-04", "2024-01-03", "2024-01-03",
+    "2024-01-05", "2024-01-09", "2024-01-10", "not-a-date", "2024-01-11", "2024-01-12",
+]
+values = [2.0, 4.0, None, 6.0, 99.0, 10.0, 12.0, 150.0, 1.0, None, None]
+series = clean_series(dates, values, max_gap=3)
+report = series.report
+assert report.entries == 11 and report.invalid_dates == 1, report
+assert report.nulls == 3 and report.implausible == 2, report
+assert report.duplicates == 1 and report.unordered == 1, report
+assert report.missing_dates == 3, report
+assert report.trimmed == 3 and report.days == 9, report
+assert report.filled == 4 and report.unfilled == 0 and report.ok, report
+assert series.dates()[0] == "2024-01-01" and series.dates()[-1] == "2024-01-09"
+# First non-null value per day wins, the Jan 4 null and Jan 6-8 are interpolated.
+expected = [2.0, 4.0, 6.0, 8.0, 10.0, 10.5, 11.0, 11.5, 12.0]
+assert np.allclose(series.values, expected), series.values
+
+# Gaps longer than max_gap and leading gaps stay NaN.
+kept = clean_series(["2024-01-01", "2024-01-02", "2024-01-06"], [None, 1.0, 5.0], max_gap=2)
+assert kept.report.unfilled == 4 and not kept.report.ok, kept.report
+assert math.isnan(kept.values[0]) and np.isnan(kept.values[2:5]).all()
+try:
+    clean_series(["2024-01-01", "2024-01-06"], [1.0, 5.0], max_gap=2, strict=True)
+except DataQualityError:
+    pass
+else:
+    raise AssertionError("strict mode must reject remaining gaps")
+try:
+    clean_series(["x"], [1.0])
+except DataQualityError:
+    pass
+else:
+    raise AssertionError("a series without valid dates must be rejected")
+
+# fill_gaps handles many runs at once and matches per-run interpolation.
+rng = np.random.default_rng(7)
+data = rng.normal(5.0, 3.0, 2000)
+holes = data.copy()
+holes[rng.choice(np.arange(1, 1999), 400, replace=False)] = np.nan
+reference = holes.copy()
+filled = fill_gaps(holes, 2000)
+known = np.flatnonzero(~np.isnan(reference))
+assert filled == int(np.isnan(reference).sum())
+assert np.allclose(holes, np.interp(np.arange(2000), known, reference[known]))
+
+# Clean input passes unchanged, so GTS stays identical to calculate_gts.
+clean_dates = [f"2024-02-{day:02d}" for day in range(1, 29)]
+clean_values = [float(day % 7) - 1.0 for day in range(28)]
+unchanged = clean_series(clean_dates, clean_values)
+assert unchanged.report.summary() == "28 days" and unchanged.dates() == clean_dates
+assert gts.calculate_gts(unchanged.dates(), unchanged.values.tolist()) == gts.calculate_gts(clean_dates, clean_values)
+
+# Input files: JS arrays with nulls, an Open-Meteo response, a long gap and a broken file.
+(tmp / "gappy.js").write_text(
+    'const dates = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"];\n'
+    "const values = [1.0, null, 3.0, 4.0, null];\n",
+    encoding="utf-8",
+)
+(tmp / "response.json").write_text(
+    json.dumps({"daily": {"time": clean_dates, "temperature_2m_mean": clean_values}}), encoding="utf-8"
+)
+(tmp / "holes.json").write_text(
+    json.dumps({"daily": {"time": ["2024-01-01", "2024-01-09"], "temperature_2m_mean": [1.0, 2.0]}}),
+    encoding="utf-8",
+)
+(tmp / "holes.js").write_text(
+    'const dates = ["2024-01-01", "2024-01-09"];\nconst values = [1.0, 2.0];\n', encoding="utf-8"
+)
+(tmp / "broken.js").write_text("const dates = [];\n", encoding="utf-8")
+
+inputs = [str(tmp / name) for name in ("gappy.js", "response.json", "holes.json", "broken.js")]
+report_path = tmp / "quality.jsonl"
+status = quality.main(inputs + ["--output-dir", str(tmp / "clean"), "--report", str(report_path)])
+assert status == 1
+lines = [json.loads(line) for line in report_path.read_text(encoding="utf-8").splitlines()]
+assert len(lines) == 4
+assert lines[0]["ok"] and lines[0]["filled"] == 1 and lines[0]["trimmed"] == 1
+assert lines[1]["ok"] and lines[1]["days"] == 28
+assert not lines[2]["ok"] and lines[2]["unfilled"] == 7
+assert "error" in lines[3]
+cleaned = json.loads((tmp / "clean" / "gappy.json").read_text(encoding="utf-8"))
+assert cleaned["dates"] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+assert cleaned["values"] == [1.0, 2.0, 3.0, 4.0] and cleaned["quality"]["nulls"] == 2
+assert quality.main(inputs[:2]) == 0
+
+# --max-gap makes gts and heatsum accept the gappy file.
+assert gts.main(["-i", inputs[0], "-o", str(tmp / "plain.txt")]) == 1
+assert gts.main(["-i", inputs[0], "-o", str(tmp / "gts.txt"), "--max-gap", "2"]) == 0
+assert gts.main(["-i", str(tmp / "holes.js"), "-o", str(tmp / "x.txt"), "--max-gap", "2"]) == 1
+assert heatsum.main(["-i", inputs[0], "-o", str(tmp / "sums.json"), "--max-gap", "2", "-m", "gts"]) == 0
+sums = json.loads((tmp / "sums.json").read_text(encoding="utf-8"))
+assert len(sums["dates"]) == 4 and all(value is not None for value in sums["metrics"]["gts"])
+EOF
+
+echo "OK"
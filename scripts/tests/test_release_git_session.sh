@@ -0,0 +1,174 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Exercises the GitSession layer of release_from_dev.py against a local
+bare repository that stands in for origin.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+export GIT_AUTHOR_NAME="test" GIT_AUTHOR_EMAIL="test@example.com"
+export GIT_COMMITTER_NAME="test" GIT_COMMITTER_EMAIL="test@example.com"
+
+git init -q --bare "$TMP_DIR/origin.git"
+git init -q -b main "$TMP_DIR/beelot"
+
+pushd "$TMP_DIR/beelot" >/dev/null
+git remote add origin "$TMP_DIR/origin.git"
+mkdir -p assets/js
+cat > assets/js/version.js <<'EOF'
+// assets/js/version.js
+export const VERSION = "0.2.1";
+EOF
+cat > package.json <<'EOF'
+{
+  "name": "beelot-test",
+  "version": "0.2.3"
+}
+EOF
+git add -A
+git commit -q -m "initial"
+git branch dev
+git tag -a v0.2.0 -m "Release 0.2.0"
+git push -q -u origin main dev v0.2.0
+git tag -a v0.2.9 -m "local only"
+
+python3 - "$SCRIPTS_DIR" <<'EOF'
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from beelot import release_from_dev as release
+
+with release.GitSession(dryrun=False) as session:
+    versions = release.read_versions_from_branch(session, "dev")
+    assert versions == ("0.2.1", "0.2.3"), versions
+    assert release.max_version(*versions) == "0.2.3"
+
+    assert session.is_worktree_clean()
+
+    remote_old = session.submit(session.remote_tag_exists, "v0.2.0")
+    remote_local_only = session.submit(session.remote_tag_exists, "v0.2.9")
+    local_local_only = session.submit(session.local_tag_exists, "v0.2.9")
+    local_missing = session.submit(session.local_tag_exists, "v9.9.9")
+    assert remote_old.result()[0] is True
+    assert remote_local_only.result()[0] is False
+    assert local_local_only.result()[0] is True
+    assert local_missing.result()[0] is False
+
+    try:
+        release.read_versions_from_branch(session, "no-such-branch")
+    except RuntimeError as exc:
+        assert "missing" in str(exc), exc
+    else:
+        raise AssertionError("expected missing branch to fail")
+
+with release.GitSession(dryrun=True) as session:
+    assert session.remote_tag_exists("v0.2.0") is False
+EOF
+
+# A failing pre-flight check leaves main where it was; a passing one releases.
+git checkout -q dev
+echo "feature" > feature.txt
+git add feature.txt
+git commit -q -m "feature"
+git push -q
+git checkout -q main
+python3 - "$SCRIPTS_DIR" <<'EOF'
+import contextlib
+import io
+import subprocess
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from beelot import release_from_dev as release
+
+
+def git(*args):
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def failing_preflight(version_source, dryrun):
+    raise RuntimeError("Pre-flight checks failed: tests")
+
+
+main_before = git("rev-parse", "main")
+release.run_sync_versions = lambda dryrun: None
+release.run_release_preflight = failing_preflight
+with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()) as err:
+    try:
+        release.main(["--apply"])
+    except SystemExit as exc:
+        assert exc.code == 1
+    else:
+        raise AssertionError("release succeeded despite failing checks")
+assert "Pre-flight checks failed" in err.getvalue(), err.getvalue()
+assert "main is unchanged" in out.getvalue(), out.getvalue()
+assert git("rev-parse", "HEAD") == main_before and git("branch", "--show-current") == "main"
+assert git("status", "--porcelain") == ""
+assert git("rev-parse", "origin/main") == main_before and not git("tag", "--list", "v0.2.3")
+
+release.run_release_preflight = lambda version_source, dryrun: None
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    release.main(["--apply"])
+assert "Release completed successfully" in out.getvalue(), out.getvalue()
+assert git("ls-remote", "--tags", "origin", "v0.2.3")
+assert git("rev-parse", "origin/main") == git("rev-parse", "origin/dev") == git("rev-parse", "dev")
+EOF
+
+echo "dirty" > untracked.txt
+python3 - "$SCRIPTS_DIR" <<'EOF'
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from beelot import release_from_dev as release
+
+with release.GitSession(dryrun=False) as session:
+    assert not session.is_worktree_clean()
+EOF
+popd >/dev/null
+
+echo "OK"
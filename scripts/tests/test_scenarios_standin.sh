@@ -0,0 +1,142 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the what-if scenario engine on hand-computed series and runs
+`beelot scenarios` against the local Open-Meteo stand-in.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import scenarios
+from beelot.ensemble import Threshold, thresholds_from_tracht
+from beelot.standin import OpenMeteoStandIn
+from beelot.tracht_index import DEFAULT_INPUT, parse_tracht_data
+
+# 10 °C every day from 1 April on: the GTS grows by 10 per day.
+dates = [(date(2023, 4, 1) + timedelta(days=offset)).isoformat() for offset in range(30)]
+base = [10.0] * 30
+batch = [
+    scenarios.Scenario("+0", offset=0.0),
+    scenarios.Scenario("+10", offset=10.0),
+    scenarios.Scenario("-10 in April", deltas={4: -10.0}),
+    scenarios.Scenario("+10 in May only", offset=10.0, months=frozenset({5})),
+]
+results = scenarios.run_scenarios(dates, base, batch, [Threshold("A", 100.0), Threshold("B", 1000.0)])
+assert [result.name for result in results] == ["base", "+0", "+10", "-10 in April", "+10 in May only"]
+assert results[0].dates == ["2023-04-10", None]
+assert results[1].shifts == [0, None]
+assert results[2].dates[0] == "2023-04-05" and results[2].shifts == [-5, None]
+assert results[3].dates == [None, None] and results[3].shifts == [None, None]
+assert results[4].shifts == [0, None] and results[4].final_gts == 300.0
+
+# Substitution by calendar day; 29 February of a common year comes from 28 February.
+leap_dates = ["2024-02-28", "2024-02-29", "2024-03-01"]
+table = scenarios.by_calendar_slot(["2023-02-28", "2023-03-01"], [1.0, 2.0])
+matrix = scenarios.scenario_matrix(
+    leap_dates, [0.0, 0.0, 0.0], [scenarios.Scenario("2023", substitute=2023)], {2023: table}
+)
+assert matrix.tolist() == [[1.0, 1.0, 2.0]], matrix
+
+# Hundreds of scenarios for all plants of tracht_data.js stay well under a second.
+tracht = Path(sys.argv[1]).parent / DEFAULT_INPUT
+thresholds = thresholds_from_tracht(parse_tracht_data(tracht))
+year = [(date(2023, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(365)]
+rng = np.random.default_rng(1)
+temps = (8 - 10 * np.cos(2 * np.pi * (np.arange(365) - 15) / 365.25) + rng.normal(0, 3, 365)).round(1).tolist()
+many = [scenarios.Scenario(f"{offset:+.2f}", offset=offset) for offset in np.linspace(-3, 3, 500)]
+start = time.perf_counter()
+results = scenarios.run_scenarios(year, temps, many, thresholds)
+elapsed = time.perf_counter() - start
+assert elapsed < 1.0, elapsed
+shifts = np.array([[np.nan if s is None else s for s in result.shifts] for result in results[1:]])
+# Warmer never blooms later.
+assert np.all(np.nan_to_num(np.diff(shifts, axis=0), nan=0.0) <= 0)
+
+past = 2023  # common year, like its substitute 2022
+(tmp / "scenarios.json").write_text(
+    json.dumps(
+        [
+            {"name": "same", "offset": 0},
+            {"name": "warm spring", "offset": 1.5, "months": [3, 4, 5]},
+            {"name": "other year", "substitute": past - 1},
+        ]
+    ),
+    encoding="utf-8",
+)
+with OpenMeteoStandIn() as standin:
+    status = scenarios.main(
+        [
+            "-l", "48.14,11.58", "--year", str(past), "-s", str(tmp / "scenarios.json"),
+            "--offsets", "-1", "--tracht", str(tracht), "--archive-url", standin.archive_url, "-o", str(tmp / "shifts.json"),
+        ]
+    )
+    assert status == 0
+    other_dates, other_values = scenarios.fetch_year(standin.archive_url, 48.14, 11.58, past - 1)
+
+report = json.loads((tmp / "shifts.json").read_text(encoding="utf-8"))
+by_name = {item["name"]: item for item in report["scenarios"]}
+assert list(by_name) == ["same", "warm spring", "other year", "-1 °C"]
+assert all(shift in (0, None) for shift in by_name["same"]["shifts"])
+assert all(shift is None or shift <= 0 for shift in by_name["warm spring"]["shifts"])
+assert all(shift is None or shift >= 0 for shift in by_name["-1 °C"]["shifts"])
+other = scenarios.run_scenarios(other_dates, other_values, [], thresholds)[0]
+assert [d and d[5:] for d in by_name["other year"]["dates"]] == [d and d[5:] for d in other.dates]
+EOF
+
+echo "OK"
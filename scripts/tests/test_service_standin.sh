@@ -0,0 +1,142 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Runs the GTS HTTP service against the local Open-Meteo stand-in and checks
+the response shape, cache keys, request coalescing and the directory store.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import service
+from beelot.gts import calculate_gts
+from beelot.openmeteo import fetch_daily
+from beelot.standin import OpenMeteoStandIn
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+assert service.compute_cache_key("historical", 48.135, 11.0, "2024") == "historical_48.14_11_2024"
+assert service.compute_cache_key("recent", -33.868, 151.2093, "a_b") == "recent_-33.87_151.21_a_b"
+
+past = date.today().year - 2
+query = f"lat=48.14&lon=11.58&year={past}&start={past}-03-01&end={past}-04-10"
+with OpenMeteoStandIn() as standin:
+    gts_service = service.GTSService(
+        standin.archive_url, standin.forecast_url, store=service.DirectoryCacheStore(tmp / "store")
+    )
+    with service.GTSServiceThread(gts_service) as server:
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            responses = list(pool.map(get, [f"{server.url}/gts?{query}"] * 20))
+        assert all(status == 200 for status, _ in responses), responses[0]
+        assert all(payload == responses[0][1] for _, payload in responses)
+        # Twenty concurrent requests, one full-year fetch upstream.
+        assert standin.request_count == 1, standin.request_count
+        status, stats = get(f"{server.url}/stats")
+        assert stats["upstream_fetches"] == 1 and stats["lru_hits"] + stats["coalesced"] == 19, stats
+
+        dates, values = fetch_daily(standin.archive_url, 48.14, 11.58, date(past, 1, 1), date(past, 4, 11))
+        expected = [
+            item for item in calculate_gts(dates, values) if f"{past}-03-01" <= item["date"] <= f"{past}-04-10"
+        ]
+        payload = responses[0][1]
+        assert payload["year"] == past
+        assert payload["labels"][0] == "1.3" and payload["labels"][-1] == "10.4", payload["labels"]
+        assert payload["gtsValues"] == [item["gts"] for item in expected]
+
+        # The current year is fetched once and then served from the LRU.
+        before = standin.request_count
+        status, current = get(f"{server.url}/gts?lat=52.52&lon=13.40")
+        assert status == 200 and current["year"] == date.today().year, current
+        assert get(f"{server.url}/gts?lat=52.52&lon=13.40")[1] == current
+        assert standin.request_count == before + 1
+
+        assert get(f"{server.url}/gts?lat=abc&lon=1")[0] == 400
+        assert get(f"{server.url}/gts?lat=48&lon=11&year=1800")[0] == 400
+        assert get(f"{server.url}/nope")[0] == 404
+        assert get(f"{server.url}/health") == (200, {"ok": True})
+
+    assert (tmp / "store" / f"historical_48.14_11.58_{past}.json").exists()
+
+    # A restarted service answers past years from the directory store.
+    fresh = service.GTSService(
+        standin.archive_url, standin.forecast_url, store=service.DirectoryCacheStore(tmp / "store")
+    )
+    with service.GTSServiceThread(fresh) as server:
+        before = standin.request_count
+        assert get(f"{server.url}/gts?{query}")[1] == payload
+        assert standin.request_count == before
+        assert get(f"{server.url}/stats")[1]["store_hits"] == 1
+
+lru = service.LRUCache(2)
+lru.set("a", 1)
+lru.set("b", 2)
+lru.get("a")
+lru.set("c", 3)
+assert lru.get("b") is None and lru.get("a") == 1 and lru.get("c") == 3
+lru.set("d", 4, ttl_s=0.0)
+assert lru.get("d") is None
+EOF
+
+echo "OK"
@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the priority merge of beelot.stitch and fetches a stitched series
+from the local Open-Meteo stand-in.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import stitch
+from beelot.standin import ARCHIVE_DELAY_DAYS, OpenMeteoStandIn
+
+series = stitch.stitch(
+    [
+        stitch.DailySource(stitch.FORECAST, ["2026-01-03", "2026-01-04", "2026-01-05"], [1.0, 2.0, 3.0]),
+        stitch.DailySource(stitch.ERA5, ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"], [5.0, None, 7.0, None]),
+        stitch.DailySource(stitch.RECENT, ["2026-01-04"], [9.0]),
+    ]
+)
+assert series.dates() == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04", "2026-01-05"]
+assert series.provenance.tolist() == [stitch.ERA5, stitch.MISSING, stitch.ERA5, stitch.RECENT, stitch.FORECAST]
+assert series.missing_days() == 1
+# January is weighted 0.5; the missing day contributes nothing.
+assert series.gts().tolist() == [2.5, 2.5, 6.0, 10.5, 12.0], series.gts()
+
+today = date.today()
+with OpenMeteoStandIn() as standin:
+    status = stitch.main(
+        [
+            "-l", "48.14,11.58",
+            "--start", (today - timedelta(days=30)).isoformat(),
+            "--end", (today + timedelta(days=6)).isoformat(),
+            "--archive-url", standin.archive_url,
+            "--forecast-url", standin.forecast_url,
+            "-o", str(tmp / "series.json"),
+        ]
+    )
+    assert status == 0, status
+    assert standin.request_count == 2, standin.request_count
+
+result = json.loads((tmp / "series.json").read_text(encoding="utf-8"))
+expected = ["era5"] * (31 - ARCHIVE_DELAY_DAYS) + ["recent"] * (ARCHIVE_DELAY_DAYS - 1) + ["forecast"] * 7
+assert result["provenance"] == expected, result["provenance"]
+assert None not in result["values"]
+assert result["dates"][30] == today.isoformat()
+EOF
+
+echo "OK"
@@ -0,0 +1,122 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the tracht_data.js parser and the interval index of beelot.tracht_index
+against a linear scan, and that assets/js/tracht_index.js is up to date.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import sys
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+repo = Path(sys.argv[1]).parent
+
+from beelot import tracht_index as ti
+
+# Commented-out and inactive rows are skipped; a missing TS_end means a single GTS value.
+source = tmp / "tracht_data.js"
+source.write_text(
+    "export const defaultTrachtData = [\n"
+    '  { active: true, plant: "A", TS_start: 0, TS_end: 10, url: "" },\n'
+    '  { active: true, plant: "B", TS_start: 10, TS_end: 10, url: "" },\n'
+    '  { active: false, plant: "C", TS_start: 5, TS_end: 8, url: "" },\n'
+    '  // { active: true, plant: "D", TS_start: 1, TS_end: 2, url: "" },\n'
+    '  { active: true, plant: "E", TS_start: 11, url: "https://example.org/e" },\n'
+    "];\n",
+    encoding="utf-8",
+)
+intervals = ti.parse_tracht_data(source)
+assert [(item.plant, item.ts_start, item.ts_end) for item in intervals] == [("A", 0, 10), ("B", 10, 10), ("E", 11, 11)]
+assert intervals[2].url == "https://example.org/e" and intervals[2].line_no == 6
+
+# Intervals the sweep cannot represent are rejected, when parsing and when indexing.
+for row in ('{ plant: "X", TS_start: 20, TS_end: 10 }', '{ plant: "X", TS_start: -10, TS_end: -5 }'):
+    bad = tmp / "bad.js"
+    bad.write_text(f"export const defaultTrachtData = [\n  {row},\n];\n", encoding="utf-8")
+    try:
+        ti.parse_tracht_data(bad)
+    except ValueError as exc:
+        assert "line 2" in str(exc), exc
+    else:
+        raise AssertionError(f"accepted {row}")
+for start, end in ((-10, -5), (20, 10)):
+    try:
+        ti.TrachtIntervalIndex(intervals + [ti.TrachtInterval("X", start, end, None, 9)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"indexed [{start}, {end}]")
+
+# Lookups agree with a linear scan using the float comparison of the client.
+defaults = ti.parse_tracht_data(repo / ti.DEFAULT_INPUT)
+for entries in (intervals, defaults):
+    index = ti.TrachtIntervalIndex(entries)
+    key = lambda item: (item.ts_start, item.ts_end, item.line_no)
+    for step in range(-4, 4 * index.max_gts + 8):
+        gts = step / 4
+        expected = [item for item in entries if item.ts_start <= gts <= item.ts_end]
+        assert sorted(index.active_at(gts), key=key) == sorted(expected, key=key), gts
+    for low in range(0, index.max_gts + 50, 25):
+        found = index.starting_between(low, low + 60)
+        assert found == sorted((item for item in entries if low <= item.ts_start <= low + 60), key=key)
+index = ti.TrachtIntervalIndex(intervals)
+assert [item.plant for item in index.active_at(10)] == ["A", "B"] and index.active_at(10.5) == []
+assert [item.plant for item in index.active_at(11)] == ["E"] and index.active_at(11.5) == []
+
+# The committed module is what the generator writes for the default data.
+output = tmp / "tracht_index.js"
+assert ti.main(["-i", str(repo / ti.DEFAULT_INPUT), "-o", str(output)]) == 0
+generated = output.read_text(encoding="utf-8").splitlines()[2:]
+assert generated == (repo / ti.DEFAULT_OUTPUT).read_text(encoding="utf-8").splitlines()[2:]
+assert ti.main(["-i", str(tmp / "missing.js"), "-o", str(output)]) == 1
+EOF
+
+echo "OK"
@@ -0,0 +1,129 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Runs the incremental updater against the local Open-Meteo stand-in: a
+second tick fetches only the unsettled days and rewrites no artifacts, and a
+location that lost its state is rebuilt without touching the others.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import sys
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import updater
+from beelot.standin import ARCHIVE_DELAY_DAYS, OpenMeteoStandIn
+
+state = ["--state-dir", str(tmp / "state")]
+assert updater.main(state + ["add", "a1", "48.14,11.58"]) == 0
+assert updater.main(state + ["add", "b2", "52.52,13.40"]) == 0
+assert [loc.id for loc in updater.load_locations(tmp / "state")] == ["a1", "b2"]
+
+(tmp / "tracht_data.js").write_text(
+    'export const defaultTrachtData = [\n'
+    '  { active: true, plant: "Früh", TS_start: 50, TS_end: 120, url: "" },\n'
+    '  { active: true, plant: "Nie", TS_start: 99999, TS_end: 99999, url: "" },\n'
+    '];\n',
+    encoding="utf-8",
+)
+
+today = date.today()
+with OpenMeteoStandIn() as standin:
+    config = updater.UpdaterConfig(
+        state_dir=tmp / "state",
+        output_dir=tmp / "out",
+        thresholds=updater.thresholds_from_tracht(updater.parse_tracht_data(tmp / "tracht_data.js")),
+        archive_url=standin.archive_url,
+        forecast_url=standin.forecast_url,
+        horizon_days=7,
+        workers=2,
+        spread_seconds=0.0,
+    )
+
+    first = {result.location_id: result for result in updater.run_tick(config, today)}
+    settled_days = (today - date(today.year, 1, 1)).days - (ARCHIVE_DELAY_DAYS - 1)
+    for result in first.values():
+        assert result.error is None, result
+        assert result.newly_settled == settled_days, result
+        assert sorted(result.written) == ["bloom", "gts"], result
+
+    second = updater.run_tick(config, today)
+    for result in second:
+        assert result.fetched_days == ARCHIVE_DELAY_DAYS - 1 + 7, result
+        assert result.newly_settled == 0 and result.written == [], result
+
+    # Lost state of one location (e.g. crash before the first write).
+    (tmp / "state" / "state" / "b2.json").unlink()
+    (tmp / "out" / "gts" / "b2.json").unlink()
+    third = {result.location_id: result for result in updater.run_tick(config, today)}
+    assert third["a1"].written == [], third["a1"]
+    assert third["b2"].newly_settled == settled_days and third["b2"].written == ["gts"], third["b2"]
+
+gts = json.loads((tmp / "out" / "gts" / "a1.json").read_text(encoding="utf-8"))
+assert len(gts["gts"]) == (today - date(today.year, 1, 1)).days
+assert len(gts["forecast_gts"]) == 7
+bloom = json.loads((tmp / "out" / "bloom" / "a1.json").read_text(encoding="utf-8"))
+assert bloom["plants"][0]["source"] == "era5" and bloom["plants"][1]["date"] is None, bloom
+scheduler = json.loads((tmp / "state" / "scheduler.json").read_text(encoding="utf-8"))
+assert scheduler["last_tick"] == today.isoformat()
+
+# A missed run is caught up at once; otherwise the next run is jittered.
+now = datetime(2026, 5, 1, 9, 0)
+assert updater.next_run(now, time(5, 30), date(2026, 4, 30), 600) == now
+tomorrow = updater.next_run(now, time(5, 30), date(2026, 5, 1), 600)
+assert datetime(2026, 5, 2, 5, 30) <= tomorrow <= datetime(2026, 5, 2, 5, 40), tomorrow
+later_today = updater.next_run(datetime(2026, 5, 1, 4, 0), time(5, 30), date(2026, 4, 30), 0)
+assert later_today == datetime(2026, 5, 1, 5, 30), later_today
+EOF
+
+echo "OK"
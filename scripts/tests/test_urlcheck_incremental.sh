@@ -0,0 +1,172 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the incremental mode of beelot urlcheck (state file, git revision
+range, JSON and JUnit reports) against a local HTTP server.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import subprocess
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from beelot import naturadb_url_check, urlstate
+
+hits = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        hits.append(self.path.strip("/"))
+        body = ("Error404" if self.path.startswith("/missing") else "Pflanze").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        return
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_address[1]}"
+
+repo = tmp / "repo"
+repo.mkdir()
+tracht = repo / "tracht_data.js"
+
+
+def write_tracht(paths):
+    tracht.write_text(
+        "const defaultTrachtData = [\n"
+        + "".join(f'  {{ plant: "Pflanze {path}", url: "{base}/{path}" }},\n' for path in paths)
+        + "];\n",
+        encoding="utf-8",
+    )
+
+
+def git(*args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def run(*options):
+    hits.clear()
+    return naturadb_url_check.main([str(tracht), "--delay", "0", *options])
+
+
+git("init", "-q")
+git("config", "user.email", "test@example.com")
+git("config", "user.name", "test")
+write_tracht([f"p{i}" for i in range(6)])
+git("add", "tracht_data.js")
+git("commit", "-q", "-m", "first")
+
+# Fingerprints ignore the line number.
+entries = naturadb_url_check.parse_js_file(str(tracht))
+moved = naturadb_url_check.TrachtEntry(entries[0].plant, entries[0].url, 99)
+assert urlstate.fingerprint(moved) == urlstate.fingerprint(entries[0])
+
+# First run with an empty state checks everything, the second only the sample.
+state = tmp / "state.json"
+assert run("--state", str(state), "--sample", "2") == 0
+assert sorted(hits) == [f"p{i}" for i in range(6)], hits
+assert run("--state", str(state), "--sample", "2") == 0
+assert len(hits) == 2, hits
+first_sample = set(hits)
+assert run("--state", str(state), "--sample", "2") == 0
+assert len(hits) == 2 and not first_sample & set(hits), hits
+
+# Edited and added entries are new; a broken page is retried on the next run.
+write_tracht(["p0", "p1", "changed", "p3", "p4", "p5", "missing"])
+report = tmp / "report.json"
+assert run("--state", str(state), "--sample", "0", "--report-json", str(report)) == 0
+assert sorted(hits) == ["changed", "missing"], hits
+payload = json.loads(report.read_text(encoding="utf-8"))
+assert payload["entries"] == 7 and payload["checked"] == 2 and payload["problems"] == 1, payload
+assert {row["url"].rsplit("/", 1)[1]: row["selected"] for row in payload["results"]} == {
+    "changed": "new",
+    "missing": "new",
+}
+saved = json.loads(state.read_text(encoding="utf-8"))["entries"]
+assert len(saved) == 7 and not any(item["url"].endswith("/p2") for item in saved.values())
+assert run("--state", str(state), "--sample", "0", "--fail-on-problems") == 1
+assert hits == ["missing"], hits
+
+# A git range selects the entries that differ from the committed file.
+expected = {
+    urlstate.fingerprint(entry)
+    for entry in naturadb_url_check.parse_js_file(str(tracht))
+    if entry.url.endswith(("/changed", "/missing"))
+}
+assert urlstate.changed_fingerprints(tracht, "HEAD") == expected
+git("commit", "-q", "-am", "second")
+assert urlstate.changed_fingerprints(tracht, "HEAD") == set()
+junit = tmp / "urlcheck.xml"
+assert run("--since", "HEAD~1..HEAD", "--junit", str(junit), "--fail-on-problems") == 1
+assert sorted(hits) == ["changed", "missing"], hits
+suite = ET.parse(junit).getroot().find("testsuite")
+assert suite.get("tests") == "2" and suite.get("failures") == "1", ET.tostring(suite)
+failed = [case for case in suite.iter("testcase") if case.find("failure") is not None]
+assert len(failed) == 1 and "Pflanze missing" in failed[0].get("name"), failed[0].get("name")
+assert failed[0].find("failure").get("message") == "Error404 marker found in HTML"
+
+assert run("--since", "HEAD") == 0 and hits == []
+assert run("--since", "no-such-revision") == 1
+server.shutdown()
+EOF
+
+echo "OK"
@@ -0,0 +1,205 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Runs `beelot urlcheck` with metrics export against a local HTTP server
+(ok, Error404, redirect, flaky and throttled pages) and checks the JSON
+report and the Prometheus text file.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import re
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+from urllib3.util import connection
+
+from beelot import naturadb_url_check, urlmetrics
+
+original_set_socket_options = connection._set_socket_options
+
+hits = {}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        hits[self.path] = hits.get(self.path, 0) + 1
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/throttled" or (self.path == "/flaky" and hits[self.path] == 1):
+            self.send_response(429 if self.path == "/throttled" else 503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = ("Error404" if self.path == "/missing" else "Pflanze " * 100).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        return
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_address[1]}"
+
+tracht = tmp / "tracht_data.js"
+paths = ["ok", "missing", "redirect", "flaky", "throttled"]
+tracht.write_text(
+    "const defaultTrachtData = [\n"
+    + "".join(f'  {{ plant: "Pflanze {path}", url: "{base}/{path}" }},\n' for path in paths)
+    + "];\n",
+    encoding="utf-8",
+)
+
+report_path = tmp / "report.json"
+prom_path = tmp / "metrics" / "urlcheck.prom"
+status = naturadb_url_check.main(
+    [str(tracht), "--delay", "0", "--retries", "1", "--backoff", "0",
+     "--metrics-json", str(report_path), "--metrics-prom", str(prom_path)]
+)
+assert status == 0, status
+
+report = json.loads(report_path.read_text(encoding="utf-8"))
+host = report["hosts"]["127.0.0.1"]
+# ok, missing, redirect, flaky twice, throttled twice.
+assert host["requests"] == 7, host
+assert host["retries"] == 2, host
+assert host["redirects"] == 1, host
+assert host["status"] == {"200": 4, "429": 2, "503": 1}, host["status"]
+assert host["bytes"] == 3 * 800 + len("Error404"), host["bytes"]
+assert report["problems"] == 2, report["problems"]
+
+by_url = {}
+for item in report["requests"]:
+    by_url.setdefault(item["url"].rsplit("/", 1)[1], []).append(item)
+assert by_url["redirect"][0]["redirects"] == [f"302 {base}/redirect"]
+assert [item["status"] for item in by_url["flaky"]] == [503, 200]
+for item in report["requests"]:
+    phases = item["phases"]
+    assert set(phases) == set(urlmetrics.PHASES)
+    assert phases["tls"] == 0.0
+    assert phases["connect"] > 0.0, phases
+    parts = sum(phases[name] for name in ("dns", "connect", "tls", "ttfb", "body"))
+    assert abs(parts - phases["total"]) < 1e-6, phases
+
+lines = prom_path.read_text(encoding="utf-8").splitlines()
+samples = {}
+for line in lines:
+    if line.startswith("#"):
+        assert re.match(r"# (HELP|TYPE) beelot_urlcheck_\w+ ", line), line
+        continue
+    name, value = line.rsplit(" ", 1)
+    samples[name] = float(value)
+buckets = [
+    value for name, value in samples.items()
+    if name.startswith('beelot_urlcheck_phase_seconds_bucket{host="127.0.0.1",phase="total",')
+]
+assert buckets == sorted(buckets) and buckets[-1] == 7, buckets
+assert samples['beelot_urlcheck_phase_seconds_count{host="127.0.0.1",phase="total"}'] == 7
+# Every run rewrites the file from zero, so the per-run totals are gauges.
+assert samples['beelot_urlcheck_requests{host="127.0.0.1",status="429"}'] == 2
+assert samples['beelot_urlcheck_retries{host="127.0.0.1"}'] == 2
+assert samples['beelot_urlcheck_bytes{host="127.0.0.1"}'] == host["bytes"]
+assert not [line for line in lines if line.startswith("# TYPE") and line.endswith(" counter")], lines
+assert not [name for name in samples if "_total" in name], samples
+assert samples["beelot_urlcheck_problems"] == 2
+assert not list(prom_path.parent.glob(".*.tmp"))
+
+# urllib3 resolves the host once per new connection, and that lookup is the dns phase.
+real_getaddrinfo = socket.getaddrinfo
+lookups = []
+
+
+def slow_getaddrinfo(*args, **kwargs):
+    lookups.append(args[0])
+    # The hook is in place while the timed connection resolves the host.
+    assert connection._set_socket_options is not original_set_socket_options
+    time.sleep(0.05)
+    return real_getaddrinfo(*args, **kwargs)
+
+
+socket.getaddrinfo = slow_getaddrinfo
+try:
+    session = urlmetrics.instrumented_session()
+    with urlmetrics.RequestTimer() as timer:
+        response = session.get(f"{base}/ok", stream=True, timeout=5)
+        timer.headers_received()
+        assert len(response.content) == 800
+finally:
+    socket.getaddrinfo = real_getaddrinfo
+    session.close()
+assert lookups == ["127.0.0.1"], lookups
+assert connection._set_socket_options is original_set_socket_options
+assert timer.phases["dns"] >= 0.05, timer.phases
+assert timer.phases["connect"] < 0.05, timer.phases
+
+problems = naturadb_url_check.check_urls(
+    naturadb_url_check.parse_js_file(str(tracht))[:2], timeout_s=5.0, delay_s=0.0
+)
+server.shutdown()
+assert [problem.reason for problem in problems] == ["Error404 marker found in HTML"], problems
+EOF
+
+echo "OK"
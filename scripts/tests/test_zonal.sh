@@ -0,0 +1,221 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+PROG="$(basename "$0")"
+KEEP_TMP=0
+SCRIPTS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+
+show_help() {
+  cat <<EOF
+Usage: $PROG [OPTIONS]
+
+Checks the cell-to-region weights, area-weighted mean curves, crossing
+dates and static artifacts of beelot zonal on a synthetic grid cube.
+
+Options:
+  --keep-tmp     Keep temporary directory for inspection.
+  -h, --help, -? Show this help message and exit.
+
+Examples:
+  $PROG
+  $PROG --keep-tmp
+  $PROG -h
+EOF
+}
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --keep-tmp)
+      KEEP_TMP=1
+      shift
+      ;;
+    -h|--help|-\?)
+      show_help
+      exit 0
+      ;;
+    *)
+      echo "Error: unknown option: $1" >&2
+      show_help >&2
+      exit 1
+      ;;
+  esac
+done
+
+TMP_DIR="$(mktemp -d)"
+cleanup() {
+  if [[ "$KEEP_TMP" -eq 0 ]]; then
+    rm -rf "$TMP_DIR"
+  else
+    echo "Keeping temp dir: $TMP_DIR"
+  fi
+}
+trap cleanup EXIT
+
+python3 - "$SCRIPTS_DIR" "$TMP_DIR" <<'EOF'
+import json
+import math
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, sys.argv[1])
+tmp = Path(sys.argv[2])
+
+import numpy as np
+
+from beelot import zonal
+from beelot.cube import CubeStore, calendar_slot
+from beelot.tracht_index import DEFAULT_INPUT
+
+TRACHT = str(Path(sys.argv[1]).parent / DEFAULT_INPUT)
+CELL = 0.1
+
+# 10 x 10 grid of 0.1 degree cells with centres at 48.05..48.95 N, 11.05..11.95 E.
+FIRST, LAST = 2022, 2024
+store = CubeStore.create(tmp / "cube", FIRST, LAST, capacity=128)
+rng = np.random.default_rng(5)
+start = date(FIRST, 1, 1)
+days = (date(LAST, 12, 31) - start).days + 1
+season = 8.0 - 10.0 * np.cos(2 * np.pi * np.arange(days) / 365.25)
+for row in range(10):
+    for col in range(10):
+        location_id = f"c{row}{col}"
+        store.add_location(location_id, round(48.05 + 0.1 * row, 2), round(11.05 + 0.1 * col, 2))
+        temperatures = season + 0.3 * col - 0.2 * row + rng.normal(0.0, 1.0, days)
+        # One cell has no data in 2024.
+        count = days - 366 if location_id == "c99" else days
+        store.write_days(location_id, start, temperatures[:count])
+store.close()
+
+
+def square(west, south, east, north):
+    return [[west, south], [east, south], [east, north], [west, north], [west, south]]
+
+
+features = [
+    # Exactly the four cells c00, c01, c10, c11.
+    {"type": "Feature", "properties": {"AGS": "01", "GEN": "Aligned"}, "geometry": {
+        "type": "Polygon", "coordinates": [square(11.0, 48.0, 11.2, 48.2)]}},
+    # Half of each of c33 and c34 (triangle over the 2x1 rectangle of those cells).
+    {"type": "Feature", "properties": {"AGS": "02", "GEN": "Triangle"}, "geometry": {
+        "type": "Polygon", "coordinates": [[[11.3, 48.3], [11.5, 48.3], [11.3, 48.4], [11.3, 48.3]]]}},
+    # 3x3 cells around c66 without c66 itself, plus c99 as a second part.
+    {"type": "Feature", "properties": {"AGS": "03", "GEN": "Holey"}, "geometry": {
+        "type": "MultiPolygon", "coordinates": [
+            [square(11.5, 48.5, 11.8, 48.8), square(11.6, 48.6, 11.7, 48.7)[::-1]],
+            [square(11.9, 48.9, 12.0, 49.0)],
+        ]}},
+    # Irregular polygon partly outside the grid.
+    {"type": "Feature", "properties": {"AGS": "04", "GEN": "Outside"}, "geometry": {
+        "type": "Polygon",
+        "coordinates": [[[10.8, 48.42], [11.33, 48.47], [11.27, 48.81], [10.9, 48.9], [10.8, 48.42]]]}},
+]
+regions_path = tmp / "regions.geojson"
+regions_path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+
+regions = zonal.load_regions(regions_path)
+assert [region.id for region in regions] == ["01", "02", "03", "04"]
+assert [region.name for region in regions] == ["Aligned", "Triangle", "Holey", "Outside"]
+
+store = CubeStore.open(tmp / "cube")
+ids = [location.id for location in store.locations]
+weights = zonal.build_weights(regions, store.locations, CELL)
+matrix = weights.matrix
+
+
+def cell_km2(location_id):
+    lat = store.locations[ids.index(location_id)].lat
+    return CELL * CELL * math.cos(math.radians(lat)) * zonal.KM_PER_DEG**2
+
+
+def nonzero(row):
+    return {ids[index] for index in np.flatnonzero(matrix[row] > 1e-9)}
+
+
+assert nonzero(0) == {"c00", "c01", "c10", "c11"}
+for location_id in nonzero(0):
+    assert abs(matrix[0, ids.index(location_id)] - cell_km2(location_id)) < 1e-6
+assert nonzero(1) == {"c33", "c34"}
+assert abs(matrix[1, ids.index("c33")] - 0.75 * cell_km2("c33")) < 1e-6
+assert abs(matrix[1, ids.index("c34")] - 0.25 * cell_km2("c34")) < 1e-6
+assert nonzero(2) == {f"c{r}{c}" for r in (5, 6, 7) for c in (5, 6, 7)} - {"c66"} | {"c99"}
+coverage = weights.coverage()
+assert np.allclose(coverage[:3], 1.0, atol=2e-3), coverage
+assert 0.3 < coverage[3] < 0.9, coverage
+assert abs(matrix[3].sum() - coverage[3] * weights.area_km2[3]) < 1e-6 * weights.area_km2[3]
+
+# Brute-force clipping of the irregular polygon on a fine point raster.
+polygon = np.array(features[3]["geometry"]["coordinates"][0][:-1])
+for location_id in nonzero(3):
+    location = store.locations[ids.index(location_id)]
+    offsets = (np.arange(200) + 0.5) / 200 * CELL - CELL / 2
+    xs, ys = np.meshgrid(location.lon + offsets, location.lat + offsets)
+    inside = np.zeros(xs.shape, dtype=bool)
+    for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        crosses = (y1 > ys) != (y2 > ys)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            at = x1 + (ys - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (xs < at)
+    share = matrix[3, ids.index(location_id)] / cell_km2(location_id)
+    assert abs(share - inside.mean()) < 0.01, (location_id, share, inside.mean())
+
+# Mean curves against a loop over regions, years and slots.
+data = store.data()
+means = zonal.zonal_means(data, matrix, min_valid=0.5)
+assert means.shape == (4, 3, 366)
+for row in range(4):
+    for year in range(3):
+        block = np.array(data[:, year], dtype=np.float64)
+        known = ~np.isnan(block)
+        weight = matrix[row][:, None] * known
+        with np.errstate(invalid="ignore", divide="ignore"):
+            expected = np.nansum(block * matrix[row][:, None], axis=0) / weight.sum(axis=0)
+        expected[weight.sum(axis=0) < 0.5 * matrix[row].sum()] = np.nan
+        assert np.allclose(means[row, year], expected, equal_nan=True, rtol=1e-9)
+assert np.isnan(means[:, 0, 59]).all() and not np.isnan(means[:, 2, 59]).any()
+# c99 is 1 of 9 cells of "Holey" and missing in 2024; with min_valid 1.0 the region drops out.
+strict = zonal.zonal_means(data, matrix, min_valid=1.0)
+assert np.isnan(strict[2, 2]).all() and not np.isnan(strict[2, 1, :59]).any()
+assert np.allclose(strict[:2], means[:2], equal_nan=True)
+
+# CLI: artifacts, crossing dates and the weight cache.
+out = tmp / "site"
+store.close()
+status = zonal.main(["-d", str(tmp / "cube"), "-r", str(regions_path), "-o", str(out), "--tracht", TRACHT])
+assert status == 0
+cache = tmp / "cube" / "zonal_regions.npz"
+assert cache.exists()
+payload = json.loads((out / "zonal.json").read_text(encoding="utf-8"))
+assert payload["years"] == [2022, 2023, 2024]
+assert [region["id"] for region in payload["regions"]] == ["01", "02", "03", "04"]
+assert [region["cells"] for region in payload["regions"]] == [4, 2, 9, len(nonzero(3))]
+shape = payload["curves"]["shape"]
+curves = np.frombuffer((out / "curves.u16").read_bytes(), dtype="<u2").reshape(shape)
+decoded = np.where(curves == zonal.CURVE_MISSING, np.nan, curves / zonal.CURVE_SCALE)
+assert np.allclose(decoded, np.round(means * 10) / 10, equal_nan=True, atol=1e-9)
+
+levels = [item["ts_start"] for item in payload["thresholds"]]
+for row, region in enumerate(payload["regions"]):
+    for index, year in enumerate(payload["years"]):
+        dates = payload["bloom"][region["id"]][str(year)]
+        for level, value in zip(levels, dates):
+            reached = np.flatnonzero(means[row, index] >= level)
+            if reached.size == 0:
+                assert value is None
+            else:
+                day = date.fromisoformat(value)
+                assert day.year == year and calendar_slot(day.month, day.day) == reached[0], (value, reached[0])
+
+cache_stamp = cache.stat().st_mtime_ns
+with CubeStore.open(tmp / "cube") as store:
+    key = zonal.weights_key(regions_path, store.locations, CELL, zonal.ID_PROPERTIES + zonal.NAME_PROPERTIES)
+assert zonal.load_weights(cache, key) is not None and zonal.load_weights(cache, "other") is None
+status = zonal.main(
+    ["-d", str(tmp / "cube"), "-r", str(regions_path), "-o", str(out), "--tracht", TRACHT, "--years", "2023"]
+)
+assert status == 0 and cache.stat().st_mtime_ns == cache_stamp
+payload = json.loads((out / "zonal.json").read_text(encoding="utf-8"))
+assert payload["years"] == [2023] and payload["curves"]["shape"] == [4, 1, 366]
+EOF
+
+echo "OK"
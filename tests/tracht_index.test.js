@@ -0,0 +1,39 @@
+import { defaultTrachtData } from '../assets/js/tracht_data';
+import {
+    TRACHT_INDEX_ENTRIES,
+    TRACHT_INDEX_MAX_GTS,
+    plantsActiveAt,
+    plantsStartingBetween
+} from '../assets/js/tracht_index';
+
+const activeDefaults = defaultTrachtData.filter(row => row.active);
+const keyOf = row => `${row.TS_start}|${row.TS_end}|${row.plant}`;
+const keys = rows => rows.map(keyOf).sort();
+
+describe('tracht_index', () => {
+    test('indexes every active default entry', () => {
+        expect(keys(TRACHT_INDEX_ENTRIES)).toEqual(keys(activeDefaults));
+    });
+
+    test('plantsActiveAt matches a linear scan', () => {
+        for (let gts = -1; gts <= TRACHT_INDEX_MAX_GTS + 1; gts += 0.25) {
+            const expected = activeDefaults.filter(
+                row => row.TS_start <= gts && gts <= row.TS_end
+            );
+            expect(keys(plantsActiveAt(gts))).toEqual(keys(expected));
+        }
+    });
+
+    test('plantsStartingBetween matches a linear scan and is ordered', () => {
+        for (let low = 0; low < 1000; low += 25) {
+            const high = low + 60;
+            const result = plantsStartingBetween(low, high);
+            const expected = activeDefaults.filter(
+                row => low <= row.TS_start && row.TS_start <= high
+            );
+            expect(keys(result)).toEqual(keys(expected));
+            const starts = result.map(row => row.TS_start);
+            expect(starts).toEqual([...starts].sort((a, b) => a - b));
+        }
+    });
+});
@@ -1,4 +1,9 @@
-import { shiftDateStringByDays } from "../assets/js/utils";
+import {
+    filterByDateRange,
+    formatDayMonth,
+    isoMonth,
+    shiftDateStringByDays
+} from "../assets/js/utils";
 
 describe("shiftDateStringByDays", () => {
     test("increments by one day", () => {
@@ -17,3 +22,50 @@ describe("shiftDateStringByDays", () => {
         expect(shiftDateStringByDays("2026-02-31", 1)).toBeNull();
     });
 });
+
+describe("isoMonth", () => {
+    test("reads the month from the string", () => {
+        expect(isoMonth("2024-01-31")).toBe(1);
+        expect(isoMonth("2024-02-29")).toBe(2);
+        expect(isoMonth("2024-12-01")).toBe(12);
+    });
+});
+
+describe("formatDayMonth", () => {
+    test("formats without leading zeros", () => {
+        expect(formatDayMonth("2024-03-05")).toBe("5.3");
+        expect(formatDayMonth("2024-12-31")).toBe("31.12");
+    });
+});
+
+describe("filterByDateRange", () => {
+    const entries = ["2024-02-28", "2024-02-29", "2024-03-01", "2024-03-02", "2024-03-03"]
+        .map((date, i) => ({ date, gts: i }));
+
+    test("includes start and end day", () => {
+        const result = filterByDateRange(entries, new Date(2024, 1, 29), new Date(2024, 2, 2));
+        expect(result.map(entry => entry.date)).toEqual(["2024-02-29", "2024-03-01", "2024-03-02"]);
+    });
+
+    test("keeps the whole end day when the end date has a time", () => {
+        const result = filterByDateRange(entries, new Date(2024, 2, 1), new Date(2024, 2, 2, 0, 0, 1));
+        expect(result.map(entry => entry.date)).toEqual(["2024-03-01", "2024-03-02"]);
+        const evening = filterByDateRange(entries, new Date(2024, 2, 3, 18, 30), new Date(2024, 2, 3, 23, 59));
+        expect(evening.map(entry => entry.date)).toEqual(["2024-03-03"]);
+    });
+});
+
+// Run under `npm run test:tz` to check these west of UTC, where
+// new Date("2024-03-01") falls on 29 February local time.
+describe("date helpers keep the calendar day in any time zone", () => {
+    test("formatDayMonth and isoMonth keep the calendar day", () => {
+        expect(formatDayMonth("2024-03-01")).toBe("1.3");
+        expect(isoMonth("2024-03-01")).toBe(3);
+    });
+
+    test("filterByDateRange keeps the first day of the range", () => {
+        const entries = [{ date: "2024-02-29" }, { date: "2024-03-01" }, { date: "2024-03-02" }];
+        const result = filterByDateRange(entries, new Date(2024, 2, 1), new Date(2024, 2, 1));
+        expect(result).toEqual([{ date: "2024-03-01" }]);
+    });
+});